@@ -13,6 +13,7 @@ from .security.decorators import has_access, permission_name  # noqa: F401
 # Import original views first
 from .views import (  # noqa: F401
     CompactCRUDMixin,
+    IndexView,
     MasterDetailView,
     ModelView,
     MultipleView,
@@ -21,51 +22,33 @@ from .views import (  # noqa: F401
     SimpleFormView,
 )  # noqa: F401
 
-# Import enhanced components
-try:
-    from .enhanced_index_view import IndexView  # Enhanced beautiful dashboard
-    
-    # Also make enhanced wizard views available
-    from .views.dashboard import DashboardIndexView, DashboardAPIView
-    from .views.wizard import WizardFormView, WizardModelView
-    from .views.wizard_builder import (
-        WizardBuilderView,
-        WizardTemplateGalleryView,
-        WizardPreviewView,
-        WizardManagementView
-    )
-    from .views.wizard_migration import (
-        WizardMigrationView,
-        WizardExportView,
-        WizardImportView,
-        WizardBackupView
-    )
-    
-    # Export enhanced views for easy access
-    __all__ = [
-        # Core Flask-AppBuilder
-        'AppBuilder', 'BaseView', 'ModelView', 'expose', 'action',
-        'has_access', 'permission_name', 'ModelRestApi',
-        'CompactCRUDMixin', 'MasterDetailView', 'MultipleView',
-        'PublicFormView', 'RestCRUDView', 'SimpleFormView',
-        
-        # Enhanced Views
-        'IndexView',  # Beautiful dashboard
-        'DashboardIndexView', 'DashboardAPIView',
-        'WizardFormView', 'WizardModelView',
-        'WizardBuilderView', 'WizardTemplateGalleryView', 
-        'WizardPreviewView', 'WizardManagementView',
-        'WizardMigrationView', 'WizardExportView',
-        'WizardImportView', 'WizardBackupView',
-    ]
-    
-except ImportError:
-    # Fallback to original IndexView if enhanced views not available
-    from .views import IndexView  # noqa: F401
-    
-    __all__ = [
+from .utils.lazy import lazy_exports
+
+# Enhanced views pull in large widget and wizard modules, they are imported
+# on first access so a plain ``import flask_appbuilder`` stays fast
+_LAZY_IMPORTS = {
+    'DashboardIndexView': '.views.dashboard',
+    'DashboardAPIView': '.views.dashboard',
+    'WizardFormView': '.views.wizard',
+    'WizardModelView': '.views.wizard',
+    'WizardBuilderView': '.views.wizard_builder',
+    'WizardTemplateGalleryView': '.views.wizard_builder',
+    'WizardPreviewView': '.views.wizard_builder',
+    'WizardManagementView': '.views.wizard_builder',
+    'WizardMigrationView': '.views.wizard_migration',
+    'WizardExportView': '.views.wizard_migration',
+    'WizardImportView': '.views.wizard_migration',
+    'WizardBackupView': '.views.wizard_migration',
+}
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    globals(),
+    _LAZY_IMPORTS,
+    exports=[
         'AppBuilder', 'BaseView', 'ModelView', 'IndexView', 'expose', 'action',
         'has_access', 'permission_name', 'ModelRestApi',
         'CompactCRUDMixin', 'MasterDetailView', 'MultipleView',
         'PublicFormView', 'RestCRUDView', 'SimpleFormView',
-    ]
+    ],
+)
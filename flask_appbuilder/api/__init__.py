@@ -49,6 +49,7 @@ except ImportError:
 
 from .convert import Model2SchemaConverter
 from .schemas import get_info_schema, get_item_schema, get_list_schema
+from .serializers import dumps_response, get_row_serializer
 from .._compat import as_unicode
 from ..baseviews import AbstractViewApi
 from ..const import (
@@ -56,6 +57,7 @@ from ..const import (
     API_ADD_COLUMNS_RIS_KEY,
     API_ADD_TITLE_RES_KEY,
     API_ADD_TITLE_RIS_KEY,
+    API_COUNT_MODE_RIS_KEY,
     API_DESCRIPTION_COLUMNS_RES_KEY,
     API_DESCRIPTION_COLUMNS_RIS_KEY,
     API_EDIT_COLUMNS_RES_KEY,
@@ -70,10 +72,12 @@ from ..const import (
     API_LIST_COLUMNS_RIS_KEY,
     API_LIST_TITLE_RES_KEY,
     API_LIST_TITLE_RIS_KEY,
+    API_NEXT_CURSOR_RES_KEY,
     API_ORDER_COLUMN_RIS_KEY,
     API_ORDER_COLUMNS_RES_KEY,
     API_ORDER_COLUMNS_RIS_KEY,
     API_ORDER_DIRECTION_RIS_KEY,
+    API_PAGE_AFTER_RIS_KEY,
     API_PAGE_INDEX_RIS_KEY,
     API_PAGE_SIZE_RIS_KEY,
     API_PERMISSIONS_RES_KEY,
@@ -91,6 +95,7 @@ from ..const import (
 from ..exceptions import (
     FABException,
     InvalidColumnArgsFABException,
+    InvalidCursorFABException,
     InvalidOrderByColumnFABException,
 )
 from ..hooks import get_before_request_hooks, wrap_route_handler_with_hooks
@@ -647,17 +652,17 @@ class BaseApi(AbstractViewApi):
         """
         Will return a list with views that need to be initialized.
         Normally related_views from ModelView
-        
+        """
         return []
 
     def get_init_inner_views(self) -> List[AbstractViewApi]:
-        
+        """
         Sets initialized inner views
-        
+        """
         pass  # pragma: no cover
 
     def get_method_permission(self, method_name: str) -> str:
-        
+        """
         Returns the permission name for a method
         """
         if self.method_permission_name:
@@ -788,9 +793,9 @@ class BaseModelApi(BaseApi):
 
         class MyModelApi(BaseModelApi):
             datamodel = SQLAInterface(MyTable)
-    
+    """
     search_columns = None
-    
+    """
     List with allowed search columns, if not provided all possible search
     columns will be used. If you want to limit the search (*filter*) columns
      possibilities, define it with a list of column names from your model::
@@ -815,18 +820,18 @@ class BaseModelApi(BaseApi):
             datamodel = SQLAInterface(MyTable)
             search_columns = ['name', 'address']
 
-    
+    """
     search_filters = None
-    
+    """
     Override default search filters for columns
-    
+    """
     search_exclude_columns = None
-    
+    """
     List with columns to exclude from search. Search includes all possible
     columns by default
-    
+    """
     label_columns = None
-    
+    """
     Dictionary of labels for your columns, override this if you want
      different pretify labels
 
@@ -836,9 +841,9 @@ class BaseModelApi(BaseApi):
             datamodel = SQLAInterface(MyTable)
             label_columns = {'name':'My Name Label Override'}
 
-    
+    """
     base_filters = None
-    
+    """
     Filter the view use: [['column_name',BaseFilter,'value'],]
 
     example::
@@ -851,10 +856,10 @@ class BaseModelApi(BaseApi):
             base_filters = [['created_by', FilterEqualFunction, get_user],
                             ['name', FilterStartsWith, 'a']]
 
-    
+    """
 
     base_order = None
-    
+    """
     Use this property to set default ordering for lists
      ('col_name','asc|desc')::
 
@@ -862,11 +867,11 @@ class BaseModelApi(BaseApi):
             datamodel = SQLAInterface(MyTable)
             base_order = ('my_column_name','asc')
 
-    
+    """
     _base_filters = None
-     Internal base Filter from class Filters will always filter view 
+    """ Internal base Filter from class Filters will always filter view """
     _filters = None
-    
+    """
     Filters object will calculate all possible filter types
     based on search_columns
     """
@@ -882,13 +887,13 @@ class BaseModelApi(BaseApi):
     def _gen_labels_columns(self, list_columns: List[str]) -> None:
         """
         Auto generates pretty label_columns from list of columns
-        
+        """
         for col in list_columns:
             if not self.label_columns.get(col):
                 self.label_columns[col] = self._prettify_column(col)
 
     def _label_columns_json(self, cols: Optional[List[str]] = None) -> Dict[str, Any]:
-        
+        """
         Prepares dict with labels to be JSON serializable
         """
         ret = {}
@@ -946,6 +951,16 @@ class ModelRestApi(BaseModelApi):
     
     list_select_columns: Optional[List[str]] = None
     list_outer_default_load = False
+    list_fast_serialization = False
+    """
+    If True, get_list selects only the requested columns as rows and
+    serializes them with a function compiled from the list schema, instead of
+    loading model instances and dumping them with marshmallow. The response
+    is encoded with orjson, if installed, when it produces the same output.
+    Only applies when all list columns are plain model columns of string,
+    integer, float, boolean, date or datetime types, otherwise the regular
+    path is used
+    """
     list_columns: Optional[List[str]] = None
     show_select_columns: Optional[List[str]] = None
     show_outer_default_load = False
@@ -1029,6 +1044,8 @@ class ModelRestApi(BaseModelApi):
             self.list_model_schema = self.model2schemaconverter.convert(
                 self.list_columns, parent_schema_name=self.list_model_schema_name
             )
+            # Warm up the schema used when clients select these columns
+            self.model2schemaconverter.convert(self.list_columns)
         if self.add_model_schema is None:
             self.add_model_schema = self.model2schemaconverter.convert(
                 self.add_columns,
@@ -1045,6 +1062,7 @@ class ModelRestApi(BaseModelApi):
             self.show_model_schema = self.model2schemaconverter.convert(
                 self.show_columns, parent_schema_name=self.show_model_schema_name
             )
+            self.model2schemaconverter.convert(self.show_columns)
 
     def _init_titles(self) -> None:
         """
@@ -1301,11 +1319,11 @@ class ModelRestApi(BaseModelApi):
               $ref: '#/components/responses/422'
             500:
               $ref: '#/components/responses/500'
-        
+        """
         return self.info_headless(**kwargs)
 
     def get_headless(self, pk: ModelKeyType, **kwargs: Any) -> Response:
-        
+        """
             Get an item from Model
 
         :param pk: Item primary key
@@ -1425,11 +1443,11 @@ class ModelRestApi(BaseModelApi):
               $ref: '#/components/responses/422'
             500:
               $ref: '#/components/responses/500'
-        
+        """
         return self.get_headless(pk, **kwargs)
 
     def get_list_headless(self, **kwargs: Any) -> Response:
-        
+        """
         Get list of items from Model
         """
         response = dict()
@@ -1469,23 +1487,108 @@ class ModelRestApi(BaseModelApi):
             return self.response_400(message=str(e))
         # handle pagination
         page_index, page_size = self._handle_page_args(args)
+        after = args.get(API_PAGE_AFTER_RIS_KEY)
         # Make the query
-        count, lst = self.datamodel.query(
-            joined_filters,
-            order_column,
-            order_direction,
-            page=page_index,
-            page_size=page_size,
-            select_columns=select_columns,
-            outer_default_load=self.list_outer_default_load,
-        )
+        try:
+            fast_list = self._query_list_rows(
+                list_model_schema,
+                joined_filters,
+                order_column,
+                order_direction,
+                page_index,
+                page_size,
+                after,
+                args.get(API_COUNT_MODE_RIS_KEY),
+            )
+            if fast_list is None:
+                count, lst = self.datamodel.query(
+                    joined_filters,
+                    order_column,
+                    order_direction,
+                    page=page_index,
+                    page_size=page_size,
+                    select_columns=select_columns,
+                    outer_default_load=self.list_outer_default_load,
+                    after=after,
+                    count_mode=args.get(API_COUNT_MODE_RIS_KEY),
+                )
+        except InvalidCursorFABException as e:
+            return self.response_400(message=str(e))
+        if fast_list is None:
+            response[API_RESULT_RES_KEY] = list_model_schema.dump(lst, many=True)
+        else:
+            count, lst, response[API_RESULT_RES_KEY] = fast_list
         pks = self.datamodel.get_keys(lst)
-        response[API_RESULT_RES_KEY] = list_model_schema.dump(lst, many=True)
         response["ids"] = pks
         response["count"] = count
+        if after is not None:
+            next_cursor = None
+            if lst and page_size and len(lst) == page_size:
+                next_cursor = self.datamodel.encode_cursor(
+                    lst[-1], order_column, order_direction
+                )
+            response[API_NEXT_CURSOR_RES_KEY] = next_cursor
         self.pre_get_list(response)
+        if fast_list is not None and self._can_dump_list_fast(list_model_schema):
+            body = dumps_response(response)
+            if body is not None:
+                resp = make_response(body, 200)
+                resp.headers["Content-Type"] = "application/json; charset=utf-8"
+                return resp
         return self.response(200, **response)
 
+    def _query_list_rows(
+        self,
+        list_model_schema: Schema,
+        filters: Filters,
+        order_column: str,
+        order_direction: str,
+        page_index: Optional[int],
+        page_size: Optional[int],
+        after: Optional[str],
+        count_mode: Optional[str],
+    ) -> Optional[Tuple[Optional[int], List[Any], List[Dict[str, Any]]]]:
+        """
+        Queries and serializes the list as plain column rows when
+        `list_fast_serialization` is enabled
+
+        :return: A tuple with the count, the rows and the serialized result,
+            or None if the list needs to be loaded as model instances
+        """
+        if not self.list_fast_serialization or not hasattr(
+            self.datamodel, "query_rows"
+        ):
+            return None
+        serializer, columns = get_row_serializer(list_model_schema)
+        if serializer is None:
+            return None
+        result = self.datamodel.query_rows(
+            columns,
+            filters,
+            order_column,
+            order_direction,
+            page=page_index,
+            page_size=page_size,
+            after=after,
+            count_mode=count_mode,
+        )
+        if result is None:
+            return None
+        count, rows = result
+        return count, rows, serializer(rows)
+
+    def _can_dump_list_fast(self, list_model_schema: Schema) -> bool:
+        """
+        orjson formats floats differently from the json module, only
+        use it when no float can be in the response
+        """
+        if type(self).pre_get_list is not ModelRestApi.pre_get_list:
+            return False
+        pk_name = self.datamodel.get_pk_name()
+        pk_names = pk_name if isinstance(pk_name, list) else [pk_name]
+        columns = get_row_serializer(list_model_schema)[1] + pk_names
+        return not any(self.datamodel.is_float(column) for column in columns)
+
     @expose("/", methods=["GET"])
     @protect()
     @safe
@@ -1555,8 +1658,16 @@ class ModelRestApi(BaseModelApi):
                           type: string
                       count:
                         description: >-
-                          The total record count on the backend
+                          The total record count on the backend, estimated
+                          or null depending on the requested count mode
                         type: number
+                        nullable: true
+                      next:
+                        description: >-
+                          Keyset pagination cursor for the next page, only
+                          returned when an after cursor was requested
+                        type: string
+                        nullable: true
                       order_columns:
                         description: >-
                           A list of allowed columns to sort
@@ -1577,11 +1688,11 @@ class ModelRestApi(BaseModelApi):
               $ref: '#/components/responses/422'
             500:
               $ref: '#/components/responses/500'
-        
+        """
         return self.get_list_headless(**kwargs)
 
     def post_headless(self) -> Response:
-        
+        """
         POST/Add item to Model
         """
         if not request.is_json:
@@ -1640,11 +1751,11 @@ class ModelRestApi(BaseModelApi):
               $ref: '#/components/responses/422'
             500:
               $ref: '#/components/responses/500'
-        
+        """
         return self.post_headless()
 
     def put_headless(self, pk: ModelKeyType) -> Response:
-        
+        """
         PUT/Edit item to Model
         """
         item = self.datamodel.get(pk, self._base_filters)
@@ -1708,11 +1819,11 @@ class ModelRestApi(BaseModelApi):
               $ref: '#/components/responses/422'
             500:
               $ref: '#/components/responses/500'
-        
+        """
         return self.put_headless(pk)
 
     def delete_headless(self, pk: ModelKeyType) -> Response:
-        
+        """
         Delete item from Model
         """
         item = self.datamodel.get(pk, self._base_filters)
@@ -1755,19 +1866,19 @@ class ModelRestApi(BaseModelApi):
               $ref: '#/components/responses/422'
             500:
               $ref: '#/components/responses/500'
-        
+        """
         return self.delete_headless(pk)
 
-    
+    """
     ------------------------------------------------
                 HELPER FUNCTIONS
     ------------------------------------------------
-    
+    """
 
     def _handle_page_args(
         self, rison_args: Dict[str, Any]
     ) -> Tuple[Optional[int], Optional[int]]:
-        
+        """
         Helper function to handle rison page
         arguments, sets defaults and impose
         FAB_API_MAX_PAGE_SIZE
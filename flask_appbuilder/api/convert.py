@@ -1,4 +1,6 @@
-from typing import Any, Callable, Dict, List, Optional, Type
+from collections import OrderedDict
+import threading
+from typing import Any, Callable, Dict, Hashable, List, Optional, Type
 
 from flask_appbuilder.models.sqla import Model
 from flask_appbuilder.models.sqla.interface import SQLAInterface
@@ -97,8 +99,15 @@ class BaseModel2SchemaConverter(object):
 class Model2SchemaConverter(BaseModel2SchemaConverter):
     """
     Class that converts Models to marshmallow Schemas
+
+    Converted schemas are kept in a bounded LRU keyed by model, column set,
+    nesting and parent schema name, so requests selecting the same columns
+    reuse one schema instead of building new schema classes each time.
     """
 
+    #: Maximum number of converted schemas kept per converter
+    schema_cache_size = 128
+
     def __init__(
         self,
         datamodel: SQLAInterface,
@@ -108,6 +117,33 @@ class Model2SchemaConverter(BaseModel2SchemaConverter):
         :param datamodel: SQLAInterface
         """
         super(Model2SchemaConverter, self).__init__(datamodel, validators_columns)
+        self._schema_cache: "OrderedDict[Hashable, SQLAlchemyAutoSchema]" = (
+            OrderedDict()
+        )
+        self._schema_cache_lock = threading.Lock()
+        self.schema_cache_hits = 0
+        self.schema_cache_misses = 0
+
+    def get_cache_stats(self) -> Dict[str, int]:
+        """
+        Get schema cache size and hit/miss counters
+        """
+        with self._schema_cache_lock:
+            return {
+                "size": len(self._schema_cache),
+                "maxsize": self.schema_cache_size,
+                "hits": self.schema_cache_hits,
+                "misses": self.schema_cache_misses,
+            }
+
+    def clear_cache(self) -> None:
+        """
+        Drop all cached schemas
+        """
+        with self._schema_cache_lock:
+            self._schema_cache.clear()
+            self.schema_cache_hits = 0
+            self.schema_cache_misses = 0
 
     @staticmethod
     def _debug_schema(schema: SQLAlchemyAutoSchema) -> None:
@@ -267,6 +303,37 @@ class Model2SchemaConverter(BaseModel2SchemaConverter):
         :param nested: Generate relation with nested schemas
         :return: ModelSchema object
         """
+        key = (
+            model or self.datamodel.obj,
+            frozenset(columns),
+            nested,
+            parent_schema_name,
+        )
+        with self._schema_cache_lock:
+            schema = self._schema_cache.get(key)
+            if schema is not None:
+                self._schema_cache.move_to_end(key)
+                self.schema_cache_hits += 1
+                return schema
+            self.schema_cache_misses += 1
+
+        schema = self._convert(
+            columns, model=model, nested=nested, parent_schema_name=parent_schema_name
+        )
+        with self._schema_cache_lock:
+            self._schema_cache[key] = schema
+            self._schema_cache.move_to_end(key)
+            while len(self._schema_cache) > self.schema_cache_size:
+                self._schema_cache.popitem(last=False)
+        return schema
+
+    def _convert(
+        self,
+        columns: List[str],
+        model: Optional[Type[Model]] = None,
+        nested: bool = True,
+        parent_schema_name: Optional[str] = None,
+    ) -> SQLAlchemyAutoSchema:
         super(Model2SchemaConverter, self).convert(
             columns, model=model, nested=nested, parent_schema_name=parent_schema_name
         )
@@ -1,13 +1,24 @@
+from collections import OrderedDict
+import gzip
+import hashlib
+import logging
+import threading
+
 from apispec import APISpec
 from apispec.ext.marshmallow import MarshmallowPlugin
 from apispec.ext.marshmallow.common import resolve_schema_cls
-from flask import current_app, request
+from flask import current_app, json, make_response, request
 from flask_appbuilder.api import BaseApi
 from flask_appbuilder.api import expose, protect, safe
 from flask_appbuilder.basemanager import BaseManager
 from flask_appbuilder.baseviews import BaseView
 from flask_appbuilder.security.decorators import has_access
 
+log = logging.getLogger(__name__)
+
+# Server URL of specs generated without FAB_OPENAPI_SERVERS, replaced by the request host
+HOST_URL_PLACEHOLDER = "__fab_openapi_host_url__"
+
 
 def resolver(schema):
     schema_cls = resolve_schema_cls(schema)
@@ -53,22 +64,41 @@ class OpenApi(BaseApi):
             500:
               $ref: '#/components/responses/500'
         """
-        version_found = False
-        api_spec = self._create_api_spec(version)
-        for base_api in current_app.appbuilder.baseviews:
-            if isinstance(base_api, BaseApi) and base_api.version == version:
-                base_api.add_api_spec(api_spec)
-                version_found = True
-        if version_found:
-            return self.response(200, **api_spec.to_dict())
-        else:
+        servers = current_app.config.get("FAB_OPENAPI_SERVERS")
+        spec = current_app.appbuilder.openapi_manager.get_spec(
+            version, servers, host_url=request.host_url
+        )
+        if spec is None:
             return self.response_404()
+        return self._spec_response(spec)
 
     @staticmethod
-    def _create_api_spec(version):
-        servers = current_app.config.get(
-            "FAB_OPENAPI_SERVERS", [{"url": request.host_url}]
-        )
+    def _spec_response(spec):
+        """
+        Serve a pre-serialized spec, gzip encoded when the client accepts it,
+        answering conditional requests with 304
+        """
+        etag, body, gzip_body = spec
+        use_gzip = "gzip" in request.accept_encodings
+        if use_gzip:
+            etag = f"{etag}-gzip"
+        if request.if_none_match.contains_weak(etag):
+            resp = make_response("", 304)
+        else:
+            resp = make_response(gzip_body if use_gzip else body, 200)
+            resp.headers["Content-Type"] = "application/json; charset=utf-8"
+            if use_gzip:
+                resp.headers["Content-Encoding"] = "gzip"
+        resp.set_etag(etag)
+        resp.vary.add("Accept-Encoding")
+        return resp
+
+    @staticmethod
+    def _create_api_spec(version, servers=None):
+        if servers is None:
+            servers = current_app.config.get(
+                "FAB_OPENAPI_SERVERS", [{"url": request.host_url}]
+            )
         return APISpec(
             title=current_app.appbuilder.app_name,
             version=version,
@@ -96,9 +126,128 @@ class SwaggerView(BaseView):
 
 
 class OpenApiManager(BaseManager):
+    """
+    Registers the OpenAPI views and keeps the generated specs.
+
+    Generating a spec walks every registered API, so each one is built once
+    per version, stored as serialized and gzip compressed JSON with a strong
+    ETag, and dropped when an API is added. Without FAB_OPENAPI_SERVERS the
+    spec is built with a placeholder server URL, and the copies with the
+    request host substituted are kept in a small LRU cache, so arbitrary
+    Host headers cannot grow the cache or trigger a rebuild.
+    """
+
+    host_specs_cache_size = 32
+    """ Number of specs kept with a request host substituted """
+
+    def __init__(self, appbuilder):
+        super().__init__(appbuilder)
+        self._specs = {}
+        self._host_specs = OrderedDict()
+        self._specs_lock = threading.Lock()
+
     def register_views(self):
         if not self.appbuilder.app.config.get("FAB_ADD_OPENAPI_VIEWS", True):
             return
         if self.appbuilder.get_app.config.get("FAB_API_SWAGGER_UI", False):
             self.appbuilder.add_api(OpenApi)
             self.appbuilder.add_view_no_menu(SwaggerView)
+
+    def get_spec(self, version, servers=None, host_url=None):
+        """
+        Get the serialized spec of an API version, generating it on first use
+
+        :param version: The API version, e.g. "v1"
+        :param servers: The configured OpenAPI servers list,
+            None to use the request host
+        :param host_url: The request host, used when no servers are configured
+        :return: (etag, json bytes, gzip bytes) or None if no API has this version
+        """
+        spec = self._get_generated_spec(version, servers)
+        if spec is None or servers:
+            return spec
+
+        key = (version, host_url)
+        with self._specs_lock:
+            host_spec = self._host_specs.get(key)
+            if host_spec is not None:
+                self._host_specs.move_to_end(key)
+                return host_spec
+        host_spec = self._substitute_host(spec, host_url)
+        with self._specs_lock:
+            self._host_specs[key] = host_spec
+            while len(self._host_specs) > self.host_specs_cache_size:
+                self._host_specs.popitem(last=False)
+        return host_spec
+
+    def invalidate_specs(self):
+        """Drop generated specs, called when an API is added"""
+        with self._specs_lock:
+            self._specs = {}
+            self._host_specs = OrderedDict()
+
+    def warm_up(self, background=True):
+        """
+        Generate the specs of all registered API versions ahead of the first request
+
+        :param background: Generate in a daemon thread instead of blocking
+        """
+        app = self.appbuilder.get_app
+        servers = app.config.get("FAB_OPENAPI_SERVERS")
+        versions = {
+            baseview.version
+            for baseview in self.appbuilder.baseviews
+            if isinstance(baseview, BaseApi)
+        }
+
+        def generate():
+            with app.app_context():
+                for version in sorted(versions):
+                    self._get_generated_spec(version, servers)
+
+        if background:
+            threading.Thread(target=generate, name="openapi-spec", daemon=True).start()
+        else:
+            generate()
+
+    def _get_generated_spec(self, version, servers):
+        """Get the spec generated for the configured servers, or for the host placeholder"""
+        key = (version, json.dumps(servers, sort_keys=True) if servers else None)
+        spec = self._specs.get(key)
+        if spec is not None:
+            return spec
+        with self._specs_lock:
+            spec = self._specs.get(key)
+            if spec is None:
+                spec = self._build_spec(
+                    version, servers or [{"url": HOST_URL_PLACEHOLDER}]
+                )
+                if spec is not None:
+                    self._specs[key] = spec
+        return spec
+
+    @staticmethod
+    def _substitute_host(spec, host_url):
+        _, body, _ = spec
+        # The URL is replaced inside a JSON string, so it is inserted JSON escaped
+        host = json.dumps(host_url or "/")[1:-1].encode("utf-8")
+        body = body.replace(HOST_URL_PLACEHOLDER.encode("utf-8"), host)
+        return OpenApiManager._serialized_spec(body)
+
+    @staticmethod
+    def _serialized_spec(body):
+        etag = hashlib.sha256(body).hexdigest()[:32]
+        return etag, body, gzip.compress(body)
+
+    def _build_spec(self, version, servers):
+        api_spec = OpenApi._create_api_spec(version, servers)
+        version_found = False
+        for base_api in self.appbuilder.baseviews:
+            if isinstance(base_api, BaseApi) and base_api.version == version:
+                base_api.add_api_spec(api_spec)
+                version_found = True
+        if not version_found:
+            return None
+        body = json.dumps(api_spec.to_dict()).encode("utf-8")
+        log.debug("Generated OpenAPI spec for %s, %s bytes", version, len(body))
+        return self._serialized_spec(body)
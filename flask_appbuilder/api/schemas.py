@@ -3,6 +3,10 @@ from marshmallow import post_load, Schema
 from ..const import (
     API_ADD_COLUMNS_RIS_KEY,
     API_ADD_TITLE_RIS_KEY,
+    API_COUNT_MODE_ESTIMATE,
+    API_COUNT_MODE_EXACT,
+    API_COUNT_MODE_NONE,
+    API_COUNT_MODE_RIS_KEY,
     API_DESCRIPTION_COLUMNS_RIS_KEY,
     API_EDIT_COLUMNS_RIS_KEY,
     API_EDIT_TITLE_RIS_KEY,
@@ -13,6 +17,7 @@ from ..const import (
     API_ORDER_COLUMN_RIS_KEY,
     API_ORDER_COLUMNS_RIS_KEY,
     API_ORDER_DIRECTION_RIS_KEY,
+    API_PAGE_AFTER_RIS_KEY,
     API_PAGE_INDEX_RIS_KEY,
     API_PAGE_SIZE_RIS_KEY,
     API_PERMISSIONS_RIS_KEY,
@@ -76,6 +81,15 @@ get_list_schema = {
         API_ORDER_DIRECTION_RIS_KEY: {"type": "string", "enum": ["asc", "desc"]},
         API_PAGE_INDEX_RIS_KEY: {"type": "integer"},
         API_PAGE_SIZE_RIS_KEY: {"type": "integer"},
+        API_PAGE_AFTER_RIS_KEY: {"type": "string"},
+        API_COUNT_MODE_RIS_KEY: {
+            "type": "string",
+            "enum": [
+                API_COUNT_MODE_EXACT,
+                API_COUNT_MODE_ESTIMATE,
+                API_COUNT_MODE_NONE,
+            ],
+        },
         API_FILTERS_RIS_KEY: {
             "type": "array",
             "items": {
@@ -0,0 +1,168 @@
+"""
+Fast serialization for ModelRestApi list responses.
+
+Compiles marshmallow schemas made only of plain column fields into a
+function that turns selected row tuples into the same dicts
+``schema.dump`` returns, and encodes responses with orjson, when it's
+installed, only if it produces the same bytes as the app's jsonify.
+"""
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import weakref
+
+from flask import current_app
+from marshmallow import fields, Schema
+from marshmallow.decorators import POST_DUMP, PRE_DUMP
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+RowSerializer = Callable[[Sequence[Sequence[Any]]], List[Dict[str, Any]]]
+
+
+def _isoformat(value: Any) -> str:
+    return value.isoformat()
+
+
+# Field classes (exact, not subclasses) whose dump is a plain conversion
+# of a non null column value
+_FIELD_CONVERTERS: Dict[type, Callable[[Any], Any]] = {
+    fields.String: str,
+    fields.Integer: int,
+    fields.Float: float,
+    fields.Boolean: bool,
+    fields.DateTime: _isoformat,
+    fields.Date: _isoformat,
+}
+
+_row_serializers: "weakref.WeakKeyDictionary[Schema, Tuple]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_field_converter(field: fields.Field) -> Optional[Callable[[Any], Any]]:
+    converter = _FIELD_CONVERTERS.get(type(field))
+    if converter is None or field.data_key or field.attribute:
+        return None
+    if isinstance(field, fields.Number) and field.as_string:
+        return None
+    if isinstance(field, (fields.DateTime, fields.Date)) and field.format not in (
+        None,
+        "iso",
+        "iso8601",
+    ):
+        return None
+    return converter
+
+
+def _compile_row_serializer(schema: Schema) -> Optional[RowSerializer]:
+    if schema._hooks.get(PRE_DUMP) or schema._hooks.get(POST_DUMP):
+        return None
+    converters = []
+    for name, field in schema.dump_fields.items():
+        converter = _get_field_converter(field)
+        if converter is None:
+            return None
+        converters.append((name, converter))
+    # Generate one function per schema, like collections.namedtuple does,
+    # so each row is a single dict display instead of a loop over fields
+    items = ", ".join(
+        f"{name!r}: None if row[{i}] is None else _f{i}(row[{i}])"
+        for i, (name, _) in enumerate(converters)
+    )
+    source = f"def serialize(rows):\n    return [{{{items}}} for row in rows]\n"
+    namespace = {f"_f{i}": converter for i, (_, converter) in enumerate(converters)}
+    exec(source, namespace)
+    return namespace["serialize"]
+
+
+def get_row_serializer(schema: Schema) -> Tuple[Optional[RowSerializer], List[str]]:
+    """
+    Returns a function that serializes rows selected with the schema's
+    columns, in order, like ``schema.dump(rows, many=True)`` would.
+    Compiled once per schema instance.
+
+    :param schema: A marshmallow schema instance
+    :return: A tuple with the serializer, or None if any field needs
+        marshmallow, and the column names the rows must be selected with
+    """
+    try:
+        return _row_serializers[schema]
+    except KeyError:
+        pass
+    serializer = _compile_row_serializer(schema)
+    columns = list(schema.dump_fields) if serializer else []
+    _row_serializers[schema] = (serializer, columns)
+    return serializer, columns
+
+
+def _get_json_options() -> Optional[Tuple[bool, bool, Callable[[Any], Any]]]:
+    """
+    Returns (sort_keys, ensure_ascii, default) as jsonify would use them,
+    or None if the app pretty prints or has a custom JSON encoder
+    """
+    app = current_app
+    provider = getattr(app, "json", None)
+    if provider is None:
+        # Flask < 2.2
+        from flask.json import JSONEncoder
+
+        if app.json_encoder is not JSONEncoder:
+            return None
+        if app.config["JSONIFY_PRETTYPRINT_REGULAR"] or app.debug:
+            return None
+        return (
+            app.config["JSON_SORT_KEYS"],
+            app.config["JSON_AS_ASCII"],
+            JSONEncoder().default,
+        )
+
+    from flask.json.provider import DefaultJSONProvider
+
+    if (
+        type(provider) is not DefaultJSONProvider
+        or getattr(app, "_json_encoder", None) is not None
+    ):
+        return None
+    # Deprecated config keys take precedence up to Flask 2.3
+    pretty = app.config.get("JSONIFY_PRETTYPRINT_REGULAR")
+    compact = provider.compact if pretty is None else not pretty
+    if compact is False or (compact is None and app.debug):
+        return None
+    sort_keys = app.config.get("JSON_SORT_KEYS")
+    ensure_ascii = app.config.get("JSON_AS_ASCII")
+    return (
+        provider.sort_keys if sort_keys is None else sort_keys,
+        provider.ensure_ascii if ensure_ascii is None else ensure_ascii,
+        provider.default,
+    )
+
+
+def dumps_response(obj: Any) -> Optional[bytes]:
+    """
+    Encodes a response body with orjson, byte for byte like jsonify.
+    Returns None if orjson is not installed or the result could differ,
+    the caller should then use jsonify.
+
+    orjson formats floats differently, so obj must not contain floats.
+
+    :param obj: The response data
+    """
+    if orjson is None:
+        return None
+    options = _get_json_options()
+    if options is None:
+        return None
+    sort_keys, ensure_ascii, default = options
+    # Let the app's JSON default serialize what the stdlib encoder can't
+    option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+    if sort_keys:
+        option |= orjson.OPT_SORT_KEYS
+    try:
+        body = orjson.dumps(obj, default=default, option=option)
+    except TypeError:
+        return None
+    if ensure_ascii and not body.isascii():
+        return None
+    return body + b"\n"
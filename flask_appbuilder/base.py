@@ -248,6 +248,8 @@ class AppBuilder:
                 self.register_blueprint(baseview)
             # Add missing permissions where needed
         self.add_permissions()
+        if self.get_app.config.get("FAB_OPENAPI_WARM_UP", False):
+            self.openapi_manager.warm_up()
 
     @property
     def get_app(self) -> Flask:
@@ -594,7 +596,10 @@ class AppBuilder:
         :param baseview: A BaseApi type class
         :return: The instantiated base view
         """
-        return self.add_view_no_menu(baseview)
+        baseview = self.add_view_no_menu(baseview)
+        if self.openapi_manager:
+            self.openapi_manager.invalidate_specs()
+        return baseview
 
     def security_cleanup(self) -> None:
         """
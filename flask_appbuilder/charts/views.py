@@ -168,6 +168,34 @@ class GroupByChartView(BaseChartView):
             formatter = {}
         return self.ProcessClass([group_by], series, formatter)
 
+    def _get_chart_data(self, group, filters, order_column, order_direction):
+        """
+        Returns the processed chart data. Grouping and aggregation are pushed
+        to the database when the datamodel supports the definition columns,
+        property or function columns are processed in python
+        """
+        if isinstance(group, GroupByProcessData):
+            result = self.datamodel.query_group_aggregate(
+                group.group_bys_cols[0], group.aggr_by_cols, filters=filters
+            )
+            if result is not None:
+                return [[group.format_columns(row[0])] + row[1:] for row in result]
+        elif isinstance(group, DirectProcessData):
+            lst = self.datamodel.query_direct(
+                group.group_bys_cols + list(group.aggr_by_cols),
+                filters=filters,
+                order_column=order_column,
+                order_direction=order_direction,
+            )
+            if lst is not None:
+                return group.apply(lst, sort=order_column == "")
+        count, lst = self.datamodel.query(
+            filters=filters,
+            order_column=order_column,
+            order_direction=order_direction,
+        )
+        return group.apply(lst, sort=order_column == "")
+
     def _get_chart_widget(
         self,
         filters=None,
@@ -186,16 +214,12 @@ class GroupByChartView(BaseChartView):
         if not self.datamodel.get_order_columns_list([order_column]):
             order_column = ""
             order_direction = ""
-        count, lst = self.datamodel.query(
-            filters=joined_filters,
-            order_column=order_column,
-            order_direction=order_direction,
-        )
         if not definition:
             definition = self.definitions[0]
         group = self.get_group_by_class(definition)
         value_columns = group.to_json(
-            group.apply(lst, sort=order_column == ""), self.label_columns
+            self._get_chart_data(group, joined_filters, order_column, order_direction),
+            self.label_columns,
         )
         widgets["chart"] = self.chart_widget(
             route_base=self.route_base,
@@ -5,32 +5,26 @@ Real-time collaboration, team management, and shared workspace capabilities
 for Flask-AppBuilder applications.
 """
 
-from .core.collaboration_engine import CollaborationEngine
-from .core.team_manager import TeamManager
-from .core.workspace_manager import WorkspaceManager
-from .realtime.websocket_manager import WebSocketManager
-from .editing.multi_user_editor import MultiUserEditor
-from .communication.communication_service import CommunicationService
-from .integration.version_control import VersionControlIntegration
+from ..utils.lazy import lazy_exports
 
-# AI Components
-from .ai.chatbot_service import ChatbotService
-from .ai.knowledge_base import KnowledgeBaseManager
-from .ai.rag_engine import RAGEngine
-from .ai.ai_models import ModelManager, AIModelAdapter
-
-__all__ = [
-    "CollaborationEngine",
-    "TeamManager", 
-    "WorkspaceManager",
-    "WebSocketManager",
-    "MultiUserEditor",
-    "CommunicationService",
-    "VersionControlIntegration",
+# Components are imported on first access, importing one submodule of the
+# package shouldn't load the whole collaboration and AI stack
+_LAZY_IMPORTS = {
+    "CollaborationEngine": ".core.collaboration_engine",
+    "TeamManager": ".core.team_manager",
+    "WorkspaceManager": ".core.workspace_manager",
+    "WebSocketManager": ".realtime.websocket_manager",
+    "MultiUserEditor": ".editing.multi_user_editor",
+    "CommunicationService": ".communication.communication_service",
+    "VersionControlIntegration": ".integration.version_control",
     # AI Components
-    "ChatbotService",
-    "KnowledgeBaseManager",
-    "RAGEngine",
-    "ModelManager",
-    "AIModelAdapter",
-]
+    "ChatbotService": ".ai.chatbot_service",
+    "KnowledgeBaseManager": ".ai.knowledge_base",
+    "RAGEngine": ".ai.rag_engine",
+    "ModelManager": ".ai.ai_models",
+    "AIModelAdapter": ".ai.ai_models",
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, globals(), _LAZY_IMPORTS)
@@ -0,0 +1,403 @@
+"""
+In-memory embedding matrix for brute-force vector search.
+
+Keeps the embeddings of a scope (a workspace, or all workspaces) as one
+contiguous float32 NumPy matrix with L2-normalized rows, so a cosine
+similarity search is a single matrix-vector product followed by an
+``argpartition`` top-k. Matrices can be saved to and memory-mapped from
+``.npy`` files so several worker processes share the pages of a large index.
+"""
+
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Marker for rows without a team
+NO_TEAM = -1
+
+
+class EmbeddingMatrix:
+    """
+    Growable float32 matrix of normalized embeddings with per-row filters.
+
+    Rows carry the embedding id, team id and a small integer code for the
+    document type, so team and type filters are boolean masks over the
+    scores rather than ORM queries. Deleted rows are tombstoned and removed
+    by ``compact()``, which runs automatically once a quarter of the rows
+    are dead.
+    """
+
+    def __init__(self, dimension: int, capacity: int = 1024):
+        self.dimension = dimension
+        self._vectors = np.zeros((capacity, dimension), dtype=np.float32)
+        self._ids = np.zeros(capacity, dtype=np.int64)
+        self._teams = np.zeros(capacity, dtype=np.int64)
+        self._types = np.zeros(capacity, dtype=np.int16)
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._size = 0
+        self._dead = 0
+        self._row_of: Dict[int, int] = {}
+        self._type_codes: Dict[str, int] = {}
+        self._mapped = False
+        # Highest embedding id read from the database, later rows are read above it
+        self.high_water = 0
+
+    def __len__(self) -> int:
+        return self._size - self._dead
+
+    def __contains__(self, embedding_id: int) -> bool:
+        return embedding_id in self._row_of
+
+    def type_code(self, document_type: str) -> int:
+        """Get (assigning if needed) the integer code of a document type."""
+        code = self._type_codes.get(document_type)
+        if code is None:
+            code = self._type_codes[document_type] = len(self._type_codes)
+        return code
+
+    def _ensure_writable(self, extra_rows: int):
+        """Grow the arrays (and detach them from a memory map) before writing."""
+        needed = self._size + extra_rows
+        capacity = self._vectors.shape[0]
+        if needed <= capacity and not self._mapped:
+            return
+
+        new_capacity = max(capacity, 1)
+        while new_capacity < needed:
+            new_capacity *= 2
+
+        def grow(array, shape):
+            grown = np.zeros(shape, dtype=array.dtype)
+            grown[:self._size] = array[:self._size]
+            return grown
+
+        self._vectors = grow(self._vectors, (new_capacity, self.dimension))
+        self._ids = grow(self._ids, new_capacity)
+        self._teams = grow(self._teams, new_capacity)
+        self._types = grow(self._types, new_capacity)
+        self._alive = grow(self._alive, new_capacity)
+        self._mapped = False
+
+    def add(self, embedding_ids: Sequence[int], vectors: Sequence[Sequence[float]],
+            team_ids: Sequence[Optional[int]], document_types: Sequence[str]) -> int:
+        """
+        Add embeddings, replacing rows that already exist for the same ids.
+
+        Vectors whose dimension does not match the matrix are skipped.
+
+        Returns:
+            Number of rows added
+        """
+        keep = [i for i, vector in enumerate(vectors) if len(vector) == self.dimension]
+        if len(keep) != len(vectors):
+            logger.warning(f"Skipping {len(vectors) - len(keep)} embeddings with dimension != {self.dimension}")
+            embedding_ids = [embedding_ids[i] for i in keep]
+            team_ids = [team_ids[i] for i in keep]
+            document_types = [document_types[i] for i in keep]
+            vectors = [vectors[i] for i in keep]
+        batch = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dimension)
+
+        if not len(batch):
+            return 0
+
+        self.remove(embedding_ids)
+        self._ensure_writable(len(batch))
+
+        norms = np.linalg.norm(batch, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+
+        start, end = self._size, self._size + len(batch)
+        self._vectors[start:end] = batch / norms
+        self._ids[start:end] = embedding_ids
+        self._teams[start:end] = [NO_TEAM if t is None else t for t in team_ids]
+        self._types[start:end] = [self.type_code(t) for t in document_types]
+        self._alive[start:end] = True
+        for offset, embedding_id in enumerate(embedding_ids):
+            self._row_of[int(embedding_id)] = start + offset
+        self._size = end
+        return len(batch)
+
+    def remove(self, embedding_ids: Iterable[int]) -> int:
+        """Tombstone the rows of the given embedding ids."""
+        rows = [self._row_of.pop(int(i)) for i in embedding_ids if int(i) in self._row_of]
+        if not rows:
+            return 0
+        self._alive[rows] = False
+        self._dead += len(rows)
+        if self._dead > max(1024, self._size // 4):
+            self.compact()
+        return len(rows)
+
+    def compact(self):
+        """Drop tombstoned rows, keeping the remaining rows contiguous."""
+        alive = np.flatnonzero(self._alive[:self._size])
+        count = len(alive)
+        vectors = self._vectors[alive]
+        ids = self._ids[alive]
+        teams = self._teams[alive]
+        types = self._types[alive]
+
+        capacity = max(1024, count * 2)
+        self._vectors = np.zeros((capacity, self.dimension), dtype=np.float32)
+        self._ids = np.zeros(capacity, dtype=np.int64)
+        self._teams = np.zeros(capacity, dtype=np.int64)
+        self._types = np.zeros(capacity, dtype=np.int16)
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._vectors[:count] = vectors
+        self._ids[:count] = ids
+        self._teams[:count] = teams
+        self._types[:count] = types
+        self._alive[:count] = True
+        self._size = count
+        self._dead = 0
+        self._mapped = False
+        self._row_of = {int(embedding_id): row for row, embedding_id in enumerate(ids)}
+
+    def search(self, query_vector: Sequence[float], limit: int,
+               similarity_threshold: float = -1.0, team_id: Optional[int] = None,
+               document_types: Optional[Sequence[str]] = None) -> List[Tuple[int, float]]:
+        """
+        Find the most similar embeddings by cosine similarity.
+
+        Args:
+            query_vector: Query embedding (need not be normalized)
+            limit: Maximum number of results
+            similarity_threshold: Minimum similarity of returned rows
+            team_id: Only rows of this team
+            document_types: Only rows of these document types
+
+        Returns:
+            List of (embedding_id, similarity) sorted by similarity, descending
+        """
+        if self._size == 0 or limit <= 0:
+            return []
+
+        query = np.asarray(query_vector, dtype=np.float32)
+        if query.shape != (self.dimension,):
+            logger.warning(f"Query dimension {query.shape} does not match index dimension {self.dimension}")
+            return []
+        norm = float(np.linalg.norm(query))
+        if norm == 0:
+            return []
+
+        scores = self._vectors[:self._size] @ (query / norm)
+
+        mask = self._alive[:self._size].copy()
+        if team_id:
+            mask &= self._teams[:self._size] == team_id
+        if document_types:
+            codes = [self._type_codes[t] for t in document_types if t in self._type_codes]
+            mask &= np.isin(self._types[:self._size], codes)
+        mask &= scores >= similarity_threshold
+
+        candidates = np.flatnonzero(mask)
+        if len(candidates) > limit:
+            top = np.argpartition(scores[candidates], -limit)[-limit:]
+            candidates = candidates[top]
+        order = candidates[np.argsort(-scores[candidates], kind='stable')]
+
+        return [(int(self._ids[row]), float(scores[row])) for row in order]
+
+    def save(self, path: str):
+        """Save the live rows as ``.npy`` files plus a JSON manifest under path."""
+        if self._dead:
+            self.compact()
+        os.makedirs(path, exist_ok=True)
+        for name in ('vectors', 'ids', 'teams', 'types'):
+            tmp_path = os.path.join(path, f'{name}.tmp.npy')
+            np.save(tmp_path, getattr(self, f'_{name}')[:self._size])
+            os.replace(tmp_path, os.path.join(path, f'{name}.npy'))
+        with open(os.path.join(path, 'manifest.json'), 'w') as f:
+            json.dump({'dimension': self.dimension, 'size': self._size,
+                       'type_codes': self._type_codes, 'high_water': self.high_water}, f)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> Optional['EmbeddingMatrix']:
+        """
+        Load a matrix saved with ``save()``.
+
+        With mmap the vectors are memory-mapped read-only and copied into
+        memory only when the matrix is first modified.
+        """
+        manifest_path = os.path.join(path, 'manifest.json')
+        if not os.path.exists(manifest_path):
+            return None
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+
+        matrix = cls(manifest['dimension'], capacity=0)
+        matrix._vectors = np.load(os.path.join(path, 'vectors.npy'), mmap_mode='r' if mmap else None)
+        matrix._ids = np.load(os.path.join(path, 'ids.npy'))
+        matrix._teams = np.load(os.path.join(path, 'teams.npy'))
+        matrix._types = np.load(os.path.join(path, 'types.npy'))
+        matrix._size = len(matrix._ids)
+        matrix._alive = np.ones(matrix._size, dtype=bool)
+        matrix._type_codes = manifest.get('type_codes', {})
+        matrix._row_of = {int(embedding_id): row for row, embedding_id in enumerate(matrix._ids)}
+        matrix._mapped = mmap
+        matrix.high_water = manifest.get('high_water', 0)
+        return matrix
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get row counts and memory use."""
+        return {
+            'dimension': self.dimension,
+            'rows': len(self),
+            'tombstoned': self._dead,
+            'capacity': self._vectors.shape[0],
+            'memory_mapped': self._mapped,
+            'memory_mb': self._vectors.nbytes / 1024 / 1024
+        }
+
+
+class EmbeddingMatrixIndex:
+    """
+    Per-workspace embedding matrices, loaded lazily from the database.
+
+    The ``None`` scope holds every embedding and serves searches without a
+    workspace filter. Matrices are built from a column-only query (no ORM
+    objects) the first time a scope is searched, or memory-mapped from
+    ``storage_dir`` when a saved copy exists, and then kept in sync by the
+    vector store's add and delete paths.
+    """
+
+    def __init__(self, storage_dir: Optional[str] = None, mmap: bool = True,
+                 batch_size: int = 5000):
+        self.storage_dir = storage_dir
+        self.mmap = mmap
+        self.batch_size = batch_size
+        self._matrices: Dict[Optional[int], EmbeddingMatrix] = {}
+        self._lock = threading.RLock()
+
+    def _scope_path(self, workspace_id: Optional[int]) -> Optional[str]:
+        if not self.storage_dir:
+            return None
+        return os.path.join(self.storage_dir, f'workspace_{workspace_id if workspace_id else "all"}')
+
+    def get_matrix(self, session, workspace_id: Optional[int]) -> Optional[EmbeddingMatrix]:
+        """
+        Get the matrix of a scope, building it on first use.
+
+        Rows added to the database by other processes since the matrix was
+        built (ids above its high-water mark) are appended first.
+        """
+        workspace_id = workspace_id or None
+        with self._lock:
+            matrix = self._matrices.get(workspace_id)
+            if matrix is None:
+                matrix = self._load(session, workspace_id)
+                if matrix is not None:
+                    self._matrices[workspace_id] = matrix
+            else:
+                self._append_rows(session, workspace_id, matrix)
+            return matrix
+
+    def _load(self, session, workspace_id: Optional[int]) -> Optional[EmbeddingMatrix]:
+        path = self._scope_path(workspace_id)
+        if path:
+            matrix = EmbeddingMatrix.load(path, mmap=self.mmap)
+            if matrix is not None:
+                self._append_rows(session, workspace_id, matrix)
+                logger.info(f"Memory-mapped {len(matrix)} embeddings for workspace {workspace_id}")
+                return matrix
+
+        matrix = self._append_rows(session, workspace_id, None)
+        if matrix is not None:
+            logger.info(f"Loaded {len(matrix)} embeddings for workspace {workspace_id}")
+        return matrix
+
+    def _append_rows(self, session, workspace_id: Optional[int],
+                     matrix: Optional[EmbeddingMatrix]) -> Optional[EmbeddingMatrix]:
+        """Read embeddings above the matrix high-water mark with a column-only query."""
+        from .models import VectorEmbedding
+
+        query = session.query(
+            VectorEmbedding.id,
+            VectorEmbedding.embedding_vector,
+            VectorEmbedding.team_id,
+            VectorEmbedding.document_type
+        )
+        if workspace_id:
+            query = query.filter(VectorEmbedding.workspace_id == workspace_id)
+        if matrix is not None:
+            query = query.filter(VectorEmbedding.id > matrix.high_water)
+        query = query.order_by(VectorEmbedding.id.asc())
+
+        for rows in _batched(query.yield_per(self.batch_size), self.batch_size):
+            last_id = rows[-1].id
+            if matrix is not None:
+                # Rows this process already added through the vector store
+                rows = [row for row in rows if row.id not in matrix]
+            vectors = []
+            for row in rows:
+                try:
+                    vectors.append(json.loads(row.embedding_vector))
+                except (json.JSONDecodeError, TypeError):
+                    vectors.append([])
+            if matrix is None:
+                dimension = next((len(v) for v in vectors if v), None)
+                if dimension is None:
+                    continue
+                matrix = EmbeddingMatrix(dimension)
+            if rows:
+                matrix.add([row.id for row in rows], vectors,
+                           [row.team_id for row in rows], [row.document_type for row in rows])
+            # Rows that were skipped still move the mark
+            matrix.high_water = max(matrix.high_water, last_id)
+
+        return matrix
+
+    def _scopes_for(self, workspace_id: Optional[int]) -> List[EmbeddingMatrix]:
+        workspace_id = workspace_id or None
+        scopes = [self._matrices.get(workspace_id)]
+        if workspace_id:
+            scopes.append(self._matrices.get(None))
+        return [matrix for matrix in scopes if matrix is not None]
+
+    def add(self, workspace_id: Optional[int], embedding_ids: Sequence[int],
+            vectors: Sequence[Sequence[float]], team_ids: Sequence[Optional[int]],
+            document_types: Sequence[str]):
+        """Add embeddings to the loaded matrices of their workspace and of the global scope."""
+        with self._lock:
+            for matrix in self._scopes_for(workspace_id):
+                matrix.add(embedding_ids, vectors, team_ids, document_types)
+
+    def remove(self, embedding_ids: Sequence[int]) -> int:
+        """Remove embeddings from every loaded matrix."""
+        with self._lock:
+            return sum(matrix.remove(embedding_ids) for matrix in self._matrices.values())
+
+    def save(self):
+        """Save every loaded matrix under storage_dir."""
+        if not self.storage_dir:
+            return
+        with self._lock:
+            for workspace_id, matrix in self._matrices.items():
+                matrix.save(self._scope_path(workspace_id))
+
+    def clear(self):
+        """Drop all loaded matrices."""
+        with self._lock:
+            self._matrices.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-scope matrix statistics."""
+        with self._lock:
+            return {str(workspace_id): matrix.get_stats() for workspace_id, matrix in self._matrices.items()}
+
+
+def _batched(iterable, size: int):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -6,6 +6,7 @@ with proper memory management, indexing strategies, and production optimizations
 """
 
 import os
+import base64
 import pickle
 import logging
 import threading
@@ -16,6 +17,7 @@ from dataclasses import dataclass
 from enum import Enum
 import json
 import numpy as np
+from sqlalchemy import func
 
 try:
     import faiss
@@ -24,6 +26,11 @@ except ImportError:
     FAISS_AVAILABLE = False
     faiss = None
 
+try:
+    import fcntl
+except ImportError:  # Windows, a single writer per index path is up to the deployment
+    fcntl = None
+
 from .types import DocumentChunk, RetrievalResult, DocumentType
 from .models import VectorEmbedding
 
@@ -103,10 +110,29 @@ class FAISSVectorStore:
         index_config: Optional[IndexConfig] = None,
         index_path: Optional[str] = None,
         use_gpu: bool = False,
-        enable_monitoring: bool = True
+        enable_monitoring: bool = True,
+        mmap: bool = True,
+        read_only: bool = False,
+        snapshot_every: int = 1000
     ):
         self.session_factory = session_factory
         self.embedding_dim = embedding_dim
+
+        # Persistence: snapshots are memory-mapped on load, changes since the
+        # last snapshot go to an append-only delta log next to it. Only one
+        # process writes them; read-only stores (extra worker processes, or
+        # any store that can't take the writer lock) tail the delta log.
+        self.mmap = mmap
+        self.read_only = read_only
+        self.snapshot_every = snapshot_every
+        self.db_high_water = 0
+        self._delta_entries = 0
+        self._delta_position = None  # (inode, offset) of the delta log read so far
+        self._writer_lock_file = None
+        self._index_mmapped = False
+        self._overlay = None
+        self._replaying = False
+        self.snapshot_loaded = False
         self.index_config = index_config or IndexConfig(embedding_dim=embedding_dim)
         self.use_gpu = use_gpu and FAISS_AVAILABLE and faiss.get_num_gpus() > 0
         self.logger = logging.getLogger(__name__ + ".FAISSVectorStore")
@@ -126,6 +152,8 @@ class FAISSVectorStore:
         self.document_map: Dict[int, Dict[str, Any]] = {}  # FAISS ID -> document info
         self.id_counter = 0
         self.index_path = index_path
+        if self.index_path and not self.read_only:
+            self.read_only = not self._acquire_writer_lock()
 
         # Thread safety
         self.lock = threading.RLock()
@@ -138,7 +166,7 @@ class FAISSVectorStore:
         self._initialize_index()
 
         # Load existing index if available
-        if self.index_path and os.path.exists(self.index_path):
+        if self.index_path and os.path.exists(f"{self.index_path}.index"):
             self.load_index()
     
     def _initialize_fallback_mode(self):
@@ -169,19 +197,32 @@ class FAISSVectorStore:
 
             self.document_map = {}
             self.id_counter = 0
+            self._overlay = None
+
+    @property
+    def ntotal(self) -> int:
+        """Number of vectors in the index, including the in-memory overlay."""
+        if not self.index:
+            return 0
+        return self.index.ntotal + (self._overlay.ntotal if self._overlay is not None else 0)
 
     def _rebuild_index_if_needed(self) -> bool:
         """Rebuild index with optimal configuration based on current size."""
         if not self.index or self.index.ntotal == 0:
             return False
 
+        # A memory-mapped snapshot stays read-only; save_index merges the overlay
+        if self._index_mmapped:
+            return False
+
         current_size = self.index.ntotal
 
         # Check if we should rebuild for better performance
         should_rebuild = False
 
-        if (isinstance(self.index, faiss.IndexFlatL2) or
-            isinstance(self.index, faiss.GpuIndexFlatL2)) and current_size > 1000:
+        # GpuIndexFlatL2 only exists in GPU builds of FAISS
+        flat_types = (faiss.IndexFlatL2,) + ((faiss.GpuIndexFlatL2,) if hasattr(faiss, 'GpuIndexFlatL2') else ())
+        if isinstance(self.index, flat_types) and current_size > 1000:
             should_rebuild = True
             self.logger.info(f"Rebuilding index for better performance with {current_size} vectors")
 
@@ -257,8 +298,8 @@ class FAISSVectorStore:
             start_id = self.id_counter
             faiss_ids = list(range(start_id, start_id + len(embeddings)))
 
-            # Add vectors to index
-            self.index.add(embeddings)
+            # Add vectors to index, or to the overlay of a memory-mapped snapshot
+            self._writable_index().add(embeddings)
 
             # Store metadata mapping
             for i, metadata in enumerate(metadata_list):
@@ -266,6 +307,13 @@ class FAISSVectorStore:
 
             self.id_counter += len(embeddings)
 
+            self._log_delta({
+                'op': 'add',
+                'faiss_ids': faiss_ids,
+                'vectors': base64.b64encode(np.ascontiguousarray(embeddings).tobytes()).decode('ascii'),
+                'metadata': metadata_list
+            }, db_ids=[m.get('db_id') for m in metadata_list])
+
             # Track timing
             add_time = time.time() - start_time
             self.index_times.append(add_time)
@@ -289,7 +337,7 @@ class FAISSVectorStore:
             self.logger.debug("FAISS fallback mode: Returning empty search results")
             return []
 
-        if self.index.ntotal == 0:
+        if self.ntotal == 0:
             return []
 
         with self.lock:
@@ -301,7 +349,7 @@ class FAISSVectorStore:
             query_vector = query_vector.astype(np.float32)
 
             # Perform search
-            distances, indices = self.index.search(query_vector, min(k, self.index.ntotal))
+            distances, indices = self._search_index(query_vector, k)
 
             # Convert distances to similarity scores (cosine similarity)
             # FAISS L2 distance: d = ||a-b||^2 = ||a||^2 + ||b||^2 - 2*a·b
@@ -333,10 +381,14 @@ class FAISSVectorStore:
 
         removed_count = 0
         with self.lock:
+            removed = []
             for faiss_id in faiss_ids:
-                if faiss_id in self.document_map:
+                if faiss_id in self.document_map and not self.document_map[faiss_id].get("_removed"):
                     self.document_map[faiss_id]["_removed"] = True
-                    removed_count += 1
+                    removed.append(faiss_id)
+            removed_count = len(removed)
+            if removed:
+                self._log_delta({'op': 'remove', 'faiss_ids': removed})
 
         self.logger.warning(f"Marked {removed_count} vectors as removed (FAISS doesn't support efficient deletion)")
         return removed_count
@@ -357,27 +409,46 @@ class FAISSVectorStore:
 
         with self.lock:
             try:
-                # Save FAISS index
+                # Save FAISS index; write-then-rename so readers that have the
+                # previous snapshot mapped keep a consistent file
                 index_file = f"{save_path}.index"
 
                 if self.use_gpu and hasattr(self.index, 'getResources'):
                     # Move to CPU for saving
                     cpu_index = faiss.index_gpu_to_cpu(self.index)
-                    faiss.write_index(cpu_index, index_file)
+                    faiss.write_index(cpu_index, f"{index_file}.tmp")
                 else:
-                    faiss.write_index(self.index, index_file)
+                    faiss.write_index(self._merged_index(), f"{index_file}.tmp")
 
                 # Save metadata
                 metadata_file = f"{save_path}.metadata"
-                with open(metadata_file, 'wb') as f:
+                with open(f"{metadata_file}.tmp", 'wb') as f:
                     pickle.dump({
                         'document_map': self.document_map,
                         'id_counter': self.id_counter,
                         'embedding_dim': self.embedding_dim,
-                        'index_config': self.index_config
+                        'index_config': self.index_config,
+                        'db_high_water': self.db_high_water
                     }, f)
 
-                self.logger.info(f"Saved FAISS index with {self.index.ntotal} vectors to {save_path}")
+                os.replace(f"{index_file}.tmp", index_file)
+                os.replace(f"{metadata_file}.tmp", metadata_file)
+
+                # The snapshot now contains everything in the delta log. The log is
+                # replaced rather than truncated, readers tailing it see a new file
+                if save_path == self.index_path:
+                    delta_path = self._delta_log_path()
+                    open(f"{delta_path}.tmp", 'w').close()
+                    os.replace(f"{delta_path}.tmp", delta_path)
+                    self._delta_entries = 0
+                    self._delta_position = None
+
+                    # Map the new snapshot in place of the old one and its overlay
+                    if self._overlay is not None:
+                        self.index = self._read_index_file(index_file, mmap=True)
+                        self._overlay = None
+
+                self.logger.info(f"Saved FAISS index with {self.ntotal} vectors to {save_path}")
                 return save_path
 
             except Exception as e:
@@ -404,10 +475,12 @@ class FAISSVectorStore:
 
         with self.lock:
             try:
-                # Load FAISS index
-                cpu_index = faiss.read_index(index_file)
+                # Load FAISS index, memory-mapped so worker processes share its pages
+                use_gpu = self.use_gpu and faiss.get_num_gpus() > 0
+                cpu_index = self._read_index_file(index_file, mmap=self.mmap and not use_gpu)
+                self._overlay = None
 
-                if self.use_gpu and faiss.get_num_gpus() > 0:
+                if use_gpu:
                     res = faiss.StandardGpuResources()
                     self.index = faiss.index_cpu_to_gpu(res, 0, cpu_index)
                 else:
@@ -420,14 +493,204 @@ class FAISSVectorStore:
                     self.id_counter = metadata['id_counter']
                     self.embedding_dim = metadata['embedding_dim']
                     self.index_config = metadata.get('index_config', self.index_config)
+                    self.db_high_water = metadata.get('db_high_water', 0)
 
-                self.logger.info(f"Loaded FAISS index with {self.index.ntotal} vectors from {load_path}")
+                replayed = self._replay_delta_log(load_path)
+                self.snapshot_loaded = True
+
+                self.logger.info(
+                    f"Loaded FAISS index with {self.ntotal} vectors from {load_path} "
+                    f"(mmap={self._index_mmapped}, replayed {replayed} delta entries)"
+                )
                 return True
 
             except Exception as e:
                 self.logger.error(f"Failed to load FAISS index: {e}")
                 return False
 
+    def _acquire_writer_lock(self) -> bool:
+        """Become the one process that writes the snapshot and delta log of index_path."""
+        if fcntl is None:
+            return True
+        os.makedirs(os.path.dirname(self.index_path) or '.', exist_ok=True)
+        lock_file = open(f"{self.index_path}.lock", 'a')
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            self.logger.info(f"Another process writes {self.index_path}, opening it read-only")
+            return False
+        self._writer_lock_file = lock_file
+        return True
+
+    def close(self):
+        """Release the writer lock, so another store can write the index."""
+        if self._writer_lock_file is not None:
+            self._writer_lock_file.close()
+            self._writer_lock_file = None
+            self.read_only = True
+
+    def _delta_log_path(self, path: Optional[str] = None) -> str:
+        return f"{path or self.index_path}.delta"
+
+    def _read_index_file(self, index_file: str, mmap: bool):
+        """Read an index file, memory-mapped when possible."""
+        self._index_mmapped = False
+        if mmap:
+            try:
+                index = faiss.read_index(index_file, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+                self._index_mmapped = True
+                return index
+            except Exception as e:
+                # Not every index type can be mapped
+                self.logger.info(f"Could not memory-map {index_file}, reading it: {e}")
+        return faiss.read_index(index_file)
+
+    def _writable_index(self):
+        """
+        Index that new vectors go to.
+
+        A memory-mapped snapshot is read-only and shared between processes,
+        so vectors added after loading it (including replayed delta log
+        entries) go to a small in-memory overlay. Overlay positions continue
+        the ids of the snapshot.
+        """
+        if not self._index_mmapped:
+            return self.index
+        if self._overlay is None:
+            self._overlay = faiss.IndexFlatL2(self.embedding_dim)
+        return self._overlay
+
+    def _search_index(self, query_vector: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Search the snapshot and the overlay and merge the nearest k of both."""
+        distances, indices = self.index.search(query_vector, max(1, min(k, self.index.ntotal)))
+        if self._overlay is None or self._overlay.ntotal == 0:
+            return distances, indices
+
+        overlay_distances, overlay_indices = self._overlay.search(
+            query_vector, min(k, self._overlay.ntotal)
+        )
+        overlay_indices = np.where(overlay_indices == -1, -1, overlay_indices + self.index.ntotal)
+
+        distances = np.concatenate([distances, overlay_distances], axis=1)
+        indices = np.concatenate([indices, overlay_indices], axis=1)
+        # Missing results (-1) have undefined distances; sort them last
+        distances = np.where(indices == -1, np.inf, distances)
+        order = np.argsort(distances, axis=1, kind='stable')[:, :k]
+        return np.take_along_axis(distances, order, axis=1), np.take_along_axis(indices, order, axis=1)
+
+    def _merged_index(self):
+        """In-memory index holding the snapshot and the overlay, for writing a new snapshot."""
+        if self._overlay is None or self._overlay.ntotal == 0:
+            return self.index
+        merged = faiss.clone_index(self.index)
+        merged.add(self._overlay.reconstruct_n(0, self._overlay.ntotal))
+        return merged
+
+    def _log_delta(self, entry: Dict[str, Any], db_ids: Optional[List[Any]] = None):
+        """Append an add/remove entry to the delta log and snapshot when it grows too long."""
+        known_ids = [db_id for db_id in (db_ids or []) if db_id is not None]
+        if known_ids:
+            self.db_high_water = max(self.db_high_water, max(known_ids))
+
+        if self._replaying or self.read_only or not self.index_path:
+            return
+
+        entry['db_high_water'] = self.db_high_water
+        os.makedirs(os.path.dirname(self.index_path) or '.', exist_ok=True)
+        with open(self._delta_log_path(), 'a') as f:
+            f.write(json.dumps(entry, default=str) + '\n')
+            f.flush()
+        self._delta_entries += 1
+
+        if self.snapshot_every and self._delta_entries >= self.snapshot_every:
+            self.save_index()
+
+    def _replay_delta_log(self, path: str) -> int:
+        """Apply the delta log written since the snapshot at path."""
+        delta_path = self._delta_log_path(path)
+        replayed = self._read_delta_log(delta_path, None) or 0
+        self._delta_entries = replayed
+
+        if not self.read_only and self._delta_position and os.path.getsize(delta_path) > self._delta_position[1]:
+            # Torn last line of a crashed writer, new entries must start on a line of their own
+            self.logger.warning(f"Dropping unreadable last delta log entry in {delta_path}")
+            with open(delta_path, 'r+b') as f:
+                f.truncate(self._delta_position[1])
+        return replayed
+
+    def tail_delta_log(self) -> Optional[int]:
+        """
+        Apply the entries the writer appended to the delta log since it was read.
+
+        Returns:
+            Number of entries applied, or None when the writer has saved a new
+            snapshot since, which then needs to be loaded instead
+        """
+        if not self.index_path:
+            return 0
+        with self.lock:
+            replayed = self._read_delta_log(self._delta_log_path(), self._delta_position)
+            if replayed:
+                self._delta_entries += replayed
+            return replayed
+
+    def _read_delta_log(self, delta_path: str, position: Optional[Tuple[int, int]]) -> Optional[int]:
+        """Apply complete delta log lines after position; None if the log was replaced."""
+        try:
+            f = open(delta_path, 'rb')
+        except FileNotFoundError:
+            self._delta_position = None
+            return 0 if position is None else None
+
+        with f:
+            inode = os.fstat(f.fileno()).st_ino
+            offset = 0
+            if position is not None:
+                if position[0] != inode:
+                    return None
+                offset = position[1]
+            f.seek(offset)
+            data = f.read()
+
+        # A line without its newline is still being written, it is read next time
+        end = data.rfind(b'\n') + 1
+        self._delta_position = (inode, offset + end)
+
+        replayed = 0
+        self._replaying = True
+        try:
+            for line in data[:end].decode('utf-8', errors='replace').splitlines():
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    self.logger.warning(f"Skipping unreadable delta log entry in {delta_path}")
+                    continue
+
+                if entry['op'] == 'add':
+                    faiss_ids = entry['faiss_ids']
+                    if faiss_ids and faiss_ids[-1] < self.id_counter:
+                        # Already in a snapshot saved while this log was read
+                        continue
+                    vectors = np.frombuffer(
+                        base64.b64decode(entry['vectors']), dtype=np.float32
+                    ).reshape(-1, self.embedding_dim)
+                    if faiss_ids and faiss_ids[0] != self.id_counter:
+                        self.logger.warning(
+                            f"Delta log ids start at {faiss_ids[0]}, index at {self.id_counter}"
+                        )
+                    self.add_vectors(vectors, entry['metadata'])
+                elif entry['op'] == 'remove':
+                    self.remove_vectors(entry['faiss_ids'])
+
+                self.db_high_water = max(self.db_high_water, entry.get('db_high_water', 0))
+                replayed += 1
+        finally:
+            self._replaying = False
+        return replayed
+
     def get_stats(self) -> Dict[str, Any]:
         """Get comprehensive statistics about the vector store."""
         with self.lock:
@@ -438,7 +701,8 @@ class FAISSVectorStore:
             avg_index_time = sum(self.index_times[-100:]) / len(self.index_times[-100:]) if self.index_times else 0
 
             return {
-                "total_vectors": self.index.ntotal if self.index else 0,
+                "total_vectors": self.ntotal,
+                "overlay_vectors": self._overlay.ntotal if self._overlay is not None else 0,
                 "active_vectors": active_vectors,
                 "removed_vectors": len(self.document_map) - active_vectors,
                 "embedding_dimension": self.embedding_dim,
@@ -447,7 +711,10 @@ class FAISSVectorStore:
                 "average_search_time_ms": avg_search_time * 1000,
                 "average_index_time_ms": avg_index_time * 1000,
                 "total_searches": len(self.search_times),
-                "memory_usage_mb": self._estimate_memory_usage()
+                "memory_usage_mb": self._estimate_memory_usage(),
+                "memory_mapped": self._index_mmapped,
+                "delta_log_entries": self._delta_entries,
+                "db_high_water": self.db_high_water
             }
 
     def _estimate_memory_usage(self) -> float:
@@ -456,7 +723,7 @@ class FAISSVectorStore:
             return 0.0
 
         # Rough estimates based on FAISS documentation
-        vector_memory = self.index.ntotal * self.embedding_dim * 4 / (1024 * 1024)  # 4 bytes per float32
+        vector_memory = self.ntotal * self.embedding_dim * 4 / (1024 * 1024)  # 4 bytes per float32
         metadata_memory = len(self.document_map) * 1024 / (1024 * 1024)  # ~1KB per metadata entry
 
         return vector_memory + metadata_memory
@@ -464,16 +731,37 @@ class FAISSVectorStore:
     def optimize_index(self) -> bool:
         """Optimize index for better search performance."""
         with self.lock:
-            if not self.index or self.index.ntotal < 1000:
+            if not self.index or self.ntotal < 1000:
                 return False
 
             self.logger.info("Optimizing FAISS index for better performance...")
             return self._rebuild_index_if_needed()
 
+    def rebuild(self, embeddings: np.ndarray, metadata_list: List[Dict[str, Any]]) -> List[int]:
+        """
+        Replace the whole index with the given vectors.
+
+        The rebuild is not written to the delta log; a fresh snapshot is
+        saved instead (unless the store is read-only).
+        """
+        with self.lock:
+            self.clear()
+            self._replaying = True
+            try:
+                faiss_ids = self.add_vectors(embeddings, metadata_list)
+            finally:
+                self._replaying = False
+
+            if self.index_path and not self.read_only:
+                self.save_index()
+            return faiss_ids
+
     def clear(self):
         """Clear all vectors and metadata."""
         with self.lock:
             self._initialize_index()
+            self._index_mmapped = False
+            self.db_high_water = 0
             self.logger.info("Cleared all vectors from FAISS index")
 
 
@@ -492,11 +780,18 @@ class FAISSIntegratedVectorStore:
         faiss_index_path: Optional[str] = None,
         embedding_dim: int = 768,
         use_gpu: bool = False,
-        enable_monitoring: bool = True
+        enable_monitoring: bool = True,
+        mmap: bool = True,
+        read_only: bool = False,
+        snapshot_every: int = 1000,
+        refresh_interval: int = 30
     ):
         self.session_factory = session_factory
         self.embedding_model = embedding_model
         self.logger = logging.getLogger(__name__ + ".FAISSIntegratedVectorStore")
+        self.refresh_interval = refresh_interval
+        self._last_refresh = time.time()
+        self._snapshot_mtime = None
 
         # Initialize FAISS store
         self.faiss_store = FAISSVectorStore(
@@ -504,27 +799,58 @@ class FAISSIntegratedVectorStore:
             embedding_dim=embedding_dim,
             index_path=faiss_index_path,
             use_gpu=use_gpu,
-            enable_monitoring=enable_monitoring
+            enable_monitoring=enable_monitoring,
+            mmap=mmap,
+            read_only=read_only,
+            snapshot_every=snapshot_every
         )
 
         # Sync FAISS index with database on startup
+        self._snapshot_mtime = self._get_snapshot_mtime()
         self._sync_with_database()
 
+    @staticmethod
+    def _embedding_metadata(embedding: VectorEmbedding) -> Dict[str, Any]:
+        return {
+            'db_id': embedding.id,
+            'document_id': embedding.document_id,
+            'document_type': embedding.document_type,
+            'chunk_index': embedding.chunk_index,
+            'content': embedding.content,
+            'metadata': embedding.get_metadata(),
+            'workspace_id': embedding.workspace_id,
+            'team_id': embedding.team_id,
+            'user_id': embedding.user_id
+        }
+
     def _sync_with_database(self):
-        """Sync FAISS index with database records."""
+        """Sync FAISS index with database records.
+
+        With a loaded snapshot only embeddings above its database high-water
+        mark are added. The full rebuild from every row only runs when there
+        is no snapshot, and then saves one for the next start.
+        """
+        if getattr(self.faiss_store, '_fallback_mode', False):
+            return
+
+        session = None
         try:
             session = self.session_factory()
 
+            if self.faiss_store.snapshot_loaded:
+                self._catch_up(session)
+                return
+
             # Get all embeddings from database
-            embeddings = session.query(VectorEmbedding).all()
+            embeddings = session.query(VectorEmbedding).order_by(VectorEmbedding.id.asc()).all()
 
             if not embeddings:
                 self.logger.info("No embeddings found in database")
                 return
 
             # Check if FAISS index needs rebuilding
-            if self.faiss_store.index.ntotal != len(embeddings):
-                self.logger.info(f"Rebuilding FAISS index: DB has {len(embeddings)}, FAISS has {self.faiss_store.index.ntotal}")
+            if self.faiss_store.ntotal != len(embeddings):
+                self.logger.info(f"Rebuilding FAISS index: DB has {len(embeddings)}, FAISS has {self.faiss_store.ntotal}")
 
                 # Rebuild FAISS index from database
                 vectors = []
@@ -534,30 +860,117 @@ class FAISSIntegratedVectorStore:
                     vector = embedding.get_embedding_vector()
                     if vector and len(vector) == self.faiss_store.embedding_dim:
                         vectors.append(vector)
-                        metadata_list.append({
-                            'db_id': embedding.id,
-                            'document_id': embedding.document_id,
-                            'document_type': embedding.document_type,
-                            'chunk_index': embedding.chunk_index,
-                            'content': embedding.content,
-                            'metadata': embedding.get_metadata(),
-                            'workspace_id': embedding.workspace_id,
-                            'team_id': embedding.team_id,
-                            'user_id': embedding.user_id
-                        })
+                        metadata_list.append(self._embedding_metadata(embedding))
 
                 if vectors:
                     # Clear and rebuild FAISS index
-                    self.faiss_store.clear()
                     vectors_array = np.array(vectors, dtype=np.float32)
-                    self.faiss_store.add_vectors(vectors_array, metadata_list)
+                    self.faiss_store.rebuild(vectors_array, metadata_list)
+                    self.faiss_store.db_high_water = max(self.faiss_store.db_high_water, embeddings[-1].id)
 
                     self.logger.info(f"Rebuilt FAISS index with {len(vectors)} vectors")
 
         except Exception as e:
             self.logger.error(f"Failed to sync FAISS with database: {e}")
         finally:
-            session.close()
+            if session:
+                session.close()
+
+    def _catch_up(self, session, batch_size: int = 1000) -> int:
+        """Add embeddings written to the database after the index high-water mark.
+
+        Rows deleted without going through this store (by other code paths,
+        or while no writer was running) are then removed from the index.
+        """
+        added = 0
+        while True:
+            embeddings = session.query(VectorEmbedding).filter(
+                VectorEmbedding.id > self.faiss_store.db_high_water
+            ).order_by(VectorEmbedding.id.asc()).limit(batch_size).all()
+            if not embeddings:
+                break
+
+            indexed = self._indexed_db_ids()
+            vectors = []
+            metadata_list = []
+            for embedding in embeddings:
+                vector = embedding.get_embedding_vector()
+                if embedding.id in indexed or not vector or len(vector) != self.faiss_store.embedding_dim:
+                    continue
+                vectors.append(vector)
+                metadata_list.append(self._embedding_metadata(embedding))
+
+            if vectors:
+                self.faiss_store.add_vectors(np.array(vectors, dtype=np.float32), metadata_list)
+                added += len(vectors)
+            self.faiss_store.db_high_water = max(self.faiss_store.db_high_water, embeddings[-1].id)
+
+        if added:
+            self.logger.info(f"Added {added} embeddings written since the FAISS snapshot")
+        self._remove_deleted(session)
+        return added
+
+    def _remove_deleted(self, session) -> int:
+        """Remove vectors whose database rows are gone, comparing counts before ids."""
+        indexed = self._indexed_db_ids()
+        if session.query(func.count(VectorEmbedding.id)).scalar() == len(indexed):
+            return 0
+
+        # Rows without a usable vector are never indexed, so counts can differ
+        # without deletions; the id diff is a column-only query
+        db_ids = {db_id for db_id, in session.query(VectorEmbedding.id)}
+        stale = [faiss_id for db_id, faiss_id in indexed.items() if db_id not in db_ids]
+        if stale:
+            self.faiss_store.remove_vectors(stale)
+            self.logger.info(f"Removed {len(stale)} embeddings deleted from the database")
+        return len(stale)
+
+    def _get_snapshot_mtime(self) -> Optional[float]:
+        index_path = getattr(self.faiss_store, 'index_path', None)
+        if not index_path or not os.path.exists(f"{index_path}.index"):
+            return None
+        return os.path.getmtime(f"{index_path}.index")
+
+    def _refresh(self):
+        """Pick up changes made by other processes, at most every refresh_interval seconds.
+
+        Read-only stores apply what the writer appended to the delta log, or
+        remap the snapshot when the writer has saved a new one; every store
+        then adds embeddings above its high-water mark and drops deleted ones.
+        """
+        if getattr(self.faiss_store, '_fallback_mode', False):
+            return
+        now = time.time()
+        if now - self._last_refresh < self.refresh_interval:
+            return
+        self._last_refresh = now
+
+        if self.faiss_store.read_only:
+            mtime = self._get_snapshot_mtime()
+            if mtime is not None and mtime != self._snapshot_mtime:
+                self._snapshot_mtime = mtime
+                self.faiss_store.load_index()
+            elif self.faiss_store.tail_delta_log() is None:
+                self._snapshot_mtime = self._get_snapshot_mtime()
+                self.faiss_store.load_index()
+
+        session = None
+        try:
+            session = self.session_factory()
+            self._catch_up(session)
+        except Exception as e:
+            self.logger.error(f"Failed to refresh FAISS index: {e}")
+        finally:
+            if session:
+                session.close()
+
+    def _indexed_db_ids(self) -> Dict[Any, int]:
+        """Map of database id to FAISS id for the vectors in the index."""
+        return {
+            meta.get('db_id'): faiss_id
+            for faiss_id, meta in self.faiss_store.document_map.items()
+            if not meta.get('_removed')
+        }
 
     async def add_documents(
         self,
@@ -658,6 +1071,8 @@ class FAISSIntegratedVectorStore:
     ) -> List[RetrievalResult]:
         """High-performance similarity search using FAISS."""
         try:
+            self._refresh()
+
             # Generate query embedding
             query_embeddings = await self.embedding_model.generate_embeddings([query])
             query_vector = np.array(query_embeddings[0], dtype=np.float32)
@@ -720,6 +1135,44 @@ class FAISSIntegratedVectorStore:
             self.logger.error(f"FAISS similarity search failed: {e}")
             return []
 
+    async def delete_documents(
+        self,
+        document_ids: List[str],
+        workspace_id: Optional[int] = None
+    ) -> int:
+        """Delete documents from the database and the FAISS index."""
+        session = None
+        try:
+            session = self.session_factory()
+
+            query_builder = session.query(VectorEmbedding).filter(
+                VectorEmbedding.document_id.in_(document_ids)
+            )
+
+            if workspace_id:
+                query_builder = query_builder.filter(VectorEmbedding.workspace_id == workspace_id)
+
+            db_ids = [row.id for row in query_builder.with_entities(VectorEmbedding.id)]
+            deleted_count = query_builder.delete(synchronize_session=False)
+            session.commit()
+
+            indexed = self._indexed_db_ids()
+            faiss_ids = [indexed[db_id] for db_id in db_ids if db_id in indexed]
+            if faiss_ids:
+                self.faiss_store.remove_vectors(faiss_ids)
+
+            self.logger.info(f"Deleted {deleted_count} embeddings from integrated vector store")
+            return deleted_count
+
+        except Exception as e:
+            if session:
+                session.rollback()
+            self.logger.error(f"Failed to delete documents: {e}")
+            raise
+        finally:
+            if session:
+                session.close()
+
     def get_stats(self) -> Dict[str, Any]:
         """Get comprehensive statistics from both FAISS and database."""
         faiss_stats = self.faiss_store.get_stats()
@@ -749,10 +1202,11 @@ class FAISSIntegratedVectorStore:
     def shutdown(self):
         """Shutdown the integrated vector store."""
         # Save index before shutdown
-        if self.faiss_store.index_path:
+        if self.faiss_store.index_path and not self.faiss_store.read_only:
             try:
                 self.faiss_store.save_index()
             except Exception as e:
                 self.logger.error(f"Failed to save index during shutdown: {e}")
+        self.faiss_store.close()
 
         self.logger.info("FAISS integrated vector store shutdown completed")
\ No newline at end of file
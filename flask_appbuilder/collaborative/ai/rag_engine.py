@@ -302,10 +302,22 @@ class RAGContext:
 class VectorStore:
     """Vector storage and similarity search with memory management."""
 
-    def __init__(self, session_factory, embedding_model: AIModelAdapter, enable_monitoring: bool = True):
+    def __init__(self, session_factory, embedding_model: AIModelAdapter, enable_monitoring: bool = True,
+                 use_embedding_matrix: bool = True, matrix_storage_dir: Optional[str] = None):
+        self.session_factory = session_factory
         self.embedding_model = embedding_model
         self.logger = logging.getLogger(__name__)
 
+        # Per-workspace in-memory embedding matrices (needs NumPy), searched
+        # with one matrix-vector product instead of scanning every row
+        self.embedding_index = None
+        if use_embedding_matrix:
+            try:
+                from .embedding_matrix import EmbeddingMatrixIndex
+                self.embedding_index = EmbeddingMatrixIndex(storage_dir=matrix_storage_dir)
+            except ImportError:
+                self.logger.warning("NumPy not available, similarity search will scan embeddings")
+
         # Memory management components
         self.memory_monitor = MemoryMonitor(max_memory_mb=512)
         self.connection_pool = ConnectionPool(session_factory, max_connections=10)
@@ -350,7 +362,8 @@ class VectorStore:
             "memory_usage": self.memory_monitor.get_memory_usage(),
             "connection_pool": self.connection_pool.get_pool_stats(),
             "embedding_cache": self.embedding_cache.get_stats(),
-            "similarity_cache": self.similarity_cache.get_stats()
+            "similarity_cache": self.similarity_cache.get_stats(),
+            "embedding_matrices": self.embedding_index.get_stats() if self.embedding_index else {}
         }
 
     def shutdown(self):
@@ -358,6 +371,9 @@ class VectorStore:
         self.memory_monitor.stop_monitoring()
         self.embedding_cache.clear()
         self.similarity_cache.clear()
+        if self.embedding_index:
+            self.embedding_index.save()
+            self.embedding_index.clear()
         self.logger.info("VectorStore shutdown completed")
 
     async def add_documents(
@@ -375,6 +391,7 @@ class VectorStore:
 
             session, connection_id = self.connection_pool.acquire_session()
             embedding_ids = []
+            new_embeddings = []
 
             for chunk, embedding in zip(chunks, embeddings):
                 # Check for existing embedding with same content hash
@@ -410,8 +427,14 @@ class VectorStore:
                 session.add(vector_embedding)
                 session.flush()  # Get ID without committing
                 embedding_ids.append(str(vector_embedding.id))
+                new_embeddings.append((vector_embedding.id, embedding, chunk.document_type.value))
 
             session.commit()
+
+            if self.embedding_index and new_embeddings:
+                ids, vectors, types = zip(*new_embeddings)
+                self.embedding_index.add(workspace_id, ids, vectors, [team_id] * len(ids), types)
+                self.similarity_cache.clear()
             self.logger.info(f"Added {len(embedding_ids)} embeddings to vector store")
             return embedding_ids
 
@@ -496,6 +519,14 @@ class VectorStore:
 
             session, connection_id = self.connection_pool.acquire_session()
 
+            matrix = self.embedding_index.get_matrix(session, workspace_id) if self.embedding_index else None
+            if matrix is not None:
+                final_results = self._matrix_search(
+                    session, matrix, query_vector, team_id, document_types, limit, similarity_threshold
+                )
+                self.similarity_cache.put(cache_key, final_results)
+                return final_results
+
             # Build query with filters
             query_builder = session.query(VectorEmbedding)
 
@@ -558,6 +589,65 @@ class VectorStore:
             if session and connection_id:
                 self.connection_pool.release_session(session, connection_id)
 
+    def _matrix_search(
+        self,
+        session,
+        matrix,
+        query_vector: List[float],
+        team_id: Optional[int],
+        document_types: Optional[List[DocumentType]],
+        limit: int,
+        similarity_threshold: float
+    ) -> List[RetrievalResult]:
+        """Top-k search over the in-memory embedding matrix, loading only the hits."""
+        rows = {}
+        while True:
+            hits = matrix.search(
+                query_vector,
+                limit,
+                similarity_threshold=similarity_threshold,
+                team_id=team_id,
+                document_types=[dt.value for dt in document_types] if document_types else None
+            )
+            missing = [embedding_id for embedding_id, _ in hits if embedding_id not in rows]
+            if missing:
+                rows.update(
+                    (row.id, row) for row in session.query(VectorEmbedding).filter(
+                        VectorEmbedding.id.in_(missing)
+                    )
+                )
+            # Rows deleted outside this store are dropped from the matrices and
+            # the search repeated, so they don't cost callers any of the k hits
+            stale = [embedding_id for embedding_id, _ in hits if embedding_id not in rows]
+            if not stale or not self.embedding_index.remove(stale):
+                break
+
+        results = []
+        for embedding_id, similarity in hits:
+            candidate = rows.get(embedding_id)
+            if candidate is None:
+                continue
+
+            chunk = DocumentChunk(
+                content=candidate.content,
+                metadata=candidate.get_metadata(),
+                chunk_index=candidate.chunk_index,
+                document_id=candidate.document_id,
+                document_type=DocumentType(candidate.document_type)
+            )
+            results.append(RetrievalResult(
+                chunk=chunk,
+                similarity_score=similarity,
+                rank=len(results) + 1,
+                metadata={
+                    "embedding_id": candidate.id,
+                    "created_at": candidate.created_at.isoformat() if candidate.created_at else None,
+                    "content_length": candidate.content_length
+                }
+            ))
+
+        return results
+
     def _create_search_cache_key(
         self,
         query: str,
@@ -640,9 +730,15 @@ class VectorStore:
             if workspace_id:
                 query_builder = query_builder.filter(VectorEmbedding.workspace_id == workspace_id)
 
+            deleted_ids = [row.id for row in query_builder.with_entities(VectorEmbedding.id)] if self.embedding_index else []
+
             deleted_count = query_builder.delete(synchronize_session=False)
             session.commit()
 
+            if deleted_ids:
+                self.embedding_index.remove(deleted_ids)
+                self.similarity_cache.clear()
+
             self.logger.info(f"Deleted {deleted_count} embeddings from vector store")
             return deleted_count
 
@@ -0,0 +1,295 @@
+"""
+Document Buffer
+
+Persistent rope used as the text buffer of collaborative documents. Text is
+kept in leaves of bounded size under a height-balanced (AVL) tree, so insert
+and delete cost O(log n) plus the size of one leaf instead of a copy of the
+whole document. Nodes are never mutated: every edit returns a new buffer
+sharing all untouched subtrees with the old one, which makes snapshots for
+rollback free.
+"""
+
+from typing import Iterator, List, Optional, Tuple, Union
+
+#: Leaves are split at this many characters; small enough that editing a leaf
+#: is cheap, large enough to keep the tree shallow.
+LEAF_SIZE = 512
+
+
+class _Node:
+    """Rope node: a leaf holding text, or a branch over two subtrees."""
+
+    __slots__ = ("left", "right", "text", "length", "height")
+
+    def __init__(
+        self,
+        text: Optional[str] = None,
+        left: Optional["_Node"] = None,
+        right: Optional["_Node"] = None,
+    ):
+        self.text = text
+        self.left = left
+        self.right = right
+        if text is not None:
+            self.length = len(text)
+            self.height = 0
+        else:
+            self.length = left.length + right.length
+            self.height = max(left.height, right.height) + 1
+
+
+def _height(node: Optional[_Node]) -> int:
+    return node.height if node is not None else -1
+
+
+def _rotate_left(node: _Node) -> _Node:
+    right = node.right
+    return _Node(left=_Node(left=node.left, right=right.left), right=right.right)
+
+
+def _rotate_right(node: _Node) -> _Node:
+    left = node.left
+    return _Node(left=left.left, right=_Node(left=left.right, right=node.right))
+
+
+def _join_right(left: _Node, right: _Node) -> _Node:
+    """Join a shorter rope onto the right spine of a taller one."""
+    outer, inner = left.left, left.right
+    if _height(inner) <= _height(right) + 1:
+        joined = _Node(left=inner, right=right)
+        if _height(joined) <= _height(outer) + 1:
+            return _Node(left=outer, right=joined)
+        return _rotate_left(_Node(left=outer, right=_rotate_right(joined)))
+
+    joined = _join_right(inner, right)
+    if _height(joined) <= _height(outer) + 1:
+        return _Node(left=outer, right=joined)
+    return _rotate_left(_Node(left=outer, right=joined))
+
+
+def _join_left(left: _Node, right: _Node) -> _Node:
+    """Join a shorter rope onto the left spine of a taller one."""
+    inner, outer = right.left, right.right
+    if _height(inner) <= _height(left) + 1:
+        joined = _Node(left=left, right=inner)
+        if _height(joined) <= _height(outer) + 1:
+            return _Node(left=joined, right=outer)
+        return _rotate_right(_Node(left=_rotate_left(joined), right=outer))
+
+    joined = _join_left(left, inner)
+    if _height(joined) <= _height(outer) + 1:
+        return _Node(left=joined, right=outer)
+    return _rotate_right(_Node(left=joined, right=outer))
+
+
+def _join(left: Optional[_Node], right: Optional[_Node]) -> Optional[_Node]:
+    """Concatenate two ropes, in time proportional to their height difference."""
+    if left is None or left.length == 0:
+        return right
+    if right is None or right.length == 0:
+        return left
+
+    if (
+        left.text is not None
+        and right.text is not None
+        and left.length + right.length <= LEAF_SIZE
+    ):
+        return _Node(text=left.text + right.text)
+
+    if _height(left) > _height(right) + 1:
+        return _join_right(left, right)
+    if _height(right) > _height(left) + 1:
+        return _join_left(left, right)
+    return _Node(left=left, right=right)
+
+
+def _split(node: Optional[_Node], index: int) -> Tuple[Optional[_Node], Optional[_Node]]:
+    """Split a rope into the text before and from ``index``."""
+    if node is None:
+        return None, None
+    if index <= 0:
+        return None, node
+    if index >= node.length:
+        return node, None
+
+    if node.text is not None:
+        return _Node(text=node.text[:index]), _Node(text=node.text[index:])
+
+    if index < node.left.length:
+        left, middle = _split(node.left, index)
+        return left, _join(middle, node.right)
+    middle, right = _split(node.right, index - node.left.length)
+    return _join(node.left, middle), right
+
+
+def _build(text: str) -> Optional[_Node]:
+    """Build a balanced rope over a string."""
+    if not text:
+        return None
+    leaves = [
+        _Node(text=text[i : i + LEAF_SIZE]) for i in range(0, len(text), LEAF_SIZE)
+    ]
+
+    def build(start: int, stop: int) -> _Node:
+        if stop - start == 1:
+            return leaves[start]
+        middle = (start + stop) // 2
+        return _Node(left=build(start, middle), right=build(middle, stop))
+
+    return build(0, len(leaves))
+
+
+def _edit_leaf(node: _Node, index: int, delete: int, text: str) -> Optional[_Node]:
+    """
+    Replace ``delete`` characters at ``index`` with ``text`` when the change
+    stays inside one leaf, copying only the path down to it.
+
+    Returns None when the edit spans leaves, would overflow the leaf or
+    would empty it; the caller then falls back to split and join.
+    """
+    if node.text is not None:
+        if index + delete > node.length or node.length - delete + len(text) > LEAF_SIZE:
+            return None
+        new_text = node.text[:index] + text + node.text[index + delete :]
+        return _Node(text=new_text) if new_text else None
+
+    left_length = node.left.length
+    if index + delete <= left_length and (delete or index < left_length):
+        left = _edit_leaf(node.left, index, delete, text)
+        if left is None:
+            return None
+        return _Node(left=left, right=node.right)
+    if index >= left_length:
+        right = _edit_leaf(node.right, index - left_length, delete, text)
+        if right is None:
+            return None
+        return _Node(left=node.left, right=right)
+    return None
+
+
+class DocumentBuffer:
+    """
+    Immutable text buffer backed by a rope.
+
+    Behaves like a read-only string for length, slicing, iteration and
+    comparison. ``insert`` and ``delete`` return a new buffer; the old one
+    stays valid and shares structure with it. ``str()`` builds the full
+    text once and caches it.
+    """
+
+    __slots__ = ("_root", "_text")
+
+    def __init__(self, text: Union[str, "DocumentBuffer"] = ""):
+        if isinstance(text, DocumentBuffer):
+            self._root, self._text = text._root, text._text
+        else:
+            self._root = _build(text)
+            self._text = text
+
+    @classmethod
+    def _from_root(cls, root: Optional[_Node]) -> "DocumentBuffer":
+        buffer = cls.__new__(cls)
+        buffer._root = root
+        buffer._text = None if root is not None else ""
+        return buffer
+
+    def __len__(self) -> int:
+        return self._root.length if self._root is not None else 0
+
+    def __str__(self) -> str:
+        if self._text is None:
+            self._text = "".join(self._leaves())
+        return self._text
+
+    def __repr__(self) -> str:
+        return f"DocumentBuffer(length={len(self)}, height={self.height})"
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, DocumentBuffer):
+            return self._root is other._root or str(self) == str(other)
+        if isinstance(other, str):
+            return str(self) == other
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(str(self))
+
+    def __iter__(self) -> Iterator[str]:
+        for leaf in self._leaves():
+            yield from leaf
+
+    def __getitem__(self, key: Union[int, slice]) -> str:
+        if self._text is not None:
+            return self._text[key]
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step != 1:
+                return str(self)[key]
+            return self.substring(start, stop)
+
+        length = len(self)
+        if key < 0:
+            key += length
+        if not 0 <= key < length:
+            raise IndexError("DocumentBuffer index out of range")
+        return self.substring(key, key + 1)
+
+    @property
+    def height(self) -> int:
+        """Height of the rope, for diagnostics"""
+        return _height(self._root) + 1
+
+    def _leaves(self, start: int = 0, stop: Optional[int] = None) -> List[str]:
+        """Text of the leaves overlapping [start, stop), trimmed to the range"""
+        stop = len(self) if stop is None else stop
+        pieces = []
+        stack = [(self._root, 0)] if self._root is not None else []
+        while stack:
+            node, offset = stack.pop()
+            if offset >= stop or offset + node.length <= start:
+                continue
+            if node.text is not None:
+                pieces.append(node.text[max(start - offset, 0) : stop - offset])
+            else:
+                # Right first so the left subtree is popped first
+                stack.append((node.right, offset + node.left.length))
+                stack.append((node.left, offset))
+        return pieces
+
+    def substring(self, start: int, stop: int) -> str:
+        """Text between two positions, without building the whole document"""
+        if start >= stop:
+            return ""
+        return "".join(self._leaves(start, stop))
+
+    def insert(self, position: int, text: str) -> "DocumentBuffer":
+        """Return a buffer with ``text`` inserted at ``position``"""
+        if not 0 <= position <= len(self):
+            raise IndexError(f"Insert position {position} out of range")
+        if not text:
+            return self
+        if self._root is None:
+            return DocumentBuffer(text)
+
+        root = None
+        if len(text) <= LEAF_SIZE:
+            root = _edit_leaf(self._root, position, 0, text)
+        if root is None:
+            left, right = _split(self._root, position)
+            root = _join(_join(left, _build(text)), right)
+        return DocumentBuffer._from_root(root)
+
+    def delete(self, position: int, length: int) -> "DocumentBuffer":
+        """Return a buffer with ``length`` characters removed from ``position``"""
+        if not 0 <= position <= len(self):
+            raise IndexError(f"Delete position {position} out of range")
+        length = min(max(length, 0), len(self) - position)
+        if not length:
+            return self
+
+        root = _edit_leaf(self._root, position, length, "")
+        if root is None:
+            left, rest = _split(self._root, position)
+            _, right = _split(rest, length)
+            root = _join(left, right)
+        return DocumentBuffer._from_root(root)
@@ -28,6 +28,7 @@ from ..core.collaboration_engine import (
 )
 from ..realtime.websocket_manager import WebSocketManager, WebSocketMessage, MessageType
 from ..core.workspace_manager import WorkspaceManager, WorkspaceResource
+from .document_buffer import DocumentBuffer
 
 logger = logging.getLogger(__name__)
 
@@ -88,7 +89,7 @@ class EditorState:
     """Current state of the document being edited"""
 
     document_id: str
-    content: str = ""
+    content: DocumentBuffer = field(default_factory=DocumentBuffer)  # str accepted
     cursors: Dict[int, int] = field(default_factory=dict)  # user_id -> cursor_position
     selections: Dict[int, Tuple[int, int]] = field(
         default_factory=dict
@@ -98,6 +99,10 @@ class EditorState:
     last_modified: datetime = field(default_factory=datetime.now)
     collaborators: Set[int] = field(default_factory=set)
 
+    def __post_init__(self):
+        if not isinstance(self.content, DocumentBuffer):
+            self.content = DocumentBuffer(self.content)
+
 
 @dataclass
 class ConflictResolution:
@@ -629,10 +634,8 @@ class MultiUserEditor:
             if operation.operation_type == OperationType.INSERT:
                 # Insert text at position
                 if 0 <= operation.position <= len(state.content):
-                    state.content = (
-                        state.content[: operation.position]
-                        + operation.content
-                        + state.content[operation.position :]
+                    state.content = state.content.insert(
+                        operation.position, operation.content
                     )
 
                     # Update cursors after the insertion point
@@ -650,6 +653,8 @@ class MultiUserEditor:
                         elif end > operation.position:
                             state.selections[user_id] = (start, end + operation.length)
 
+                    state.revision += 1
+                    state.last_modified = datetime.now()
                     return True
 
             elif operation.operation_type == OperationType.DELETE:
@@ -660,9 +665,8 @@ class MultiUserEditor:
                     )
                     actual_length = end_position - operation.position
 
-                    state.content = (
-                        state.content[: operation.position]
-                        + state.content[end_position:]
+                    state.content = state.content.delete(
+                        operation.position, actual_length
                     )
 
                     # Update cursors after the deletion point
@@ -692,6 +696,8 @@ class MultiUserEditor:
                             new_end = max(operation.position, end - actual_length)
                             state.selections[user_id] = (new_start, new_end)
 
+                    state.revision += 1
+                    state.last_modified = datetime.now()
                     return True
 
             elif operation.operation_type == OperationType.CURSOR:
@@ -791,17 +797,13 @@ class MultiUserEditor:
             if not document_id or document_id not in self.editor_states:
                 return
 
+            editor_state = self.editor_states[document_id]
             position = message.data.get("position", 0)
 
-            # Create cursor operation
-            operation = Operation(
-                operation_type=OperationType.CURSOR,
-                position=position,
-                author_id=message.sender_id,
-            )
-
-            # Apply operation
-            await self.apply_operation(document_id, operation)
+            # Cursors are presence, not edits: keep the latest position and
+            # let the WebSocket manager's presence channel batch it out
+            if isinstance(position, int) and 0 <= position <= len(editor_state.content):
+                editor_state.cursors[message.sender_id] = position
 
         except Exception as e:
             logger.error(f"Error handling cursor move: {e}")
@@ -815,20 +817,20 @@ class MultiUserEditor:
             if not document_id or document_id not in self.editor_states:
                 return
 
+            editor_state = self.editor_states[document_id]
             selection_data = message.data.get("selection", {})
             start = selection_data.get("start", 0)
             end = selection_data.get("end", 0)
 
-            # Create selection operation
-            operation = Operation(
-                operation_type=OperationType.SELECTION,
-                position=start,
-                author_id=message.sender_id,
-                metadata={"start": start, "end": end},
-            )
-
-            # Apply operation
-            await self.apply_operation(document_id, operation)
+            # Like cursors, selections are stored as the latest value only
+            content_length = len(editor_state.content)
+            if (
+                isinstance(start, int)
+                and isinstance(end, int)
+                and 0 <= start <= content_length
+                and 0 <= end <= content_length
+            ):
+                editor_state.selections[message.sender_id] = (start, end)
 
         except Exception as e:
             logger.error(f"Error handling selection change: {e}")
@@ -850,7 +852,7 @@ class MultiUserEditor:
                 sender_id=0,  # System message
                 resource_id=document_id,
                 data={
-                    "content": editor_state.content,
+                    "content": str(editor_state.content),
                     "revision": editor_state.revision,
                     "cursors": editor_state.cursors,
                     "selections": dict(editor_state.selections),
@@ -1273,11 +1275,12 @@ class MultiUserEditor:
             Backup data
         """
         try:
+            # The content buffer is immutable, keeping a reference is a snapshot
             return {
                 "content": editor_state.content,
-                "collaborators": deepcopy(editor_state.collaborators),
-                "cursor_positions": deepcopy(editor_state.cursor_positions),
-                "selections": deepcopy(editor_state.selections),
+                "collaborators": set(editor_state.collaborators),
+                "cursors": dict(editor_state.cursors),
+                "selections": dict(editor_state.selections),
                 "last_modified": editor_state.last_modified,
                 "version": editor_state.version
                 if hasattr(editor_state, "version")
@@ -1302,9 +1305,9 @@ class MultiUserEditor:
                 logger.warning("Cannot restore from empty backup")
                 return
 
-            editor_state.content = backup.get("content", "")
+            editor_state.content = backup.get("content", DocumentBuffer())
             editor_state.collaborators = backup.get("collaborators", set())
-            editor_state.cursor_positions = backup.get("cursor_positions", {})
+            editor_state.cursors = backup.get("cursors", {})
             editor_state.selections = backup.get("selections", {})
             editor_state.last_modified = backup.get("last_modified", datetime.now())
 
@@ -1421,13 +1424,13 @@ class MultiUserEditor:
         """
         try:
             # Check if content is valid
-            if not isinstance(editor_state.content, str):
-                logger.error("Editor state content is not a string")
+            if not isinstance(editor_state.content, DocumentBuffer):
+                logger.error("Editor state content is not a document buffer")
                 return False
 
             # Check cursor positions are within content bounds
             content_length = len(editor_state.content)
-            for user_id, position in editor_state.cursor_positions.items():
+            for user_id, position in editor_state.cursors.items():
                 if (
                     not isinstance(position, int)
                     or position < 0
@@ -0,0 +1,167 @@
+"""
+Presence Channel
+
+Coalesces high-frequency cursor and selection updates. Only the latest
+cursor and selection of each user per resource is kept, and the changes are
+flushed on a fixed tick as one batched update per session.
+"""
+
+import asyncio
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PresenceKey = Tuple[int, Optional[str]]  # (user_id, resource_id)
+
+
+@dataclass
+class PresenceSessionStats:
+    """Per-session presence counters"""
+
+    events: int = 0  # cursor/selection updates received
+    coalesced: int = 0  # updates replaced or suppressed before being sent
+    updates_sent: int = 0  # user entries sent in batches
+    flushes: int = 0  # batched messages sent
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "events": self.events,
+            "coalesced": self.coalesced,
+            "updates_sent": self.updates_sent,
+            "flushes": self.flushes,
+            "coalesce_ratio": self.coalesced / self.events if self.events else 0.0,
+        }
+
+
+class PresenceChannel:
+    """
+    Latest-value store for cursor and selection presence.
+
+    ``update`` only records the new value; ``flush`` (run every
+    ``tick_interval`` seconds by ``run``) hands each session's changed
+    entries to ``publish(session_id, updates)`` in a single call. Entries
+    equal to what was last published are dropped, so a user moving the
+    cursor back and forth within a tick sends nothing.
+    """
+
+    FIELDS = ("cursor", "selection")
+
+    def __init__(
+        self,
+        publish: Callable[[str, List[Dict[str, Any]]], Any],
+        tick_interval: float = 0.05,
+    ):
+        self.publish = publish
+        self.tick_interval = tick_interval
+
+        # session_id -> (user_id, resource_id) -> {"cursor": ..., "selection": ...}
+        self._pending: Dict[str, Dict[PresenceKey, Dict[str, Any]]] = defaultdict(dict)
+        self._published: Dict[str, Dict[PresenceKey, Dict[str, Any]]] = defaultdict(dict)
+        self._stats: Dict[str, PresenceSessionStats] = defaultdict(PresenceSessionStats)
+
+    def update(
+        self,
+        session_id: str,
+        user_id: int,
+        field_name: str,
+        value: Any,
+        resource_id: Optional[str] = None,
+    ) -> None:
+        """Record the latest cursor or selection of a user"""
+        if field_name not in self.FIELDS:
+            raise ValueError(f"Unknown presence field: {field_name}")
+
+        stats = self._stats[session_id]
+        stats.events += 1
+
+        entry = self._pending[session_id].setdefault((user_id, resource_id), {})
+        if field_name in entry:
+            stats.coalesced += 1
+        entry[field_name] = value
+
+    def flush(self) -> int:
+        """Publish pending changes, one batch per session; returns batches sent"""
+        batches = 0
+        pending, self._pending = self._pending, defaultdict(dict)
+
+        for session_id, entries in pending.items():
+            stats = self._stats[session_id]
+            published = self._published[session_id]
+            updates = []
+
+            for (user_id, resource_id), fields in entries.items():
+                previous = published.setdefault((user_id, resource_id), {})
+                changed = {
+                    name: value
+                    for name, value in fields.items()
+                    if name not in previous or previous[name] != value
+                }
+                stats.coalesced += len(fields) - len(changed)
+                if not changed:
+                    continue
+
+                previous.update(changed)
+                updates.append(
+                    {"user_id": user_id, "resource_id": resource_id, **changed}
+                )
+
+            if not updates:
+                continue
+
+            try:
+                self.publish(session_id, updates)
+            except Exception as e:
+                logger.error(f"Error publishing presence for session {session_id}: {e}")
+                continue
+
+            stats.flushes += 1
+            stats.updates_sent += len(updates)
+            batches += 1
+
+        return batches
+
+    async def run(self) -> None:
+        """Flush pending presence every tick"""
+        while True:
+            try:
+                await asyncio.sleep(self.tick_interval)
+                self.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error in presence flush loop: {e}")
+
+    def remove_user(self, session_id: str, user_id: int) -> None:
+        """Forget the presence of a user that left a session"""
+        for entries in (self._pending.get(session_id), self._published.get(session_id)):
+            if entries:
+                for key in [key for key in entries if key[0] == user_id]:
+                    del entries[key]
+
+    def remove_session(self, session_id: str) -> None:
+        """Forget all presence and stats of a session"""
+        self._pending.pop(session_id, None)
+        self._published.pop(session_id, None)
+        self._stats.pop(session_id, None)
+
+    def get_session_stats(self, session_id: str) -> Dict[str, Any]:
+        """Get the presence counters of a session"""
+        stats = self._stats.get(session_id) or PresenceSessionStats()
+        return stats.to_dict()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get presence counters over all sessions"""
+        total = PresenceSessionStats()
+        for stats in self._stats.values():
+            total.events += stats.events
+            total.coalesced += stats.coalesced
+            total.updates_sent += stats.updates_sent
+            total.flushes += stats.flushes
+        return {
+            "sessions": len(self._stats),
+            "pending_sessions": len(self._pending),
+            **total.to_dict(),
+        }
@@ -14,9 +14,11 @@ from dataclasses import dataclass, field, asdict
 from enum import Enum
 from datetime import datetime, timedelta
 import logging
-from collections import defaultdict
+from collections import defaultdict, deque
 import gc
 
+logger = logging.getLogger(__name__)
+
 try:
     import websockets
     from websockets.exceptions import ConnectionClosed, WebSocketException
@@ -28,6 +30,12 @@ except ImportError:
         "websockets package not available. Install with: pip install websockets"
     )
 
+    class WebSocketException(Exception):
+        """Placeholder so send error handling works without websockets"""
+
+    class ConnectionClosed(WebSocketException):
+        """Placeholder so send error handling works without websockets"""
+
 from flask import Flask
 from flask_appbuilder import AppBuilder
 
@@ -36,8 +44,7 @@ from ..core.collaboration_engine import (
     CollaborativeEvent,
     CollaborativeEventType,
 )
-
-logger = logging.getLogger(__name__)
+from .presence_channel import PresenceChannel
 
 
 class MessageType(Enum):
@@ -58,6 +65,7 @@ class MessageType(Enum):
     SELECTION_CHANGE = "selection_change"
     TEXT_CHANGE = "text_change"
     FORM_CHANGE = "form_change"
+    PRESENCE = "presence"  # Batched cursor/selection updates
 
     # Resource management
     LOCK_REQUEST = "lock_request"
@@ -111,6 +119,72 @@ class WebSocketConnection:
     )  # Track token validation
     subscribed_resources: Set[str] = field(default_factory=set)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    outbox: Optional["ConnectionOutbox"] = None  # Created on first send
+    writer_task: Optional[asyncio.Task] = None
+
+
+class ConnectionOutbox:
+    """
+    Outbound message queue of a single connection.
+
+    Holds encoded payloads waiting for the connection's writer task. Payloads
+    sent with a coalesce key replace the pending payload with the same key in
+    place, so a burst of cursor moves from one user costs one send. Once the
+    number of pending payloads reaches the high-water mark, further puts are
+    refused and the caller treats the connection as a slow consumer.
+    """
+
+    def __init__(self, high_water: int):
+        self.high_water = high_water
+        self._pending: deque = deque()  # [coalesce_key, payload] entries
+        self._coalesced: Dict[Any, list] = {}
+        self._ready = asyncio.Event()
+        self.closed = False
+        self.sent = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def put(self, payload: str, coalesce_key: Any = None) -> bool:
+        """Queue a payload, returning False if the outbox is full or closed."""
+        if self.closed:
+            return False
+
+        if coalesce_key is not None:
+            entry = self._coalesced.get(coalesce_key)
+            if entry is not None:
+                entry[1] = payload
+                self.coalesced += 1
+                return True
+
+        if len(self._pending) >= self.high_water:
+            return False
+
+        entry = [coalesce_key, payload]
+        self._pending.append(entry)
+        if coalesce_key is not None:
+            self._coalesced[coalesce_key] = entry
+        self._ready.set()
+        return True
+
+    async def get(self) -> Optional[str]:
+        """Wait for the next payload; returns None once closed and drained."""
+        while not self._pending:
+            if self.closed:
+                return None
+            self._ready.clear()
+            await self._ready.wait()
+
+        coalesce_key, payload = self._pending.popleft()
+        if coalesce_key is not None:
+            self._coalesced.pop(coalesce_key, None)
+        return payload
+
+    def close(self) -> None:
+        """Refuse new payloads and let the writer finish what is pending."""
+        self.closed = True
+        self._ready.set()
 
 
 class WebSocketManager:
@@ -177,8 +251,23 @@ class WebSocketManager:
             "jwt_validation_cache_max_age": 300,  # seconds - max age before forced revalidation
             "force_disconnect_on_auth_failure": True,  # disconnect immediately on auth failure
             "log_security_events": True,  # log all authentication and security events
+            # Outbound delivery
+            "outbound_queue_high_water": 256,  # pending messages before a connection is dropped
+            "max_concurrent_sends": 100,  # socket writes in flight across all connections
+            "send_timeout": 10,  # seconds a single socket write may take
+            "outbound_drain_timeout": 1.0,  # seconds to flush pending messages on disconnect
+            "presence_tick_interval": 0.05,  # seconds between batched cursor/selection flushes
         }
 
+        # Cursor and selection updates, coalesced and flushed per session
+        self.presence = PresenceChannel(
+            self._publish_presence, self.config["presence_tick_interval"]
+        )
+
+        # Outbound delivery: socket writes in flight and slow consumer counters
+        self._send_semaphore = asyncio.Semaphore(self.config["max_concurrent_sends"])
+        self.slow_consumer_disconnects = 0
+
         # Setup
         self._setup_collaboration_integration()
         self._setup_message_handlers()
@@ -256,6 +345,9 @@ class WebSocketManager:
         # Start heartbeat checker
         loop.create_task(self._heartbeat_checker())
 
+        # Start presence flush
+        loop.create_task(self.presence.run())
+
         # Start memory cleanup task
         loop.create_task(self._memory_cleanup_loop())
 
@@ -506,10 +598,9 @@ class WebSocketManager:
 
             # Only broadcast if at least one handler succeeded
             if successful_handlers > 0:
-                # Broadcast to other users if needed
+                # Broadcast to other users if needed. Cursor and selection
+                # updates go out batched through the presence channel
                 if message.message_type in [
-                    MessageType.CURSOR_MOVE,
-                    MessageType.SELECTION_CHANGE,
                     MessageType.TEXT_CHANGE,
                     MessageType.FORM_CHANGE,
                 ]:
@@ -650,6 +741,7 @@ class WebSocketManager:
                 connection.session_id, connection.user_id
             )
             self.session_connections[connection.session_id].discard(connection_id)
+            self._forget_presence(connection.session_id, connection.user_id)
             connection.session_id = None
 
             await self._send_to_connection(
@@ -749,19 +841,70 @@ class WebSocketManager:
         self, connection_id: str, message: WebSocketMessage
     ) -> None:
         """Handle cursor movement"""
-        # Store cursor position and broadcast
+        # Store cursor position and queue it for the next presence flush
         if connection_id in self.connections:
             connection = self.connections[connection_id]
             connection.metadata["cursor_position"] = message.data.get("position")
+            self._record_presence(
+                connection, message, "cursor", message.data.get("position")
+            )
 
     async def _handle_selection_change(
         self, connection_id: str, message: WebSocketMessage
     ) -> None:
         """Handle selection change"""
-        # Store selection and broadcast
+        # Store selection and queue it for the next presence flush
         if connection_id in self.connections:
             connection = self.connections[connection_id]
             connection.metadata["selection"] = message.data.get("selection")
+            self._record_presence(
+                connection, message, "selection", message.data.get("selection")
+            )
+
+    def _record_presence(
+        self,
+        connection: WebSocketConnection,
+        message: WebSocketMessage,
+        field_name: str,
+        value: Any,
+    ) -> None:
+        """Record a cursor or selection update in the presence channel"""
+        session_id = message.session_id or connection.session_id
+        if session_id:
+            self.presence.update(
+                session_id,
+                connection.user_id,
+                field_name,
+                value,
+                resource_id=message.resource_id,
+            )
+
+    def _publish_presence(self, session_id: str, updates: List[Dict[str, Any]]) -> None:
+        """
+        Send a batch of presence updates to a session.
+
+        The batch is encoded once for all participants, so it includes the
+        recipient's own entries; clients skip those by user_id.
+        """
+        connection_ids = self.session_connections.get(session_id)
+        if not connection_ids:
+            return
+
+        self._broadcast(
+            connection_ids,
+            WebSocketMessage(
+                message_type=MessageType.PRESENCE,
+                session_id=session_id,
+                data={"updates": updates},
+            ),
+        )
+
+    def _forget_presence(self, session_id: str, user_id: int) -> None:
+        """Drop presence of a user leaving a session, or of the emptied session"""
+        if self.session_connections.get(session_id):
+            self.presence.remove_user(session_id, user_id)
+        else:
+            self.presence.remove_session(session_id)
 
     async def _handle_text_change(
         self, connection_id: str, message: WebSocketMessage
@@ -803,14 +946,11 @@ class WebSocketManager:
         if not message.session_id or message.session_id not in self.session_connections:
             return
 
-        connection_ids = self.session_connections[message.session_id].copy()
-
-        for connection_id in connection_ids:
-            if exclude_sender and connection_id in self.connections:
-                if self.connections[connection_id].user_id == message.sender_id:
-                    continue
-
-            await self._send_to_connection(connection_id, message)
+        self._broadcast(
+            self.session_connections[message.session_id],
+            message,
+            exclude_user_id=message.sender_id if exclude_sender else None,
+        )
 
     async def _broadcast_to_workspace(
         self, workspace_id: str, message: WebSocketMessage
@@ -819,31 +959,48 @@ class WebSocketManager:
         if workspace_id not in self.workspace_connections:
             return
 
-        connection_ids = self.workspace_connections[workspace_id].copy()
-
-        for connection_id in connection_ids:
-            await self._send_to_connection(connection_id, message)
+        self._broadcast(self.workspace_connections[workspace_id], message)
 
     async def _broadcast_to_user(self, user_id: int, message: WebSocketMessage) -> None:
         """Broadcast message to all connections of a specific user"""
         if user_id not in self.user_connections:
             return
 
-        connection_ids = self.user_connections[user_id].copy()
-
-        for connection_id in connection_ids:
-            await self._send_to_connection(connection_id, message)
+        self._broadcast(self.user_connections[user_id], message)
 
-    async def _send_to_connection(
-        self, connection_id: str, message: WebSocketMessage
-    ) -> bool:
-        """Send message to a specific connection"""
-        if connection_id not in self.connections:
-            return False
+    def _broadcast(
+        self,
+        connection_ids: Set[str],
+        message: WebSocketMessage,
+        exclude_user_id: Optional[int] = None,
+    ) -> int:
+        """
+        Queue a message for a set of connections.
 
-        try:
-            connection = self.connections[connection_id]
-            message_data = {
+        The message is encoded once and handed to each connection's outbox;
+        the socket writes happen in the per-connection writer tasks, so a slow
+        recipient never delays the others. Returns the number of connections
+        the message was queued for.
+        """
+        payload = self._encode_message(message)
+        coalesce_key = self._coalesce_key(message)
+
+        queued = 0
+        for connection_id in list(connection_ids):
+            connection = self.connections.get(connection_id)
+            if connection is None:
+                continue
+            if exclude_user_id is not None and connection.user_id == exclude_user_id:
+                continue
+            if self._enqueue(connection, payload, coalesce_key):
+                queued += 1
+        return queued
+
+    @staticmethod
+    def _encode_message(message: WebSocketMessage) -> str:
+        """Serialize a message to its JSON wire format"""
+        return json.dumps(
+            {
                 "id": message.message_id,
                 "type": message.message_type.value,
                 "sender_id": message.sender_id,
@@ -854,18 +1011,120 @@ class WebSocketManager:
                 "data": message.data,
                 "timestamp": message.timestamp.isoformat(),
             }
+        )
 
-            await connection.websocket.send(json.dumps(message_data))
-            return True
+    @staticmethod
+    def _coalesce_key(message: WebSocketMessage) -> Optional[tuple]:
+        """
+        Key under which a pending message may be replaced by a newer one.
 
-        except (ConnectionClosed, WebSocketException):
-            # Connection is closed, clean it up
-            await self._cleanup_connection(connection_id)
+        Only cursor and selection updates are coalesced, since each one
+        supersedes the previous state of the same user on the same resource.
+        """
+        if message.message_type in (
+            MessageType.CURSOR_MOVE,
+            MessageType.SELECTION_CHANGE,
+        ):
+            return (message.message_type, message.sender_id, message.resource_id)
+        return None
+
+    def _enqueue(
+        self, connection: WebSocketConnection, payload: str, coalesce_key: Any = None
+    ) -> bool:
+        """Queue an encoded payload for a connection, starting its writer if needed"""
+        if connection.outbox is None:
+            connection.outbox = ConnectionOutbox(
+                self.config["outbound_queue_high_water"]
+            )
+        elif connection.outbox.closed:
             return False
-        except Exception as e:
-            logger.error(f"Error sending message to {connection_id}: {e}")
+        if connection.writer_task is None or connection.writer_task.done():
+            connection.writer_task = asyncio.ensure_future(
+                self._connection_writer(connection)
+            )
+
+        if connection.outbox.put(payload, coalesce_key):
+            return True
+
+        if not connection.outbox.closed:
+            # The client is not reading fast enough, drop it rather than
+            # buffering without bound
+            self.slow_consumer_disconnects += 1
+            logger.warning(
+                f"Disconnecting slow WebSocket consumer {connection.connection_id}: "
+                f"{len(connection.outbox)} messages pending"
+            )
+            self._schedule_disconnect(connection)
+        return False
+
+    def _schedule_disconnect(self, connection: WebSocketConnection) -> None:
+        """Stop queueing for a connection and clean it up in the background"""
+        if connection.outbox is not None:
+            if connection.outbox.closed:
+                # Already being cleaned up
+                return
+            connection.outbox.close()
+        asyncio.ensure_future(self._cleanup_connection(connection.connection_id))
+
+    async def _connection_writer(self, connection: WebSocketConnection) -> None:
+        """Write queued payloads to a connection's socket in order"""
+        outbox = connection.outbox
+        connection_id = connection.connection_id
+
+        while True:
+            payload = await outbox.get()
+            if payload is None:
+                return
+
+            try:
+                async with self._send_semaphore:
+                    await asyncio.wait_for(
+                        connection.websocket.send(payload),
+                        timeout=self.config["send_timeout"],
+                    )
+                outbox.sent += 1
+            except asyncio.CancelledError:
+                raise
+            except (ConnectionClosed, WebSocketException):
+                # Connection is closed, clean it up
+                self._schedule_disconnect(connection)
+                return
+            except asyncio.TimeoutError:
+                self.slow_consumer_disconnects += 1
+                logger.warning(f"Send to WebSocket {connection_id} timed out")
+                self._schedule_disconnect(connection)
+                return
+            except Exception as e:
+                logger.error(f"Error sending message to {connection_id}: {e}")
+
+    async def _send_to_connection(
+        self, connection_id: str, message: WebSocketMessage
+    ) -> bool:
+        """Queue a message for a specific connection"""
+        connection = self.connections.get(connection_id)
+        if connection is None:
             return False
 
+        return self._enqueue(
+            connection, self._encode_message(message), self._coalesce_key(message)
+        )
+
+    async def _close_outbox(self, connection: WebSocketConnection) -> None:
+        """Flush what is pending for a connection and stop its writer"""
+        task = connection.writer_task
+        if connection.outbox is not None:
+            connection.outbox.close()
+        if task is None or task.done() or task is asyncio.current_task():
+            return
+
+        # Give the writer a moment to deliver final messages, e.g. an error
+        # sent just before a forced disconnect
+        done, _ = await asyncio.wait(
+            [task], timeout=self.config["outbound_drain_timeout"]
+        )
+        if not done:
+            task.cancel()
+
     async def _send_error(self, connection_id: str, error_message: str) -> None:
         """Send error message to connection"""
         await self._send_to_connection(
@@ -1062,6 +1321,7 @@ class WebSocketManager:
                     connection.session_id, connection.user_id
                 )
                 self.session_connections[connection.session_id].discard(connection_id)
+                self._forget_presence(connection.session_id, connection.user_id)
 
             # Remove from all tracking with weak references cleanup
             self.user_connections[connection.user_id].discard(connection_id)
@@ -1074,6 +1334,9 @@ class WebSocketManager:
             if hasattr(connection, "subscribed_resources"):
                 connection.subscribed_resources.clear()
 
+            # Deliver pending messages and stop the writer task
+            await self._close_outbox(connection)
+
             # Close WebSocket connection if still open
             if hasattr(connection, "websocket") and connection.websocket:
                 try:
@@ -1106,6 +1369,8 @@ class WebSocketManager:
         except Exception as e:
             logger.error(f"Error during connection cleanup {connection_id}: {e}")
             # Force cleanup even on error
+            if connection.outbox is not None:
+                connection.outbox.close()
             self.connections.pop(connection_id, None)
 
     async def _heartbeat_checker(self) -> None:
@@ -1161,6 +1426,17 @@ class WebSocketManager:
             "active_sessions": len(self.session_connections),
             "active_workspaces": len(self.workspace_connections),
             "message_queue_size": self.message_queue.qsize(),
+            "outbound_pending": sum(
+                len(c.outbox) for c in self.connections.values() if c.outbox
+            ),
+            "outbound_sent": sum(
+                c.outbox.sent for c in self.connections.values() if c.outbox
+            ),
+            "outbound_coalesced": sum(
+                c.outbox.coalesced for c in self.connections.values() if c.outbox
+            ),
+            "slow_consumer_disconnects": self.slow_consumer_disconnects,
+            "presence": self.presence.get_stats(),
             "websocket_server_running": self.websocket_server is not None,
             "rate_limit_entries": len(self.rate_limits),
             "weak_references": len(self._weak_connection_refs),
@@ -1687,6 +1963,7 @@ class WebSocketManager:
             ]
             for session_id in empty_sessions:
                 del self.session_connections[session_id]
+                self.presence.remove_session(session_id)
 
             # Clean up empty workspace connections
             empty_workspaces = [
@@ -4,40 +4,26 @@ Flask-AppBuilder Configuration Package
 Configuration classes and utilities for Flask-AppBuilder components.
 """
 
-from .wizard import (
-    WizardConfig,
-    WizardUIConfig, 
-    WizardBehaviorConfig,
-    WizardPersistenceConfig,
-    WizardSecurityConfig,
-    WizardIntegrationConfig,
-    WizardAccessibilityConfig,
-    WizardPerformanceConfig,
-    WizardAdvancedConfig,
-    WizardTheme,
-    WizardAnimation,
-    WizardLayout,
-    WizardValidationMode,
-    WIZARD_CONFIG_PRESETS,
-    get_wizard_config,
-    create_custom_config
-)
+from ..utils.lazy import lazy_exports
 
-__all__ = [
-    'WizardConfig',
-    'WizardUIConfig',
-    'WizardBehaviorConfig', 
-    'WizardPersistenceConfig',
-    'WizardSecurityConfig',
-    'WizardIntegrationConfig',
-    'WizardAccessibilityConfig',
-    'WizardPerformanceConfig',
-    'WizardAdvancedConfig',
-    'WizardTheme',
-    'WizardAnimation', 
-    'WizardLayout',
-    'WizardValidationMode',
-    'WIZARD_CONFIG_PRESETS',
-    'get_wizard_config',
-    'create_custom_config'
-]
\ No newline at end of file
+# Wizard configuration is only loaded when used
+_LAZY_IMPORTS = {
+    'WizardConfig': '.wizard',
+    'WizardUIConfig': '.wizard',
+    'WizardBehaviorConfig': '.wizard',
+    'WizardPersistenceConfig': '.wizard',
+    'WizardSecurityConfig': '.wizard',
+    'WizardIntegrationConfig': '.wizard',
+    'WizardAccessibilityConfig': '.wizard',
+    'WizardPerformanceConfig': '.wizard',
+    'WizardAdvancedConfig': '.wizard',
+    'WizardTheme': '.wizard',
+    'WizardAnimation': '.wizard',
+    'WizardLayout': '.wizard',
+    'WizardValidationMode': '.wizard',
+    'WIZARD_CONFIG_PRESETS': '.wizard',
+    'get_wizard_config': '.wizard',
+    'create_custom_config': '.wizard',
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, globals(), _LAZY_IMPORTS, exports=[])
@@ -169,6 +169,7 @@ API_LIST_TITLE_RES_KEY = "list_title"
 API_ADD_TITLE_RES_KEY = "add_title"
 API_EDIT_TITLE_RES_KEY = "edit_title"
 API_SHOW_TITLE_RES_KEY = "show_title"
+API_NEXT_CURSOR_RES_KEY = "next"
 
 # Request Rison keys
 
@@ -189,6 +190,12 @@ API_ORDER_COLUMN_RIS_KEY = "order_column"
 API_ORDER_DIRECTION_RIS_KEY = "order_direction"
 API_PAGE_INDEX_RIS_KEY = "page"
 API_PAGE_SIZE_RIS_KEY = "page_size"
+API_PAGE_AFTER_RIS_KEY = "after"
+API_COUNT_MODE_RIS_KEY = "count"
+
+API_COUNT_MODE_EXACT = "exact"
+API_COUNT_MODE_ESTIMATE = "estimate"
+API_COUNT_MODE_NONE = "none"
 
 API_LIST_TITLE_RIS_KEY = "list_title"
 API_ADD_TITLE_RIS_KEY = "add_title"
@@ -7,6 +7,7 @@ for PostgreSQL AGE extension with OpenCypher query support.
 
 import json
 import logging
+import re
 from datetime import datetime
 from typing import Dict, List, Optional, Any, Tuple, Union
 from dataclasses import dataclass, asdict
@@ -14,11 +15,15 @@ from enum import Enum
 import sqlalchemy as sa
 from sqlalchemy import create_engine, text
 from sqlalchemy.exc import SQLAlchemyError
-import networkx as nx
 import numpy as np
 
+from .graph_snapshot import GraphSnapshot, GraphSnapshotCache
+
 logger = logging.getLogger(__name__)
 
+# Cypher clauses that change the graph
+_CYPHER_WRITE_CLAUSE = re.compile(r"\b(CREATE|MERGE|SET|DELETE|REMOVE)\b", re.IGNORECASE)
+
 
 class GraphElementType(Enum):
     """Types of graph elements"""
@@ -189,6 +194,7 @@ class GraphDatabaseManager:
         self.database_uri = database_uri
         self.graph_name = graph_name
         self.engine = None
+        self.snapshot_cache = GraphSnapshotCache()
         self._initialize_connection()
         self._ensure_age_extension()
         self._create_graph_if_not_exists()
@@ -295,6 +301,9 @@ class GraphDatabaseManager:
                         parsed_results.append(parsed_data)
                     except (json.JSONDecodeError, TypeError):
                         parsed_results.append(str(row[0]))
+
+                if _CYPHER_WRITE_CLAUSE.search(query):
+                    self.snapshot_cache.invalidate(self.graph_name)
                 
                 return {
                     "success": True,
@@ -508,6 +517,33 @@ class GraphDatabaseManager:
                 "metadata": {}
             }
     
+    def get_graph_snapshot(self, refresh: bool = True) -> GraphSnapshot:
+        """
+        Get the cached topology snapshot of this graph
+
+        Args:
+            refresh: Replay pending change log entries before returning
+
+        Returns:
+            GraphSnapshot shared by the analytics methods
+        """
+        return self.snapshot_cache.get(self, refresh=refresh)
+
+    def _get_node_properties(self, node_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch properties of the given nodes with a single query"""
+        if not node_ids:
+            return {}
+        id_list = ", ".join(str(int(node_id)) for node_id in node_ids if str(node_id).isdigit())
+        result = self.execute_cypher_query(
+            f"MATCH (m) WHERE id(m) IN [{id_list}] RETURN [id(m), properties(m)]"
+        )
+        properties = {}
+        if result["success"]:
+            for item in result["results"]:
+                if isinstance(item, list) and len(item) >= 2:
+                    properties[str(item[0])] = item[1] if isinstance(item[1], dict) else {}
+        return properties
+
     def find_shortest_path(self, start_node: str, end_node: str, max_length: int = 10) -> Dict[str, Any]:
         """
         Find shortest path between two nodes
@@ -521,44 +557,27 @@ class GraphDatabaseManager:
             Dictionary with path information
         """
         try:
-            query = f"""
-            MATCH path = shortestPath((start)-[*1..{max_length}]->(end))
-            WHERE id(start) = '{start_node}' AND id(end) = '{end_node}'
-            RETURN path, length(path) as length
-            """
-            
-            result = self.execute_cypher_query(query)
+            snapshot = self.get_graph_snapshot()
+            found = snapshot.memoize(
+                ("shortest_path", str(start_node), str(end_node), max_length),
+                lambda: snapshot.shortest_path(str(start_node), str(end_node), max_length)
+            )
             
-            if result["success"] and result["results"]:
-                path_data = result["results"][0]
+            if found:
+                nodes, edges = found
+                path = GraphPath(
+                    id=f"path_{start_node}_{end_node}",
+                    nodes=list(nodes),
+                    edges=list(edges),
+                    length=len(edges),
+                    properties={"algorithm": "shortest_path"}
+                )
                 
-                if path_data and isinstance(path_data, list) and len(path_data) >= 2:
-                    path_info = path_data[0]
-                    length = path_data[1]
-                    
-                    # Extract nodes and edges from path
-                    nodes = []
-                    edges = []
-                    
-                    if isinstance(path_info, dict) and "nodes" in path_info:
-                        nodes = [str(node_id) for node_id in path_info["nodes"]]
-                    
-                    if isinstance(path_info, dict) and "edges" in path_info:
-                        edges = [str(edge_id) for edge_id in path_info["edges"]]
-                    
-                    path = GraphPath(
-                        id=f"path_{start_node}_{end_node}",
-                        nodes=nodes,
-                        edges=edges,
-                        length=length,
-                        properties={"algorithm": "shortest_path"}
-                    )
-                    
-                    return {
-                        "success": True,
-                        "path": path.to_dict(),
-                        "found": True
-                    }
+                return {
+                    "success": True,
+                    "path": path.to_dict(),
+                    "found": True
+                }
             
             return {
                 "success": True,
@@ -580,78 +599,69 @@ class GraphDatabaseManager:
         """
         Calculate node centrality using specified algorithm
         
+        Scores are computed over the whole graph snapshot and cached until
+        the graph changes.
+        
         Args:
-            algorithm: Centrality algorithm (betweenness, closeness, degree, eigenvector)
-            limit: Maximum number of nodes to analyze
+            algorithm: Centrality algorithm (betweenness, closeness, degree, eigenvector, pagerank)
+            limit: Maximum number of top scoring nodes to return
             
         Returns:
             Dictionary with centrality scores
         """
         try:
-            # Get graph data for analysis
-            graph_data = self.get_graph_data(limit=limit)
+            snapshot = self.get_graph_snapshot()
             
-            if not graph_data["success"]:
-                return graph_data
-            
-            nodes = graph_data["nodes"]
-            edges = graph_data["edges"]
-            
-            if not nodes:
-                return {"success": True, "centrality": {}, "algorithm": algorithm}
+            def compute():
+                if algorithm == "degree":
+                    return snapshot.degree_centrality()
+                if algorithm == "pagerank":
+                    return snapshot.pagerank()
+                
+                import networkx as nx
+
+                G = snapshot.to_networkx(directed=True)
+                if algorithm == "betweenness":
+                    return nx.betweenness_centrality(G)
+                if algorithm == "closeness":
+                    return nx.closeness_centrality(G)
+                if algorithm == "eigenvector":
+                    try:
+                        return nx.eigenvector_centrality(G, max_iter=1000)
+                    except nx.PowerIterationFailedConvergence:
+                        return nx.eigenvector_centrality_numpy(G)
+                return None
             
-            # Create NetworkX graph for algorithm execution
-            G = nx.DiGraph() if any(edge.get("directed", True) for edge in edges) else nx.Graph()
-            
-            # Add nodes
-            for node in nodes:
-                G.add_node(node["id"], **node["properties"])
-            
-            # Add edges
-            for edge in edges:
-                weight = edge.get("weight", 1.0)
-                G.add_edge(edge["source"], edge["target"], weight=weight, **edge["properties"])
-            
-            # Calculate centrality
-            centrality_scores = {}
-            
-            if algorithm == "betweenness":
-                centrality_scores = nx.betweenness_centrality(G)
-            elif algorithm == "closeness":
-                centrality_scores = nx.closeness_centrality(G)
-            elif algorithm == "degree":
-                centrality_scores = nx.degree_centrality(G)
-            elif algorithm == "eigenvector":
-                try:
-                    centrality_scores = nx.eigenvector_centrality(G, max_iter=1000)
-                except nx.PowerIterationFailedConvergence:
-                    centrality_scores = nx.eigenvector_centrality_numpy(G)
-            elif algorithm == "pagerank":
-                centrality_scores = nx.pagerank(G)
-            else:
+            if algorithm not in ("betweenness", "closeness", "degree", "eigenvector", "pagerank"):
                 return {
                     "success": False,
                     "error": f"Unknown centrality algorithm: {algorithm}"
                 }
             
+            centrality_scores = snapshot.memoize(("centrality", algorithm), compute)
+            
+            if not centrality_scores:
+                return {"success": True, "centrality": {}, "algorithm": algorithm}
+            
             # Sort by centrality score
-            sorted_centrality = sorted(
-                centrality_scores.items(),
-                key=lambda x: x[1],
-                reverse=True
+            sorted_centrality = snapshot.memoize(
+                ("centrality_sorted", algorithm),
+                lambda: sorted(centrality_scores.items(), key=lambda x: x[1], reverse=True)
             )
+            scores = list(centrality_scores.values())
             
             return {
                 "success": True,
-                "centrality": dict(sorted_centrality),
+                "centrality": dict(sorted_centrality[:limit]),
                 "algorithm": algorithm,
                 "top_nodes": sorted_centrality[:20],  # Top 20 nodes
                 "statistics": {
-                    "mean": np.mean(list(centrality_scores.values())),
-                    "std": np.std(list(centrality_scores.values())),
-                    "max": max(centrality_scores.values()),
-                    "min": min(centrality_scores.values())
-                }
+                    "mean": np.mean(scores),
+                    "std": np.std(scores),
+                    "max": sorted_centrality[0][1],
+                    "min": sorted_centrality[-1][1]
+                },
+                "graph_version": snapshot.version
             }
             
         except Exception as e:
@@ -674,53 +684,48 @@ class GraphDatabaseManager:
             Dictionary with community information
         """
         try:
-            # Get graph data
-            graph_data = self.get_graph_data()
-            
-            if not graph_data["success"]:
-                return graph_data
-            
-            nodes = graph_data["nodes"]
-            edges = graph_data["edges"]
-            
-            # Create NetworkX graph
-            G = nx.Graph()  # Use undirected for community detection
+            snapshot = self.get_graph_snapshot()
             
-            for node in nodes:
-                G.add_node(node["id"], **node["properties"])
-            
-            for edge in edges:
-                weight = edge.get("weight", 1.0)
-                G.add_edge(edge["source"], edge["target"], weight=weight)
-            
-            # Detect communities
-            communities = {}
-            
-            if algorithm == "louvain":
-                try:
-                    import community as community_louvain
-                    partition = community_louvain.best_partition(G, resolution=resolution)
-                    communities = partition
-                except ImportError:
-                    # Fallback to basic connected components
-                    components = list(nx.connected_components(G))
+            def compute():
+                communities = {}
+                components = None
+                
+                if algorithm == "louvain":
+                    try:
+                        import community as community_louvain
+                        G = snapshot.to_networkx(directed=False)
+                        communities = community_louvain.best_partition(G, resolution=resolution)
+                    except ImportError:
+                        # Fallback to basic connected components
+                        components = snapshot.connected_components()
+                else:
+                    # Default to connected components
+                    components = snapshot.connected_components()
+                
+                if components is not None:
                     for i, component in enumerate(components):
                         for node in component:
                             communities[node] = i
-            else:
-                # Default to connected components
-                components = list(nx.connected_components(G))
-                for i, component in enumerate(components):
-                    for node in component:
-                        communities[node] = i
-            
-            # Analyze communities
-            community_stats = {}
-            for node_id, community_id in communities.items():
-                if community_id not in community_stats:
-                    community_stats[community_id] = {"nodes": [], "size": 0}
-                community_stats[community_id]["nodes"].append(node_id)
-                community_stats[community_id]["size"] += 1
+                
+                # Analyze communities
+                community_stats = {}
+                for node_id, community_id in communities.items():
+                    if community_id not in community_stats:
+                        community_stats[community_id] = {"nodes": [], "size": 0}
+                    community_stats[community_id]["nodes"].append(node_id)
+                    community_stats[community_id]["size"] += 1
+                
+                from networkx.algorithms.community import modularity as nx_modularity
+
+                modularity = nx_modularity(
+                    snapshot.to_networkx(directed=False),
+                    [set(stats["nodes"]) for stats in community_stats.values()]
+                ) if community_stats else 0
+                return communities, community_stats, modularity
+            
+            communities, community_stats, modularity = snapshot.memoize(
+                ("communities", algorithm, resolution), compute
+            )
             
             return {
                 "success": True,
@@ -728,9 +733,8 @@ class GraphDatabaseManager:
                 "community_stats": community_stats,
                 "algorithm": algorithm,
                 "num_communities": len(community_stats),
-                "modularity": nx.algorithms.community.modularity(
-                    G, [set(stats["nodes"]) for stats in community_stats.values()]
-                ) if community_stats else 0
+                "modularity": modularity,
+                "graph_version": snapshot.version
             }
             
         except Exception as e:
@@ -814,6 +818,9 @@ class GraphDatabaseManager:
         """
         Get neighbors of a specific node
         
+        Traversal runs on the graph snapshot; neighbor properties are read
+        with one query for the whole result.
+        
         Args:
             node_id: Target node ID
             depth: Traversal depth
@@ -823,52 +830,32 @@ class GraphDatabaseManager:
             Dictionary with neighbor information
         """
         try:
-            # Build traversal query based on direction
-            if direction == "out":
-                pattern = f"(n)-[r*1..{depth}]->(m)"
-            elif direction == "in":
-                pattern = f"(m)-[r*1..{depth}]->(n)"
-            else:  # both
-                pattern = f"(n)-[r*1..{depth}]-(m)"
-            
-            query = f"""
-            MATCH {pattern}
-            WHERE id(n) = '{node_id}'
-            RETURN DISTINCT m, labels(m) as labels, id(m) as neighbor_id, 
-                   length(r) as distance
-            ORDER BY distance
-            """
-            
-            result = self.execute_cypher_query(query)
+            snapshot = self.get_graph_snapshot()
+            found = snapshot.memoize(
+                ("neighbors", str(node_id), depth, direction),
+                lambda: snapshot.neighbors(str(node_id), depth, direction)
+            )
+            properties = self._get_node_properties([neighbor_id for neighbor_id, _ in found])
+            
+            neighbors = []
+            for neighbor_id, distance in found:
+                neighbor = GraphNode(
+                    id=neighbor_id,
+                    label=snapshot.label_of(snapshot.node_index[neighbor_id]),
+                    properties=properties.get(neighbor_id, {})
+                )
+                neighbor_dict = neighbor.to_dict()
+                neighbor_dict["distance"] = distance
+                neighbors.append(neighbor_dict)
             
-            if result["success"]:
-                neighbors = []
-                for item in result["results"]:
-                    if item and isinstance(item, list) and len(item) >= 4:
-                        node_data = item[0] if isinstance(item[0], dict) else {}
-                        labels = item[1] if isinstance(item[1], list) else []
-                        neighbor_id = str(item[2])
-                        distance = item[3]
-                        
-                        neighbor = GraphNode(
-                            id=neighbor_id,
-                            label=labels[0] if labels else "Node",
-                            properties=node_data
-                        )
-                        neighbor_dict = neighbor.to_dict()
-                        neighbor_dict["distance"] = distance
-                        neighbors.append(neighbor_dict)
-                
-                return {
-                    "success": True,
-                    "node_id": node_id,
-                    "neighbors": neighbors,
-                    "count": len(neighbors),
-                    "depth": depth,
-                    "direction": direction
-                }
-            else:
-                return result
+            return {
+                "success": True,
+                "node_id": node_id,
+                "neighbors": neighbors,
+                "count": len(neighbors),
+                "depth": depth,
+                "direction": direction
+            }
                 
         except Exception as e:
             logger.error(f"Failed to get node neighbors: {e}")
@@ -0,0 +1,579 @@
+"""
+Graph Snapshot Cache
+
+Keeps an in-memory, array-based copy of a graph's topology for analytics.
+Nodes and edges are stored as NumPy arrays of integer indexes (no property
+dictionaries), adjacency is materialized as CSR arrays on demand, and the
+snapshot is kept current by replaying ``graph_change_log`` entries instead
+of re-reading the whole graph. Algorithm results are memoized per snapshot
+version, so repeated analytics on an unchanged graph are dictionary hits.
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple, TYPE_CHECKING
+
+import numpy as np
+from sqlalchemy import text
+
+if TYPE_CHECKING:
+    import networkx as nx
+
+logger = logging.getLogger(__name__)
+
+
+def _import_csgraph() -> Optional[Tuple[Callable, Callable]]:
+    """SciPy is optional and slow to import, it's only imported on first use"""
+    try:
+        from scipy.sparse import csr_matrix
+        from scipy.sparse.csgraph import connected_components
+    except ImportError:
+        return None
+    return csr_matrix, connected_components
+
+
+def _grow(array: np.ndarray, size: int) -> np.ndarray:
+    """Return ``array`` with capacity for at least ``size`` items"""
+    if size <= len(array):
+        return array
+    grown = np.zeros(max(size, 2 * len(array), 64), dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
+def _as_dict(data: Any) -> Dict[str, Any]:
+    """Change log payloads may arrive as JSON text or already decoded"""
+    if isinstance(data, str):
+        try:
+            data = json.loads(data)
+        except ValueError:
+            return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _edge_weight(value: Any) -> float:
+    try:
+        return float(value) if value is not None else 1.0
+    except (TypeError, ValueError):
+        return 1.0
+
+
+class GraphSnapshot:
+    """
+    Compact topology of one graph.
+
+    Node ids map to dense integer indexes; removed nodes and edges are
+    tombstoned and dropped on compaction. ``version`` is bumped whenever the
+    topology changes, which invalidates CSR arrays and memoized results.
+    """
+
+    def __init__(self, graph_name: str):
+        self.graph_name = graph_name
+        self.version = 0
+        self.change_id = 0  # Last graph_change_log id applied, None without a change log
+        self.loaded_at = time.time()
+        self.lock = threading.RLock()
+
+        self.node_ids: List[str] = []
+        self.node_index: Dict[str, int] = {}
+        self.labels: List[str] = []
+        self._label_codes: Dict[str, int] = {}
+        self._node_label = np.zeros(0, dtype=np.int32)
+        self._node_alive = np.zeros(0, dtype=bool)
+
+        self.edge_ids: List[str] = []
+        self.edge_index: Dict[str, int] = {}
+        self._edge_source = np.zeros(0, dtype=np.int32)
+        self._edge_target = np.zeros(0, dtype=np.int32)
+        self._edge_weight = np.zeros(0, dtype=np.float32)
+        self._edge_alive = np.zeros(0, dtype=bool)
+
+        self._csr: Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = {}
+        self._memo: Dict[Hashable, Any] = {}
+        self.memo_hits = 0
+        self.memo_misses = 0
+
+    # Topology updates
+
+    @property
+    def node_count(self) -> int:
+        return int(self._node_alive[:len(self.node_ids)].sum())
+
+    @property
+    def edge_count(self) -> int:
+        return int(self._edge_alive[:len(self.edge_ids)].sum())
+
+    def _label_code(self, label: Optional[str]) -> int:
+        label = label or "Node"
+        code = self._label_codes.get(label)
+        if code is None:
+            code = self._label_codes[label] = len(self.labels)
+            self.labels.append(label)
+        return code
+
+    def add_node(self, node_id: str, label: Optional[str] = None) -> int:
+        """Add a node, or revive/relabel an existing one; returns its index"""
+        index = self.node_index.get(node_id)
+        if index is None:
+            index = len(self.node_ids)
+            self.node_ids.append(node_id)
+            self.node_index[node_id] = index
+            self._node_label = _grow(self._node_label, index + 1)
+            self._node_alive = _grow(self._node_alive, index + 1)
+        if label is not None or not self._node_alive[index]:
+            self._node_label[index] = self._label_code(label)
+        self._node_alive[index] = True
+        return index
+
+    def remove_node(self, node_id: str) -> None:
+        """Tombstone a node and its incident edges"""
+        index = self.node_index.get(node_id)
+        if index is None:
+            return
+        self._node_alive[index] = False
+        count = len(self.edge_ids)
+        incident = (self._edge_source[:count] == index) | (self._edge_target[:count] == index)
+        self._edge_alive[:count][incident] = False
+
+    def add_edge(self, edge_id: str, source: str, target: str, weight: float = 1.0) -> None:
+        """Add or replace an edge, creating missing endpoint nodes"""
+        source_index = self.node_index.get(source)
+        if source_index is None or not self._node_alive[source_index]:
+            source_index = self.add_node(source)
+        target_index = self.node_index.get(target)
+        if target_index is None or not self._node_alive[target_index]:
+            target_index = self.add_node(target)
+
+        index = self.edge_index.get(edge_id)
+        if index is None:
+            index = len(self.edge_ids)
+            self.edge_ids.append(edge_id)
+            self.edge_index[edge_id] = index
+            self._edge_source = _grow(self._edge_source, index + 1)
+            self._edge_target = _grow(self._edge_target, index + 1)
+            self._edge_weight = _grow(self._edge_weight, index + 1)
+            self._edge_alive = _grow(self._edge_alive, index + 1)
+        self._edge_source[index] = source_index
+        self._edge_target[index] = target_index
+        self._edge_weight[index] = weight
+        self._edge_alive[index] = True
+
+    def remove_edge(self, edge_id: str) -> None:
+        """Tombstone an edge"""
+        index = self.edge_index.get(edge_id)
+        if index is not None:
+            self._edge_alive[index] = False
+
+    def apply_change(
+        self,
+        change_type: str,
+        element_id: str,
+        old_data: Any = None,
+        new_data: Any = None,
+    ) -> bool:
+        """
+        Apply one ``graph_change_log`` entry.
+
+        Returns False when the change cannot be applied incrementally (schema
+        or batch changes, edges without endpoints) and a reload is needed.
+        """
+        old_data, new_data = _as_dict(old_data), _as_dict(new_data)
+        element_id = str(element_id)
+
+        if change_type in ("node_created", "node_updated"):
+            self.add_node(element_id, new_data.get("label"))
+        elif change_type == "node_deleted":
+            self.remove_node(element_id)
+        elif change_type in ("edge_created", "edge_updated"):
+            data = {**old_data, **new_data}
+            source = data.get("source", data.get("start_id"))
+            target = data.get("target", data.get("end_id"))
+            if source is None or target is None:
+                return False
+            properties = data.get("properties") or {}
+            weight = data.get("weight", properties.get("weight"))
+            self.add_edge(element_id, str(source), str(target), _edge_weight(weight))
+        elif change_type == "edge_deleted":
+            self.remove_edge(element_id)
+        else:
+            return False
+        return True
+
+    def mark_changed(self) -> None:
+        """Bump the version, dropping CSR arrays and memoized results"""
+        self.version += 1
+        self._csr.clear()
+        self._memo.clear()
+        if len(self.edge_ids) > 1024 and self.edge_count < len(self.edge_ids) // 2:
+            self.compact()
+
+    def compact(self) -> None:
+        """Drop tombstoned edges from the edge arrays"""
+        count = len(self.edge_ids)
+        alive = np.flatnonzero(self._edge_alive[:count])
+        self.edge_ids = [self.edge_ids[i] for i in alive]
+        self.edge_index = {edge_id: i for i, edge_id in enumerate(self.edge_ids)}
+        self._edge_source = self._edge_source[alive]
+        self._edge_target = self._edge_target[alive]
+        self._edge_weight = self._edge_weight[alive]
+        self._edge_alive = np.ones(len(alive), dtype=bool)
+        self._csr.clear()
+
+    # Adjacency
+
+    def csr(self, direction: str = "out") -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        CSR adjacency of the live edges.
+
+        Args:
+            direction: "out" for successors, "in" for predecessors
+
+        Returns:
+            (indptr, neighbors, weights, edge positions) arrays
+        """
+        cached = self._csr.get(direction)
+        if cached is not None:
+            return cached
+
+        count = len(self.edge_ids)
+        edges = np.flatnonzero(self._edge_alive[:count])
+        sources = self._edge_source[edges]
+        targets = self._edge_target[edges]
+        if direction == "in":
+            sources, targets = targets, sources
+
+        order = np.argsort(sources, kind="stable")
+        counts = np.bincount(sources, minlength=len(self.node_ids))
+        indptr = np.zeros(len(self.node_ids) + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+
+        cached = (indptr, targets[order], self._edge_weight[edges][order], edges[order])
+        self._csr[direction] = cached
+        return cached
+
+    def alive_nodes(self) -> np.ndarray:
+        """Indexes of live nodes"""
+        return np.flatnonzero(self._node_alive[:len(self.node_ids)])
+
+    def label_of(self, index: int) -> str:
+        return self.labels[self._node_label[index]]
+
+    def memoize(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the result for ``key`` at this version, computing it once"""
+        with self.lock:
+            if key in self._memo:
+                self.memo_hits += 1
+                return self._memo[key]
+            self.memo_misses += 1
+            result = compute()
+            self._memo[key] = result
+            return result
+
+    # Algorithms
+
+    def to_networkx(self, directed: bool = True) -> "nx.Graph":
+        """Topology-only NetworkX graph (node ids and edge weights), memoized"""
+        import networkx as nx
+
+        def build():
+            graph = nx.DiGraph() if directed else nx.Graph()
+            graph.add_nodes_from(self.node_ids[i] for i in self.alive_nodes())
+            count = len(self.edge_ids)
+            edges = np.flatnonzero(self._edge_alive[:count])
+            graph.add_weighted_edges_from(
+                (self.node_ids[s], self.node_ids[t], float(w))
+                for s, t, w in zip(
+                    self._edge_source[edges], self._edge_target[edges], self._edge_weight[edges]
+                )
+            )
+            return graph
+
+        return self.memoize(("networkx", directed), build)
+
+    def degree_centrality(self) -> Dict[str, float]:
+        """In plus out degree over n - 1, as NetworkX computes it for digraphs"""
+        nodes = self.alive_nodes()
+        if len(nodes) <= 1:
+            return {self.node_ids[i]: 1.0 for i in nodes}
+        out_indptr = self.csr("out")[0]
+        in_indptr = self.csr("in")[0]
+        degree = np.diff(out_indptr) + np.diff(in_indptr)
+        scale = 1.0 / (len(nodes) - 1)
+        return {self.node_ids[i]: float(degree[i]) * scale for i in nodes}
+
+    def pagerank(self, alpha: float = 0.85, max_iter: int = 100, tol: float = 1.0e-6) -> Dict[str, float]:
+        """Weighted PageRank by power iteration over the CSR arrays"""
+        nodes = self.alive_nodes()
+        n = len(nodes)
+        if n == 0:
+            return {}
+
+        size = len(self.node_ids)
+        alive = self._node_alive[:size]
+        indptr, targets, weights, _ = self.csr("out")
+        sources = np.repeat(np.arange(size), np.diff(indptr))
+        out_weight = np.bincount(sources, weights=weights, minlength=size)
+        share = np.divide(weights, out_weight[sources], out=np.zeros(len(weights)), where=out_weight[sources] > 0)
+        dangling = alive & (out_weight == 0)
+
+        rank = np.where(alive, 1.0 / n, 0.0)
+        for _ in range(max_iter):
+            previous = rank
+            rank = np.bincount(targets, weights=previous[sources] * share, minlength=size) * alpha
+            rank += (alpha * previous[dangling].sum() + (1.0 - alpha)) / n
+            rank[~alive] = 0.0
+            if np.abs(rank - previous).sum() < n * tol:
+                break
+        return {self.node_ids[i]: float(rank[i]) for i in nodes}
+
+    def connected_components(self) -> List[List[str]]:
+        """Weakly connected components as lists of node ids"""
+        nodes = self.alive_nodes()
+        csgraph = _import_csgraph()
+        if csgraph is None:
+            import networkx as nx
+
+            return [sorted(c) for c in nx.connected_components(self.to_networkx(directed=False))]
+
+        csr_matrix, csgraph_components = csgraph
+        indptr, targets, _, _ = self.csr("out")
+        size = len(self.node_ids)
+        matrix = csr_matrix((np.ones(len(targets)), targets, indptr), shape=(size, size))
+        _, labels = csgraph_components(matrix, directed=True, connection="weak")
+        components: Dict[int, List[str]] = {}
+        for i in nodes:
+            components.setdefault(int(labels[i]), []).append(self.node_ids[i])
+        return list(components.values())
+
+    def shortest_path(
+        self, start: str, end: str, max_length: int = 10
+    ) -> Optional[Tuple[List[str], List[str]]]:
+        """Unweighted directed shortest path as (node ids, edge ids), or None"""
+        start_index = self.node_index.get(start)
+        end_index = self.node_index.get(end)
+        if (
+            start_index is None or end_index is None
+            or not self._node_alive[start_index] or not self._node_alive[end_index]
+        ):
+            return None
+
+        indptr, targets, _, edges = self.csr("out")
+        parent: Dict[int, Tuple[int, int]] = {start_index: (-1, -1)}
+        frontier = [start_index]
+        for _ in range(max_length):
+            if end_index in parent or not frontier:
+                break
+            next_frontier = []
+            for node in frontier:
+                for k in range(indptr[node], indptr[node + 1]):
+                    neighbor = int(targets[k])
+                    if neighbor not in parent:
+                        parent[neighbor] = (node, int(edges[k]))
+                        next_frontier.append(neighbor)
+            frontier = next_frontier
+
+        if end_index not in parent:
+            return None
+        node_path, edge_path = [], []
+        node = end_index
+        while node != -1:
+            node_path.append(self.node_ids[node])
+            node, edge = parent[node]
+            if edge != -1:
+                edge_path.append(self.edge_ids[edge])
+        return node_path[::-1], edge_path[::-1]
+
+    def neighbors(self, node_id: str, depth: int = 1, direction: str = "both") -> List[Tuple[str, int]]:
+        """Nodes within ``depth`` hops as (node id, distance), nearest first"""
+        start = self.node_index.get(node_id)
+        if start is None or not self._node_alive[start]:
+            return []
+
+        adjacency = []
+        if direction in ("out", "both"):
+            adjacency.append(self.csr("out"))
+        if direction in ("in", "both"):
+            adjacency.append(self.csr("in"))
+
+        seen = {start}
+        result = []
+        frontier = deque([start])
+        for distance in range(1, depth + 1):
+            next_frontier = deque()
+            for node in frontier:
+                for indptr, targets, _, _ in adjacency:
+                    for neighbor in targets[indptr[node]:indptr[node + 1]].tolist():
+                        if neighbor not in seen:
+                            seen.add(neighbor)
+                            result.append((self.node_ids[neighbor], distance))
+                            next_frontier.append(neighbor)
+            frontier = next_frontier
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Snapshot size and cache counters"""
+        arrays = [
+            self._node_label, self._node_alive, self._edge_source,
+            self._edge_target, self._edge_weight, self._edge_alive,
+        ]
+        arrays.extend(a for cached in self._csr.values() for a in cached)
+        return {
+            "graph_name": self.graph_name,
+            "version": self.version,
+            "change_id": self.change_id,
+            "nodes": self.node_count,
+            "edges": self.edge_count,
+            "array_bytes": int(sum(a.nbytes for a in arrays)),
+            "memoized_results": len(self._memo),
+            "memo_hits": self.memo_hits,
+            "memo_misses": self.memo_misses,
+        }
+
+
+class GraphSnapshotCache:
+    """
+    Snapshots per graph name, refreshed from ``graph_change_log``.
+
+    A snapshot is loaded in full the first time it is requested. After
+    that, at most every ``refresh_interval`` seconds, change log entries
+    newer than the last one applied are replayed onto it. If the change log
+    holds a change that cannot be applied incrementally, the snapshot is
+    reloaded, and it is also reloaded after ``max_age`` seconds as a safety
+    net. Without a change log a snapshot is kept until ``max_age`` or until
+    a write made through the manager invalidates the snapshot of its graph.
+    Loads and replays of different graphs don't wait on each other.
+    """
+
+    def __init__(self, refresh_interval: float = 1.0, max_age: float = 300.0):
+        self.refresh_interval = refresh_interval
+        self.max_age = max_age
+        self._snapshots: Dict[str, GraphSnapshot] = {}
+        self._checked_at: Dict[str, float] = {}
+        self._graph_locks: Dict[str, threading.Lock] = {}
+        self._invalidations = 0
+        self._lock = threading.Lock()
+
+    def _graph_lock(self, graph_name: str) -> threading.Lock:
+        with self._lock:
+            lock = self._graph_locks.get(graph_name)
+            if lock is None:
+                lock = self._graph_locks[graph_name] = threading.Lock()
+            return lock
+
+    def _store(self, graph_name: str, snapshot: GraphSnapshot, invalidations: int) -> None:
+        """Cache a loaded snapshot, unless a write invalidated snapshots while it was loading"""
+        with self._lock:
+            if invalidations == self._invalidations:
+                self._snapshots[graph_name] = snapshot
+                self._checked_at[graph_name] = time.time()
+
+    def get(self, manager, refresh: bool = True) -> GraphSnapshot:
+        """Get the current snapshot of the manager's graph"""
+        graph_name = manager.graph_name
+        with self._graph_lock(graph_name):
+            invalidations = self._invalidations
+            snapshot = self._snapshots.get(graph_name)
+            if snapshot is None or time.time() - snapshot.loaded_at > self.max_age:
+                snapshot = self._load(manager)
+                self._store(graph_name, snapshot, invalidations)
+                return snapshot
+
+            if (
+                refresh
+                and snapshot.change_id is not None
+                and time.time() - self._checked_at.get(graph_name, 0) >= self.refresh_interval
+            ):
+                self._checked_at[graph_name] = time.time()
+                if not self._replay_changes(manager, snapshot):
+                    snapshot = self._load(manager)
+                    self._store(graph_name, snapshot, invalidations)
+            return snapshot
+
+    def invalidate(self, graph_name: Optional[str] = None) -> None:
+        """Drop the snapshot of one graph, or all snapshots"""
+        with self._lock:
+            self._invalidations += 1
+            if graph_name is None:
+                self._snapshots.clear()
+                self._checked_at.clear()
+            else:
+                self._snapshots.pop(graph_name, None)
+                self._checked_at.pop(graph_name, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            snapshots = list(self._snapshots.items())
+        return {name: snapshot.get_stats() for name, snapshot in snapshots}
+
+    @staticmethod
+    def _latest_change_id(manager) -> Optional[int]:
+        try:
+            with manager.engine.connect() as conn:
+                return conn.execute(text(
+                    "SELECT COALESCE(MAX(id), 0) FROM graph_change_log WHERE graph_name = :graph_name"
+                ), {"graph_name": manager.graph_name}).scalar()
+        except Exception as e:
+            logger.debug(f"Graph change log not available: {e}")
+            return None
+
+    def _load(self, manager) -> GraphSnapshot:
+        """Read the full topology of the manager's graph"""
+        snapshot = GraphSnapshot(manager.graph_name)
+        # Read the change log position first, changes racing the load are replayed later.
+        # None means there is no change log to replay
+        snapshot.change_id = self._latest_change_id(manager) if manager.engine else None
+
+        started = time.time()
+        node_result = manager.execute_cypher_query("MATCH (n) RETURN [id(n), label(n)]")
+        if node_result["success"]:
+            for item in node_result["results"]:
+                if isinstance(item, list) and len(item) >= 2:
+                    snapshot.add_node(str(item[0]), item[1])
+
+        edge_result = manager.execute_cypher_query(
+            "MATCH (a)-[r]->(b) RETURN [id(r), id(a), id(b), r.weight]"
+        )
+        if edge_result["success"]:
+            for item in edge_result["results"]:
+                if isinstance(item, list) and len(item) >= 3:
+                    weight = item[3] if len(item) > 3 else None
+                    snapshot.add_edge(str(item[0]), str(item[1]), str(item[2]), _edge_weight(weight))
+
+        snapshot.mark_changed()
+        logger.info(
+            f"Loaded graph snapshot {manager.graph_name}: {snapshot.node_count} nodes, "
+            f"{snapshot.edge_count} edges in {time.time() - started:.2f}s"
+        )
+        return snapshot
+
+    def _replay_changes(self, manager, snapshot: GraphSnapshot) -> bool:
+        """Apply new change log entries; returns False if a reload is needed"""
+        try:
+            with manager.engine.connect() as conn:
+                rows = conn.execute(text("""
+                    SELECT id, change_type, element_id, old_data, new_data
+                    FROM graph_change_log
+                    WHERE graph_name = :graph_name AND id > :change_id
+                    ORDER BY id
+                """), {"graph_name": manager.graph_name, "change_id": snapshot.change_id}).fetchall()
+        except Exception as e:
+            # Keep the snapshot, max_age and write invalidation still bound its staleness
+            logger.debug(f"Graph change log not available, keeping snapshot: {e}")
+            return True
+
+        if not rows:
+            return True
+
+        with snapshot.lock:
+            for change_id, change_type, element_id, old_data, new_data in rows:
+                if not snapshot.apply_change(change_type, element_id, old_data, new_data):
+                    logger.info(
+                        f"Reloading graph snapshot {manager.graph_name} after {change_type} change"
+                    )
+                    return False
+                snapshot.change_id = change_id
+            snapshot.mark_changed()
+        return True
@@ -5,14 +5,18 @@ Provides comprehensive database migration, backup, restoration, and
 schema versioning capabilities with admin-level security controls.
 """
 
+import contextlib
 import json
 import logging
 import os
 import gzip
+import io
 import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Tuple, Union
-from dataclasses import dataclass, asdict
+from typing import Dict, Iterator, List, Optional, Any, Tuple, Union
+from dataclasses import dataclass, asdict, field
 from enum import Enum
 from pathlib import Path
 import hashlib
@@ -21,11 +25,27 @@ import uuid
 from sqlalchemy import create_engine, text, inspect, MetaData, Table
 from sqlalchemy.engine import Engine
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.pool import SingletonThreadPool
 
 from .erd_manager import DatabaseERDManager, DatabaseSchema, DatabaseTable
 
+try:
+    import zstandard
+
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Rows per multi-row INSERT statement and fetched per round trip
+BACKUP_BATCH_SIZE = 1000
+# Tables dumped concurrently, each on its own connection
+BACKUP_MAX_WORKERS = 4
+BACKUP_GZIP_LEVEL = 6
+BACKUP_COMPRESSION_EXTENSIONS = {"gzip": ".sql.gz", "zstd": ".sql.zst"}
+
 
 class MigrationType(Enum):
     """Types of database migrations"""
@@ -75,6 +95,8 @@ class DatabaseBackup:
     description: Optional[str] = None
     retention_days: int = 30
     is_automated: bool = False
+    # Row count and SHA256 checksum of each table's data, by table name
+    table_stats: Dict[str, Dict[str, Any]] = field(default_factory=dict)
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization"""
@@ -94,6 +116,7 @@ class DatabaseBackup:
             "description": self.description,
             "retention_days": self.retention_days,
             "is_automated": self.is_automated,
+            "table_stats": self.table_stats,
         }
 
 
@@ -169,6 +192,144 @@ class SchemaVersion:
         }
 
 
+def _sql_literal(value: Any) -> str:
+    """Render a column value as a SQL literal for INSERT statements"""
+    if value is None:
+        return "NULL"
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return f"X'{bytes(value).hex()}'"
+    escaped_value = str(value).replace("'", "''")
+    return f"'{escaped_value}'"
+
+
+def _open_backup_file(file_path: str, mode: str, compression: Optional[str]):
+    """
+    Open a backup file in text mode ("rt" or "wt"), through a streaming
+    gzip or zstd (de)compressor if compression is given
+    """
+    if compression == "gzip":
+        return gzip.open(
+            file_path, mode, compresslevel=BACKUP_GZIP_LEVEL, encoding="utf-8"
+        )
+    if compression == "zstd":
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError("zstd compression requires the zstandard package")
+        raw = open(file_path, mode[0] + "b")
+        if mode[0] == "w":
+            stream = zstandard.ZstdCompressor().stream_writer(raw)
+        else:
+            # Backups are a sequence of frames, one per table
+            stream = zstandard.ZstdDecompressor().stream_reader(
+                raw, read_across_frames=True
+            )
+        return io.TextIOWrapper(stream, encoding="utf-8")
+    return open(file_path, mode, encoding="utf-8")
+
+
+def _compress_bytes(data: bytes, compression: Optional[str]) -> bytes:
+    """Compress data as a complete gzip member or zstd frame"""
+    if compression == "gzip":
+        return gzip.compress(data, BACKUP_GZIP_LEVEL)
+    if compression == "zstd":
+        return zstandard.ZstdCompressor().compress(data)
+    return data
+
+
+def _iter_sql_statements(lines: Iterator[str]) -> Iterator[str]:
+    """
+    Yield the statements of a backup one at a time, without the
+    terminating ';'. A statement ends with a ';' at the end of a line,
+    outside of a string literal, values may contain newlines and ';'
+    """
+    statement: List[str] = []
+    in_string = False
+    for line in lines:
+        if not statement and (not line.strip() or line.lstrip().startswith("--")):
+            continue
+        statement.append(line)
+        # Escaped quotes ('') don't change the state
+        if line.count("'") % 2:
+            in_string = not in_string
+        if not in_string and line.rstrip().endswith(";"):
+            yield "".join(statement).strip()[:-1]
+            statement = []
+    if statement and "".join(statement).strip():
+        yield "".join(statement).strip()
+
+
+class _ChecksumWriter(io.TextIOBase):
+    """Text stream that writes through to another one, hashing the data"""
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._hash = hashlib.sha256()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: str) -> int:
+        self._hash.update(data.encode("utf-8"))
+        return self._stream.write(data)
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+
+class _CopyDataReader(io.TextIOBase):
+    """
+    Reads the data of a COPY ... FROM stdin block from the backup lines,
+    up to the terminating \\. line, for psycopg2's copy_expert
+    """
+
+    def __init__(self, lines: Iterator[str]):
+        self._lines = lines
+        self._buffer = ""
+        self._done = False
+
+    def readable(self) -> bool:
+        return True
+
+    def _read_line(self) -> bool:
+        line = next(self._lines, "\\.\n")
+        if line.rstrip("\r\n") == "\\.":
+            self._done = True
+            return False
+        self._buffer += line
+        return True
+
+    def _take(self, size: int) -> str:
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def read(self, size: Optional[int] = -1) -> str:
+        if size is None or size < 0:
+            while self._read_line():
+                pass
+            return self._take(len(self._buffer))
+        while len(self._buffer) < size and not self._done and self._read_line():
+            pass
+        return self._take(size)
+
+    def readline(self, size: Optional[int] = -1) -> str:
+        if not self._buffer and not self._done:
+            self._read_line()
+        end = self._buffer.find("\n") + 1 or len(self._buffer)
+        if size is not None and 0 <= size < end:
+            end = size
+        return self._take(end)
+
+    def skip(self):
+        """Consume the rest of the block, after a failed COPY"""
+        self._buffer = ""
+        while not self._done:
+            self._read_line()
+            self._buffer = ""
+
+
 class DatabaseMigrationManager:
     """
     Comprehensive database migration and backup management system
@@ -316,10 +477,21 @@ class DatabaseMigrationManager:
         description: Optional[str] = None,
         compress: bool = True,
         retention_days: int = 30,
+        compression: str = "gzip",
+        max_workers: Optional[int] = None,
     ) -> str:
         """
         Create a database backup
 
+        Table data is streamed in batches into multi-row INSERT statements
+        (COPY blocks on PostgreSQL with psycopg2) and written through the
+        compressor, tables are dumped in parallel on separate connections.
+        On PostgreSQL all connections read from one exported snapshot, on
+        other databases tables related by foreign keys are dumped together
+        in one transaction. If any table cannot be dumped, no backup is
+        created. Row counts and checksums of each table are stored in a
+        manifest next to the backup file.
+
         Args:
             backup_name: Name for the backup
             backup_type: Type of backup (full, schema_only, etc.)
@@ -328,12 +500,19 @@ class DatabaseMigrationManager:
             description: Optional backup description
             compress: Whether to compress the backup
             retention_days: Days to retain the backup
+            compression: "gzip" or "zstd" (requires zstandard)
+            max_workers: Tables dumped concurrently, defaults to
+                BACKUP_MAX_WORKERS. Use 1 for a dump from a single connection
 
         Returns:
             Backup ID
         """
         if not self.engine or not self.erd_manager:
             raise RuntimeError("Database connection not available")
+        if compression not in BACKUP_COMPRESSION_EXTENSIONS:
+            raise ValueError(f"Unsupported backup compression: {compression}")
+        if compress and compression == "zstd" and not ZSTD_AVAILABLE:
+            raise RuntimeError("zstd compression requires the zstandard package")
 
         backup_id = str(uuid.uuid4())
         timestamp = datetime.utcnow()
@@ -342,7 +521,7 @@ class DatabaseMigrationManager:
             # Generate filename
             filename = f"{backup_name}_{timestamp.strftime('%Y%m%d_%H%M%S')}"
             if compress:
-                filename += ".sql.gz"
+                filename += BACKUP_COMPRESSION_EXTENSIONS[compression]
             else:
                 filename += ".sql"
 
@@ -357,18 +536,15 @@ class DatabaseMigrationManager:
             else:
                 tables_to_backup = tables
 
-            # Generate backup content
-            backup_content = self._generate_backup_content(
-                schema, backup_type, tables_to_backup
-            )
-
             # Write backup file
-            if compress:
-                with gzip.open(file_path, "wt", encoding="utf-8") as f:
-                    f.write(backup_content)
-            else:
-                with open(file_path, "w", encoding="utf-8") as f:
-                    f.write(backup_content)
+            table_stats = self._write_backup(
+                file_path,
+                schema,
+                backup_type,
+                tables_to_backup,
+                compression if compress else None,
+                max_workers,
+            )
 
             # Calculate file size and checksum
             file_size = os.path.getsize(file_path)
@@ -389,9 +565,11 @@ class DatabaseMigrationManager:
                 tables_included=tables_to_backup,
                 description=description,
                 retention_days=retention_days,
+                table_stats=table_stats,
             )
 
             # Store backup record
+            self._write_backup_manifest(backup)
             self._store_backup_record(backup)
             self.backups.append(backup)
 
@@ -401,14 +579,102 @@ class DatabaseMigrationManager:
         except Exception as e:
             logger.error(f"Failed to create backup: {e}")
             # Cleanup partial backup file
-            if "file_path" in locals() and os.path.exists(file_path):
-                os.remove(file_path)
+            if "file_path" in locals():
+                for path in (file_path, self._get_manifest_path(file_path)):
+                    if os.path.exists(path):
+                        os.remove(path)
             raise
 
-    def _generate_backup_content(
+    def _write_backup(
+        self,
+        file_path: str,
+        schema: DatabaseSchema,
+        backup_type: BackupType,
+        tables: List[str],
+        compression: Optional[str],
+        max_workers: Optional[int] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Write the backup file, return row counts and checksums by table
+
+        Each table's data is dumped by a worker into its own compressed part
+        file, the parts are appended to the backup in table order. gzip
+        members and zstd frames can be concatenated, so the result is a
+        single stream.
+
+        Raises:
+            RuntimeError: If the data of a table could not be dumped
+        """
+        table_stats: Dict[str, Dict[str, Any]] = {}
+        with open(file_path, "wb") as backup_file:
+            backup_file.write(
+                _compress_bytes(
+                    self._generate_backup_header(schema, backup_type, tables).encode(
+                        "utf-8"
+                    ),
+                    compression,
+                )
+            )
+
+            if backup_type in [BackupType.FULL, BackupType.DATA_ONLY] and tables:
+                workers = self._get_backup_workers(max_workers, len(tables))
+                with tempfile.TemporaryDirectory(
+                    dir=self.backup_directory
+                ) as part_directory, self._export_snapshot(
+                    workers
+                ) as snapshot_id, ThreadPoolExecutor(max_workers=workers) as executor:
+                    part_paths = {
+                        table_name: os.path.join(part_directory, f"{index}.part")
+                        for index, table_name in enumerate(tables)
+                    }
+                    if snapshot_id or workers == 1:
+                        groups = [[table_name] for table_name in tables]
+                    else:
+                        groups = self._group_related_tables(schema, tables)
+                    futures = {}
+                    for group in groups:
+                        future = executor.submit(
+                            self._dump_table_group,
+                            group,
+                            [part_paths[table_name] for table_name in group],
+                            compression,
+                            snapshot_id,
+                        )
+                        for table_name in group:
+                            futures[table_name] = future
+                    try:
+                        for table_name in tables:
+                            stats = futures[table_name].result()[table_name]
+                            with open(part_paths[table_name], "rb") as part_file:
+                                shutil.copyfileobj(part_file, backup_file)
+                            os.remove(part_paths[table_name])
+                            table_stats[table_name] = stats
+                    except Exception:
+                        for future in futures.values():
+                            future.cancel()
+                        raise
+
+            backup_file.write(
+                _compress_bytes(
+                    self._generate_backup_footer(schema, backup_type, tables).encode(
+                        "utf-8"
+                    ),
+                    compression,
+                )
+            )
+        return table_stats
+
+    def _get_backup_workers(self, max_workers: Optional[int], table_count: int) -> int:
+        """Number of tables to dump concurrently"""
+        if isinstance(self.engine.pool, SingletonThreadPool):
+            # In memory SQLite, every thread would see a different database
+            return 1
+        return max(1, min(max_workers or BACKUP_MAX_WORKERS, table_count))
+
+    def _generate_backup_header(
         self, schema: DatabaseSchema, backup_type: BackupType, tables: List[str]
     ) -> str:
-        """Generate backup content based on type"""
+        """Generate the backup header and table structure"""
         content_parts = []
 
         # Add header
@@ -433,16 +699,13 @@ SET FOREIGN_KEY_CHECKS = 0;
                     content_parts.append(f"DROP TABLE IF EXISTS {table.name};\n")
                     content_parts.append(table_ddl)
 
-        if backup_type in [BackupType.FULL, BackupType.DATA_ONLY]:
-            # Add table data
-            for table_name in tables:
-                try:
-                    data_sql = self._generate_table_data_sql(table_name)
-                    if data_sql:
-                        content_parts.append(f"\n-- Data for table: {table_name}\n")
-                        content_parts.append(data_sql)
-                except Exception as e:
-                    logger.warning(f"Could not backup data for table {table_name}: {e}")
+        return "\n".join(content_parts) + "\n"
+
+    def _generate_backup_footer(
+        self, schema: DatabaseSchema, backup_type: BackupType, tables: List[str]
+    ) -> str:
+        """Generate the statements that follow the table data"""
+        content_parts = []
 
         # Add foreign key constraints (after all tables are created)
         if backup_type in [BackupType.FULL, BackupType.SCHEMA_ONLY]:
@@ -506,57 +769,137 @@ SET FOREIGN_KEY_CHECKS = 0;
 
         return "\n".join(lines)
 
-    def _generate_table_data_sql(self, table_name: str) -> str:
-        """Generate INSERT statements for table data"""
-        if not self.engine:
-            return ""
+    @contextlib.contextmanager
+    def _export_snapshot(self, workers: int) -> Iterator[Optional[str]]:
+        """
+        On PostgreSQL, hold a transaction open and yield its exported
+        snapshot id, so that every dump connection reads the same data.
+        Yields None on other databases or for a single worker.
+        """
+        if workers == 1 or self.engine.dialect.name != "postgresql":
+            yield None
+            return
+        with self.engine.connect() as conn:
+            conn = conn.execution_options(isolation_level="REPEATABLE READ")
+            with conn.begin():
+                yield conn.execute(text("SELECT pg_export_snapshot()")).scalar()
 
-        try:
-            with self.engine.connect() as conn:
-                # Get table structure
-                result = conn.execute(text(f"DESCRIBE {table_name}"))
-                columns = [row[0] for row in result]
-
-                if not columns:
-                    return ""
-
-                # Get data
-                result = conn.execute(text(f"SELECT * FROM {table_name}"))
-                rows = result.fetchall()
-
-                if not rows:
-                    return ""
-
-                sql_parts = []
-                sql_parts.append(f"-- Data for table {table_name}")
-
-                # Disable foreign key checks for data insertion
-                columns_str = ", ".join(columns)
-
-                for row in rows:
-                    values = []
-                    for value in row:
-                        if value is None:
-                            values.append("NULL")
-                        elif isinstance(value, str):
-                            # Escape single quotes
-                            escaped_value = value.replace("'", "''")
-                            values.append(f"'{escaped_value}'")
-                        elif isinstance(value, (int, float)):
-                            values.append(str(value))
-                        else:
-                            values.append(f"'{str(value)}'")
+    def _group_related_tables(
+        self, schema: DatabaseSchema, tables: List[str]
+    ) -> List[List[str]]:
+        """Split tables into groups connected by foreign keys, in table order"""
+        group_of = {table_name: {table_name} for table_name in tables}
+        for relationship in schema.relationships:
+            source = group_of.get(relationship.source_table)
+            target = group_of.get(relationship.target_table)
+            if source is None or target is None or source is target:
+                continue
+            source |= target
+            for table_name in target:
+                group_of[table_name] = source
+
+        groups = []
+        for table_name in tables:
+            group = group_of[table_name]
+            if table_name == min(group, key=tables.index):
+                groups.append(sorted(group, key=tables.index))
+        return groups
+
+    def _dump_table_group(
+        self,
+        table_names: List[str],
+        part_paths: List[str],
+        compression: Optional[str],
+        snapshot_id: Optional[str] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Dump the data of tables to part files, in one transaction on one connection
+
+        Args:
+            table_names: Tables to dump
+            part_paths: Part file of each table
+            compression: Compression of the part files
+            snapshot_id: PostgreSQL snapshot exported by _export_snapshot
+                to read the data from
+
+        Returns:
+            The row count and SHA256 checksum of each table's data
 
-                    values_str = ", ".join(values)
-                    sql_parts.append(
-                        f"INSERT INTO {table_name} ({columns_str}) VALUES ({values_str});"
+        Raises:
+            RuntimeError: If a table could not be dumped
+        """
+        stats = {}
+        with self.engine.connect() as conn:
+            if snapshot_id:
+                conn = conn.execution_options(isolation_level="REPEATABLE READ")
+            with conn.begin():
+                if snapshot_id:
+                    conn.exec_driver_sql(
+                        f"SET TRANSACTION SNAPSHOT {_sql_literal(snapshot_id)}"
                     )
+                for table_name, part_path in zip(table_names, part_paths):
+                    try:
+                        with _open_backup_file(part_path, "wt", compression) as f:
+                            writer = _ChecksumWriter(f)
+                            row_count = self._write_table_data(conn, table_name, writer)
+                    except Exception as e:
+                        raise RuntimeError(
+                            f"Could not backup data for table {table_name}: {e}"
+                        ) from e
+                    stats[table_name] = {
+                        "rows": row_count,
+                        "checksum": writer.hexdigest(),
+                    }
+        return stats
+
+    def _write_table_data(self, conn, table_name: str, out) -> int:
+        """
+        Stream a table's rows to out as multi-row INSERT statements, or a
+        COPY block on PostgreSQL with psycopg2. Rows are fetched in batches
+        through a server side cursor where the driver supports it.
 
-                return "\n".join(sql_parts) + "\n"
+        Returns:
+            Number of rows written
+        """
+        table = Table(table_name, MetaData(), autoload_with=conn)
+        preparer = conn.dialect.identifier_preparer
+        table_sql = preparer.format_table(table)
+        columns_sql = ", ".join(preparer.quote(column.name) for column in table.columns)
 
-        except Exception as e:
-            logger.warning(f"Could not generate data SQL for {table_name}: {e}")
-            return ""
+        out.write(f"\n-- Data for table: {table_name}\n")
+
+        if self._supports_copy(conn):
+            out.write(f"COPY {table_sql} ({columns_sql}) FROM stdin;\n")
+            cursor = conn.connection.cursor()
+            try:
+                cursor.copy_expert(
+                    f"COPY {table_sql} ({columns_sql}) TO STDOUT", out
+                )
+                row_count = cursor.rowcount
+            finally:
+                cursor.close()
+            out.write("\\.\n")
+            return row_count
+
+        # Primary key order keeps the output, and its checksum, stable
+        query = table.select().order_by(*table.primary_key.columns)
+        result = conn.execution_options(stream_results=True).execute(query)
+        row_count = 0
+        while True:
+            rows = result.fetchmany(BACKUP_BATCH_SIZE)
+            if not rows:
+                break
+            values = ",\n".join(
+                "(" + ", ".join(_sql_literal(value) for value in row) + ")"
+                for row in rows
+            )
+            out.write(f"INSERT INTO {table_sql} ({columns_sql}) VALUES\n{values};\n")
+            row_count += len(rows)
+        return row_count
+
+    def _supports_copy(self, conn) -> bool:
+        """Whether table data can be dumped and restored with COPY"""
+        return conn.dialect.name == "postgresql" and conn.dialect.driver == "psycopg2"
 
     def _generate_foreign_key_constraints(
         self, schema: DatabaseSchema, tables: List[str]
@@ -617,29 +960,27 @@ SET FOREIGN_KEY_CHECKS = 0;
 
             logger.info(f"Starting restore from backup: {backup_id}")
 
-            # Read backup content
-            if backup.compressed:
-                with gzip.open(backup.file_path, "rt", encoding="utf-8") as f:
-                    backup_content = f.read()
-            else:
-                with open(backup.file_path, "r", encoding="utf-8") as f:
-                    backup_content = f.read()
-
-            # Execute restore
-            with self.engine.begin() as conn:
-                # Split content into individual statements
-                statements = [
-                    stmt.strip() for stmt in backup_content.split(";") if stmt.strip()
-                ]
-
-                for statement in statements:
-                    if statement.strip():
-                        try:
-                            conn.execute(text(statement))
-                        except Exception as e:
-                            logger.warning(
-                                f"Failed to execute statement: {statement[:100]}... Error: {e}"
+            # Execute restore, streaming statements from the backup file
+            with _open_backup_file(
+                backup.file_path, "rt", self._get_backup_compression(backup)
+            ) as f, self.engine.begin() as conn:
+                lines = iter(f)
+                for statement in _iter_sql_statements(lines):
+                    try:
+                        if statement.startswith("COPY ") and statement.endswith(
+                            " FROM stdin"
+                        ):
+                            self._restore_copy_data(conn, statement, lines)
+                        else:
+                            # Values may contain anything that looks like a
+                            # bind parameter, send statements unprocessed
+                            conn.exec_driver_sql(
+                                statement, execution_options={"no_parameters": True}
                             )
+                    except Exception as e:
+                        logger.warning(
+                            f"Failed to execute statement: {statement[:100]}... Error: {e}"
+                        )
 
             logger.info(f"Backup restored successfully: {backup_id}")
             return True
@@ -648,6 +989,45 @@ SET FOREIGN_KEY_CHECKS = 0;
             logger.error(f"Failed to restore backup {backup_id}: {e}")
             raise
 
+    def _restore_copy_data(self, conn, statement: str, lines: Iterator[str]):
+        """Load the data block that follows a COPY ... FROM stdin statement"""
+        reader = _CopyDataReader(lines)
+        try:
+            if not self._supports_copy(conn):
+                raise RuntimeError("COPY data can only be restored with psycopg2")
+            cursor = conn.connection.cursor()
+            try:
+                cursor.copy_expert(statement, reader)
+            finally:
+                cursor.close()
+        finally:
+            reader.skip()
+
+    def _get_backup_compression(self, backup: DatabaseBackup) -> Optional[str]:
+        """Compression of a backup file, from its extension"""
+        if not backup.compressed:
+            return None
+        if backup.file_path.endswith(BACKUP_COMPRESSION_EXTENSIONS["zstd"]):
+            return "zstd"
+        return "gzip"
+
+    def _get_manifest_path(self, file_path: str) -> str:
+        """Path of the manifest written next to a backup file"""
+        return f"{file_path}.manifest.json"
+
+    def _write_backup_manifest(self, backup: DatabaseBackup):
+        """Write the backup record, with per table stats, next to the backup file"""
+        with open(self._get_manifest_path(backup.file_path), "w", encoding="utf-8") as f:
+            json.dump(backup.to_dict(), f, indent=2)
+
+    def _load_backup_table_stats(self, file_path: str) -> Dict[str, Dict[str, Any]]:
+        """Load per table stats from a backup manifest, if there is one"""
+        try:
+            with open(self._get_manifest_path(file_path), encoding="utf-8") as f:
+                return json.load(f).get("table_stats", {})
+        except (OSError, ValueError):
+            return {}
+
     def get_backup(self, backup_id: str) -> Optional[DatabaseBackup]:
         """Get backup by ID"""
         for backup in self.backups:
@@ -680,9 +1060,10 @@ SET FOREIGN_KEY_CHECKS = 0;
             return False
 
         try:
-            # Remove file
-            if os.path.exists(backup.file_path):
-                os.remove(backup.file_path)
+            # Remove file and manifest
+            for path in (backup.file_path, self._get_manifest_path(backup.file_path)):
+                if os.path.exists(path):
+                    os.remove(path)
 
             # Remove from database
             self._delete_backup_from_db(backup_id)
@@ -1297,6 +1678,7 @@ SET FOREIGN_KEY_CHECKS = 0;
             description=row.description,
             retention_days=row.retention_days,
             is_automated=row.is_automated,
+            table_stats=self._load_backup_table_stats(row.file_path),
         )
 
     def _row_to_migration(self, row) -> DatabaseMigration:
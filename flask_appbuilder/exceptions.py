@@ -40,6 +40,12 @@ class InvalidColumnArgsFABException(FABException):
     ...
 
 
+class InvalidCursorFABException(FABException):
+    """Invalid or mismatched keyset pagination cursor"""
+
+    ...
+
+
 class InterfaceQueryWithoutSession(FABException):
     """You need to setup a session on the interface to perform queries"""
 
@@ -5,10 +5,11 @@ Provides comprehensive CSV export functionality with customizable formatting,
 encoding, and delimiter options.
 """
 
+import codecs
 import csv
 import logging
 from io import StringIO
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Union
 from datetime import datetime, date
 
 log = logging.getLogger(__name__)
@@ -81,6 +82,62 @@ class CSVExporter:
             log.error(f"CSV export failed: {e}")
             raise
     
+    def export_stream(self,
+                      rows: Iterable[Dict[str, Any]],
+                      headers: List[str],
+                      column_labels: Optional[Dict[str, str]] = None,
+                      metadata: Optional[Dict[str, Any]] = None,
+                      options: Optional[Dict[str, Any]] = None) -> Iterator[bytes]:
+        """
+        Export rows to CSV as a stream of encoded chunks.
+        
+        Rows are consumed lazily and flushed every ``chunk_rows`` rows, so
+        memory stays bounded regardless of the number of rows.
+        
+        Args:
+            rows: Iterable of row dictionaries
+            headers: Column names to write, in order
+            column_labels: Optional mapping of column names to header labels
+            metadata: Export metadata
+            options: CSV-specific export options
+            
+        Yields:
+            Encoded CSV chunks
+        """
+        export_options = {**self.default_options, **(options or {})}
+        column_labels = column_labels or {}
+        chunk_rows = export_options.get('chunk_rows', 1000)
+        # An incremental encoder only writes the BOM once for utf-16
+        encoder = codecs.getincrementalencoder(export_options['encoding'])()
+        output = StringIO()
+        writer = csv.writer(
+            output,
+            delimiter=export_options['delimiter'],
+            quotechar=export_options['quotechar'],
+            quoting=export_options['quoting']
+        )
+        
+        if export_options.get('include_metadata', True) and metadata:
+            self._write_metadata_header(output, metadata, export_options)
+        if export_options.get('include_headers', True):
+            writer.writerow([column_labels.get(header, header) for header in headers])
+        
+        record_count = 0
+        for row in rows:
+            formatted_row = self._format_row(row, export_options)
+            writer.writerow(
+                [formatted_row.get(header, export_options['null_value']) for header in headers]
+            )
+            record_count += 1
+            if record_count % chunk_rows == 0:
+                yield encoder.encode(output.getvalue())
+                output.seek(0)
+                output.truncate(0)
+        
+        yield encoder.encode(output.getvalue(), final=True)
+        output.close()
+        log.info(f"CSV stream export completed: {record_count} records")
+    
     def _write_metadata_header(self, output: StringIO, 
                               metadata: Dict[str, Any], 
                               options: Dict[str, Any]) -> None:
@@ -6,8 +6,9 @@ charts, and multiple worksheet support.
 """
 
 import logging
+import tempfile
 from io import BytesIO
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Union
 from datetime import datetime, date
 from decimal import Decimal
 
@@ -15,6 +16,8 @@ log = logging.getLogger(__name__)
 
 try:
     from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.utils import get_column_letter
     from openpyxl.styles import Font, Fill, PatternFill, Alignment, Border, Side
     from openpyxl.utils.dataframe import dataframe_to_rows
     from openpyxl.formatting.rule import ColorScaleRule
@@ -123,6 +126,85 @@ class ExcelExporter:
             log.error(f"Excel export failed: {e}")
             raise
     
+    def export_stream(self,
+                      rows: Iterable[Dict[str, Any]],
+                      headers: List[str],
+                      column_labels: Optional[Dict[str, str]] = None,
+                      metadata: Optional[Dict[str, Any]] = None,
+                      options: Optional[Dict[str, Any]] = None) -> Iterator[bytes]:
+        """
+        Export rows to Excel as a stream of byte chunks.
+        
+        Uses an openpyxl write-only workbook, rows are flushed to a temporary
+        file as they are appended so memory stays bounded. The xlsx archive is
+        streamed from the temporary file once all rows are written. Data cells
+        are not styled, metadata goes to its own sheet and charts are not
+        supported in this mode.
+        
+        Args:
+            rows: Iterable of row dictionaries
+            headers: Column names to write, in order
+            column_labels: Optional mapping of column names to header labels
+            metadata: Export metadata
+            options: Excel-specific export options
+            
+        Yields:
+            xlsx file chunks
+            
+        Raises:
+            ImportError: If openpyxl is not available
+        """
+        if not OPENPYXL_AVAILABLE:
+            raise ImportError("openpyxl package is required for Excel export functionality")
+        
+        export_options = {**self.default_options, **(options or {})}
+        column_labels = column_labels or {}
+        chunk_size = export_options.get('chunk_size', 64 * 1024)
+        
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet(title=export_options['sheet_name'])
+        include_headers = export_options.get('include_headers', True) and headers
+        # Sheet views and column widths must be set before the first row
+        if include_headers and export_options.get('freeze_headers', True):
+            ws.freeze_panes = 'A2'
+        if export_options.get('column_widths') == 'auto':
+            for col_idx, header in enumerate(headers, 1):
+                label = str(column_labels.get(header, header))
+                ws.column_dimensions[get_column_letter(col_idx)].width = min(max(len(label) + 2, 10), 50)
+        
+        if include_headers:
+            header_cells = []
+            for header in headers:
+                cell = WriteOnlyCell(ws, value=str(column_labels.get(header, header)))
+                self._apply_header_style(cell, export_options)
+                header_cells.append(cell)
+            ws.append(header_cells)
+        
+        record_count = 0
+        for row in rows:
+            ws.append(
+                [self._format_cell_value(row.get(header), export_options) for header in headers]
+            )
+            record_count += 1
+        
+        if include_headers and export_options.get('auto_filter', True) and record_count:
+            ws.auto_filter.ref = f"A1:{get_column_letter(len(headers))}{record_count + 1}"
+        
+        if export_options.get('include_metadata', True) and metadata:
+            metadata_sheet = wb.create_sheet(title="Export Metadata")
+            for key, value in metadata.items():
+                metadata_sheet.append([key.replace('_', ' ').title(), str(value)])
+        
+        with tempfile.TemporaryFile() as output:
+            wb.save(output)
+            output.seek(0)
+            while True:
+                chunk = output.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        log.info(f"Excel stream export completed: {record_count} records")
+    
     def _write_excel_data(self, worksheet, 
                          data: List[Dict[str, Any]], 
                          metadata: Optional[Dict[str, Any]],
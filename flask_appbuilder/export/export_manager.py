@@ -7,12 +7,13 @@ with customizable formatting and metadata options.
 
 import logging
 from enum import Enum
-from typing import List, Dict, Any, Optional, Union, IO
+from typing import List, Dict, Any, Iterator, Optional, Union, IO
 from datetime import datetime
 from io import BytesIO, StringIO
 
 from flask import current_app
 from flask_login import current_user
+from sqlalchemy import inspect as sa_inspect
 
 log = logging.getLogger(__name__)
 
@@ -179,6 +180,70 @@ class ExportManager:
             log.error(f"Query result export failed: {e}")
             raise
     
+    def stream_query(self,
+                     query,
+                     format_type: ExportFormat,
+                     columns: Optional[List[str]] = None,
+                     column_labels: Optional[Dict[str, str]] = None,
+                     metadata: Optional[Dict[str, Any]] = None,
+                     options: Optional[Dict[str, Any]] = None,
+                     batch_size: int = 1000) -> Iterator[bytes]:
+        """
+        Stream a SQLAlchemy model query in the specified format.
+        
+        Rows are fetched with a server side cursor in batches of
+        ``batch_size`` and converted one at a time, headers come from the
+        model column metadata, so memory stays bounded regardless of the
+        number of rows.
+        
+        Args:
+            query: SQLAlchemy query over a single model
+            format_type: Target export format, must support streaming
+            columns: Optional column names to export, defaults to all model columns
+            column_labels: Optional mapping of column names to display labels
+            metadata: Optional metadata to include
+            options: Format-specific options
+            batch_size: Number of rows fetched per round trip
+            
+        Returns:
+            Iterator of encoded export chunks
+            
+        Raises:
+            ValueError: If format does not support streaming
+        """
+        exporter = self._exporters.get(format_type)
+        if not hasattr(exporter, 'export_stream'):
+            raise ValueError(f"Export format {format_type.value} does not support streaming")
+        
+        model = query.column_descriptions[0]['entity']
+        headers = columns or self._get_model_columns(model)
+        export_metadata = self._prepare_metadata(metadata, format_type)
+        
+        def rows():
+            for item in query.yield_per(batch_size):
+                yield {column: getattr(item, column) for column in headers}
+        
+        return exporter.export_stream(
+            rows(),
+            headers,
+            column_labels=column_labels,
+            metadata=export_metadata,
+            options=options or {}
+        )
+    
+    @staticmethod
+    def _get_model_columns(model) -> List[str]:
+        """
+        Get the column attribute names of a model, in mapper order.
+        
+        Args:
+            model: SQLAlchemy model class
+            
+        Returns:
+            List of column attribute names
+        """
+        return [column.key for column in sa_inspect(model).mapper.column_attrs]
+    
     def get_supported_formats(self) -> List[str]:
         """
         Get list of supported export formats.
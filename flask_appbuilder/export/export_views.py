@@ -11,7 +11,7 @@ from typing import List, Dict, Any, Optional
 from datetime import datetime
 from io import BytesIO
 
-from flask import request, jsonify, send_file, flash, redirect, url_for, Response
+from flask import request, jsonify, send_file, flash, redirect, url_for, Response, stream_with_context
 from flask_appbuilder.baseviews import BaseView, expose
 from flask_appbuilder.security.decorators import has_access
 from flask_appbuilder.forms import DynamicForm
@@ -501,32 +501,47 @@ class ExportView(BaseView):
         Returns:
             Tuple of (content_type, filename)
         """
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        base_filename = export_config.get('filename') or f"export_{timestamp}"
-        
-        # Remove extension if already present
-        if '.' in base_filename:
-            base_filename = base_filename.rsplit('.', 1)[0]
-        
-        content_types = {
-            ExportFormat.CSV: 'text/csv',
-            ExportFormat.EXCEL: 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-            ExportFormat.PDF: 'application/pdf',
-            ExportFormat.JSON: 'application/json'
-        }
-        
-        extensions = {
-            ExportFormat.CSV: 'csv',
-            ExportFormat.EXCEL: 'xlsx',
-            ExportFormat.PDF: 'pdf',
-            ExportFormat.JSON: 'json'
-        }
-        
-        content_type = content_types.get(export_format, 'application/octet-stream')
-        extension = extensions.get(export_format, 'bin')
-        filename = f"{base_filename}.{extension}"
+        return get_download_params(export_format, export_config.get('filename'))
+
+
+def get_download_params(export_format: ExportFormat,
+                        base_filename: Optional[str] = None) -> tuple:
+    """
+    Get content type and filename for download.
+    
+    Args:
+        export_format: Export format enum
+        base_filename: Optional filename, generated from a timestamp if empty
         
-        return content_type, filename
+    Returns:
+        Tuple of (content_type, filename)
+    """
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    base_filename = base_filename or f"export_{timestamp}"
+    
+    # Remove extension if already present
+    if '.' in base_filename:
+        base_filename = base_filename.rsplit('.', 1)[0]
+    
+    content_types = {
+        ExportFormat.CSV: 'text/csv',
+        ExportFormat.EXCEL: 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        ExportFormat.PDF: 'application/pdf',
+        ExportFormat.JSON: 'application/json'
+    }
+    
+    extensions = {
+        ExportFormat.CSV: 'csv',
+        ExportFormat.EXCEL: 'xlsx',
+        ExportFormat.PDF: 'pdf',
+        ExportFormat.JSON: 'json'
+    }
+    
+    content_type = content_types.get(export_format, 'application/octet-stream')
+    extension = extensions.get(export_format, 'bin')
+    filename = f"{base_filename}.{extension}"
+    
+    return content_type, filename
 
 
 class DataExportView(BaseView):
@@ -539,32 +554,119 @@ class DataExportView(BaseView):
     
     route_base = '/data-export'
     
+    stream_formats = (ExportFormat.CSV, ExportFormat.EXCEL)
+    """ Formats that can be streamed by export_model """
+    
+    def __init__(self):
+        """Initialize data export view."""
+        super().__init__()
+        self.export_manager = None
+    
+    def _get_export_manager(self) -> ExportManager:
+        """Get or create export manager instance."""
+        if not self.export_manager:
+            self.export_manager = ExportManager(self.appbuilder.app)
+        return self.export_manager
+    
+    def _find_model_view(self, model_name: str):
+        """
+        Find a registered view for a model the current user can list.
+        
+        Args:
+            model_name: Name of the model class
+            
+        Returns:
+            The view instance or None
+        """
+        for view in self.appbuilder.baseviews:
+            datamodel = getattr(view, 'datamodel', None)
+            if (
+                datamodel is not None
+                and getattr(datamodel, 'session', None) is not None
+                and datamodel.obj.__name__ == model_name
+                and self.appbuilder.sm.has_access('can_list', view.class_permission_name)
+            ):
+                return view
+        return None
+    
+    @staticmethod
+    def _get_export_columns(view) -> List[str]:
+        """
+        Get the columns of a model view that may be exported.
+        
+        Only columns the view already shows, its list columns or else its
+        show columns, are exported, limited to plain model columns so
+        relations and computed columns are left out.
+        
+        Args:
+            view: Registered model view
+            
+        Returns:
+            List of column names, empty if the view shows none
+        """
+        model_columns = set(ExportManager._get_model_columns(view.datamodel.obj))
+        shown_columns = getattr(view, 'list_columns', None) or getattr(view, 'show_columns', None) or []
+        return [column for column in shown_columns if column in model_columns]
+    
     @expose('/model/<model_name>')
     @has_access
     def export_model(self, model_name: str):
         """
         Export data from a specific model.
         
+        The export is streamed from a server side cursor, so memory stays
+        bounded regardless of the number of rows. Only models with a
+        registered view the user can list are exported, with that view's
+        columns and base filters.
+        
         Args:
             model_name: Name of the model to export
             
         Returns:
-            Export configuration page for the model
+            Streaming file response
         """
         try:
             # Get export format from query parameters
-            export_format = request.args.get('format', 'csv')
+            export_format = ExportFormat(request.args.get('format', 'csv'))
             max_records = request.args.get('max_records', type=int)
             
-            # In a real implementation, you would:
-            # 1. Get the model class from model_name
-            # 2. Query the data based on filters
-            # 3. Apply permissions checking
-            # 4. Generate the export
+            if export_format not in self.stream_formats:
+                flash(f"{export_format.value.upper()} format can't be streamed", 'error')
+                return redirect(url_for('ExportView.index'))
             
-            flash(f"Model export for '{model_name}' in {export_format.upper()} format would be generated here.", 'info')
-            return redirect(url_for('ExportView.index'))
+            view = self._find_model_view(model_name)
+            if view is None:
+                flash(f"Model '{model_name}' not found", 'error')
+                return redirect(url_for('ExportView.index'))
+            
+            columns = self._get_export_columns(view)
+            if not columns:
+                flash(f"Model '{model_name}' has no exportable columns", 'error')
+                return redirect(url_for('ExportView.index'))
             
+            datamodel = view.datamodel
+            query = datamodel.session.query(datamodel.obj)
+            query = datamodel.apply_filters(query, view._base_filters)
+            if max_records:
+                query = query.limit(max_records)
+            
+            chunks = self._get_export_manager().stream_query(
+                query,
+                export_format,
+                columns=columns,
+                column_labels=getattr(view, 'label_columns', None),
+                metadata={'title': model_name}
+            )
+            content_type, filename = get_download_params(export_format, model_name)
+            return Response(
+                stream_with_context(chunks),
+                mimetype=content_type,
+                headers={'Content-Disposition': f'attachment; filename={filename}'}
+            )
+            
+        except ValueError as e:
+            flash(f"Export failed: {str(e)}", 'error')
+            return redirect(url_for('ExportView.index'))
         except Exception as e:
             log.error(f"Error exporting model {model_name}: {e}")
             flash(f"Export failed: {str(e)}", 'error')
@@ -70,18 +70,18 @@ except ImportError:
             self.datamodel = datamodel
     __all__.extend(['DynamicForm', 'GeneralModelConverter'])
 
-# Import wizard forms
-try:
-    from .wizard import WizardForm, WizardStep, WizardFormData, WizardFormPersistence
-    
-    wizard_exports = [
-        'WizardForm',
-        'WizardStep', 
-        'WizardFormData',
-        'WizardFormPersistence'
-    ]
-    
-    __all__.extend(wizard_exports)
-    
-except ImportError:
-    pass  # Continue without wizard forms if not available
+# Wizard forms are imported on first access, if available
+from ..utils.lazy import lazy_exports
+
+wizard_exports = [
+    'WizardForm',
+    'WizardStep', 
+    'WizardFormData',
+    'WizardFormPersistence'
+]
+
+_LAZY_IMPORTS = {name: '.wizard' for name in wizard_exports}
+
+__getattr__, __dir__ = lazy_exports(
+    __name__, globals(), _LAZY_IMPORTS, exports=globals().pop('__all__')
+)
@@ -0,0 +1,35 @@
+"""
+Migration for persistent parallel join tokens
+
+This migration adds the join state of parallel gateways to process instances:
+- ab_process_instances.join_tokens: Branch arrivals at parallel joins, keyed by
+  join node id, with the number of branches activated at the fork
+
+Join state used to live in the memory of the engine, so a join waited forever
+after the engine was restarted or the instance was resumed elsewhere.
+"""
+
+from alembic import op
+from sqlalchemy import Column
+from sqlalchemy.dialects.postgresql import JSONB
+
+
+def upgrade():
+    """Add the join tokens column."""
+
+    op.add_column(
+        'ab_process_instances',
+        Column('join_tokens', JSONB, nullable=True)
+    )
+
+
+def downgrade():
+    """Drop the join tokens column."""
+    op.drop_column('ab_process_instances', 'join_tokens')
+
+
+if __name__ == "__main__":
+    print("Process Join Tokens Migration")
+    print("=" * 50)
+    print("This migration adds:")
+    print("- ab_process_instances.join_tokens: Persistent parallel join state")
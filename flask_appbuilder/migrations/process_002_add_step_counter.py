@@ -0,0 +1,41 @@
+"""
+Migration for the process instance step counter
+
+This migration adds the step counter used for step execution order:
+- ab_process_instances.step_counter: Number of steps created for the instance
+
+Existing instances are backfilled with the highest execution_order of their
+steps, so new steps continue the order instead of starting again at 1.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import Column, Integer
+
+
+def upgrade():
+    """Add and backfill the step counter column."""
+
+    op.add_column(
+        'ab_process_instances',
+        Column('step_counter', Integer, nullable=False, server_default='0')
+    )
+
+    op.execute(sa.text(
+        "UPDATE ab_process_instances SET step_counter = COALESCE(("
+        "SELECT MAX(ab_process_steps.execution_order) FROM ab_process_steps "
+        "WHERE ab_process_steps.process_instance_id = ab_process_instances.id"
+        "), 0)"
+    ))
+
+
+def downgrade():
+    """Drop the step counter column."""
+    op.drop_column('ab_process_instances', 'step_counter')
+
+
+if __name__ == "__main__":
+    print("Process Step Counter Migration")
+    print("=" * 50)
+    print("This migration adds:")
+    print("- ab_process_instances.step_counter: Step execution order counter")
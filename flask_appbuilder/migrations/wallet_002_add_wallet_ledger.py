@@ -0,0 +1,58 @@
+"""
+Migration for the Wallet Ledger
+
+This migration adds the running-balance ledger to the wallet system:
+- ab_wallet_transactions.balance_after: Wallet balance after each transaction
+- ab_user_wallets.ledger_initialized: Whether the wallet ledger has been built
+- ab_wallet_daily_balances: Daily income/expense totals and closing balances
+
+Existing wallets are left with ledger_initialized = false and keep using the
+transaction scans until UserWallet.rebuild_ledger() is run for them.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import Column, Integer, Date, Boolean, Numeric, ForeignKey
+
+
+def upgrade():
+    """Add wallet ledger columns and table."""
+
+    op.add_column(
+        'ab_wallet_transactions',
+        Column('balance_after', Numeric(precision=15, scale=2), nullable=True)
+    )
+    op.add_column(
+        'ab_user_wallets',
+        Column('ledger_initialized', Boolean, nullable=False, server_default=sa.false())
+    )
+
+    # Create ab_wallet_daily_balances table
+    op.create_table(
+        'ab_wallet_daily_balances',
+        Column('id', Integer, primary_key=True),
+        Column('wallet_id', Integer, ForeignKey('ab_user_wallets.id'), nullable=False),
+        Column('day', Date, nullable=False),
+        Column('income_total', Numeric(precision=15, scale=2), nullable=False, default=0.00),
+        Column('expense_total', Numeric(precision=15, scale=2), nullable=False, default=0.00),
+        Column('transaction_count', Integer, nullable=False, default=0),
+        Column('net_change', Numeric(precision=15, scale=2), nullable=False, default=0.00),
+        Column('closing_balance', Numeric(precision=15, scale=2), nullable=False, default=0.00),
+        sa.UniqueConstraint('wallet_id', 'day', name='uq_wallet_daily_balance_day')
+    )
+
+
+def downgrade():
+    """Drop wallet ledger columns and table."""
+    op.drop_table('ab_wallet_daily_balances')
+    op.drop_column('ab_user_wallets', 'ledger_initialized')
+    op.drop_column('ab_wallet_transactions', 'balance_after')
+
+
+if __name__ == "__main__":
+    print("Wallet Ledger Migration")
+    print("=" * 50)
+    print("This migration adds:")
+    print("- ab_wallet_transactions.balance_after: Running balance per transaction")
+    print("- ab_user_wallets.ledger_initialized: Ledger backfill flag")
+    print("- ab_wallet_daily_balances: Daily wallet totals and closing balances")
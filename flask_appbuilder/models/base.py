@@ -177,6 +177,22 @@ class BaseInterface:
     ):
         pass
 
+    def query_group_aggregate(
+        self, group_by, aggregations, filters=None, period=None
+    ):
+        """
+        Returns rows grouped and aggregated by the backend, or None when
+        the backend can't aggregate the given columns and functions
+        """
+        return None
+
+    def query_direct(self, columns, filters=None, order_column="", order_direction=""):
+        """
+        Returns rows with just the given columns, or None when the
+        backend can't select them directly
+        """
+        return None
+
     def is_image(self, col_name):
         return False
 
@@ -1,20 +1,38 @@
 # -*- coding: utf-8 -*-
+import base64
+import binascii
 from contextlib import suppress
+import datetime
+from decimal import Decimal
+import json
 import logging
-from typing import Any, Dict, List, Optional, Tuple, Type, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union
+import uuid
 
 from flask_appbuilder._compat import as_unicode
 from flask_appbuilder.const import (
+    API_COUNT_MODE_ESTIMATE,
+    API_COUNT_MODE_NONE,
     LOGMSG_ERR_DBI_DEL_GENERIC,
     LOGMSG_WAR_DBI_ADD_INTEGRITY,
     LOGMSG_WAR_DBI_DEL_INTEGRITY,
     LOGMSG_WAR_DBI_EDIT_INTEGRITY,
 )
-from flask_appbuilder.exceptions import InterfaceQueryWithoutSession
+from flask_appbuilder.exceptions import (
+    InterfaceQueryWithoutSession,
+    InvalidCursorFABException,
+)
 from flask_appbuilder.filemanager import FileManager, ImageManager
 from flask_appbuilder.models.base import BaseInterface
 from flask_appbuilder.models.filters import Filters
-from flask_appbuilder.models.group import GroupByCol, GroupByDateMonth, GroupByDateYear
+from flask_appbuilder.models.group import (
+    aggregate_avg,
+    aggregate_count,
+    aggregate_sum,
+    GroupByCol,
+    GroupByDateMonth,
+    GroupByDateYear,
+)
 from flask_appbuilder.models.mixins import FileColumn, ImageColumn
 from flask_appbuilder.models.sqla import filters, Model
 from flask_appbuilder.utils.base import (
@@ -22,9 +40,10 @@ from flask_appbuilder.utils.base import (
     get_column_root_relation,
     is_column_dotted,
 )
-from sqlalchemy import asc, desc
+from sqlalchemy import and_, asc, cast, desc, extract, func, Integer, or_
 from sqlalchemy import types as sa_types
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.orm import aliased, class_mapper, ColumnProperty, contains_eager, Load
 from sqlalchemy.orm.descriptor_props import SynonymProperty
 from sqlalchemy.orm.properties import RelationshipProperty
@@ -47,6 +66,33 @@ def _is_sqla_type(model: Model, sa_type: Type[TypeEngine]) -> bool:
     )
 
 
+def _encode_cursor_value(value: Any) -> List[Any]:
+    if isinstance(value, datetime.datetime):
+        return ["dt", value.isoformat()]
+    if isinstance(value, datetime.date):
+        return ["d", value.isoformat()]
+    if isinstance(value, Decimal):
+        return ["dec", str(value)]
+    if isinstance(value, uuid.UUID):
+        return ["uuid", str(value)]
+    return ["v", value]
+
+
+def _decode_cursor_value(value: List[Any]) -> Any:
+    tag, raw = value
+    if tag == "dt":
+        return datetime.datetime.fromisoformat(raw)
+    if tag == "d":
+        return datetime.date.fromisoformat(raw)
+    if tag == "dec":
+        return Decimal(raw)
+    if tag == "uuid":
+        return uuid.UUID(raw)
+    if tag == "v":
+        return raw
+    raise ValueError(f"Unknown cursor value type {tag}")
+
+
 class SQLAInterface(BaseInterface):
     """
     SQLAModel
@@ -220,6 +266,143 @@ class SQLAInterface(BaseInterface):
             query = query.limit(page_size)
         return query
 
+    def _get_keyset_order_column(self, order_column: str) -> str:
+        """
+        Resolves the model column used to seek on for keyset pagination,
+        only plain (non dotted) columns of the model are supported
+        """
+        if not order_column:
+            return ""
+        if hasattr(self.obj, order_column):
+            if hasattr(getattr(self.obj, order_column), "_col_name"):
+                order_column = getattr(self._get_attr(order_column), "_col_name")
+        if is_column_dotted(order_column) or order_column not in self.list_columns:
+            raise InvalidCursorFABException(
+                f"Keyset pagination is not supported when ordering by {order_column}"
+            )
+        return order_column
+
+    def encode_cursor(
+        self, item: Model, order_column: str = "", order_direction: str = ""
+    ) -> Optional[str]:
+        """
+        Returns an opaque keyset pagination cursor that points right after
+        ``item``, for the given order. Returns None when the model has a
+        composite primary key. NULL order values are encoded too, the seek
+        predicate knows where the database sorts them.
+
+        :param item: The last item of the current page
+        :param order_column: name of the column to order
+        :param order_direction: the direction to order <'asc'|'desc'>
+        """
+        pk_name = self.get_pk_name()
+        if not pk_name or not isinstance(pk_name, str):
+            return None
+        order_column = self._get_keyset_order_column(order_column)
+        values = [getattr(item, pk_name)]
+        if order_column and order_column != pk_name:
+            values.insert(0, getattr(item, order_column))
+        payload = {
+            "c": order_column,
+            "d": order_direction,
+            "v": [_encode_cursor_value(value) for value in values],
+        }
+        return base64.urlsafe_b64encode(
+            json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        ).decode("ascii")
+
+    def decode_cursor(
+        self, cursor: str, order_column: str = "", order_direction: str = ""
+    ) -> List[Any]:
+        """
+        Decodes a cursor generated by `encode_cursor`, checks that it was
+        issued for the same order and returns the seek values
+        (order column value, pk value) or just (pk value,)
+        """
+        order_column = self._get_keyset_order_column(order_column)
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+            values = [_decode_cursor_value(value) for value in payload["v"]]
+            cursor_column, cursor_direction = payload["c"], payload["d"]
+        except (binascii.Error, UnicodeError, TypeError, KeyError, ValueError):
+            raise InvalidCursorFABException("Invalid pagination cursor")
+        if cursor_column != order_column or cursor_direction != order_direction:
+            raise InvalidCursorFABException(
+                "Pagination cursor does not match the requested order"
+            )
+        expected = 2 if order_column and order_column != self.get_pk_name() else 1
+        if len(values) != expected:
+            raise InvalidCursorFABException("Invalid pagination cursor")
+        return values
+
+    def apply_keyset(
+        self,
+        query: Query,
+        order_column: str,
+        order_direction: str,
+        after: str,
+    ) -> Query:
+        """
+        Applies a keyset (seek) predicate so that only rows after the cursor
+        are returned. An empty cursor selects the first page. Ordering must be
+        applied by `apply_order_by` with the primary key as a tie breaker.
+
+        :param query: The query to apply the seek predicate
+        :param order_column: name of the column to order
+        :param order_direction: the direction to order <'asc'|'desc'>
+        :param after: cursor generated by `encode_cursor` or an empty string
+        """
+        pk = self.get_pk()
+        if pk is None:
+            raise InvalidCursorFABException(
+                "Keyset pagination is not supported on composite primary keys"
+            )
+        keyset_column = self._get_keyset_order_column(order_column)
+        if not after:
+            return query
+        values = self.decode_cursor(after, order_column, order_direction)
+        if not keyset_column:
+            return query.filter(pk > values[0])
+        # apply_order_by treats any direction other then asc as desc
+        descending = order_direction != "asc"
+        column = getattr(self.obj, keyset_column)
+        if len(values) == 1:
+            return query.filter(pk < values[0] if descending else pk > values[0])
+        order_value, pk_value = values
+        after_pk = pk < pk_value if descending else pk > pk_value
+        if not self.is_nullable(keyset_column):
+            after_value = column < order_value if descending else column > order_value
+            return query.filter(
+                or_(after_value, and_(column == order_value, after_pk))
+            )
+        return query.filter(
+            self._get_nullable_keyset_predicate(
+                column, order_value, after_pk, descending
+            )
+        )
+
+    def _get_nullable_keyset_predicate(
+        self, column: Any, order_value: Any, after_pk: Any, descending: bool
+    ) -> Any:
+        """
+        Seek predicate for a nullable order column. Comparisons never match
+        NULL, so rows with a NULL order value are selected explicitly, on
+        the side of the non NULL values where the database sorts them
+        """
+        # PostgreSQL and Oracle sort NULL as the largest value, others as the smallest
+        nulls_high = self.session.bind.dialect.name in ("postgresql", "oracle")
+        nulls_last = nulls_high != descending
+        if order_value is None:
+            after_nulls = and_(column.is_(None), after_pk)
+            if nulls_last:
+                return after_nulls
+            return or_(after_nulls, column.isnot(None))
+        after_value = column < order_value if descending else column > order_value
+        predicate = or_(after_value, and_(column == order_value, after_pk))
+        if nulls_last:
+            return or_(predicate, column.is_(None))
+        return predicate
+
     def apply_filters(self, query: Query, filters: Optional[Filters]) -> Query:
         if filters:
             return filters.apply_all(query)
@@ -382,10 +565,17 @@ class SQLAInterface(BaseInterface):
         page_size: Optional[int] = None,
         select_columns: Optional[List[str]] = None,
         aliases_mapping: Dict[str, AliasedClass] = None,
+        after: Optional[str] = None,
     ) -> Query:
         inner_filters = self.get_inner_filters(filters)
         query = self.apply_inner_select_joins(query, select_columns, aliases_mapping)
         query = self.apply_filters(query, inner_filters)
+        if after is not None:
+            query = self.apply_keyset(query, order_column, order_direction, after)
+            # The seek predicate replaces the offset
+            page = None
+            if not order_column:
+                query = query.order_by(self.get_pk())
         query = self.apply_engine_specific_hack(query, page, page_size, order_column)
         query = self.apply_order_by(
             query,
@@ -407,6 +597,39 @@ class SQLAInterface(BaseInterface):
             query, filters, select_columns=select_columns, aliases_mapping={}
         ).count()
 
+    def query_count_estimate(
+        self,
+        query: Query,
+        filters: Optional[Filters] = None,
+        select_columns: Optional[List[str]] = None,
+    ) -> int:
+        """
+        Returns the query planner row estimate for the filtered query instead
+        of running a full count. Only PostgreSQL is supported, other dialects
+        fall back to `query_count`
+        """
+        count_query = self._apply_inner_all(
+            query, filters, select_columns=select_columns, aliases_mapping={}
+        )
+        dialect = self.session.bind.dialect
+        if dialect.name == "postgresql":
+            compiled = count_query.statement.compile(dialect=dialect)
+            try:
+                with self.session.begin_nested():
+                    plan = (
+                        self.session.connection()
+                        .exec_driver_sql(
+                            f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+                        )
+                        .scalar()
+                    )
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                return int(plan[0]["Plan"]["Plan Rows"])
+            except (SQLAlchemyError, LookupError, TypeError, ValueError) as e:
+                log.warning("Could not estimate query count: %s", e)
+        return count_query.count()
+
     def apply_all(
         self,
         query: Query,
@@ -417,6 +640,7 @@ class SQLAInterface(BaseInterface):
         page_size: Optional[int] = None,
         select_columns: Optional[List[str]] = None,
         outer_default_load: bool = False,
+        after: Optional[str] = None,
     ) -> Query:
         """
         Accepts a SQLAlchemy Query and applies all filtering logic, order by and
@@ -440,6 +664,9 @@ class SQLAInterface(BaseInterface):
             the load of the many-to-many relationships at the model level.
             we will apply:
              https://docs.sqlalchemy.org/en/14/orm/loading_relationships.html#sqlalchemy.orm.Load.defaultload
+        :param after: Keyset pagination cursor, when set (an empty string
+            selects the first page) rows are seeked after the cursor
+            instead of using an offset, and `page` is ignored
         :return: A SQLAlchemy Query with all the applied logic
         """
         aliases_mapping = {}
@@ -452,6 +679,7 @@ class SQLAInterface(BaseInterface):
             page_size,
             select_columns,
             aliases_mapping=aliases_mapping,
+            after=after,
         )
         # Only use a from_self if we need to select a join one to many or many to many
         if select_columns and self.exists_col_to_many(select_columns):
@@ -463,6 +691,8 @@ class SQLAInterface(BaseInterface):
                 select_columns,
                 outer_default_load=outer_default_load,
             )
+            if after is not None and not order_column:
+                outer_query = outer_query.order_by(self.get_pk())
             return self.apply_order_by(outer_query, order_column, order_direction)
         else:
             return inner_query
@@ -476,7 +706,9 @@ class SQLAInterface(BaseInterface):
         page_size: Optional[int] = None,
         select_columns: Optional[List[str]] = None,
         outer_default_load: bool = False,
-    ) -> Tuple[int, List[Model]]:
+        after: Optional[str] = None,
+        count_mode: Optional[str] = None,
+    ) -> Tuple[Optional[int], List[Model]]:
         """
         Returns the results for a model query, applies filters, sorting and pagination
 
@@ -492,13 +724,21 @@ class SQLAInterface(BaseInterface):
             the load of the many-to-many relationships at the model level.
             we will apply:
              https://docs.sqlalchemy.org/en/14/orm/loading_relationships.html#sqlalchemy.orm.Load.defaultload
+        :param after: Keyset pagination cursor, see `apply_all`
+        :param count_mode: <'exact'|'estimate'|'none'> how to compute the
+            count, defaults to exact. 'none' skips the count and returns None
         :return: A tuple with the query count (non paginated) and the results
         """
         if not self.session:
             raise InterfaceQueryWithoutSession()
         query = self.session.query(self.obj)
 
-        count = self.query_count(query, filters, select_columns)
+        if count_mode == API_COUNT_MODE_NONE:
+            count = None
+        elif count_mode == API_COUNT_MODE_ESTIMATE:
+            count = self.query_count_estimate(query, filters, select_columns)
+        else:
+            count = self.query_count(query, filters, select_columns)
         query = self.apply_all(
             query,
             filters,
@@ -507,6 +747,8 @@ class SQLAInterface(BaseInterface):
             page,
             page_size,
             select_columns,
+            outer_default_load=outer_default_load,
+            after=after,
         )
         query_results = query.all()
 
@@ -518,9 +760,180 @@ class SQLAInterface(BaseInterface):
                 return count, query_results
         return count, result
 
+    def query_rows(
+        self,
+        columns: List[str],
+        filters: Optional[Filters] = None,
+        order_column: str = "",
+        order_direction: str = "",
+        page: Optional[int] = None,
+        page_size: Optional[int] = None,
+        after: Optional[str] = None,
+        count_mode: Optional[str] = None,
+    ) -> Optional[Tuple[Optional[int], List[Row]]]:
+        """
+        Like `query` but selects only the given plain columns, returning rows
+        instead of model instances. The rows start with the requested columns,
+        in order, followed by the primary key and order column if they were
+        not requested, all accessible by name. Returns None if any of the
+        columns or the order column is not a plain model column
+
+        :param columns: A List of plain column names to select
+        :param filters: A Filter class that contains all filters to apply
+        :param order_column: name of the column to order
+        :param order_direction: the direction to order <'asc'|'desc'>
+        :param page: the current page
+        :param page_size: the current page size
+        :param after: Keyset pagination cursor, see `apply_all`
+        :param count_mode: <'exact'|'estimate'|'none'> see `query`
+        :return: A tuple with the query count (non paginated) and the rows
+        """
+        if not self.session:
+            raise InterfaceQueryWithoutSession()
+        pk_name = self.get_pk_name()
+        pk_names = pk_name if isinstance(pk_name, list) else [pk_name]
+        select_names = list(columns)
+        for name in pk_names + ([order_column] if order_column else []):
+            if name not in select_names:
+                select_names.append(name)
+        if not all(self._is_plain_column(name) for name in select_names):
+            return None
+        query = self.session.query(self.obj)
+
+        if count_mode == API_COUNT_MODE_NONE:
+            count = None
+        elif count_mode == API_COUNT_MODE_ESTIMATE:
+            count = self.query_count_estimate(query, filters)
+        else:
+            count = self.query_count(query, filters)
+        query = self.apply_all(
+            query, filters, order_column, order_direction, page, page_size, after=after
+        )
+        query = query.with_entities(
+            *[getattr(self.obj, name).label(name) for name in select_names]
+        )
+        return count, query.all()
+
+    def _is_plain_column(self, col_name: str) -> bool:
+        return col_name in self.list_columns and not self.is_relation(col_name)
+
+    def _get_sql_aggregate(
+        self, aggregate_func: Callable[..., Any], col_name: str
+    ) -> Optional[Any]:
+        """
+        Translates a chart aggregate function to its SQL counterpart,
+        returns None if it's a custom aggregate function
+        """
+        if aggregate_func is aggregate_count:
+            return func.count()
+        if not self._is_plain_column(col_name):
+            return None
+        if aggregate_func is aggregate_sum:
+            return func.sum(getattr(self.obj, col_name))
+        if aggregate_func is aggregate_avg:
+            return func.avg(getattr(self.obj, col_name))
+        return None
+
+    def _get_group_by_columns(self, group_by: str, period: Optional[str]) -> List[Any]:
+        column = getattr(self.obj, group_by)
+        if period == "year":
+            return [cast(extract("year", column), Integer)]
+        if period == "month":
+            return [
+                cast(extract("year", column), Integer),
+                cast(extract("month", column), Integer),
+            ]
+        return [column]
+
+    def query_group_aggregate(
+        self,
+        group_by: str,
+        aggregations: List[Tuple[Callable[..., Any], str]],
+        filters: Optional[Filters] = None,
+        period: Optional[str] = None,
+    ) -> Optional[List[List[Any]]]:
+        """
+        Groups and aggregates on the database using GROUP BY, instead of
+        loading every model instance. Returns a list of
+        [group value, aggregate, ...] sorted by group, month periods group
+        by a (year, month) tuple. Returns None if the group column or any of the
+        aggregations are not plain model columns or known aggregate functions
+
+        :param group_by: The column name to group by
+        :param aggregations: A list of tuples (<AGGR FUNC>, <COLNAME>)
+        :param filters: dict with filters {<col_name>:<value,...}
+        :param period: Optional date period to group by <'month'|'year'>
+        """
+        if not self._is_plain_column(group_by):
+            return None
+        aggregates = []
+        for aggregation in aggregations:
+            aggregate = self._get_sql_aggregate(aggregation[0], aggregation[1])
+            if aggregate is None:
+                return None
+            aggregates.append(aggregate)
+        group_columns = self._get_group_by_columns(group_by, period)
+        query = self.session.query(*group_columns, *aggregates).select_from(self.obj)
+        query = self._get_base_query(query=query, filters=filters)
+        query = query.group_by(*group_columns).order_by(*group_columns)
+        result = []
+        for row in query.all():
+            if period == "month":
+                if row[0] is None:
+                    continue
+                grouped = (row[0], row[1])
+            else:
+                grouped = row[0]
+            values = list(row[len(group_columns) :])
+            for i, aggregation in enumerate(aggregations):
+                # Keep the same types as the python aggregation
+                if aggregation[0] is aggregate_avg:
+                    values[i] = float(values[i] or 0.0)
+                elif aggregation[0] is aggregate_sum and values[i] is None:
+                    values[i] = 0
+            result.append([grouped] + values)
+        return result
+
+    def query_direct(
+        self,
+        columns: List[str],
+        filters: Optional[Filters] = None,
+        order_column: str = "",
+        order_direction: str = "",
+    ) -> Optional[List[Any]]:
+        """
+        Selects just the given columns, rows can be accessed by column name
+        like a model instance. Returns None if any column is not a plain
+        model column
+
+        :param columns: A list of column names
+        :param filters: dict with filters {<col_name>:<value,...}
+        :param order_column: name of the column to order
+        :param order_direction: the direction to order <'asc'|'desc'>
+        """
+        for col_name in columns:
+            # Row attributes like count or index would shadow the column
+            if not self._is_plain_column(col_name) or hasattr(Row, col_name):
+                return None
+        query = self.session.query(
+            *[getattr(self.obj, col_name) for col_name in columns]
+        ).select_from(self.obj)
+        query = self._get_base_query(
+            query=query,
+            filters=filters,
+            order_column=order_column,
+            order_direction=order_direction,
+        )
+        return query.all()
+
     def query_simple_group(
         self, group_by="", aggregate_func=None, aggregate_col=None, filters=None
     ):
+        result = self.query_group_aggregate(
+            group_by, [(aggregate_count, "")], filters=filters
+        )
+        if result is not None:
+            return result
         query = self.session.query(self.obj)
         query = self._get_base_query(query=query, filters=filters)
         query_result = query.all()
@@ -528,13 +941,23 @@ class SQLAInterface(BaseInterface):
         return group.apply(query_result)
 
     def query_month_group(self, group_by="", filters=None):
+        group = GroupByDateMonth(group_by, "Group by Month")
+        result = self.query_group_aggregate(
+            group_by, [(aggregate_count, "")], filters=filters, period="month"
+        )
+        if result is not None:
+            return [[group.get_format_group_col(row[0])] + row[1:] for row in result]
         query = self.session.query(self.obj)
         query = self._get_base_query(query=query, filters=filters)
         query_result = query.all()
-        group = GroupByDateMonth(group_by, "Group by Month")
         return group.apply(query_result)
 
     def query_year_group(self, group_by="", filters=None):
+        result = self.query_group_aggregate(
+            group_by, [(aggregate_count, "")], filters=filters, period="year"
+        )
+        if result is not None:
+            return result
         query = self.session.query(self.obj)
         query = self._get_base_query(query=query, filters=filters)
         query_result = query.all()
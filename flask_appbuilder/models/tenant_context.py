@@ -5,13 +5,19 @@ Handles tenant identification, context management, and request-scoped
 tenant isolation for Flask-AppBuilder multi-tenant applications.
 """
 
+import copy
 import logging
+import threading
+import time
 from functools import wraps
-from typing import Optional, Callable, Any
+from typing import Optional, Callable, Any, Dict, Set, Tuple
 from urllib.parse import urlparse
 from contextlib import contextmanager
 
 from flask import g, request, jsonify, current_app
+from sqlalchemy import event, inspect as sa_inspect
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
 from werkzeug.exceptions import BadRequest, Forbidden, NotFound
 
 log = logging.getLogger(__name__)
@@ -53,6 +59,101 @@ def tenant_operation_boundary(operation_name: str):
         raise TenantOperationError(f"Operation '{operation_name}' failed: {str(e)}", e)
 
 
+class TenantResolutionCache:
+    """
+    In-process host to tenant cache for request tenant resolution.
+    
+    Stores column snapshots of resolved tenants keyed by host, with a TTL,
+    and negative entries for hosts that don't resolve to a tenant. Snapshots
+    are merged into the request session without a database round trip.
+    A tenant id to hosts index allows invalidation per tenant.
+    """
+    
+    def __init__(self, ttl: int = 300, negative_ttl: int = 60, maxsize: int = 10000):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[str, Tuple[Optional[Dict[str, Any]], float]] = {}
+        self._hosts_by_tenant_id: Dict[int, Set[str]] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, host: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """
+        Get a cached entry for host.
+        
+        Returns a tuple (found, snapshot), snapshot is None for
+        negatively cached hosts.
+        """
+        with self._lock:
+            entry = self._entries.get(host)
+            if entry is not None and entry[1] > time.monotonic():
+                self.hits += 1
+                return True, entry[0]
+            if entry is not None:
+                self._remove(host)
+            self.misses += 1
+            return False, None
+    
+    def set(self, host: str, snapshot: Optional[Dict[str, Any]]):
+        """Cache a tenant snapshot for host, None caches a negative entry"""
+        ttl = self.ttl if snapshot is not None else self.negative_ttl
+        with self._lock:
+            if host not in self._entries and len(self._entries) >= self.maxsize:
+                self._evict()
+            self._remove(host)
+            self._entries[host] = (snapshot, time.monotonic() + ttl)
+            if snapshot is not None:
+                self._hosts_by_tenant_id.setdefault(snapshot['id'], set()).add(host)
+    
+    def invalidate_tenant(self, tenant_id: int):
+        """
+        Drop the hosts resolved to a tenant, and all negative entries since
+        the tenant's slug or domain may now match them
+        """
+        with self._lock:
+            for host in list(self._hosts_by_tenant_id.get(tenant_id, ())):
+                self._remove(host)
+            for host in [host for host, entry in self._entries.items() if entry[0] is None]:
+                self._remove(host)
+    
+    def clear(self):
+        """Drop all entries"""
+        with self._lock:
+            self._entries.clear()
+            self._hosts_by_tenant_id.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache hit/miss counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'size': len(self._entries),
+            }
+    
+    def _remove(self, host: str):
+        entry = self._entries.pop(host, None)
+        if entry is not None and entry[0] is not None:
+            hosts = self._hosts_by_tenant_id.get(entry[0]['id'])
+            if hosts is not None:
+                hosts.discard(host)
+                if not hosts:
+                    del self._hosts_by_tenant_id[entry[0]['id']]
+    
+    def _evict(self):
+        now = time.monotonic()
+        expired = [host for host, entry in self._entries.items() if entry[1] <= now]
+        for host in expired:
+            self._remove(host)
+        # Entries are kept in insertion order, drop the oldest
+        if len(self._entries) >= self.maxsize:
+            self._remove(next(iter(self._entries)))
+
+
 class TenantContext:
     """
     Manages current tenant context for requests.
@@ -64,6 +165,7 @@ class TenantContext:
     def __init__(self):
         self._tenant_cache = {}
         self._context_stack = []
+        self.resolution_cache = TenantResolutionCache()
     
     def get_current_tenant(self):
         """Get current tenant from request context"""
@@ -115,6 +217,16 @@ class TenantContext:
         if self._is_development_host(host):
             return self._resolve_tenant_from_dev_context()
         
+        found, snapshot = self.resolution_cache.get(host)
+        if found:
+            return self._tenant_from_snapshot(snapshot) if snapshot else None
+        
+        tenant = self._resolve_tenant_from_host(host)
+        self.resolution_cache.set(host, self._tenant_snapshot(tenant) if tenant else None)
+        return tenant
+    
+    def _resolve_tenant_from_host(self, host: str):
+        """Resolve tenant from host querying the database"""
         # Check for custom domain first
         tenant = self._get_tenant_by_custom_domain(host)
         if tenant:
@@ -130,6 +242,29 @@ class TenantContext:
         log.warning(f"Could not resolve tenant from host: {host}")
         return None
     
+    def _tenant_snapshot(self, tenant) -> Dict[str, Any]:
+        """Copy the loaded column values of a tenant"""
+        return {
+            attr.key: getattr(tenant, attr.key)
+            for attr in sa_inspect(tenant).mapper.column_attrs
+        }
+    
+    def _tenant_from_snapshot(self, snapshot: Dict[str, Any]):
+        """
+        Build a tenant from a snapshot and merge it into the current
+        session without loading it from the database
+        """
+        from .tenant_models import Tenant
+        
+        tenant = sa_inspect(Tenant).class_manager.new_instance()
+        for key, value in snapshot.items():
+            # Don't share mutable JSON values between requests
+            if isinstance(value, (dict, list)):
+                value = copy.deepcopy(value)
+            set_committed_value(tenant, key, value)
+        make_transient_to_detached(tenant)
+        return Tenant.query.session.merge(tenant, load=False)
+    
     def _is_development_host(self, host: str) -> bool:
         """Check if host is a development environment"""
         dev_hosts = ['localhost', '127.0.0.1', '0.0.0.0']
@@ -395,6 +530,11 @@ def create_tenant_aware_query(model_class):
     return TenantAwareQuery(model_class)
 
 
+def _invalidate_tenant_resolution(mapper, connection, target):
+    """SQLAlchemy event handler to drop cached host resolutions of a tenant"""
+    tenant_context.resolution_cache.invalidate_tenant(target.id)
+
+
 class TenantMiddleware:
     """
     Flask middleware for tenant context management.
@@ -410,9 +550,20 @@ class TenantMiddleware:
     
     def init_app(self, app):
         """Initialize middleware with Flask app"""
+        from .tenant_models import Tenant
+        
         app.before_request(self.before_request)
         app.teardown_request(self.teardown_request)
         
+        cache = tenant_context.resolution_cache
+        cache.ttl = app.config.get('TENANT_RESOLUTION_CACHE_TTL', cache.ttl)
+        cache.negative_ttl = app.config.get(
+            'TENANT_RESOLUTION_CACHE_NEGATIVE_TTL', cache.negative_ttl
+        )
+        for event_name in ('after_insert', 'after_update', 'after_delete'):
+            if not event.contains(Tenant, event_name, _invalidate_tenant_resolution):
+                event.listen(Tenant, event_name, _invalidate_tenant_resolution)
+        
         # Store reference in app extensions
         if not hasattr(app, 'extensions'):
             app.extensions = {}
@@ -13,28 +13,24 @@ This module provides comprehensive business process automation capabilities incl
 __version__ = "1.0.0"
 __author__ = "Flask-AppBuilder Process Engine"
 
-from .engine.process_engine import ProcessEngine
-from .engine.process_service import ProcessService, get_process_service
-from .manager import ProcessManager, get_process_manager
-from .models.process_models import (
-    ProcessDefinition,
-    ProcessInstance,
-    ProcessStep,
-    ProcessLog,
-    ApprovalRequest,
-    SmartTrigger
-)
+from ..utils.lazy import lazy_exports
 
-__all__ = [
-    'ProcessEngine',
-    'ProcessService', 
-    'ProcessManager',
-    'get_process_service',
-    'get_process_manager',
-    'ProcessDefinition',
-    'ProcessInstance', 
-    'ProcessStep',
-    'ProcessLog',
-    'ApprovalRequest',
-    'SmartTrigger'
-]
\ No newline at end of file
+# Components are imported on first access, importing one submodule of the
+# package shouldn't load the whole engine, models and ML stack
+_LAZY_IMPORTS = {
+    'ProcessEngine': '.engine.process_engine',
+    'ProcessService': '.engine.process_service',
+    'ProcessManager': '.manager',
+    'get_process_service': '.engine.process_service',
+    'get_process_manager': '.manager',
+    'ProcessDefinition': '.models.process_models',
+    'ProcessInstance': '.models.process_models',
+    'ProcessStep': '.models.process_models',
+    'ProcessLog': '.models.process_models',
+    'ApprovalRequest': '.models.process_models',
+    'SmartTrigger': '.models.process_models',
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, globals(), _LAZY_IMPORTS)
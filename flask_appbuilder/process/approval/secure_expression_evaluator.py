@@ -26,6 +26,7 @@ from flask import current_app
 from flask_appbuilder import db
 
 from ..models.process_models import ProcessInstance
+from ..engine.expression_compiler import get_expression_cache
 from ...security.sqla.models import User
 from .crypto_config import SecureCryptoConfig
 from .audit_logger import ApprovalAuditLogger
@@ -119,7 +120,7 @@ class SecureExpressionEvaluator:
 
     def __init__(self, audit_logger: Optional[ApprovalAuditLogger] = None, config: Optional[Dict] = None):
         self.audit_logger = audit_logger or ApprovalAuditLogger()
-        self._expression_cache = {}  # Cache for validated expressions
+        self._expression_cache = get_expression_cache()  # Shared LRU of validated expressions
         
         # PERFORMANCE OPTIMIZATION: Add caching for frequently accessed data
         self._department_head_cache = {}  # Cache for department head lookups
@@ -225,16 +226,36 @@ class SecureExpressionEvaluator:
         """
         Validate expression format for basic security.
 
+        The outcome is cached per expression text in the shared expression
+        cache, so the pattern checks run once per distinct expression.
+
         Args:
             expression: Expression to validate
 
         Raises:
             SecurityViolation: If expression format is invalid
         """
-        # Check length
+        # Check length before caching so oversized input never becomes a key
         if len(expression) > 100:
             raise SecurityViolation("Expression too long")
 
+        violation = self._expression_cache.get_or_set(
+            ('approver_expression', expression),
+            lambda: self._check_expression_format(expression)
+        )
+        if violation is not None:
+            raise SecurityViolation(violation)
+
+    def _check_expression_format(self, expression: str) -> Optional[str]:
+        """
+        Run the expression format checks.
+
+        Args:
+            expression: Expression to check
+
+        Returns:
+            str: Violation message, or None if the format is valid
+        """
         # Check for dangerous patterns
         dangerous_patterns = [
             r';',  # SQL statement separator
@@ -255,11 +276,12 @@ class SecureExpressionEvaluator:
 
         for pattern in dangerous_patterns:
             if re.search(pattern, expression, re.IGNORECASE):
-                raise SecurityViolation(f"Dangerous pattern detected: {pattern}")
+                return f"Dangerous pattern detected: {pattern}"
 
         # Must match allowed character pattern
         if not re.match(r'^[a-zA-Z_][a-zA-Z0-9_\.]*$', expression):
-            raise SecurityViolation("Invalid characters in expression")
+            return "Invalid characters in expression"
+        return None
 
     def _evaluate_input_data_field(self, expression: str, context: ExpressionContext) -> Optional[int]:
         """
@@ -9,9 +9,11 @@ import logging
 import json
 import asyncio
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional, Union, Callable, Tuple
 import threading
+from collections import OrderedDict
 from copy import deepcopy
+from types import MappingProxyType
 
 from flask_appbuilder import db
 from flask_appbuilder.models.tenant_context import get_current_tenant_id
@@ -36,19 +38,74 @@ class ContextIsolationError(ContextManagerError):
     pass
 
 
+# Context sections stored per key (Redis hash), so a write only serializes
+# the keys that changed instead of the whole context
+CONTEXT_SECTIONS = ('variables', 'step_outputs')
+
+
+def _read_only_context(context: Dict[str, Any]) -> MappingProxyType:
+    """Wrap a cached context and its sections in read-only views, without copying values."""
+    return MappingProxyType({
+        key: MappingProxyType(value) if key in CONTEXT_SECTIONS and isinstance(value, dict) else value
+        for key, value in context.items()
+    })
+
+
+def _copy_context(context: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy a context and its sections into plain dicts, sharing the values."""
+    return {
+        key: dict(value) if key in CONTEXT_SECTIONS and value is not None else value
+        for key, value in context.items()
+    }
+
+
+class ContextEntry:
+    """
+    Cached process context with dirty tracking.
+    
+    ``context`` is an immutable snapshot: writers build a new top-level dict
+    (and new section dicts) instead of mutating it, so readers can use it
+    without copying. Serialized payloads of changed keys are kept until the
+    entry is flushed.
+    """
+    
+    __slots__ = ('context', 'field_sizes', 'base_size', 'size',
+                 'pending_fields', 'base_dirty', 'replaced')
+    
+    def __init__(self, context: Dict[str, Any]):
+        self.context = context
+        self.field_sizes: Dict[Tuple[str, str], int] = {}
+        self.base_size = 0
+        self.size = 0
+        self.pending_fields: Dict[Tuple[str, str], Optional[str]] = {}
+        self.base_dirty = False
+        self.replaced = False
+    
+    @property
+    def dirty(self) -> bool:
+        return self.base_dirty or self.replaced or bool(self.pending_fields)
+
+
 class ProcessContextManager:
     """
     Manages process execution context and data flow.
     
     Provides secure variable storage, context isolation, and data flow
     management for multi-tenant business processes.
+    
+    Contexts are cached in a bounded LRU of immutable snapshots. Variable
+    writes are applied copy-on-write and only the changed keys are
+    serialized; Redis and the database are updated write-behind when
+    ``flush_context`` is called at step boundaries, when a dirty context is
+    evicted, and on ``shutdown``.
     """
     
     def __init__(self, redis_client=None):
         """Initialize context manager."""
         self.redis = redis_client
         self._lock = threading.RLock()
-        self._context_cache: Dict[int, Dict[str, Any]] = {}
+        self._context_cache: 'OrderedDict[int, ContextEntry]' = OrderedDict()
+        self._cache_bytes = 0
         self._variable_validators = {}
         self._context_hooks = {}
         
@@ -57,7 +114,9 @@ class ProcessContextManager:
             'max_context_size_mb': 10,  # Max context size in MB
             'variable_ttl_seconds': 3600,  # Variable TTL in Redis
             'enable_context_encryption': True,
-            'audit_variable_access': True
+            'audit_variable_access': True,
+            'context_cache_max_entries': 1000,  # LRU bound on cached contexts
+            'context_cache_max_mb': 64  # Memory budget of cached contexts
         }
         
         log.debug("Process Context Manager initialized")
@@ -82,11 +141,9 @@ class ProcessContextManager:
                 'system_variables': self._get_system_variables(instance)
             }
             
-            # Store context
+            # Store context and persist it with the instance
             await self._store_context(context_id, base_context)
-            
-            # Update instance context reference
-            instance.context = {'context_id': context_id}
+            await self.flush_context(context_id)
             db.session.commit()
             
             log.debug(f"Initialized context for process instance {instance.id}")
@@ -134,52 +191,67 @@ class ProcessContextManager:
                           value: Any, step_id: int = None) -> bool:
         """Set variable value in process context."""
         try:
-            # Validate variable name
+            await self.set_variables(instance_id, {variable_name: value}, step_id)
+            log.debug(f"Set variable '{variable_name}' for instance {instance_id}")
+            return True
+            
+        except Exception as e:
+            log.error(f"Error setting variable '{variable_name}' for instance {instance_id}: {str(e)}")
+            raise ContextManagerError(f"Failed to set variable: {str(e)}")
+    
+    async def set_variables(self, instance_id: int, values: Dict[str, Any],
+                            step_id: int = None,
+                            step_output: Dict[str, Any] = None) -> None:
+        """
+        Set several variables in one copy-on-write context update.
+        
+        Args:
+            instance_id: Process instance ID
+            values: Variable names and values
+            step_id: Step setting the variables, recorded in the metadata
+            step_output: Optional step output record stored under ``step_id``
+        """
+        # Validate names and values before touching the context
+        for variable_name, value in values.items():
             if not self._is_valid_variable_name(variable_name):
                 raise ContextManagerError(f"Invalid variable name: {variable_name}")
-            
-            # Validate variable value
             if not await self._validate_variable_value(variable_name, value):
                 raise ContextManagerError(f"Invalid value for variable: {variable_name}")
-            
-            # Get current context
-            context = await self._get_context(instance_id)
-            
-            # Ensure tenant isolation
-            if not await self._validate_tenant_access(instance_id):
-                raise ContextIsolationError("Tenant access validation failed")
-            
-            # Set variable
-            if 'variables' not in context:
-                context['variables'] = {}
-            
-            old_value = context['variables'].get(variable_name)
-            context['variables'][variable_name] = value
-            
-            # Add metadata
-            context['variables'][f'__{variable_name}__meta'] = {
-                'updated_at': datetime.utcnow().isoformat(),
+        
+        # Ensure tenant isolation
+        if not await self._validate_tenant_access(instance_id):
+            raise ContextIsolationError("Tenant access validation failed")
+        
+        context = await self._load_context(instance_id)
+        current = context.get('variables', {})
+        updated_at = datetime.utcnow().isoformat()
+        
+        changes = {}
+        old_values = {}
+        for variable_name, value in values.items():
+            old_values[variable_name] = current.get(variable_name)
+            # Copy only the incoming value, callers may keep mutating theirs
+            changes[variable_name] = deepcopy(value) if isinstance(value, (list, dict)) else value
+            changes[f'__{variable_name}__meta'] = {
+                'updated_at': updated_at,
                 'updated_by_step': step_id,
-                'previous_value': old_value,
+                'previous_value': old_values[variable_name],
                 'type': type(value).__name__
             }
-            
-            # Store updated context
-            await self._store_context(instance_id, context)
-            
+        
+        sections = {'variables': changes}
+        if step_output is not None:
+            sections['step_outputs'] = {str(step_id): step_output}
+        self._write_context(instance_id, sections, context)
+        
+        for variable_name, value in values.items():
             # Audit variable change
             if self.config['audit_variable_access']:
                 await self._audit_variable_access(instance_id, variable_name, 'write', value, step_id)
             
             # Execute variable change hooks
-            await self._execute_variable_hooks(instance_id, variable_name, old_value, value)
-            
-            log.debug(f"Set variable '{variable_name}' for instance {instance_id}")
-            return True
-            
-        except Exception as e:
-            log.error(f"Error setting variable '{variable_name}' for instance {instance_id}: {str(e)}")
-            raise ContextManagerError(f"Failed to set variable: {str(e)}")
+            await self._execute_variable_hooks(instance_id, variable_name,
+                                               old_values[variable_name], value)
     
     async def get_all_variables(self, instance_id: int) -> Dict[str, Any]:
         """Get all variables from process context."""
@@ -214,22 +286,15 @@ class ProcessContextManager:
             if not output_data:
                 return True
             
-            context = await self._get_context(instance_id)
-            
-            # Store step outputs for reference
-            if 'step_outputs' not in context:
-                context['step_outputs'] = {}
-            
-            context['step_outputs'][str(step_id)] = {
-                'data': output_data,
-                'timestamp': datetime.utcnow().isoformat()
-            }
-            
-            # Merge output data into process variables
-            for key, value in output_data.items():
-                await self.set_variable(instance_id, key, value, step_id)
-            
-            await self._store_context(instance_id, context)
+            # Store step output for reference and merge it into the process
+            # variables in a single context update
+            await self.set_variables(
+                instance_id, output_data, step_id,
+                step_output={
+                    'data': output_data,
+                    'timestamp': datetime.utcnow().isoformat()
+                }
+            )
             
             log.debug(f"Updated context with output from step {step_id}")
             return True
@@ -279,13 +344,13 @@ class ProcessContextManager:
     async def create_context_snapshot(self, instance_id: int) -> Dict[str, Any]:
         """Create a snapshot of current context state."""
         try:
-            context = await self._get_context(instance_id)
+            context = await self._load_context(instance_id)
             
             snapshot = {
                 'snapshot_id': f"snapshot_{instance_id}_{int(datetime.utcnow().timestamp())}",
                 'instance_id': instance_id,
                 'timestamp': datetime.utcnow().isoformat(),
-                'context': deepcopy(context)
+                'context': _copy_context(context)
             }
             
             # Store snapshot if Redis is available
@@ -324,6 +389,8 @@ class ProcessContextManager:
             
             # Restore context
             await self._store_context(instance_id, context)
+            await self.flush_context(instance_id)
+            db.session.commit()
             
             log.info(f"Restored context from snapshot {snapshot_id} for instance {instance_id}")
             return True
@@ -335,11 +402,12 @@ class ProcessContextManager:
     async def finalize_context(self, instance: ProcessInstance):
         """Finalize context when process completes."""
         try:
+            await self.flush_context(instance.id)
             context = await self._get_context(instance.id)
             
             # Update instance output data
-            instance.output_data = context.get('variables', {})
-            instance.variables = context.get('variables', {})
+            instance.output_data = dict(context.get('variables', {}))
+            instance.variables = dict(context.get('variables', {}))
             
             # Store final context snapshot
             await self.create_context_snapshot(instance.id)
@@ -355,26 +423,146 @@ class ProcessContextManager:
         except Exception as e:
             log.error(f"Error finalizing context for instance {instance.id}: {str(e)}")
     
-    async def _get_context(self, instance_id: int) -> Dict[str, Any]:
-        """Get process context with caching."""
+    async def flush_context(self, instance_id: int) -> bool:
+        """
+        Write a dirty context to Redis and stage it on the instance.
+        
+        Only keys changed since the last flush are written to Redis. The
+        database update is staged on the session and committed with the
+        caller's transaction, which coalesces all variable writes of a step
+        into the step's commit.
+        
+        Returns:
+            True if there was anything to flush
+        """
+        return self._flush_entry(instance_id)
+    
+    def flush_all_contexts(self) -> int:
+        """
+        Write every dirty cached context, staged on the caller's session.
+        
+        Returns:
+            Number of contexts flushed
+        """
+        with self._lock:
+            dirty = [instance_id for instance_id, entry in self._context_cache.items() if entry.dirty]
+        return sum(1 for instance_id in dirty if self._flush_entry(instance_id))
+    
+    def shutdown(self):
+        """Flush and commit all dirty contexts so no buffered write is lost."""
+        try:
+            if self.flush_all_contexts():
+                db.session.commit()
+        except Exception as e:
+            log.error(f"Failed to flush process contexts on shutdown: {str(e)}")
+            db.session.rollback()
+            raise
+    
+    def _flush_entry(self, instance_id: int) -> bool:
+        """Write a cached context if dirty; see ``flush_context``."""
+        with self._lock:
+            entry = self._context_cache.get(instance_id)
+            if entry is None or not entry.dirty:
+                return False
+            context = entry.context
+            pending_fields = entry.pending_fields
+            base_dirty = entry.base_dirty
+            replaced = entry.replaced
+            entry.pending_fields = {}
+            entry.base_dirty = entry.replaced = False
+        
+        # Store in Redis if available
+        if self.redis:
+            try:
+                self._write_redis(instance_id, context, pending_fields, base_dirty, replaced)
+            except Exception as e:
+                log.warning(f"Failed to store context in Redis: {str(e)}")
+        
+        # Store in database as backup, committed by the caller
+        try:
+            instance = db.session.query(ProcessInstance).get(instance_id)
+            if instance:
+                context = _copy_context(context)
+                instance.context = context
+                instance.variables = context.get('variables', {})
+        except Exception as e:
+            log.warning(f"Failed to store context in database: {str(e)}")
+        
+        return True
+    
+    def _write_redis(self, instance_id: int, context: Dict[str, Any],
+                     pending_fields: Dict[Tuple[str, str], Optional[str]],
+                     base_dirty: bool, replaced: bool):
+        """Write the changed parts of a context to Redis in one pipeline."""
+        context_key = f"process_context:{instance_id}"
+        ttl = self.config['variable_ttl_seconds']
+        pipe = self.redis.pipeline(transaction=False)
+        
+        if base_dirty or replaced:
+            base = {k: v for k, v in context.items() if k not in CONTEXT_SECTIONS}
+            base['__sections__'] = list(CONTEXT_SECTIONS)
+            pipe.setex(context_key, ttl, json.dumps(base, default=str))
+        
+        if replaced:
+            for section in CONTEXT_SECTIONS:
+                pipe.delete(f"{context_key}:{section}")
+        
+        by_section: Dict[str, Dict[str, str]] = {}
+        for (section, key), payload in pending_fields.items():
+            if payload is None:
+                pipe.hdel(f"{context_key}:{section}", key)
+            else:
+                by_section.setdefault(section, {})[key] = payload
+        
+        for section in CONTEXT_SECTIONS:
+            if by_section.get(section):
+                pipe.hset(f"{context_key}:{section}", mapping=by_section[section])
+            pipe.expire(f"{context_key}:{section}", ttl)
+        pipe.expire(context_key, ttl)
+        pipe.execute()
+    
+    def _load_redis(self, instance_id: int) -> Optional[Dict[str, Any]]:
+        """Load a context from Redis, supporting the single-document layout."""
+        context_key = f"process_context:{instance_id}"
+        context_data = self.redis.get(context_key)
+        if not context_data:
+            return None
+        
+        context = json.loads(context_data)
+        sections = context.pop('__sections__', None)
+        for section in sections or ():
+            fields = self.redis.hgetall(f"{context_key}:{section}") or {}
+            context[section] = {
+                (k.decode() if isinstance(k, bytes) else k): json.loads(v)
+                for k, v in fields.items()
+            }
+        return context
+    
+    async def _get_context(self, instance_id: int) -> MappingProxyType:
+        """
+        Get process context with caching.
+        
+        Returns a read-only view of the cached snapshot and its sections,
+        without copying it. Use ``set_variables`` or ``_store_context`` to
+        change it.
+        """
+        return _read_only_context(await self._load_context(instance_id))
+    
+    async def _load_context(self, instance_id: int) -> Dict[str, Any]:
+        """Get the cached context snapshot itself; it must not be modified in place."""
         with self._lock:
             # Check cache first
-            if instance_id in self._context_cache:
-                return deepcopy(self._context_cache[instance_id])
+            entry = self._context_cache.get(instance_id)
+            if entry is not None:
+                self._context_cache.move_to_end(instance_id)
+                return entry.context
         
         # Load from Redis if available
         if self.redis:
             try:
-                context_key = f"process_context:{instance_id}"
-                context_data = self.redis.get(context_key)
-                if context_data:
-                    context = json.loads(context_data)
-                    
-                    # Update cache
-                    with self._lock:
-                        self._context_cache[instance_id] = deepcopy(context)
-                    
-                    return context
+                context = self._load_redis(instance_id)
+                if context is not None:
+                    return self._cache_context(instance_id, context, dirty=False)
             except Exception as e:
                 log.debug(f"Error loading context from Redis: {str(e)}")
         
@@ -384,56 +572,117 @@ class ProcessContextManager:
             if not instance:
                 raise ContextManagerError(f"Process instance {instance_id} not found")
             
-            context = instance.context or {}
+            context = dict(instance.context or {})
             
             # Ensure basic structure
             if 'variables' not in context:
                 context['variables'] = instance.variables or {}
             
-            # Update cache
-            with self._lock:
-                self._context_cache[instance_id] = deepcopy(context)
-            
-            return context
+            return self._cache_context(instance_id, context, dirty=False)
             
         except Exception as e:
             log.error(f"Error loading context from database: {str(e)}")
             raise ContextManagerError(f"Failed to load context: {str(e)}")
     
     async def _store_context(self, instance_id: int, context: Dict[str, Any]):
-        """Store process context with validation."""
-        # Validate context size
-        context_size = len(json.dumps(context, default=str))
-        max_size = self.config['max_context_size_mb'] * 1024 * 1024
+        """Replace the whole process context; persisted on the next flush."""
+        self._cache_context(instance_id, context, dirty=True)
+    
+    def _cache_context(self, instance_id: int, context: Dict[str, Any],
+                       dirty: bool) -> Dict[str, Any]:
+        """Cache a full context, serializing it once for size accounting."""
+        entry = ContextEntry(context)
+        base = {k: v for k, v in context.items() if k not in CONTEXT_SECTIONS}
+        entry.base_size = len(json.dumps(base, default=str))
+        entry.size = entry.base_size
         
-        if context_size > max_size:
-            raise ContextManagerError(f"Context too large: {context_size} bytes")
+        for section in CONTEXT_SECTIONS:
+            for key, value in (context.get(section) or {}).items():
+                payload = json.dumps(value, default=str)
+                entry.field_sizes[(section, key)] = len(payload)
+                entry.size += len(payload)
+                if dirty:
+                    entry.pending_fields[(section, key)] = payload
         
-        # Store in Redis if available
-        if self.redis:
-            try:
-                context_key = f"process_context:{instance_id}"
-                self.redis.setex(
-                    context_key,
-                    self.config['variable_ttl_seconds'],
-                    json.dumps(context, default=str)
-                )
-            except Exception as e:
-                log.warning(f"Failed to store context in Redis: {str(e)}")
+        self._check_context_size(entry.size)
+        entry.base_dirty = entry.replaced = dirty
         
-        # Update cache
         with self._lock:
-            self._context_cache[instance_id] = deepcopy(context)
+            previous = self._context_cache.pop(instance_id, None)
+            if previous is not None:
+                self._cache_bytes -= previous.size
+            self._context_cache[instance_id] = entry
+            self._cache_bytes += entry.size
+            self._evict()
+        return context
+    
+    def _write_context(self, instance_id: int, sections: Dict[str, Dict[str, Any]],
+                       base_context: Dict[str, Any]):
+        """
+        Apply key updates to cached context sections, copy-on-write.
         
-        # Store in database as backup
-        try:
-            instance = db.session.query(ProcessInstance).get(instance_id)
-            if instance:
-                instance.context = context
-                instance.variables = context.get('variables', {})
-                db.session.commit()
-        except Exception as e:
-            log.warning(f"Failed to store context in database: {str(e)}")
+        Only the updated values are serialized; the previous snapshot is left
+        untouched for concurrent readers. ``base_context`` is re-cached if the
+        entry was evicted since it was read.
+        """
+        payloads = {
+            (section, key): json.dumps(value, default=str)
+            for section, values in sections.items()
+            for key, value in values.items()
+        }
+        
+        with self._lock:
+            if instance_id not in self._context_cache:
+                self._cache_context(instance_id, base_context, dirty=False)
+            entry = self._context_cache[instance_id]
+            delta = sum(
+                len(payload) - entry.field_sizes.get(field, 0)
+                for field, payload in payloads.items()
+            )
+            self._check_context_size(entry.size + delta)
+            
+            context = dict(entry.context)
+            for section, values in sections.items():
+                merged = dict(context.get(section) or {})
+                merged.update(values)
+                context[section] = merged
+            
+            entry.context = context
+            for field, payload in payloads.items():
+                entry.field_sizes[field] = len(payload)
+                entry.pending_fields[field] = payload
+            entry.size += delta
+            self._cache_bytes += delta
+            self._context_cache.move_to_end(instance_id)
+            self._evict()
+    
+    def _check_context_size(self, context_size: int):
+        """Validate context size."""
+        max_size = self.config['max_context_size_mb'] * 1024 * 1024
+        if context_size > max_size:
+            raise ContextManagerError(f"Context too large: {context_size} bytes")
+    
+    def _evict(self):
+        """
+        Evict least recently used contexts over the entry or memory budget.
+        
+        Dirty contexts are flushed before they are evicted so no write is
+        lost. Must be called with the lock held.
+        """
+        max_entries = self.config['context_cache_max_entries']
+        max_bytes = self.config['context_cache_max_mb'] * 1024 * 1024
+        if len(self._context_cache) <= max_entries and self._cache_bytes <= max_bytes:
+            return
+        
+        # The most recently used context is the one being written; keep it
+        for instance_id in list(self._context_cache)[:-1]:
+            if len(self._context_cache) <= max_entries and self._cache_bytes <= max_bytes:
+                break
+            entry = self._context_cache[instance_id]
+            if entry.dirty:
+                self._flush_entry(instance_id)
+            del self._context_cache[instance_id]
+            self._cache_bytes -= entry.size
     
     def _get_system_variables(self, instance: ProcessInstance) -> Dict[str, Any]:
         """Get system-provided variables."""
@@ -528,12 +777,16 @@ class ProcessContextManager:
         try:
             # Remove from cache
             with self._lock:
-                self._context_cache.pop(instance_id, None)
+                entry = self._context_cache.pop(instance_id, None)
+                if entry is not None:
+                    self._cache_bytes -= entry.size
             
             # Clean up Redis data
             if self.redis:
                 context_key = f"process_context:{instance_id}"
-                self.redis.delete(context_key)
+                self.redis.delete(context_key, *[
+                    f"{context_key}:{section}" for section in CONTEXT_SECTIONS
+                ])
                 
         except Exception as e:
             log.debug(f"Context cleanup failed: {str(e)}")
@@ -558,6 +811,8 @@ class ProcessContextManager:
         with self._lock:
             return {
                 'cached_contexts': len(self._context_cache),
+                'cached_bytes': self._cache_bytes,
+                'dirty_contexts': sum(1 for e in self._context_cache.values() if e.dirty),
                 'registered_validators': len(self._variable_validators),
                 'registered_hooks': sum(len(hooks) for hooks in self._context_hooks.values()),
                 'redis_available': self.redis is not None,
@@ -6,6 +6,7 @@ tasks, gateways, approvals, services, and timers with comprehensive
 error handling and integration capabilities.
 """
 
+import ast
 import logging
 import asyncio
 import time
@@ -24,6 +25,8 @@ from ..models.process_models import (
     ProcessInstance, ProcessStep, ApprovalRequest, ApprovalStatus,
     SubprocessDefinition, SubprocessExecution
 )
+from ..models.process_graph import CompiledProcessGraph
+from .expression_compiler import compile_template, safe_eval
 
 log = logging.getLogger(__name__)
 
@@ -164,13 +167,19 @@ class NodeExecutor(ABC):
                 node_id=node.get('id'),
                 context_data={
                     'node_type': node.get('type'),
-                    'step_id': step.id
+                    'step_id': step.id,
+                    'execution_order': step.execution_order
                 },
                 tenant_id=instance.tenant_id
             )
             
             db.session.add(metric)
-            db.session.commit()
+            commit_step = getattr(self.engine, '_commit_step', None)
+            if commit_step is not None:
+                # Written with the engine's batched step writes, if enabled
+                commit_step()
+            else:
+                db.session.commit()
             
         except Exception as e:
             log.debug(f"Failed to record performance metrics: {str(e)}")
@@ -503,10 +512,14 @@ class GatewayExecutor(NodeExecutor):
         gateway_config = node.get('properties', {})
         conditions = gateway_config.get('conditions', [])
         
+        graph = instance.definition.compiled_graph
+        
         # Evaluate each condition
         for condition in conditions:
             if await self._evaluate_condition(instance, condition, input_data):
                 target_node = condition.get('target')
+                if target_node and not graph.has_edge(node.get('id'), target_node):
+                    log.warning(f"Gateway {node.get('id')} targets {target_node} without a connecting edge")
                 return {
                     'gateway_result': True,
                     'target_node': target_node,
@@ -604,11 +617,20 @@ class GatewayExecutor(NodeExecutor):
             return False
         
         try:
-            # Resolve variables in expression
-            resolved_expression = await self.engine.context_manager.resolve_expression(
-                instance.id, expression
-            )
+            # Simple boolean literals
+            if expression.strip().lower() in ['true', '1', 'yes']:
+                return True
+            elif expression.strip().lower() in ['false', '0', 'no']:
+                return False
             
+            # Compiled and cached before ${variable} substitution, the
+            # variable values are bound when evaluating
+            template = compile_template(expression)
+            bindings = {}
+            for name in template.variable_names:
+                bindings[name] = await self.engine.context_manager.get_variable(
+                    instance.id, name, required=True
+                )
 
             # Build context data from all available sources
             context_data = {}
@@ -632,102 +654,23 @@ class GatewayExecutor(NodeExecutor):
             # Add any output data for reference
             if instance.output_data:
                 context_data.update(instance.output_data)
-            # For safety, only allow simple boolean expressions
-            # Use safe expression evaluator instead of dangerous eval()
-            if resolved_expression.lower() in ['true', '1', 'yes']:
-                return True
-            elif resolved_expression.lower() in ['false', '0', 'no']:
-                return False
-            else:
-                # Use safe expression evaluator
-                return bool(self._safe_eval(resolved_expression, context_data))
+            
+            result = template.evaluate(context_data, bindings)
+            # A variable holding a boolean literal, e.g. "${approved}"
+            if isinstance(result, str):
+                if result.lower() in ['true', '1', 'yes']:
+                    return True
+                elif result.lower() in ['false', '0', 'no']:
+                    return False
+            return bool(result)
                 
         except Exception as e:
             log.warning(f"Expression evaluation failed: {str(e)}")
             return False
     
     def _safe_eval(self, expression: str, variables: Dict[str, Any]) -> Any:
-        """Safely evaluate boolean expression using AST parsing."""
-        import ast
-        import operator as ops
-        
-        # Safe operators only
-        safe_operators = {
-            ast.Add: ops.add, ast.Sub: ops.sub, ast.Mult: ops.mul,
-            ast.Div: ops.truediv, ast.Mod: ops.mod, ast.Pow: ops.pow,
-            ast.Eq: ops.eq, ast.NotEq: ops.ne, ast.Lt: ops.lt, 
-            ast.LtE: ops.le, ast.Gt: ops.gt, ast.GtE: ops.ge,
-            ast.And: ops.and_, ast.Or: ops.or_, ast.Not: ops.not_
-        }
-        
-        def _eval_node(node, variables):
-            """Recursively evaluate AST node."""
-            if isinstance(node, ast.Constant):  # Python 3.8+
-                return node.value
-            elif isinstance(node, ast.Num):  # Python < 3.8
-                return node.n
-            elif isinstance(node, ast.Str):  # Python < 3.8
-                return node.s
-            elif isinstance(node, ast.NameConstant):  # Python < 3.8
-                return node.value
-            elif isinstance(node, ast.Name):
-                if node.id in variables:
-                    return variables[node.id]
-                else:
-                    raise NameError(f"Variable '{node.id}' not defined")
-            elif isinstance(node, ast.BinOp):
-                left = _eval_node(node.left, variables)
-                right = _eval_node(node.right, variables)
-                op = safe_operators.get(type(node.op))
-                if op:
-                    return op(left, right)
-                else:
-                    raise TypeError(f"Unsupported operator: {type(node.op)}")
-            elif isinstance(node, ast.UnaryOp):
-                operand = _eval_node(node.operand, variables)
-                op = safe_operators.get(type(node.op))
-                if op:
-                    return op(operand)
-                else:
-                    raise TypeError(f"Unsupported unary operator: {type(node.op)}")
-            elif isinstance(node, ast.Compare):
-                left = _eval_node(node.left, variables)
-                result = True
-                for op, comparator in zip(node.ops, node.comparators):
-                    right = _eval_node(comparator, variables)
-                    op_func = safe_operators.get(type(op))
-                    if op_func:
-                        result = result and op_func(left, right)
-                        left = right  # For chained comparisons
-                    else:
-                        raise TypeError(f"Unsupported comparison: {type(op)}")
-                return result
-            elif isinstance(node, ast.BoolOp):
-                op = safe_operators.get(type(node.op))
-                if not op:
-                    raise TypeError(f"Unsupported boolean operator: {type(node.op)}")
-                
-                values = [_eval_node(value, variables) for value in node.values]
-                if isinstance(node.op, ast.And):
-                    return all(values)
-                elif isinstance(node.op, ast.Or):
-                    return any(values)
-            else:
-                raise TypeError(f"Unsupported node type: {type(node)}")
-        
-        try:
-            # Parse expression into AST
-            tree = ast.parse(expression, mode='eval')
-            
-            # Evaluate safely
-            return _eval_node(tree.body, variables)
-            
-        except (SyntaxError, ValueError, NameError, TypeError) as e:
-            log.warning(f"Safe evaluation failed for expression '{expression}': {str(e)}")
-            return False
-        except Exception as e:
-            log.error(f"Unexpected error in safe evaluation: {str(e)}")
-            return False
+        """Safely evaluate boolean expression using the cached expression compiler."""
+        return safe_eval(expression, variables)
     
     async def _evaluate_script_condition(self, instance: ProcessInstance,
                                        condition: Dict[str, Any],
@@ -1374,35 +1317,30 @@ class SubprocessExecutor(NodeExecutor):
         if not subprocess_def.process_graph:
             raise NodeExecutionError("Subprocess definition has no node definitions")
         
-        # Parse subprocess definition
-        nodes = subprocess_def.process_graph.get('nodes', [])
-        edges = subprocess_def.process_graph.get('edges', [])
+        # Use the compiled (indexed) subprocess graph
+        graph = subprocess_def.compiled_graph
         
-        if not nodes:
+        if not graph.nodes:
             return input_data
         
         # Find start node
-        start_node = None
-        for node in nodes:
-            if node.get('type') == 'start':
-                start_node = node
-                break
-        
-        if not start_node:
+        start_nodes = graph.get_start_nodes()
+        if not start_nodes:
             raise NodeExecutionError("No start node found in subprocess definition")
+        start_node = start_nodes[0]
         
         # Execute subprocess using simplified execution logic
         current_data = input_data.copy()
         visited_nodes = set()
         
         return await self._execute_subprocess_flow(
-            start_node, nodes, edges, current_data, visited_nodes,
+            start_node, graph, current_data, visited_nodes,
             subprocess_exec, parent_instance
         )
     
-    async def _execute_subprocess_flow(self, current_node: Dict[str, Any], all_nodes: List[Dict[str, Any]],
-                                     edges: List[Dict[str, Any]], data: Dict[str, Any],
-                                     visited_nodes: set, subprocess_exec: SubprocessExecution,
+    async def _execute_subprocess_flow(self, current_node: Dict[str, Any], graph: CompiledProcessGraph,
+                                     data: Dict[str, Any], visited_nodes: set,
+                                     subprocess_exec: SubprocessExecution,
                                      parent_instance: ProcessInstance) -> Dict[str, Any]:
         """Execute subprocess node flow recursively."""
         node_id = current_node['id']
@@ -1443,18 +1381,10 @@ class SubprocessExecutor(NodeExecutor):
             result_data = await executor._execute_node(parent_instance, current_node, temp_step, data)
             data.update(result_data)
         
-        # Find next nodes
-        next_nodes = []
-        for edge in edges:
-            if edge['source'] == node_id:
-                target_node = next((n for n in all_nodes if n['id'] == edge['target']), None)
-                if target_node:
-                    next_nodes.append(target_node)
-        
         # Execute next nodes
-        for next_node in next_nodes:
+        for next_node in graph.get_successors(node_id):
             data = await self._execute_subprocess_flow(
-                next_node, all_nodes, edges, data, visited_nodes,
+                next_node, graph, data, visited_nodes,
                 subprocess_exec, parent_instance
             )
         
@@ -0,0 +1,312 @@
+"""
+Safe Expression Compiler.
+
+Compiles restricted boolean/arithmetic expressions used by gateway and edge
+conditions into closure trees. The AST is parsed and validated against the
+operator whitelist once per expression text; compiled expressions are kept in
+a bounded LRU cache shared with the approval expression evaluator.
+
+Expressions referencing process variables as ``${name}`` are compiled and
+cached as templates, before substitution, and the variable values are bound
+when they are evaluated.
+"""
+
+import ast
+import logging
+import operator as ops
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List
+
+log = logging.getLogger(__name__)
+
+# Safe operators only
+SAFE_OPERATORS = {
+    ast.Add: ops.add, ast.Sub: ops.sub, ast.Mult: ops.mul,
+    ast.Div: ops.truediv, ast.Mod: ops.mod, ast.Pow: ops.pow,
+    ast.Eq: ops.eq, ast.NotEq: ops.ne, ast.Lt: ops.lt,
+    ast.LtE: ops.le, ast.Gt: ops.gt, ast.GtE: ops.ge,
+    ast.And: ops.and_, ast.Or: ops.or_, ast.Not: ops.not_
+}
+
+CompiledExpression = Callable[[Dict[str, Any]], Any]
+
+# ${name} references to process variables
+TEMPLATE_VARIABLE = re.compile(r'\$\{([^}]+)\}')
+# Names ${name} references are replaced with before parsing
+_PLACEHOLDER = re.compile(r'__tpl_\d+__')
+
+
+class ExpressionCompileError(ValueError):
+    """Raised when an expression is not valid or uses a disallowed construct."""
+    pass
+
+
+class ExpressionCache:
+    """
+    Thread-safe, bounded LRU cache for compiled and validated expressions.
+
+    Keys are the expression text, optionally namespaced by the caller with a
+    tuple so several evaluators can share the same cache.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._entries: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Return the cached value for key, computing it with factory on a miss."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        value = factory()
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get cache size and hit/miss counters."""
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+
+_expression_cache = ExpressionCache()
+
+
+def get_expression_cache() -> ExpressionCache:
+    """Get the process-wide expression cache."""
+    return _expression_cache
+
+
+def _compile_node(node: ast.AST) -> CompiledExpression:
+    """Validate an AST node and turn it into a closure."""
+    if isinstance(node, ast.Constant) or type(node).__name__ in ('Num', 'Str', 'NameConstant'):
+        # Python < 3.8 produces Num/Str/NameConstant nodes
+        value = ast.literal_eval(node)
+        if isinstance(value, str) and _PLACEHOLDER.search(value):
+            # ${name} inside a string literal is interpolated
+            def interpolate(variables):
+                try:
+                    return _PLACEHOLDER.sub(lambda match: str(variables[match.group(0)]), value)
+                except KeyError as e:
+                    raise NameError(f"Variable {e} not bound") from e
+            return interpolate
+        return lambda variables: value
+
+    if isinstance(node, ast.Name):
+        name = node.id
+
+        def load(variables):
+            if name in variables:
+                return variables[name]
+            raise NameError(f"Variable '{name}' not defined")
+        return load
+
+    if isinstance(node, ast.BinOp):
+        op = SAFE_OPERATORS.get(type(node.op))
+        if op is None:
+            raise ExpressionCompileError(f"Unsupported operator: {type(node.op)}")
+        left = _compile_node(node.left)
+        right = _compile_node(node.right)
+        return lambda variables: op(left(variables), right(variables))
+
+    if isinstance(node, ast.UnaryOp):
+        op = SAFE_OPERATORS.get(type(node.op))
+        if op is None:
+            raise ExpressionCompileError(f"Unsupported unary operator: {type(node.op)}")
+        operand = _compile_node(node.operand)
+        return lambda variables: op(operand(variables))
+
+    if isinstance(node, ast.Compare):
+        operands = [_compile_node(node.left)]
+        comparisons = []
+        for op_node, comparator in zip(node.ops, node.comparators):
+            op = SAFE_OPERATORS.get(type(op_node))
+            if op is None:
+                raise ExpressionCompileError(f"Unsupported comparison: {type(op_node)}")
+            comparisons.append(op)
+            operands.append(_compile_node(comparator))
+
+        if len(comparisons) == 1:
+            op, left, right = comparisons[0], operands[0], operands[1]
+            return lambda variables: op(left(variables), right(variables))
+
+        def compare(variables):
+            left = operands[0](variables)
+            for op, operand in zip(comparisons, operands[1:]):
+                right = operand(variables)
+                if not op(left, right):
+                    return False
+                left = right  # For chained comparisons
+            return True
+        return compare
+
+    if isinstance(node, ast.BoolOp):
+        if type(node.op) not in SAFE_OPERATORS:
+            raise ExpressionCompileError(f"Unsupported boolean operator: {type(node.op)}")
+        values = [_compile_node(value) for value in node.values]
+        if isinstance(node.op, ast.And):
+            return lambda variables: all(value(variables) for value in values)
+        return lambda variables: any(value(variables) for value in values)
+
+    raise ExpressionCompileError(f"Unsupported node type: {type(node)}")
+
+
+def _build_expression(expression: str) -> CompiledExpression:
+    try:
+        tree = ast.parse(expression, mode='eval')
+    except SyntaxError as e:
+        raise ExpressionCompileError(f"Invalid expression syntax: {e}") from e
+    return _compile_node(tree.body)
+
+
+def compile_expression(expression: str, use_cache: bool = True) -> CompiledExpression:
+    """
+    Compile a safe expression into a callable taking a variables dictionary.
+
+    Args:
+        expression: Expression text, e.g. ``"amount > 100 and approved"``
+        use_cache: Reuse the compiled expression from the shared LRU cache
+
+    Returns:
+        Callable evaluating the expression against a variables dictionary
+
+    Raises:
+        ExpressionCompileError: If the expression is invalid or not allowed
+    """
+    if not use_cache:
+        return _build_expression(expression)
+
+    def factory():
+        # Cache failures too (as their message), so invalid expressions are not re-parsed
+        try:
+            return _build_expression(expression)
+        except ExpressionCompileError as e:
+            return str(e)
+
+    compiled = _expression_cache.get_or_set(expression, factory)
+    if isinstance(compiled, str):
+        raise ExpressionCompileError(compiled)
+    return compiled
+
+
+class ExpressionTemplate:
+    """
+    An expression compiled before its ``${name}`` references are substituted.
+
+    The references become placeholder names bound at evaluation time, so one
+    compiled template serves every value of the variables.
+    """
+
+    __slots__ = ('variable_names', '_compiled')
+
+    def __init__(self, compiled: CompiledExpression, variable_names: List[str]):
+        self._compiled = compiled
+        self.variable_names = variable_names
+
+    def evaluate(self, variables: Dict[str, Any], bindings: Dict[str, Any]) -> Any:
+        """
+        Evaluate the template.
+
+        Args:
+            variables: Names available to the expression
+            bindings: Values of the ``${name}`` references, by name
+
+        Raises:
+            NameError: If a referenced variable is not bound
+        """
+        scope = dict(variables)
+        for index, name in enumerate(self.variable_names):
+            if name not in bindings:
+                raise NameError(f"Variable '{name}' not bound")
+            scope[f'__tpl_{index}__'] = bindings[name]
+        return self._compiled(scope)
+
+
+def _build_template(expression: str) -> ExpressionTemplate:
+    variable_names: List[str] = []
+
+    def placeholder(match):
+        name = match.group(1).strip()
+        if name not in variable_names:
+            variable_names.append(name)
+        return f'__tpl_{variable_names.index(name)}__'
+
+    source = TEMPLATE_VARIABLE.sub(placeholder, expression)
+    return ExpressionTemplate(_build_expression(source), variable_names)
+
+
+def compile_template(expression: str, use_cache: bool = True) -> ExpressionTemplate:
+    """
+    Compile an expression with ``${name}`` variable references.
+
+    The template is cached under its text before substitution, so distinct
+    variable values don't create cache entries.
+
+    Args:
+        expression: Expression text, e.g. ``"${amount} > limit"``
+        use_cache: Reuse the compiled template from the shared LRU cache
+
+    Returns:
+        The compiled template
+
+    Raises:
+        ExpressionCompileError: If the expression is invalid or not allowed
+    """
+    if not use_cache:
+        return _build_template(expression)
+
+    def factory():
+        try:
+            return _build_template(expression)
+        except ExpressionCompileError as e:
+            return str(e)
+
+    compiled = _expression_cache.get_or_set(('template', expression), factory)
+    if isinstance(compiled, str):
+        raise ExpressionCompileError(compiled)
+    return compiled
+
+
+def safe_eval(expression: str, variables: Dict[str, Any]) -> Any:
+    """
+    Safely evaluate an expression, returning False if it cannot be evaluated.
+
+    Args:
+        expression: Expression text
+        variables: Names available to the expression
+
+    Returns:
+        Result of the expression, or False on any error
+    """
+    try:
+        return compile_expression(expression)(variables)
+    except (SyntaxError, ValueError, NameError, TypeError) as e:
+        log.warning(f"Safe evaluation failed for expression '{expression}': {str(e)}")
+        return False
+    except Exception as e:
+        log.error(f"Unexpected error in safe evaluation: {str(e)}")
+        return False
@@ -11,9 +11,11 @@ import asyncio
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Tuple, Callable
 from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
 import uuid
 import threading
 import time
+from contextvars import ContextVar
 
 from sqlalchemy.exc import SQLAlchemyError
 from flask import current_app, g
@@ -25,6 +27,7 @@ from ..models.process_models import (
     ProcessDefinition, ProcessInstance, ProcessStep, ProcessLog,
     ProcessInstanceStatus, ProcessStepStatus
 )
+from ..models.process_graph import compile_edge_condition
 from .state_machine import ProcessStateMachine
 from .context_manager import ProcessContextManager
 from .executors import (
@@ -56,6 +59,55 @@ class ProcessValidationError(ProcessEngineError):
     pass
 
 
+class ProcessUnitOfWork:
+    """
+    Buffers the writes of a run of non-blocking nodes.
+    
+    Steps created during the run are flushed for their ids but their state
+    transitions are not committed individually; log events are collected as
+    mappings. Everything is written in one transaction on flush, with the
+    logs bulk inserted in a savepoint, so log rows that cannot be written
+    are dropped without failing the steps.
+    """
+    
+    def __init__(self):
+        self.log_entries: List[Tuple[Optional[ProcessStep], Dict[str, Any]]] = []
+    
+    def add_log(self, step: Optional[ProcessStep], values: Dict[str, Any]):
+        """Queue a log row; its step id is resolved when flushed."""
+        self.log_entries.append((step, values))
+    
+    def flush(self):
+        """Write pending steps and log rows and commit."""
+        if self.log_entries:
+            # Write pending step changes before the log rows referencing them
+            db.session.flush()
+            mappings = []
+            for step, values in self.log_entries:
+                if step is not None:
+                    values['process_step_id'] = step.id
+                mappings.append(values)
+            self.log_entries = []
+            self._insert_logs(mappings)
+        db.session.commit()
+    
+    @staticmethod
+    def _insert_logs(mappings: List[Dict[str, Any]]):
+        """Bulk insert log rows in a savepoint, logging instead of raising on failure."""
+        try:
+            with db.session.begin_nested():
+                db.session.bulk_insert_mappings(ProcessLog, mappings)
+        except Exception as e:
+            # Don't fail process execution due to logging errors
+            log.error(f"Failed to write {len(mappings)} process log events: {str(e)}")
+
+
+_current_unit_of_work: ContextVar[Optional[ProcessUnitOfWork]] = ContextVar(
+    'process_unit_of_work', default=None
+)
+_in_parallel_branch: ContextVar[bool] = ContextVar('process_parallel_branch', default=False)
+
+
 class ProcessEngine:
     """
     Main process execution engine.
@@ -81,11 +133,16 @@ class ProcessEngine:
             'default_step_timeout': 300,  # 5 minutes
             'max_retry_attempts': 3,
             'error_escalation_threshold': 5,
-            'performance_monitoring': True
+            'performance_monitoring': True,
+            'max_parallel_branches': 10,  # Concurrent branches per process instance fork
+            'max_branch_workers': 50,  # Branch worker threads shared by all instances
+            'join_update_retries': 10,  # Attempts to record a join arrival
+            'batch_step_writes': True  # Write a run of non-blocking steps in one transaction
         }
         
         # Runtime state
         self._running_instances: Dict[int, Dict[str, Any]] = {}
+        self._branch_executor: Optional[ThreadPoolExecutor] = None
         self._lock = threading.RLock()
         self._engine_stats = {
             'instances_started': 0,
@@ -220,74 +277,110 @@ class ProcessEngine:
         node_id = node.get('id')
         node_type = node.get('type')
         
+        async with self._unit_of_work():
+            try:
+                # Create or get process step
+                step = await self._create_process_step(instance, node, input_data)
+                
+                # Log step start
+                await self._log_process_event(
+                    instance.id, 'INFO', 'step_started',
+                    f"Started executing node {node_id} ({node_type})",
+                    step=step,
+                    node_id=node_id
+                )
+                
+                # Get executor for node type
+                executor = self.executors.get(node_type)
+                if not executor:
+                    raise ProcessExecutionError(f"No executor found for node type: {node_type}")
+                
+                # Mark step as running
+                step.mark_started()
+                self._commit_step()
+                
+                # Execute node
+                start_time = time.time()
+                output_data = await executor.execute(instance, node, step, input_data or {})
+                execution_time = time.time() - start_time
+                
+                # Write context changes of the step with its completion
+                await self.context_manager.flush_context(instance.id)
+                
+                # Mark step as completed
+                step.mark_completed(output_data)
+                step.execution_time = execution_time
+                self._commit_step()
+                
+                # Log step completion
+                await self._log_process_event(
+                    instance.id, 'INFO', 'step_completed',
+                    f"Completed executing node {node_id} in {execution_time:.2f}s",
+                    step=step,
+                    node_id=node_id,
+                    execution_time=execution_time
+                )
+                
+                # Continue to next nodes if not a blocking step
+                if not self._is_blocking_step(step):
+                    await self._continue_process_execution(instance, node, output_data)
+                
+                return output_data
+                
+            except Exception as e:
+                log.error(f"Node execution failed - Instance: {instance.id}, Node: {node_id}, Error: {str(e)}")
+                
+                # Mark step as failed if it exists
+                if 'step' in locals():
+                    await self.context_manager.flush_context(instance.id)
+                    step.mark_failed(str(e))
+                    self._commit_step()
+                
+                # Log error
+                await self._log_process_event(
+                    instance.id, 'ERROR', 'step_failed',
+                    f"Node {node_id} execution failed: {str(e)}",
+                    step=locals().get('step'),
+                    node_id=node_id,
+                    error_details={'error': str(e), 'node_type': node_type}
+                )
+                
+                # Handle error according to error handling strategy
+                await self._handle_step_error(instance, node, step if 'step' in locals() else None, e)
+                
+                raise ProcessExecutionError(f"Node execution failed: {str(e)}", 
+                                          instance.id, node_id, 'EXECUTION_ERROR')
+    
+    @asynccontextmanager
+    async def _unit_of_work(self):
+        """
+        Batch the writes of nested node executions into one transaction.
+        
+        The outermost node execution opens the unit of work and flushes it
+        when the run of non-blocking nodes ends, including on errors. If that
+        write fails, the transaction is rolled back and the error raised.
+        """
+        if not self.config.get('batch_step_writes') or _current_unit_of_work.get() is not None:
+            yield _current_unit_of_work.get()
+            return
+        
+        unit_of_work = ProcessUnitOfWork()
+        token = _current_unit_of_work.set(unit_of_work)
         try:
-            # Create or get process step
-            step = await self._create_process_step(instance, node, input_data)
-            
-            # Log step start
-            await self._log_process_event(
-                instance.id, 'INFO', 'step_started',
-                f"Started executing node {node_id} ({node_type})",
-                step_id=step.id,
-                node_id=node_id
-            )
-            
-            # Get executor for node type
-            executor = self.executors.get(node_type)
-            if not executor:
-                raise ProcessExecutionError(f"No executor found for node type: {node_type}")
-            
-            # Mark step as running
-            step.mark_started()
-            db.session.commit()
-            
-            # Execute node
-            start_time = time.time()
-            output_data = await executor.execute(instance, node, step, input_data or {})
-            execution_time = time.time() - start_time
-            
-            # Mark step as completed
-            step.mark_completed(output_data)
-            step.execution_time = execution_time
+            yield unit_of_work
+        finally:
+            _current_unit_of_work.reset(token)
+            try:
+                unit_of_work.flush()
+            except Exception as e:
+                log.error(f"Failed to write batched process steps: {str(e)}")
+                db.session.rollback()
+                raise
+    
+    def _commit_step(self):
+        """Commit a step state transition unless writes are being batched."""
+        if _current_unit_of_work.get() is None:
             db.session.commit()
-            
-            # Log step completion
-            await self._log_process_event(
-                instance.id, 'INFO', 'step_completed',
-                f"Completed executing node {node_id} in {execution_time:.2f}s",
-                step_id=step.id,
-                node_id=node_id,
-                execution_time=execution_time
-            )
-            
-            # Continue to next nodes if not a blocking step
-            if not self._is_blocking_step(step):
-                await self._continue_process_execution(instance, node, output_data)
-            
-            return output_data
-            
-        except Exception as e:
-            log.error(f"Node execution failed - Instance: {instance.id}, Node: {node_id}, Error: {str(e)}")
-            
-            # Mark step as failed if it exists
-            if 'step' in locals():
-                step.mark_failed(str(e))
-                db.session.commit()
-            
-            # Log error
-            await self._log_process_event(
-                instance.id, 'ERROR', 'step_failed',
-                f"Node {node_id} execution failed: {str(e)}",
-                step_id=getattr(locals().get('step'), 'id', None),
-                node_id=node_id,
-                error_details={'error': str(e), 'node_type': node_type}
-            )
-            
-            # Handle error according to error handling strategy
-            await self._handle_step_error(instance, node, step if 'step' in locals() else None, e)
-            
-            raise ProcessExecutionError(f"Node execution failed: {str(e)}", 
-                                      instance.id, node_id, 'EXECUTION_ERROR')
     
     async def _create_process_step(self, instance: ProcessInstance, node: Dict[str, Any],
                                   input_data: Dict[str, Any] = None) -> ProcessStep:
@@ -303,8 +396,9 @@ class ProcessEngine:
             tenant_id=instance.tenant_id
         )
         
-        # Set execution order
-        step.execution_order = len(instance.steps) + 1
+        # Set execution order from the instance counter (avoids loading all steps)
+        instance.step_counter = (instance.step_counter or 0) + 1
+        step.execution_order = instance.step_counter
         
         # Set due date if specified
         if 'due_in_minutes' in node.get('properties', {}):
@@ -312,7 +406,8 @@ class ProcessEngine:
             step.due_at = datetime.utcnow() + timedelta(minutes=due_minutes)
         
         db.session.add(step)
-        db.session.flush()  # Get ID without committing
+        # Executors reference the step id (approval requests, subprocesses, tasks)
+        db.session.flush()
         
         return step
     
@@ -321,86 +416,293 @@ class ProcessEngine:
                                         output_data: Dict[str, Any]):
         """Continue process execution to next nodes."""
         try:
-            # Get outgoing edges from current node
-            outgoing_edges = instance.definition.get_outgoing_edges(current_node.get('id'))
+            # Get outgoing transitions from the compiled graph
+            graph = instance.definition.compiled_graph
+            transitions = graph.get_transitions(current_node.get('id'))
             
-            if not outgoing_edges:
+            if not transitions:
                 # No outgoing edges - check if this is an end node
                 if current_node.get('type') == 'end':
                     await self._complete_process_instance(instance)
                 return
             
-            # Execute each outgoing path
-            for edge in outgoing_edges:
-                target_node_id = edge.get('target')
-                target_node = instance.definition.get_node_by_id(target_node_id)
+            # Collect the paths whose precompiled edge condition holds
+            next_nodes = []
+            for transition in transitions:
+                target_node_id = transition.edge.get('target')
                 
-                if not target_node:
+                if not transition.target:
                     log.warning(f"Target node {target_node_id} not found in process definition")
                     continue
                 
-                # Check edge conditions if any
-                if await self._evaluate_edge_condition(edge, output_data):
-                    # Execute target node (async to allow parallel paths)
-                    if self.celery:
-                        # Use Celery for async execution if available
-                        from ..tasks import execute_node_async
-                        execute_node_async.delay(instance.id, target_node_id, output_data)
-                    else:
-                        # Execute directly (in production, should use proper async handling)
-                        await self._execute_node(instance, target_node, output_data)
+                if transition.condition(output_data):
+                    next_nodes.append(transition.target)
+            
+            if self._is_parallel_gateway(current_node) and next_nodes:
+                # Fork: tell the matching join how many branches to wait for
+                self._register_fork(instance, current_node, next_nodes)
+            
+            if self.celery:
+                # Use Celery for async execution if available
+                from ..tasks import execute_node_async
+                if len(next_nodes) > 1:
+                    self._flush_pending_writes()
+                for target_node in next_nodes:
+                    execute_node_async.delay(instance.id, target_node.get('id'), output_data)
+            elif len(next_nodes) > 1 and self._is_parallel_gateway(current_node):
+                # Fork: run the branches concurrently
+                await self._execute_parallel_branches(instance, next_nodes, output_data)
+            else:
+                for target_node in next_nodes:
+                    await self._enter_node(instance, target_node, output_data)
                         
         except Exception as e:
             log.error(f"Error continuing process execution for instance {instance.id}: {str(e)}")
             await self._handle_process_error(instance, e)
     
+    @staticmethod
+    def _is_parallel_gateway(node: Dict[str, Any]) -> bool:
+        """Check whether a node is a parallel (fork/join) gateway."""
+        if node.get('type') != 'gateway':
+            return False
+        gateway_type = node.get('subtype') or node.get('properties', {}).get('gateway_type')
+        return gateway_type == 'parallel'
+    
+    def _is_join_gateway(self, graph, node: Dict[str, Any]) -> bool:
+        """Check whether a node is a parallel gateway joining several flows."""
+        return self._is_parallel_gateway(node) and len(graph.get_incoming_edges(node.get('id'))) > 1
+    
+    def _find_join_gateway(self, graph, branch_nodes: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Find the join gateway where the branches of a fork meet again.
+        
+        Walks the graph from the branch nodes, skipping over the joins of
+        nested forks, and returns the first join at the fork's own level.
+        """
+        queue = [(node, 0) for node in branch_nodes]
+        visited = set()
+        while queue:
+            node, depth = queue.pop(0)
+            node_id = node.get('id')
+            if (node_id, depth) in visited:
+                continue
+            visited.add((node_id, depth))
+            
+            if self._is_join_gateway(graph, node):
+                if depth == 0:
+                    return node
+                depth -= 1
+            if self._is_parallel_gateway(node) and len(graph.get_outgoing_edges(node_id)) > 1:
+                depth += 1
+            queue.extend((successor, depth) for successor in graph.get_successors(node_id))
+        return None
+    
+    def _register_fork(self, instance: ProcessInstance, node: Dict[str, Any],
+                       branch_nodes: List[Dict[str, Any]]):
+        """
+        Record the number of activated branches on the join token of a fork.
+        
+        Only the branches whose conditions held at the fork are counted, so a
+        join is not left waiting for flows that were never taken.
+        """
+        join = self._find_join_gateway(instance.definition.compiled_graph, branch_nodes)
+        if join is None:
+            return
+        
+        tokens = dict(self._lock_join_tokens(instance) or {})
+        tokens[str(join.get('id'))] = {
+            'fork': node.get('id'),
+            'expected': len(branch_nodes),
+            'arrived': 0,
+            'data': {}
+        }
+        instance.join_tokens = tokens
+    
+    async def _enter_node(self, instance: ProcessInstance, node: Dict[str, Any],
+                          input_data: Dict[str, Any]):
+        """Execute a node reached by a flow, waiting on join gateways first."""
+        if self._is_join_gateway(instance.definition.compiled_graph, node):
+            input_data = self._arrive_at_join(instance, node, input_data)
+            if input_data is None:
+                # Other branches still running; the last one to arrive continues
+                return
+        
+        await self._execute_node(instance, node, input_data)
+    
+    def _lock_join_tokens(self, instance: ProcessInstance) -> Optional[Dict[str, Any]]:
+        """
+        Read the join tokens of an instance, locking its row.
+        
+        Branches arrive from their own sessions, so the row lock serializes
+        their read-modify-write until each branch commits. Databases without
+        row locks (SQLite) rely on _swap_join_tokens instead.
+        """
+        return db.session.query(ProcessInstance.join_tokens).filter(
+            ProcessInstance.id == instance.id
+        ).with_for_update().scalar()
+    
+    def _swap_join_tokens(self, instance: ProcessInstance, expected: Optional[Dict[str, Any]],
+                          tokens: Dict[str, Any]) -> bool:
+        """
+        Write new join tokens only if the stored ones are still those read.
+        
+        Returns:
+            False if another branch changed the tokens in the meantime
+        """
+        query = db.session.query(ProcessInstance).filter(ProcessInstance.id == instance.id)
+        if expected is None:
+            query = query.filter(ProcessInstance.join_tokens.is_(None))
+        else:
+            query = query.filter(ProcessInstance.join_tokens == expected)
+        return query.update({ProcessInstance.join_tokens: tokens}, synchronize_session=False) == 1
+    
+    def _arrive_at_join(self, instance: ProcessInstance, node: Dict[str, Any],
+                        input_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Register a branch token at a join gateway.
+        
+        The arrival is stored on the instance and written with the step of
+        the arriving branch, so a resumed or restarted engine picks up the
+        join where it was left.
+        
+        Returns:
+            Merged data of all branches once every activated branch has
+            arrived, None while the join is still waiting
+        """
+        node_id = str(node.get('id'))
+        for _ in range(max(1, self.config['join_update_retries'])):
+            stored = self._lock_join_tokens(instance)
+            tokens = dict(stored or {})
+            join = tokens.get(node_id) or {
+                # Not reached from a tracked fork; wait for every incoming flow
+                'expected': len(instance.definition.compiled_graph.get_incoming_edges(node.get('id'))),
+                'arrived': 0,
+                'data': {}
+            }
+            join = dict(join, arrived=join['arrived'] + 1, data=dict(join['data'], **(input_data or {})))
+            
+            if join['arrived'] < join['expected']:
+                tokens[node_id] = join
+                merged = None
+            else:
+                tokens.pop(node_id, None)
+                merged = join['data']
+            
+            # Compare-and-set, so two branches never both see themselves as last
+            if self._swap_join_tokens(instance, stored, tokens):
+                break
+        else:
+            raise ProcessExecutionError(
+                f"Could not record arrival at join {node_id}, join tokens kept changing",
+                instance.id, node_id
+            )
+        
+        instance.join_tokens = tokens
+        self._commit_step()
+        return merged
+    
+    @staticmethod
+    def _clear_join_tokens(instance: ProcessInstance):
+        """Drop pending join tokens of a finished instance."""
+        instance.join_tokens = {}
+    
+    def _flush_pending_writes(self):
+        """Commit the writes of the current run so other sessions see them."""
+        unit_of_work = _current_unit_of_work.get()
+        if unit_of_work is not None:
+            unit_of_work.flush()
+        else:
+            db.session.commit()
+    
+    def _get_branch_executor(self) -> ThreadPoolExecutor:
+        """Return the engine-wide worker pool for parallel branches."""
+        with self._lock:
+            if self._branch_executor is None:
+                self._branch_executor = ThreadPoolExecutor(
+                    max_workers=max(1, self.config['max_branch_workers']),
+                    thread_name_prefix='process-branch'
+                )
+            return self._branch_executor
+    
+    def shutdown(self, wait: bool = True):
+        """Stop the parallel branch workers and write buffered process contexts."""
+        with self._lock:
+            executor, self._branch_executor = self._branch_executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+        self.context_manager.shutdown()
+    
+    async def _execute_parallel_branches(self, instance: ProcessInstance,
+                                         branch_nodes: List[Dict[str, Any]],
+                                         output_data: Dict[str, Any]):
+        """
+        Run parallel gateway branches concurrently.
+        
+        Each branch runs in a worker thread with its own application context,
+        so it gets its own database session and event loop. Wall-clock time
+        follows the slowest branch instead of the sum of all branches. All
+        forks share one pool of max_branch_workers threads, and at most
+        max_parallel_branches branches of an instance run at once; forks
+        nested inside a branch run their branches in turn on the branch's
+        worker, so they cannot starve the pool waiting on themselves.
+        """
+        # Branches use their own sessions, so make this run's writes visible first
+        self._flush_pending_writes()
+        
+        if _in_parallel_branch.get():
+            for node in branch_nodes:
+                await self._enter_node(instance, node, dict(output_data))
+            return
+        
+        app = current_app._get_current_object()
+        loop = asyncio.get_running_loop()
+        pool = self._get_branch_executor()
+        slots = asyncio.Semaphore(max(1, self.config['max_parallel_branches']))
+        tenant_id = instance.tenant_id
+        
+        async def run(node):
+            async with slots:
+                return await loop.run_in_executor(
+                    pool, self._run_branch, app, instance.id, node, dict(output_data), tenant_id
+                )
+        
+        results = await asyncio.gather(*[run(node) for node in branch_nodes], return_exceptions=True)
+        
+        # Branches committed through their own sessions
+        db.session.expire(instance)
+        
+        errors = [r for r in results if isinstance(r, BaseException)]
+        for error in errors:
+            log.error(f"Parallel branch failed for instance {instance.id}: {str(error)}")
+        if errors:
+            raise errors[0]
+    
+    def _run_branch(self, app, instance_id: int, node: Dict[str, Any],
+                    input_data: Dict[str, Any], tenant_id: Optional[int] = None):
+        """Execute one parallel branch in the calling worker thread, in the instance's tenant."""
+        with app.app_context():
+            g.current_tenant_id = tenant_id
+            token = _in_parallel_branch.set(True)
+            try:
+                instance = db.session.query(ProcessInstance).get(instance_id)
+                if not instance:
+                    raise ProcessExecutionError(f"Process instance {instance_id} not found", instance_id)
+                return asyncio.run(self._enter_node(instance, node, input_data))
+            finally:
+                _in_parallel_branch.reset(token)
+                db.session.remove()
+    
     async def _evaluate_edge_condition(self, edge: Dict[str, Any], 
                                      context_data: Dict[str, Any]) -> bool:
         """Evaluate edge condition to determine if flow should continue."""
-        condition = edge.get('condition')
-        if not condition:
-            return True  # No condition means always follow this edge
-        
-        try:
-            # Simple condition evaluation (can be extended for complex expressions)
-            if isinstance(condition, dict):
-                field = condition.get('field')
-                operator = condition.get('operator', '==')
-                value = condition.get('value')
-                
-                if field not in context_data:
-                    return False
-                
-                actual_value = context_data[field]
-                
-                if operator == '==':
-                    return actual_value == value
-                elif operator == '!=':
-                    return actual_value != value
-                elif operator == '>':
-                    return actual_value > value
-                elif operator == '>=':
-                    return actual_value >= value
-                elif operator == '<':
-                    return actual_value < value
-                elif operator == '<=':
-                    return actual_value <= value
-                elif operator == 'in':
-                    return actual_value in value
-                elif operator == 'not_in':
-                    return actual_value not in value
-            
-            return True
-            
-        except Exception as e:
-            log.warning(f"Error evaluating edge condition: {str(e)}")
-            return False
+        return compile_edge_condition(edge.get('condition'))(context_data)
     
     async def _complete_process_instance(self, instance: ProcessInstance):
         """Mark process instance as completed."""
         try:
             instance.status = ProcessInstanceStatus.COMPLETED.value
             instance.completed_at = datetime.utcnow()
+            self._clear_join_tokens(instance)
             instance.update_activity()
             
             # Update context with final state
@@ -433,6 +735,7 @@ class ProcessEngine:
         try:
             instance.status = ProcessInstanceStatus.FAILED.value
             instance.last_error = error_message
+            self._clear_join_tokens(instance)
             instance.error_count += 1
             instance.update_activity()
             
@@ -564,10 +867,24 @@ class ProcessEngine:
     async def _log_process_event(self, instance_id: int, level: str, event_type: str,
                                 message: str, step_id: int = None, node_id: str = None,
                                 user_id: int = None, execution_time: float = None,
-                                error_details: Dict[str, Any] = None):
-        """Log process execution event."""
+                                error_details: Dict[str, Any] = None,
+                                step: ProcessStep = None):
+        """
+        Log process execution event.
+        
+        Inside a unit of work the row is queued and bulk inserted when the
+        unit of work flushes; ``step`` lets its id be resolved at that point.
+        Rows are stamped with the tenant of the instance, so events logged
+        outside a request (branch threads, Celery tasks) keep their tenant.
+        """
         try:
-            log_entry = ProcessLog(
+            tenant_id = get_current_tenant_id()
+            if tenant_id is None:
+                # Identity map lookup, the instance is normally already loaded
+                instance = db.session.query(ProcessInstance).get(instance_id)
+                tenant_id = instance.tenant_id if instance is not None else None
+            
+            values = dict(
                 process_instance_id=instance_id,
                 process_step_id=step_id,
                 timestamp=datetime.utcnow(),
@@ -578,10 +895,17 @@ class ProcessEngine:
                 node_id=node_id,
                 execution_time=execution_time,
                 details=error_details or {},
-                tenant_id=get_current_tenant_id()
+                tenant_id=tenant_id
             )
             
-            db.session.add(log_entry)
+            unit_of_work = _current_unit_of_work.get()
+            if unit_of_work is not None:
+                unit_of_work.add_log(step, values)
+                return
+            
+            if step is not None:
+                values['process_step_id'] = step.id
+            db.session.add(ProcessLog(**values))
             db.session.commit()
             
         except Exception as e:
@@ -673,6 +997,7 @@ class ProcessEngine:
             # Update instance status
             instance.status = ProcessInstanceStatus.CANCELLED.value
             instance.completed_at = datetime.utcnow()
+            self._clear_join_tokens(instance)
             instance.update_activity()
             db.session.commit()
             
@@ -15,6 +15,7 @@ from .process_models import (
     ProcessTemplate,
     ProcessMetric
 )
+from .process_graph import CompiledProcessGraph, get_compiled_graph
 
 __all__ = [
     'ProcessDefinition',
@@ -24,5 +25,7 @@ __all__ = [
     'ApprovalRequest',
     'SmartTrigger',
     'ProcessTemplate',
-    'ProcessMetric'
+    'ProcessMetric',
+    'CompiledProcessGraph',
+    'get_compiled_graph'
 ]
\ No newline at end of file
@@ -0,0 +1,236 @@
+"""
+Compiled process graph.
+
+Turns the JSON ``process_graph`` stored on process and subprocess
+definitions into indexed lookup tables so that navigating the graph during
+execution is O(1) per node or edge instead of a scan of the node and edge
+lists. Compiled graphs are cached per definition and version.
+"""
+
+import logging
+import operator
+import threading
+from collections import OrderedDict, namedtuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+#: Outgoing transition: the edge itself, its resolved target node and the
+#: compiled edge condition (a callable taking the context data).
+ProcessTransition = namedtuple('ProcessTransition', ['edge', 'target', 'condition'])
+
+_CONDITION_OPERATORS = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '>': operator.gt,
+    '>=': operator.ge,
+    '<': operator.lt,
+    '<=': operator.le,
+    'in': lambda actual, expected: actual in expected,
+    'not_in': lambda actual, expected: actual not in expected,
+}
+
+
+def _always_true(context_data: Dict[str, Any]) -> bool:
+    return True
+
+
+def compile_edge_condition(condition: Any) -> Callable[[Dict[str, Any]], bool]:
+    """
+    Compile an edge condition into a predicate over the context data.
+
+    Supports the ``{'field', 'operator', 'value'}`` form and the
+    ``{'expression': ...}`` form, compiled with the shared safe expression
+    compiler. Edges without a condition, and conditions in a form that is not
+    understood, always pass. A field missing from the context, an invalid
+    expression, or an evaluation that raises, fails.
+
+    Args:
+        condition: The ``condition`` value of an edge
+
+    Returns:
+        Callable taking the context data dictionary and returning a bool
+    """
+    if not condition or not isinstance(condition, dict):
+        return _always_true
+
+    if condition.get('expression'):
+        return _compile_expression_condition(condition['expression'])
+
+    field = condition.get('field')
+    compare = _CONDITION_OPERATORS.get(condition.get('operator', '=='))
+    if compare is None:
+        return _always_true
+    expected = condition.get('value')
+
+    def predicate(context_data: Dict[str, Any]) -> bool:
+        if field not in context_data:
+            return False
+        try:
+            return bool(compare(context_data[field], expected))
+        except Exception as e:
+            log.warning(f"Error evaluating edge condition: {str(e)}")
+            return False
+
+    return predicate
+
+
+def _never_true(context_data: Dict[str, Any]) -> bool:
+    return False
+
+
+def _compile_expression_condition(expression: str) -> Callable[[Dict[str, Any]], bool]:
+    # Imported lazily, the engine package imports the models
+    from ..engine.expression_compiler import ExpressionCompileError, compile_template
+
+    try:
+        template = compile_template(expression)
+    except ExpressionCompileError as e:
+        log.warning(f"Invalid edge condition expression '{expression}': {str(e)}")
+        return _never_true
+
+    def predicate(context_data: Dict[str, Any]) -> bool:
+        try:
+            # ${name} references are bound from the context data
+            return bool(template.evaluate(context_data, context_data))
+        except Exception as e:
+            log.warning(f"Error evaluating edge condition: {str(e)}")
+            return False
+
+    return predicate
+
+
+class CompiledProcessGraph:
+    """
+    Indexed, read-only view of a process graph.
+
+    Builds node-by-id, outgoing and incoming adjacency maps once and
+    resolves each outgoing edge to its target node and compiled condition.
+    The node and edge dictionaries are shared with the source graph, not
+    copied.
+    """
+
+    __slots__ = ('nodes', 'edges', 'nodes_by_id', 'outgoing', 'incoming',
+                 'transitions', 'start_nodes')
+
+    def __init__(self, graph: Optional[Dict[str, Any]]):
+        graph = graph or {}
+        self.nodes: List[Dict[str, Any]] = list(graph.get('nodes', []))
+        self.edges: List[Dict[str, Any]] = list(graph.get('edges', []))
+
+        self.nodes_by_id: Dict[Any, Dict[str, Any]] = {}
+        for node in self.nodes:
+            # First definition wins, matching the previous linear lookup
+            self.nodes_by_id.setdefault(node.get('id'), node)
+
+        self.start_nodes = [n for n in self.nodes if n.get('type') == 'start']
+
+        self.outgoing: Dict[Any, List[Dict[str, Any]]] = {}
+        self.incoming: Dict[Any, List[Dict[str, Any]]] = {}
+        self.transitions: Dict[Any, List[ProcessTransition]] = {}
+        for edge in self.edges:
+            source = edge.get('source')
+            target = edge.get('target')
+            self.outgoing.setdefault(source, []).append(edge)
+            self.incoming.setdefault(target, []).append(edge)
+            self.transitions.setdefault(source, []).append(ProcessTransition(
+                edge, self.nodes_by_id.get(target),
+                compile_edge_condition(edge.get('condition'))
+            ))
+
+    def get_node(self, node_id: Any) -> Optional[Dict[str, Any]]:
+        """Get a node by its id."""
+        return self.nodes_by_id.get(node_id)
+
+    def get_start_nodes(self) -> List[Dict[str, Any]]:
+        """Get all start nodes."""
+        return list(self.start_nodes)
+
+    def get_outgoing_edges(self, node_id: Any) -> List[Dict[str, Any]]:
+        """Get all edges leaving a node."""
+        return list(self.outgoing.get(node_id, ()))
+
+    def get_incoming_edges(self, node_id: Any) -> List[Dict[str, Any]]:
+        """Get all edges entering a node."""
+        return list(self.incoming.get(node_id, ()))
+
+    def get_transitions(self, node_id: Any) -> List[ProcessTransition]:
+        """Get the outgoing transitions of a node, in edge order."""
+        return self.transitions.get(node_id, [])
+
+    def get_successors(self, node_id: Any) -> List[Dict[str, Any]]:
+        """Get the existing target nodes of a node's outgoing edges."""
+        return [t.target for t in self.transitions.get(node_id, ()) if t.target is not None]
+
+    def has_edge(self, source_id: Any, target_id: Any) -> bool:
+        """Check whether an edge connects two nodes."""
+        return any(e.get('target') == target_id for e in self.outgoing.get(source_id, ()))
+
+
+class ProcessGraphCache:
+    """
+    Thread-safe LRU cache of compiled graphs.
+
+    Entries are keyed by definition type, id and version and are recompiled
+    when the definition's ``changed_on`` stamp moves, so in-place edits of a
+    draft definition are picked up without a version bump.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._entries: 'OrderedDict[Tuple, Tuple[Any, CompiledProcessGraph]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(definition) -> Optional[Tuple]:
+        definition_id = getattr(definition, 'id', None)
+        if definition_id is None:
+            return None
+        return (type(definition).__name__, definition_id, getattr(definition, 'version', None))
+
+    def get(self, definition) -> CompiledProcessGraph:
+        """Get the compiled graph of a definition, compiling it if needed."""
+        key = self._key(definition)
+        if key is None:
+            # Unsaved definitions have no stable identity to cache under
+            return CompiledProcessGraph(definition.process_graph)
+
+        stamp = getattr(definition, 'changed_on', None)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == stamp:
+                self._entries.move_to_end(key)
+                return entry[1]
+
+        compiled = CompiledProcessGraph(definition.process_graph)
+        with self._lock:
+            self._entries[key] = (stamp, compiled)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return compiled
+
+    def invalidate(self, definition) -> None:
+        """Drop the cached graph of a definition."""
+        key = self._key(definition)
+        if key is not None:
+            with self._lock:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all cached graphs."""
+        with self._lock:
+            self._entries.clear()
+
+
+_graph_cache = ProcessGraphCache()
+
+
+def get_compiled_graph(definition) -> CompiledProcessGraph:
+    """Get the cached compiled graph for a process or subprocess definition."""
+    return _graph_cache.get(definition)
+
+
+def invalidate_compiled_graph(definition) -> None:
+    """Drop the cached compiled graph for a definition."""
+    _graph_cache.invalidate(definition)
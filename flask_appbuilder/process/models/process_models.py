@@ -25,6 +25,10 @@ from flask_appbuilder import Model
 from flask_appbuilder.models.mixins import AuditMixin
 from flask_appbuilder.models.tenant_models import TenantAwareMixin
 
+from .process_graph import (
+    CompiledProcessGraph, get_compiled_graph, invalidate_compiled_graph
+)
+
 log = logging.getLogger(__name__)
 
 
@@ -181,25 +185,29 @@ class ProcessDefinition(TenantAwareMixin, AuditMixin, Model):
             if edge['source'] not in node_ids or edge['target'] not in node_ids:
                 raise ValueError("Edge source/target must reference existing nodes")
         
+        invalidate_compiled_graph(self)
         return graph
     
+    @property
+    def compiled_graph(self) -> CompiledProcessGraph:
+        """Indexed process graph, cached per definition id and version."""
+        return get_compiled_graph(self)
+    
     def get_start_nodes(self) -> List[Dict[str, Any]]:
         """Get all start nodes in the process."""
-        nodes = self.process_graph.get('nodes', [])
-        return [n for n in nodes if n.get('type') == 'start']
+        return self.compiled_graph.get_start_nodes()
     
     def get_node_by_id(self, node_id: str) -> Optional[Dict[str, Any]]:
         """Get node by ID."""
-        nodes = self.process_graph.get('nodes', [])
-        for node in nodes:
-            if node.get('id') == node_id:
-                return node
-        return None
+        return self.compiled_graph.get_node(node_id)
     
     def get_outgoing_edges(self, node_id: str) -> List[Dict[str, Any]]:
         """Get all outgoing edges from a node."""
-        edges = self.process_graph.get('edges', [])
-        return [e for e in edges if e.get('source') == node_id]
+        return self.compiled_graph.get_outgoing_edges(node_id)
+    
+    def get_incoming_edges(self, node_id: str) -> List[Dict[str, Any]]:
+        """Get all incoming edges to a node."""
+        return self.compiled_graph.get_incoming_edges(node_id)
     
     def __repr__(self):
         return f'<ProcessDefinition {self.name} v{self.version} ({self.status})>'
@@ -236,6 +244,7 @@ class ProcessInstance(TenantAwareMixin, AuditMixin, Model):
     input_data = Column(JSONB, default=lambda: {})  # Initial input data
     output_data = Column(JSONB, default=lambda: {})  # Final output data
     variables = Column(JSONB, default=lambda: {})  # Process variables
+    join_tokens = Column(JSONB, default=lambda: {})  # Branch arrivals at parallel joins, by join node id
     
     # Execution tracking
     started_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -253,6 +262,9 @@ class ProcessInstance(TenantAwareMixin, AuditMixin, Model):
     last_error = Column(Text)
     retry_count = Column(Integer, default=0)
     
+    # Number of steps created so far, used for step execution order
+    step_counter = Column(Integer, default=0, server_default='0', nullable=False)
+    
     # Parent/child process relationships
     parent_instance_id = Column(Integer, ForeignKey('ab_process_instances.id'))
     
@@ -1039,6 +1051,12 @@ class SubprocessDefinition(TenantAwareMixin, AuditMixin, Model):
             raise ValueError(f"Invalid subprocess type: {subprocess_type}")
         return subprocess_type
     
+    @validates('process_graph')
+    def validate_process_graph(self, key, graph):
+        """Drop the cached compiled graph when the graph is replaced."""
+        invalidate_compiled_graph(self)
+        return graph
+    
     def validate_parameters(self, input_data: Dict[str, Any]) -> bool:
         """Validate input parameters against schema."""
         if not self.interface_schema:
@@ -1051,10 +1069,14 @@ class SubprocessDefinition(TenantAwareMixin, AuditMixin, Model):
         except Exception:
             return False
     
+    @property
+    def compiled_graph(self) -> CompiledProcessGraph:
+        """Indexed subprocess graph, cached per definition id and version."""
+        return get_compiled_graph(self)
+    
     def get_node_by_id(self, node_id: str) -> Optional[Dict[str, Any]]:
         """Get node by ID from subprocess graph."""
-        nodes = self.process_graph.get('nodes', [])
-        return next((node for node in nodes if node.get('id') == node_id), None)
+        return self.compiled_graph.get_node(node_id)
     
     def __repr__(self):
         return f'<SubprocessDefinition {self.name} v{self.version} ({self.subprocess_type})>'
@@ -5,10 +5,15 @@ This module provides comprehensive audit logging, security controls, and
 monitoring for multi-tenant Flask-AppBuilder applications.
 """
 
+import atexit
+import contextlib
 import logging
 import json
 import hashlib
 import ipaddress
+import os
+import tempfile
+import time
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional, Union
 from functools import wraps
@@ -16,10 +21,16 @@ from dataclasses import dataclass
 from enum import Enum
 import threading
 
-from flask import request, g, current_app, jsonify, session
+try:
+    import fcntl
+except ImportError:  # Windows, spool files are only locked within the process
+    fcntl = None
+
+from flask import request, g, current_app, jsonify, session, has_app_context
 from flask_login import current_user
 from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Index
 from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.declarative import declared_attr
 
 from flask_appbuilder import Model
@@ -219,22 +230,67 @@ class TenantSecurityPolicy(AuditMixin, Model):
         return f'<TenantSecurityPolicy {self.tenant_id}>'
 
 
+def _spool_default(value):
+    """JSON encoder fallback for spooled audit rows."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+@contextlib.contextmanager
+def _spool_file_lock(path: str, blocking: bool = True):
+    """
+    Hold an exclusive lock shared with the other processes using the spool.
+    
+    Yields whether the lock was acquired, which is always the case when
+    blocking.
+    """
+    if fcntl is None:
+        yield True
+        return
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'a') as lock_file:
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
 class SecurityAuditLogger:
-    """Core security audit logging system."""
+    """
+    Core security audit logging system.
+    
+    Request threads only append rows to an in-memory buffer. A dedicated
+    writer thread swaps the buffer out and inserts it with one executemany;
+    batches that cannot be written are appended to a local spool file and
+    replayed once the database accepts writes again. The spool may be shared
+    by several processes: appends are serialized with a file lock and only
+    one process replays it at a time.
+    """
     
-    def __init__(self):
+    def __init__(self, spool_path: Optional[str] = None):
         self._event_buffer = []
         self._buffer_lock = threading.Lock()
+        self._write_lock = threading.Lock()  # Held by whoever writes to the database
+        self._spool_lock = threading.Lock()
+        self._flush_requested = threading.Event()
         self._max_buffer_size = 1000
-        self._critical_buffer_size = 1500  # Hard limit to prevent memory exhaustion
+        self._critical_buffer_size = 1500  # Beyond this, events are spooled to disk instead
         self._auto_flush_interval = 30  # seconds
         self._last_flush = datetime.utcnow()
         self._suspicious_patterns = {}
         self._flush_failure_count = 0
-        self._max_flush_failures = 5  # After this many failures, start dropping events
+        self._spool_path = spool_path
+        self._app = None
         
-        # Start background flush thread
+        # Start background writer thread
         self._start_flush_thread()
+        atexit.register(self._flush_on_exit)
     
     def log_event(self, event: AuditEvent):
         """Log a security audit event."""
@@ -243,44 +299,47 @@ class SecurityAuditLogger:
             event_data = f"{event.timestamp.isoformat()}:{event.tenant_id}:{event.user_id}:{event.action}"
             event_id = hashlib.sha256(event_data.encode()).hexdigest()
             
-            # Create database record
-            audit_record = SecurityAuditLog(
-                event_type=event.event_type.value,
-                event_id=event_id,
-                tenant_id=event.tenant_id,
-                user_id=event.user_id,
-                session_id=event.session_id,
-                resource_type=event.resource_type,
-                resource_id=event.resource_id,
-                action=event.action,
-                details=event.details,
-                ip_address=event.ip_address,
-                user_agent=event.user_agent,
-                request_method=request.method if request else None,
-                request_path=request.path if request else None,
-                request_params=dict(request.args) if request else {},
-                risk_level=event.risk_level.value,
-                success=event.success,
-                error_message=event.error_message,
-                timestamp=event.timestamp
-            )
+            # Capture everything that needs the request context now, the
+            # writer thread runs outside of it
+            user_id = SecurityAuditLog.get_user_id()
+            audit_row = {
+                'event_type': event.event_type.value,
+                'event_id': event_id,
+                'tenant_id': event.tenant_id,
+                'user_id': event.user_id,
+                'session_id': event.session_id,
+                'resource_type': event.resource_type,
+                'resource_id': event.resource_id,
+                'action': event.action,
+                'details': event.details,
+                'ip_address': event.ip_address,
+                'user_agent': event.user_agent,
+                'request_method': request.method if request else None,
+                'request_path': request.path if request else None,
+                'request_params': dict(request.args) if request else {},
+                'risk_level': event.risk_level.value,
+                'success': event.success,
+                'error_message': event.error_message,
+                'timestamp': event.timestamp,
+                'created_by_fk': user_id,
+                'changed_by_fk': user_id,
+            }
+            if self._app is None and has_app_context():
+                self._app = current_app._get_current_object()
             
-            # Buffer the event for batch processing
+            # Buffer the event; the writer thread does the database work
+            overflow = None
             with self._buffer_lock:
-                # Check for critical buffer overflow condition
+                self._event_buffer.append(audit_row)
                 if len(self._event_buffer) >= self._critical_buffer_size:
-                    log.error(f"Audit buffer overflow detected! Dropping oldest events. "
-                            f"Buffer size: {len(self._event_buffer)}, Critical limit: {self._critical_buffer_size}")
-                    # Drop oldest 20% of events to make room
-                    drop_count = len(self._event_buffer) // 5
-                    self._event_buffer = self._event_buffer[drop_count:]
-                    log.warning(f"Dropped {drop_count} oldest audit events to prevent memory exhaustion")
-                
-                self._event_buffer.append(audit_record)
-                
-                # Flush if buffer reaches normal limit
-                if len(self._event_buffer) >= self._max_buffer_size:
-                    self._flush_events()
+                    overflow, self._event_buffer = self._event_buffer, []
+                elif len(self._event_buffer) >= self._max_buffer_size:
+                    self._flush_requested.set()
+            
+            if overflow:
+                # The writer is stuck on the database, keep memory bounded
+                log.warning(f"Audit writer is falling behind, spooling {len(overflow)} events to disk")
+                self._spool(overflow)
             
             # Check for suspicious patterns
             self._analyze_security_patterns(event)
@@ -295,7 +354,6 @@ class SecurityAuditLogger:
             # If individual event logging fails, we don't want to crash the application
             # Log the error and continue - this prevents audit system issues from 
             # bringing down the entire application
-    
     def log_authentication(self, event_type: AuditEventType, user_id: Optional[int], 
                           success: bool, details: Dict[str, Any] = None):
         """Log authentication-related events."""
@@ -523,92 +581,161 @@ class SecurityAuditLogger:
                 ))
     
     def _flush_events(self):
-        """Flush buffered events to database with proper overflow protection."""
-        if not self._event_buffer:
-            return
+        """Swap out the buffered events and write them, spooling them on failure."""
+        with self._buffer_lock:
+            events_to_flush, self._event_buffer = self._event_buffer, []
+            self._flush_requested.clear()
         
-        try:
-            from flask_appbuilder import db
-            
-            events_to_flush = self._event_buffer.copy()
-            self._event_buffer.clear()
-            
-            # Bulk insert
-            db.session.bulk_save_objects(events_to_flush)
-            db.session.commit()
+        with self._write_lock:
+            if events_to_flush:
+                try:
+                    self._insert_rows(events_to_flush)
+                except Exception as e:
+                    self._flush_failure_count += 1
+                    log.error(f"Failed to flush audit events (attempt {self._flush_failure_count}): {e}. "
+                              f"Spooling {len(events_to_flush)} events to disk")
+                    self._spool(events_to_flush)
+                    return
+                log.debug(f"Flushed {len(events_to_flush)} audit events to database")
             
-            log.debug(f"Flushed {len(events_to_flush)} audit events to database")
+            self._replay_spool()
             self._last_flush = datetime.utcnow()
             self._flush_failure_count = 0  # Reset failure counter on success
-            
-        except Exception as e:
-            log.error(f"Failed to flush audit events: {e}")
-            self._flush_failure_count += 1
-            
-            # Implement progressive backoff and event dropping for persistent failures
-            if self._flush_failure_count >= self._max_flush_failures:
-                log.critical(f"Audit flush has failed {self._flush_failure_count} times. "
-                           f"Dropping {len(events_to_flush)} events to prevent memory exhaustion.")
-                # Don't re-add events after multiple failures - drop them to prevent overflow
-                return
-            
-            # For early failures, re-add events but with bounds checking
-            current_buffer_size = len(self._event_buffer)
-            events_to_readd = events_to_flush
-            
-            # Ensure we don't exceed critical buffer size when re-adding
-            max_events_to_readd = self._critical_buffer_size - current_buffer_size
-            if len(events_to_readd) > max_events_to_readd > 0:
-                log.warning(f"Buffer overflow protection: Only re-adding {max_events_to_readd} "
-                          f"of {len(events_to_readd)} failed events to prevent memory exhaustion")
-                # Keep the most recent events (they're likely more important)
-                events_to_readd = events_to_readd[-max_events_to_readd:]
-            elif max_events_to_readd <= 0:
-                log.warning(f"Buffer full, dropping all {len(events_to_readd)} failed flush events")
+    
+    def _insert_rows(self, rows: List[Dict[str, Any]]):
+        """Insert rows with a single executemany, isolating rows the database rejects."""
+        from flask_appbuilder import db
+        
+        table = SecurityAuditLog.__table__
+        app_context = self._app.app_context() if self._app else contextlib.nullcontext()
+        with app_context:
+            try:
+                with db.engine.begin() as conn:
+                    conn.execute(table.insert(), rows)
                 return
+            except IntegrityError:
+                pass
             
-            # Re-add events with bounds protection
-            self._event_buffer.extend(events_to_readd)
-            log.info(f"Re-added {len(events_to_readd)} events to buffer after flush failure "
-                   f"(attempt {self._flush_failure_count}/{self._max_flush_failures})")
+            # A duplicate or invalid row must not block the rest of the batch
+            rejected = []
+            with db.engine.connect() as conn:
+                for row in rows:
+                    try:
+                        with conn.begin():
+                            conn.execute(table.insert(), row)
+                    except IntegrityError as e:
+                        log.error(f"Audit event {row.get('event_id')} rejected by database: {e}")
+                        rejected.append(row)
+        
+        if rejected:
+            self._spool(rejected, self._get_spool_path() + '.rejected')
+    
+    def _get_spool_path(self) -> str:
+        """Path of the local spool file for events that could not be written."""
+        path = self._spool_path
+        if not path and self._app is not None:
+            path = self._app.config.get(
+                'AUDIT_SPOOL_PATH',
+                os.path.join(self._app.instance_path, 'security_audit.spool')
+            )
+        return path or os.path.join(tempfile.gettempdir(), 'security_audit.spool')
+    
+    def _spool(self, rows: List[Dict[str, Any]], path: Optional[str] = None):
+        """Append rows to the spool file, one JSON document per line."""
+        path = path or self._get_spool_path()
+        lines = ''.join(json.dumps(row, default=_spool_default) + '\n' for row in rows)
+        try:
+            with self._spool_lock, _spool_file_lock(self._get_spool_path() + '.lock'):
+                os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+                with open(path, 'a', encoding='utf-8') as spool:
+                    spool.write(lines)
+                    spool.flush()
+                    os.fsync(spool.fileno())
+        except OSError as e:
+            log.critical(f"Failed to spool {len(rows)} audit events to {path}: {e}")
+    
+    def _replay_spool(self):
+        """Write spooled events to the database, called with the write lock held."""
+        path = self._get_spool_path()
+        # Another process replaying the spool already writes these rows
+        with _spool_file_lock(path + '.replay.lock', blocking=False) as acquired:
+            if acquired:
+                self._replay_spool_file(path)
+    
+    def _replay_spool_file(self, path: str):
+        """Replay the spool at path, with the replay lock held."""
+        replay_path = path + '.replay'
+        
+        # Take the current spool aside so new failures can keep appending
+        with self._spool_lock, _spool_file_lock(path + '.lock'):
+            if not os.path.exists(replay_path):
+                if not os.path.exists(path):
+                    return
+                os.replace(path, replay_path)
+        
+        with open(replay_path, encoding='utf-8') as spool:
+            rows = []
+            corrupt = []
+            for line_number, line in enumerate(spool, 1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                    row['timestamp'] = datetime.fromisoformat(row['timestamp'])
+                except (ValueError, KeyError, TypeError) as e:
+                    # A torn or corrupted line must not block the rest of the spool
+                    log.warning(f"Skipping unreadable spooled audit event at {replay_path}:{line_number}: {e}")
+                    corrupt.append(line if line.endswith('\n') else line + '\n')
+                    continue
+                rows.append(row)
+        
+        if corrupt:
+            self._quarantine_spool_lines(corrupt, path + '.corrupt')
+        
+        try:
+            for start in range(0, len(rows), self._max_buffer_size):
+                self._insert_rows(rows[start:start + self._max_buffer_size])
+        except Exception as e:
+            # Rows from earlier chunks may be replayed again, duplicates are rejected by event_id
+            log.warning(f"Failed to replay spooled audit events, will retry: {e}")
+            return
+        
+        os.remove(replay_path)
+        log.info(f"Replayed {len(rows)} spooled audit events")
+    
+    def _quarantine_spool_lines(self, lines: List[str], path: str):
+        """Keep spool lines that cannot be read aside for inspection."""
+        try:
+            with self._spool_lock, _spool_file_lock(self._get_spool_path() + '.lock'):
+                with open(path, 'a', encoding='utf-8') as quarantine:
+                    quarantine.writelines(lines)
+                    quarantine.flush()
+                    os.fsync(quarantine.fileno())
+        except OSError as e:
+            log.critical(f"Failed to quarantine {len(lines)} spooled audit events to {path}: {e}")
     
     def _start_flush_thread(self):
-        """Start background thread for periodic event flushing."""
+        """Start background thread that writes buffered events."""
         def flush_worker():
             while True:
                 try:
-                    time_since_flush = (datetime.utcnow() - self._last_flush).total_seconds()
-                    
-                    # More aggressive flushing if buffer is getting full or we have failures
-                    flush_threshold = self._auto_flush_interval
-                    with self._buffer_lock:
-                        buffer_size = len(self._event_buffer)
-                        
-                        # Reduce flush interval if buffer is getting full
-                        if buffer_size > self._max_buffer_size * 0.8:
-                            flush_threshold = 10  # Flush every 10 seconds if 80% full
-                        elif buffer_size > self._max_buffer_size * 0.5:
-                            flush_threshold = 15  # Flush every 15 seconds if 50% full
-                        
-                        # Force flush if approaching critical size regardless of time
-                        if (buffer_size >= self._max_buffer_size or 
-                            time_since_flush >= flush_threshold):
-                            self._flush_events()
-                    
-                    # Adaptive sleep based on buffer state
-                    if buffer_size > self._max_buffer_size * 0.8:
-                        time.sleep(5)  # Check more frequently when buffer is nearly full
-                    else:
-                        time.sleep(10)  # Normal check interval
-                    
+                    # Woken early by log_event once the buffer reaches its limit
+                    self._flush_requested.wait(self._auto_flush_interval)
+                    self._flush_events()
                 except Exception as e:
                     log.error(f"Audit flush thread error: {e}")
                     time.sleep(60)  # Wait longer on error
         
-        import threading
-        flush_thread = threading.Thread(target=flush_worker, daemon=True)
+        flush_thread = threading.Thread(target=flush_worker, name='security-audit-writer', daemon=True)
         flush_thread.start()
     
+    def _flush_on_exit(self):
+        """Write or spool whatever is still buffered when the process exits."""
+        try:
+            self._flush_events()
+        except Exception as e:
+            log.error(f"Failed to flush audit events on exit: {e}")
+    
     def _send_security_alert(self, event: AuditEvent):
         """Send security alert for critical events."""
         # This would integrate with notification system
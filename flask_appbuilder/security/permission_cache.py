@@ -0,0 +1,129 @@
+"""
+Compiled, in-process permission cache for the security manager.
+
+Each role is compiled once into an immutable ``frozenset`` of
+``(permission_name, view_menu_name)`` tuples, so an access check becomes a
+set lookup instead of a multi-table join. Entries are stamped with a
+version that the security manager bumps whenever roles or permissions
+change, which discards every compiled set at once.
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, FrozenSet, Iterable, Optional, Set, Tuple
+import weakref
+
+log = logging.getLogger(__name__)
+
+PermissionTuple = Tuple[str, str]
+RolePermissionLoader = Callable[[Iterable[int]], Dict[int, Set[PermissionTuple]]]
+
+
+class PermissionCache:
+    """
+    Version-stamped cache of compiled per-role permission sets.
+
+    :param loader: Callable receiving a list of role ids and returning a dict
+        of ``role_id -> {(permission_name, view_menu_name), ...}``. It is
+        expected to fetch every requested role in one bulk query.
+    :param ttl: Optional max age in seconds for the compiled sets. Bounds
+        staleness when roles are changed by another process. ``0`` or
+        ``None`` disables expiry.
+    """
+
+    _instances: "weakref.WeakSet[PermissionCache]" = weakref.WeakSet()
+
+    def __init__(self, loader: RolePermissionLoader, ttl: Optional[float] = None):
+        self._instances.add(self)
+        self._loader = loader
+        self._ttl = ttl or 0
+        self._lock = threading.RLock()
+        self._version = 0
+        self._built_at = time.monotonic()
+        self._roles: Dict[int, FrozenSet[PermissionTuple]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def invalidate(self) -> int:
+        """
+        Bump the version stamp and drop every compiled role set.
+
+        :return: The new version
+        """
+        with self._lock:
+            self._version += 1
+            self._roles = {}
+            self._built_at = time.monotonic()
+            log.debug("Permission cache invalidated, version %s", self._version)
+            return self._version
+
+    @classmethod
+    def invalidate_all(cls) -> None:
+        """
+        Invalidate every cache in the process, used when a committed
+        session changed roles or permissions without going through
+        the security manager
+        """
+        for cache in list(cls._instances):
+            cache.invalidate()
+
+    def _expired(self) -> bool:
+        return bool(self._ttl) and time.monotonic() - self._built_at > self._ttl
+
+    def get_role_permissions(
+        self, role_ids: Iterable[int]
+    ) -> Dict[int, FrozenSet[PermissionTuple]]:
+        """
+        Returns the compiled permission set for each role id, loading any
+        missing roles in a single call to the loader.
+        """
+        role_ids = list(role_ids)
+        if self._expired():
+            self.invalidate()
+        roles = self._roles
+        missing = [role_id for role_id in role_ids if role_id not in roles]
+        if not missing:
+            self.hits += 1
+            return {role_id: roles[role_id] for role_id in role_ids}
+
+        with self._lock:
+            version = self._version
+            loaded = self._loader(missing)
+            compiled = {
+                role_id: frozenset(loaded.get(role_id, ())) for role_id in missing
+            }
+            # Only publish if nobody invalidated while we were loading
+            if version == self._version:
+                roles = dict(self._roles)
+                roles.update(compiled)
+                self._roles = roles
+            else:
+                roles = dict(self._roles)
+                roles.update(compiled)
+            self.misses += 1
+        return {role_id: roles[role_id] for role_id in role_ids}
+
+    def has_permission(
+        self, role_ids: Iterable[int], permission_name: str, view_name: str
+    ) -> bool:
+        """
+        Checks if any of the roles holds ``permission_name`` on ``view_name``
+        """
+        key = (permission_name, view_name)
+        return any(
+            key in permissions
+            for permissions in self.get_role_permissions(role_ids).values()
+        )
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "version": self._version,
+            "roles": len(self._roles),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -1,12 +1,12 @@
 from datetime import datetime
 import json
 import logging
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 import uuid
 
-from sqlalchemy import and_, func, literal, update, select
+from sqlalchemy import and_, event, func, literal, update, select
 from sqlalchemy.engine.reflection import Inspector
-from sqlalchemy.orm import contains_eager
+from sqlalchemy.orm import contains_eager, object_session, Session
 from sqlalchemy.orm.exc import MultipleResultsFound
 from werkzeug.security import generate_password_hash
 
@@ -32,12 +32,34 @@ from ..mfa.manager_mixin import MFASecurityManagerMixin
 from ..mfa.views import MFASetupView, MFAVerificationView
 from ..mfa.auth_views import MFAEnabledAuthDBView
 from ..manager import BaseSecurityManager
+from ..permission_cache import PermissionCache
 from ... import const as c
 from ...models.sqla import Base
 from ...models.sqla.interface import SQLAInterface
 
 log = logging.getLogger(__name__)
 
+_PERMISSIONS_CHANGED = "fab_permissions_changed"
+
+
+def _flag_permissions_changed(mapper, connection, target) -> None:
+    """
+    Flags the session when a role or permission view is flushed, role
+    collection changes (granting or revoking) flush the role as updated
+    """
+    session = object_session(target)
+    if session is not None:
+        session.info[_PERMISSIONS_CHANGED] = True
+
+
+def _invalidate_on_commit(session) -> None:
+    if session.info.pop(_PERMISSIONS_CHANGED, False):
+        PermissionCache.invalidate_all()
+
+
+def _discard_on_rollback(session) -> None:
+    session.info.pop(_PERMISSIONS_CHANGED, None)
+
 
 class SecurityManager(BaseSecurityManager, MFASecurityManagerMixin):
     """
@@ -79,7 +101,17 @@ class SecurityManager(BaseSecurityManager, MFASecurityManagerMixin):
             F.A.B AppBuilder main object
         """
         super(SecurityManager, self).__init__(appbuilder)
-        
+        app = self.appbuilder.get_app
+        app.config.setdefault("FAB_PERMISSION_CACHE", True)
+        app.config.setdefault("FAB_PERMISSION_CACHE_TTL", 60)
+        self.permission_cache: Optional[PermissionCache] = None
+        if app.config["FAB_PERMISSION_CACHE"]:
+            self.permission_cache = PermissionCache(
+                self.get_roles_permission_tuples,
+                ttl=app.config["FAB_PERMISSION_CACHE_TTL"],
+            )
+            self._register_permission_cache_events()
+
         # Override auth views with MFA-enabled versions if MFA is enabled
         if self.appbuilder.app.config.get('FAB_MFA_ENABLED', False):
             self.authdbview = MFAEnabledAuthDBView
@@ -353,6 +385,7 @@ class SecurityManager(BaseSecurityManager, MFASecurityManagerMixin):
                 role.permissions = permissions
                 self.get_session.add(role)
                 self.get_session.commit()
+                self.invalidate_permission_cache()
                 log.info(c.LOGMSG_INF_SEC_ADD_ROLE, name)
                 return role
             except Exception as e:
@@ -368,6 +401,7 @@ class SecurityManager(BaseSecurityManager, MFASecurityManagerMixin):
             role.name = name
             self.get_session.merge(role)
             self.get_session.commit()
+            self.invalidate_permission_cache()
             log.info(c.LOGMSG_INF_SEC_UPD_ROLE, role)
         except Exception as e:
             log.error(c.LOGMSG_ERR_SEC_UPD_ROLE, e)
@@ -443,6 +477,62 @@ class SecurityManager(BaseSecurityManager, MFASecurityManagerMixin):
             ).scalar_one_or_none()
         )
 
+    def _register_permission_cache_events(self) -> None:
+        """
+        Invalidates the permission cache when a session that changed roles
+        or permission views commits, so role views, the REST API and
+        custom code don't need to call invalidate_permission_cache
+        """
+        for model in (self.role_model, self.permissionview_model):
+            for event_name in ("after_insert", "after_update", "after_delete"):
+                if not event.contains(model, event_name, _flag_permissions_changed):
+                    event.listen(model, event_name, _flag_permissions_changed)
+        for event_name, listener in (
+            ("after_commit", _invalidate_on_commit),
+            ("after_rollback", _discard_on_rollback),
+        ):
+            if not event.contains(Session, event_name, listener):
+                event.listen(Session, event_name, listener)
+
+    def invalidate_permission_cache(self) -> None:
+        """
+        Bumps the permission cache version, must be called after any
+        change to roles or their permissions
+        """
+        if self.permission_cache is not None:
+            self.permission_cache.invalidate()
+
+    def get_roles_permission_tuples(
+        self, role_ids: List[int]
+    ) -> Dict[int, Set[Tuple[str, str]]]:
+        """
+        Bulk loads all (permission, view_menu) name tuples for a list of
+        role id's using one single query. Used to compile the permission cache
+
+        :param role_ids: a list of Role ids
+        :return: Dict of role id to a set of (permission name, view menu name)
+        """
+        result: Dict[int, Set[Tuple[str, str]]] = {role_id: set() for role_id in role_ids}
+        rows = (
+            self.appbuilder.get_session.query(
+                assoc_permissionview_role.c.role_id,
+                self.permission_model.name,
+                self.viewmenu_model.name,
+            )
+            .select_from(self.permissionview_model)
+            .join(
+                assoc_permissionview_role,
+                self.permissionview_model.id
+                == assoc_permissionview_role.c.permission_view_id,
+            )
+            .join(self.permission_model)
+            .join(self.viewmenu_model)
+            .filter(assoc_permissionview_role.c.role_id.in_(role_ids))
+        ).all()
+        for role_id, permission_name, view_menu_name in rows:
+            result[role_id].add((permission_name, view_menu_name))
+        return result
+
     def exist_permission_on_roles(
         self, view_name: str, permission_name: str, role_ids: List[int]
     ) -> bool:
@@ -450,11 +540,18 @@ class SecurityManager(BaseSecurityManager, MFASecurityManagerMixin):
             Method to efficiently check if a certain permission exists
             on a list of role id's. This is used by `has_access`
 
+            When ``FAB_PERMISSION_CACHE`` is enabled the check is answered
+            from the compiled per-role permission sets, without queries.
+
         :param view_name: The view's name to check if exists on one of the roles
         :param permission_name: The permission name to check if exists
         :param role_ids: a list of Role ids
         :return: Boolean
         """
+        if self.permission_cache is not None:
+            return self.permission_cache.has_permission(
+                role_ids, permission_name, view_name
+            )
         q = (
             self.appbuilder.get_session.query(self.permissionview_model)
             .join(
@@ -767,6 +864,7 @@ class SecurityManager(BaseSecurityManager, MFASecurityManagerMixin):
             # delete permission on view
             self.get_session.delete(pv)
             self.get_session.commit()
+            self.invalidate_permission_cache()
             # if no more permission on permission view, delete permission
             if not cascade:
                 return
@@ -807,6 +905,7 @@ class SecurityManager(BaseSecurityManager, MFASecurityManagerMixin):
                 role.permissions.append(perm_view)
                 self.get_session.merge(role)
                 self.get_session.commit()
+                self.invalidate_permission_cache()
                 log.info(c.LOGMSG_INF_SEC_ADD_PERMROLE, perm_view, role.name)
             except Exception as e:
                 log.error(c.LOGMSG_ERR_SEC_ADD_PERMROLE, e)
@@ -826,11 +925,22 @@ class SecurityManager(BaseSecurityManager, MFASecurityManagerMixin):
                 role.permissions.remove(perm_view)
                 self.get_session.merge(role)
                 self.get_session.commit()
+                self.invalidate_permission_cache()
                 log.info(c.LOGMSG_INF_SEC_DEL_PERMROLE, perm_view, role.name)
             except Exception as e:
                 log.error(c.LOGMSG_ERR_SEC_DEL_PERMROLE, e)
                 self.get_session.rollback()
 
+    def security_converge(
+        self, baseviews: List, menus: Optional[List[Any]], dry=False
+    ) -> Dict:
+        state_transitions = super(SecurityManager, self).security_converge(
+            baseviews, menus, dry=dry
+        )
+        if not dry:
+            self.invalidate_permission_cache()
+        return state_transitions
+
     def export_roles(
         self, path: Optional[str] = None, indent: Optional[Union[int, str]] = None
     ) -> None:
@@ -882,3 +992,4 @@ class SecurityManager(BaseSecurityManager, MFASecurityManagerMixin):
 
         session.add_all(roles)
         session.commit()
+        self.invalidate_permission_cache()
@@ -207,6 +207,86 @@ class BillingService:
             log.error(f"Failed to track usage for tenant {tenant_id}: {e}")
             raise
     
+    def track_usage_batch(self, usage_records: List[Dict[str, Any]]) -> int:
+        """
+        Track many usage records with a single bulk insert.
+        
+        Each record is a dict with tenant_id, usage_type, amount, unit and
+        optionally metadata and timestamp. Tenants and active subscriptions
+        are loaded once per batch, records of unknown tenants are skipped.
+        
+        :return: The number of inserted usage records
+        """
+        from flask_appbuilder import db
+        
+        if not usage_records:
+            return 0
+        
+        try:
+            tenant_ids = {record['tenant_id'] for record in usage_records}
+            tenants = {
+                tenant.id: tenant
+                for tenant in Tenant.query.filter(Tenant.id.in_(tenant_ids)).all()
+            }
+            subscriptions = {
+                subscription.tenant_id: subscription
+                for subscription in TenantSubscription.query.filter(
+                    TenantSubscription.tenant_id.in_(tenant_ids),
+                    TenantSubscription.status == 'active'
+                ).all()
+            }
+            
+            mappings = []
+            for record in usage_records:
+                tenant_id = record['tenant_id']
+                if tenant_id not in tenants:
+                    log.warning(f"Skipping usage for unknown tenant {tenant_id}")
+                    continue
+                
+                active_subscription = subscriptions.get(tenant_id)
+                amount = Decimal(str(record['amount']))
+                unit_cost = None
+                total_cost = None
+                if active_subscription and active_subscription.usage_based:
+                    rates = active_subscription.usage_rate or {}
+                    if record['usage_type'] in rates:
+                        unit_cost = Decimal(str(rates[record['usage_type']]))
+                        total_cost = unit_cost * amount
+                
+                timestamp = record.get('timestamp') or datetime.utcnow()
+                mappings.append({
+                    'tenant_id': tenant_id,
+                    'subscription_id': active_subscription.id if active_subscription else None,
+                    'usage_date': timestamp.date(),
+                    'usage_type': record['usage_type'],
+                    'usage_amount': amount,
+                    'unit': record['unit'],
+                    'unit_cost': unit_cost,
+                    'total_cost': total_cost,
+                    'metadata': record.get('metadata') or {},
+                    'created_on': timestamp,
+                    'changed_on': timestamp,
+                })
+            
+            db.session.bulk_insert_mappings(TenantUsage, mappings)
+            db.session.commit()
+            
+            # Check usage limits once per tenant and usage type
+            batch_usage = {}
+            for mapping in mappings:
+                key = (mapping['tenant_id'], mapping['usage_type'])
+                batch_usage[key] = batch_usage.get(key, 0.0) + float(mapping['usage_amount'])
+            for (tenant_id, usage_type), amount in batch_usage.items():
+                self._check_usage_limits(tenants[tenant_id], usage_type, amount)
+            
+            log.debug(f"Tracked {len(mappings)} usage records for {len(tenants)} tenants")
+            return len(mappings)
+            
+        except Exception as e:
+            db.session.rollback()
+            log.error(f"Failed to track usage batch: {e}")
+            raise
+    
     def get_usage_metrics(self, tenant: Tenant, resource_types: List[str] = None) -> List[UsageMetrics]:
         """Get current usage metrics for tenant"""
         try:
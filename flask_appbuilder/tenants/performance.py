@@ -23,6 +23,8 @@ import redis
 from cachetools import TTLCache
 import json
 
+from ..models.tenant_context import tenant_context
+
 log = logging.getLogger(__name__)
 
 
@@ -369,6 +371,9 @@ class TenantCacheManager:
         with self._lock:
             self.local_cache.pop(cache_key, None)
         
+        # Remove host resolutions of the tenant
+        tenant_context.resolution_cache.invalidate_tenant(tenant_id)
+        
         # Remove from Redis
         if self.redis_client:
             try:
@@ -12,7 +12,7 @@ from functools import wraps
 from typing import Dict, Any, Optional, Callable, List
 import threading
 from threading import Thread
-from queue import Queue, Empty
+from queue import Queue, Empty, Full
 import time
 
 from flask import request, g, current_app
@@ -32,10 +32,25 @@ class UsageTracker:
     real-time usage data for billing and quota enforcement.
     """
     
-    def __init__(self, async_processing: bool = True):
-        """Initialize usage tracker"""
+    def __init__(self, async_processing: bool = True, app=None,
+                 batch_size: int = 500, flush_interval: float = 1.0,
+                 max_queue_size: int = 10000):
+        """
+        Initialize usage tracker
+        
+        :param async_processing: Queue usage and write it from a worker thread
+        :param app: Flask app to push an app context for the worker thread
+        :param batch_size: Max number of queued usage items per flush
+        :param flush_interval: Max seconds a queued usage item waits for a flush
+        :param max_queue_size: Queue bound, usage is dropped and counted when full
+        """
         self.async_processing = async_processing
-        self._usage_queue = Queue() if async_processing else None
+        self.app = app
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped_count = 0
+        self._stats_lock = threading.Lock()
+        self._usage_queue = Queue(maxsize=max_queue_size) if async_processing else None
         self._worker_thread = None
         self._stop_worker = False
         self._metrics_cache = {}
@@ -62,10 +77,12 @@ class UsageTracker:
         if self.async_processing and self._usage_queue:
             try:
                 self._usage_queue.put(usage_data, block=False)
-            except:
-                # Queue full, process synchronously
-                log.warning("Usage tracking queue full, processing synchronously")
-                self._process_usage(usage_data)
+            except Full:
+                # Backpressure, don't slow down requests when the writer lags
+                with self._stats_lock:
+                    self.dropped_count += 1
+                    dropped_count = self.dropped_count
+                log.warning(f"Usage tracking queue full, dropped usage ({dropped_count} total)")
         else:
             self._process_usage(usage_data)
     
@@ -214,21 +231,88 @@ class UsageTracker:
         log.info("Usage tracking worker thread started")
     
     def _worker_loop(self):
-        """Background worker loop for processing usage data"""
-        billing_service = get_billing_service()
-        
+        """Background worker loop, drains the queue in micro batches"""
         while not self._stop_worker:
             try:
-                # Process queued usage data
-                usage_data = self._usage_queue.get(timeout=1.0)
-                self._process_usage(usage_data)
-                self._usage_queue.task_done()
-                
-            except Empty:
-                continue
+                batch = self._drain_batch()
+                if batch:
+                    self._flush(batch)
             except Exception as e:
                 log.error(f"Error in usage tracking worker: {e}")
                 time.sleep(1)  # Brief pause on error
+        
+        # Flush whatever is left once stopped
+        while True:
+            batch = self._drain_batch(wait=False)
+            if not batch:
+                break
+            self._flush(batch)
+    
+    def _drain_batch(self, wait: bool = True) -> List[Dict[str, Any]]:
+        """
+        Collect up to batch_size queued items, waiting at most flush_interval
+        after the first one
+        """
+        batch = []
+        deadline = None
+        while len(batch) < self.batch_size:
+            try:
+                if not wait:
+                    usage_data = self._usage_queue.get(block=False)
+                elif deadline is None:
+                    usage_data = self._usage_queue.get(timeout=1.0)
+                    deadline = time.monotonic() + self.flush_interval
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    usage_data = self._usage_queue.get(timeout=remaining)
+            except Empty:
+                break
+            batch.append(usage_data)
+            self._usage_queue.task_done()
+        return batch
+    
+    @staticmethod
+    def _aggregate_batch(batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Coalesce usage items with the same tenant, usage type, unit and
+        minute into one record. Coalesced records keep the event count in
+        their metadata instead of the per event metadata.
+        """
+        aggregated = {}
+        for usage_data in batch:
+            bucket = usage_data['timestamp'].replace(second=0, microsecond=0)
+            key = (usage_data['tenant_id'], usage_data['usage_type'], usage_data['unit'], bucket)
+            record = aggregated.get(key)
+            if record is None:
+                aggregated[key] = {
+                    'tenant_id': usage_data['tenant_id'],
+                    'usage_type': usage_data['usage_type'],
+                    'unit': usage_data['unit'],
+                    'amount': usage_data['amount'],
+                    'metadata': usage_data['metadata'],
+                    'timestamp': bucket,
+                    'event_count': 1
+                }
+            else:
+                record['amount'] += usage_data['amount']
+                record['event_count'] += 1
+                record['metadata'] = {'event_count': record['event_count']}
+        return list(aggregated.values())
+    
+    def _flush(self, batch: List[Dict[str, Any]]):
+        """Write a batch of usage items with a single bulk insert"""
+        records = self._aggregate_batch(batch)
+        try:
+            billing_service = get_billing_service()
+            if self.app is not None:
+                with self.app.app_context():
+                    billing_service.track_usage_batch(records)
+            else:
+                billing_service.track_usage_batch(records)
+        except Exception as e:
+            log.error(f"Failed to flush {len(batch)} usage items: {e}")
     
     def _process_usage(self, usage_data: Dict[str, Any]):
         """Process individual usage record"""
@@ -246,11 +330,18 @@ class UsageTracker:
         except Exception as e:
             log.error(f"Failed to process usage data: {e}")
     
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue backlog and dropped usage counters"""
+        return {
+            'queued': self._usage_queue.qsize() if self._usage_queue else 0,
+            'dropped': self.dropped_count
+        }
+    
     def stop_worker(self):
-        """Stop the background worker thread"""
+        """Stop the background worker thread, flushing queued usage"""
         if self._worker_thread:
             self._stop_worker = True
-            self._worker_thread.join(timeout=5)
+            self._worker_thread.join(timeout=max(5, self.flush_interval * 2))
             log.info("Usage tracking worker thread stopped")
 
 
@@ -267,8 +358,14 @@ def get_usage_tracker() -> UsageTracker:
         with _usage_tracker_lock:
             # Double-checked locking pattern
             if _usage_tracker is None:
-                async_processing = current_app.config.get('USAGE_TRACKING_ASYNC', True)
-                _usage_tracker = UsageTracker(async_processing=async_processing)
+                config = current_app.config
+                _usage_tracker = UsageTracker(
+                    async_processing=config.get('USAGE_TRACKING_ASYNC', True),
+                    app=current_app._get_current_object(),
+                    batch_size=config.get('USAGE_TRACKING_BATCH_SIZE', 500),
+                    flush_interval=config.get('USAGE_TRACKING_FLUSH_INTERVAL', 1.0),
+                    max_queue_size=config.get('USAGE_TRACKING_QUEUE_SIZE', 10000)
+                )
     
     return _usage_tracker
 
@@ -447,7 +544,9 @@ def init_usage_tracking(app):
     # Set up usage tracking configuration
     app.config.setdefault('USAGE_TRACKING_ENABLED', True)
     app.config.setdefault('USAGE_TRACKING_ASYNC', True)
-    app.config.setdefault('USAGE_TRACKING_QUEUE_SIZE', 1000)
+    app.config.setdefault('USAGE_TRACKING_QUEUE_SIZE', 10000)
+    app.config.setdefault('USAGE_TRACKING_BATCH_SIZE', 500)
+    app.config.setdefault('USAGE_TRACKING_FLUSH_INTERVAL', 1.0)
     
     log.info("Usage tracking initialized")
 
@@ -3,13 +3,13 @@
 Utility functions and classes for Flask-AppBuilder.
 """
 
-try:
-    from .wizard_validator import WizardComponentValidator, validate_wizard_implementation, print_validation_report
-    __all__ = [
-        'WizardComponentValidator',
-        'validate_wizard_implementation', 
-        'print_validation_report'
-    ]
-except ImportError:
-    # If wizard validator is not available, continue without it
-    __all__ = []
\ No newline at end of file
+from .lazy import lazy_exports
+
+# The wizard validator imports the wizard views, only load it when used
+_LAZY_IMPORTS = {
+    'WizardComponentValidator': '.wizard_validator',
+    'validate_wizard_implementation': '.wizard_validator',
+    'print_validation_report': '.wizard_validator',
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, globals(), _LAZY_IMPORTS, exports=[])
@@ -0,0 +1,90 @@
+"""
+Lazy package exports (PEP 562).
+
+Packages that re-export classes from heavy or optional submodules declare
+where each name lives, and the submodule is only imported when the name
+is first accessed, instead of on ``import flask_appbuilder``.
+"""
+import importlib
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+def lazy_exports(
+    package: str,
+    namespace: Dict[str, Any],
+    imports: Dict[str, str],
+    groups: Optional[Dict[str, List[str]]] = None,
+    exports: Optional[List[str]] = None,
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Builds a package's module level ``__getattr__`` and ``__dir__``.
+    Resolved values are stored in the package namespace, so each name is
+    only resolved once::
+
+        _LAZY_IMPORTS = {"WizardFormView": ".wizard"}
+        __getattr__, __dir__ = lazy_exports(__name__, globals(), _LAZY_IMPORTS)
+
+    :param package: The package ``__name__``, relative modules resolve to it
+    :param namespace: The package ``globals()``
+    :param imports: Maps names to the module that defines them
+    :param groups: Maps flag names to lazy names that are only available
+        together, like a ``try: import ... except ImportError`` block.
+        The flag resolves to True if they can all be imported, in order
+    :param exports: If given, ``__all__`` resolves to these names followed
+        by the lazy names that are available
+    :return: A tuple with the ``__getattr__`` and ``__dir__`` functions
+    """
+    groups = groups or {}
+
+    def _resolve(name: str) -> Any:
+        module = importlib.import_module(imports[name], package)
+        try:
+            return getattr(module, name)
+        except AttributeError as e:
+            raise ImportError(f"cannot import name {name!r} from {module.__name__!r}") from e
+
+    def _is_available(names: List[str]) -> bool:
+        try:
+            for name in names:
+                if name not in namespace:
+                    namespace[name] = _resolve(name)
+        except ImportError:
+            return False
+        return True
+
+    def _get_all() -> List[str]:
+        names = list(exports)
+        grouped = set()
+        for flag, group_names in groups.items():
+            grouped.update(group_names)
+            if __getattr__(flag):
+                names.extend(group_names)
+        for name in imports:
+            if name not in grouped and _is_available([name]):
+                names.append(name)
+        return names
+
+    def __getattr__(name: str) -> Any:
+        if name in namespace:
+            return namespace[name]
+        if name in imports:
+            try:
+                value = _resolve(name)
+            except ImportError as e:
+                # Same as before the name was lazy, it's just not there
+                raise AttributeError(
+                    f"module {package!r} has no attribute {name!r}: {e}"
+                ) from e
+        elif name in groups:
+            value = _is_available(groups[name])
+        elif name == "__all__" and exports is not None:
+            value = _get_all()
+        else:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        namespace[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(namespace) | set(imports) | set(groups))
+
+    return __getattr__, __dir__
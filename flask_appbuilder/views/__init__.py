@@ -56,96 +56,69 @@ else:
 from flask_appbuilder.baseviews import expose, expose_api
 from flask_appbuilder.security.decorators import has_access
 
-# Import enhanced views only if dependencies are available
-try:
-    from .wizard import WizardFormView, WizardModelView, WizardFormWidget, WizardFormMixin
-    wizard_imports_available = True
-except ImportError:
-    wizard_imports_available = False
+from flask_appbuilder.utils.lazy import lazy_exports
 
-try:
-    from .wizard_builder import (
-        WizardBuilderView,
-        WizardTemplateGalleryView,
-        WizardPreviewView,
-        WizardManagementView,
-        WizardBuilderAPIView
-    )
-    builder_imports_available = True
-except ImportError:
-    builder_imports_available = False
+# Enhanced views are imported on first access, only if dependencies are available
+_LAZY_IMPORTS = {
+    'WizardFormView': '.wizard',
+    'WizardModelView': '.wizard',
+    'WizardFormWidget': '.wizard',
+    'WizardFormMixin': '.wizard',
+    'WizardBuilderView': '.wizard_builder',
+    'WizardTemplateGalleryView': '.wizard_builder',
+    'WizardPreviewView': '.wizard_builder',
+    'WizardManagementView': '.wizard_builder',
+    'WizardBuilderAPIView': '.wizard_builder',
+    'WizardMigrationView': '.wizard_migration',
+    'WizardExportView': '.wizard_migration',
+    'WizardImportView': '.wizard_migration',
+    'WizardBackupView': '.wizard_migration',
+    'WizardMigrationAPIView': '.wizard_migration',
+    'DashboardIndexView': '.dashboard',
+    'DashboardAPIView': '.dashboard',
+}
 
-try:
-    from .wizard_migration import (
-        WizardMigrationView,
-        WizardExportView,
-        WizardImportView,
-        WizardBackupView,
-        WizardMigrationAPIView
-    )
-    migration_imports_available = True
-except ImportError:
-    migration_imports_available = False
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    globals(),
+    _LAZY_IMPORTS,
+    groups={
+        'wizard_imports_available': [
+            'WizardFormView', 'WizardModelView', 'WizardFormWidget', 'WizardFormMixin',
+        ],
+        'builder_imports_available': [
+            'WizardBuilderView',
+            'WizardTemplateGalleryView',
+            'WizardPreviewView',
+            'WizardManagementView',
+            'WizardBuilderAPIView',
+        ],
+        'migration_imports_available': [
+            'WizardMigrationView',
+            'WizardExportView',
+            'WizardImportView',
+            'WizardBackupView',
+            'WizardMigrationAPIView',
+        ],
+        'dashboard_imports_available': ['DashboardIndexView', 'DashboardAPIView'],
+    },
+    exports=[
+        # Core Flask-AppBuilder views
+        'IndexView',
+        'UtilView',
+        'ModelView',
+        'MasterDetailView',
+        'MultipleView',
+        'CompactCRUDMixin',
+        'BaseFormView',
+        'SimpleFormView',
+        'PublicFormView',
+        'BaseView',
+        'RestCRUDView',
 
-try:
-    from .dashboard import (
-        DashboardIndexView,
-        DashboardAPIView
-    )
-    dashboard_imports_available = True
-except ImportError:
-    dashboard_imports_available = False
-
-# Define exports based on what's available
-__all__ = [
-    # Core Flask-AppBuilder views
-    'IndexView',
-    'UtilView', 
-    'ModelView',
-    'MasterDetailView',
-    'MultipleView',
-    'CompactCRUDMixin',
-    'BaseFormView',
-    'SimpleFormView',
-    'PublicFormView',
-    'BaseView',
-    'RestCRUDView',
-    
-    # Essential decorators and functions
-    'expose',
-    'expose_api', 
-    'has_access',
-]
-
-# Add enhanced views if available
-if wizard_imports_available:
-    __all__.extend([
-        'WizardFormView',
-        'WizardModelView',
-        'WizardFormWidget', 
-        'WizardFormMixin',
-    ])
-
-if builder_imports_available:
-    __all__.extend([
-        'WizardBuilderView',
-        'WizardTemplateGalleryView',
-        'WizardPreviewView',
-        'WizardManagementView',
-        'WizardBuilderAPIView',
-    ])
-
-if migration_imports_available:
-    __all__.extend([
-        'WizardMigrationView',
-        'WizardExportView',
-        'WizardImportView',
-        'WizardBackupView',
-        'WizardMigrationAPIView',
-    ])
-
-if dashboard_imports_available:
-    __all__.extend([
-        'DashboardIndexView',
-        'DashboardAPIView',
-    ])
+        # Essential decorators and functions
+        'expose',
+        'expose_api',
+        'has_access',
+    ],
+)
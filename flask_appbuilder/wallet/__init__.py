@@ -29,22 +29,72 @@ Components:
 """
 
 from .models import *
-from .views import *
-from .services import *
-from .widgets import *
 
-# MPESA integration (with graceful fallback)
+# MPESA models are registered with the wallet models (with graceful fallback)
 try:
     from .mpesa_models import *
-    from .mpesa_service import get_mpesa_service
-    from .mpesa_registration import init_mpesa_integration, check_mpesa_integration_status
-    MPESA_INTEGRATION_AVAILABLE = True
 except ImportError:
-    MPESA_INTEGRATION_AVAILABLE = False
-    def init_mpesa_integration(appbuilder):
+    pass
+
+from ..utils.lazy import lazy_exports
+
+# Views, services and widgets are imported on first access
+_LAZY_IMPORTS = {
+    'WalletDashboardView': '.views',
+    'WalletModelView': '.views',
+    'TransactionView': '.views',
+    'TransactionFormView': '.views',
+    'BudgetView': '.views',
+    'PaymentMethodView': '.views',
+    'WalletAnalyticsView': '.views',
+    'WalletReportsView': '.views',
+    'CategoryView': '.views',
+    'MPESAAccountModelView': '.mpesa_views',
+    'MPESATransactionModelView': '.mpesa_views',
+    'MPESAConfigurationModelView': '.mpesa_views',
+    'MPESACallbackModelView': '.mpesa_views',
+    'ValidationError': '.services',
+    'InsufficientFundsError': '.services',
+    'TransactionNotAllowedError': '.services',
+    'TransactionRequest': '.services',
+    'TransferRequest': '.services',
+    'BudgetAnalytics': '.services',
+    'WalletService': '.services',
+    'TransactionService': '.services',
+    'BudgetService': '.services',
+    'CurrencyService': '.services',
+    'AnalyticsService': '.services',
+    'get_mpesa_service': '.mpesa_service',
+    'CurrencyInputWidget': '.widgets',
+    'TransactionFormWidget': '.widgets',
+    'BudgetProgressWidget': '.widgets',
+    'WalletBalanceWidget': '.widgets',
+    'ExpenseChartWidget': '.widgets',
+}
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    globals(),
+    _LAZY_IMPORTS,
+    groups={'MPESA_INTEGRATION_AVAILABLE': ['get_mpesa_service']},
+)
+
+
+def init_mpesa_integration(appbuilder):
+    try:
+        from .mpesa_registration import init_mpesa_integration
+    except ImportError:
         return {'views_registered': False, 'api_registered': False, 'errors': ['MPESA integration not available']}
-    def check_mpesa_integration_status():
+    return init_mpesa_integration(appbuilder)
+
+
+def check_mpesa_integration_status():
+    try:
+        from .mpesa_registration import check_mpesa_integration_status
+    except ImportError:
         return {'models_available': False, 'service_available': False, 'views_available': False, 'errors': ['MPESA integration not available']}
+    return check_mpesa_integration_status()
+
 
 __version__ = '1.0.0'
 __all__ = [
@@ -56,6 +106,7 @@ __all__ = [
     'TransactionCategory',
     'RecurringTransaction',
     'WalletAudit',
+    'WalletDailyBalance',
     
     # MPESA Models (if available)
     'MPESAAccount',
@@ -11,7 +11,7 @@ import hashlib
 import hmac
 import secrets
 from decimal import Decimal, ROUND_HALF_UP
-from datetime import datetime, timedelta
+from datetime import date, datetime, time, timedelta
 from typing import Dict, List, Any, Optional, Union
 from enum import Enum
 
@@ -20,10 +20,10 @@ from flask_appbuilder import Model
 from flask_appbuilder.models.mixins import AuditMixin
 from flask_appbuilder.security import current_user
 from sqlalchemy import (
-    Column, Integer, String, Text, DateTime, Boolean, Numeric, 
-    ForeignKey, Index, CheckConstraint, UniqueConstraint, event
+    Column, Integer, String, Text, Date, DateTime, Boolean, Numeric, 
+    ForeignKey, Index, CheckConstraint, UniqueConstraint, event, false, or_
 )
-from sqlalchemy.orm import relationship, validates
+from sqlalchemy.orm import Session, object_session, relationship, validates
 from contextlib import contextmanager
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.sql import func
@@ -122,6 +122,10 @@ class UserWallet(AuditMixin, Model):
     pending_balance = Column(Numeric(precision=15, scale=2), nullable=False, default=0.00)
     last_transaction_date = Column(DateTime, nullable=True)
     
+    # Ledger: new wallets start with an (empty) consistent ledger, wallets that
+    # predate it read the legacy aggregates until rebuild_ledger() is run
+    ledger_initialized = Column(Boolean, nullable=False, default=True, server_default=false())
+    
     # Relationships
     user = relationship("User", backref="wallets")
     user_profile = relationship("UserProfile", back_populates="wallets")
@@ -129,6 +133,8 @@ class UserWallet(AuditMixin, Model):
                               cascade="all, delete-orphan")
     budgets = relationship("WalletBudget", back_populates="wallet",
                           cascade="all, delete-orphan")
+    daily_balances = relationship("WalletDailyBalance", back_populates="wallet",
+                                 cascade="all, delete-orphan", lazy='dynamic')
     
     # Cache configuration
     __cache_timeout__ = 300  # 5 minutes
@@ -151,11 +157,21 @@ class UserWallet(AuditMixin, Model):
     def get_transaction_total(self, transaction_type: TransactionType, 
                             start_date: datetime = None, end_date: datetime = None) -> Decimal:
         """Get total transactions by type and date range with optimized query."""
-        # Use optimized aggregation query directly
+        from flask_appbuilder import db
+        
+        # Income and expense totals over whole days come from the daily ledger
+        day_range = self._ledger_day_range(start_date, end_date)
+        if day_range is not None and transaction_type in WalletDailyBalance.TOTAL_COLUMNS:
+            return WalletDailyBalance.get_total(self.id, transaction_type, *day_range)
+        
+        # Use optimized aggregation query directly; void reversals are left
+        # out like in the ledger, the transactions they voided are cancelled
         query = db.session.query(func.sum(WalletTransaction.amount)).filter(
             WalletTransaction.wallet_id == self.id,
             WalletTransaction.transaction_type == transaction_type.value,
-            WalletTransaction.status == TransactionStatus.COMPLETED.value
+            WalletTransaction.status == TransactionStatus.COMPLETED.value,
+            or_(WalletTransaction.metadata_json.is_(None),
+                ~WalletTransaction.metadata_json.contains('"void_transaction_id"'))
         )
         
         if start_date:
@@ -166,6 +182,33 @@ class UserWallet(AuditMixin, Model):
         result = query.scalar()
         return result or Decimal('0.00')
     
+    def _ledger_day_range(self, start_date: datetime = None,
+                          end_date: datetime = None) -> Optional[tuple]:
+        """Map a datetime range onto whole ledger days.
+        
+        Returns:
+            (first_day, last_day) with None for an open end, or None when the
+            ledger is not initialized or the range does not cover whole days
+        """
+        if not self.ledger_initialized or self.id is None:
+            return None
+        
+        first_day = None
+        if start_date is not None:
+            if start_date.time() != time.min:
+                return None
+            first_day = start_date.date()
+        
+        last_day = None
+        if end_date is not None and end_date < datetime.utcnow():
+            # An end in the past must close its day; an end at or after now
+            # covers everything recorded so far
+            if end_date.time() < time(23, 59, 59):
+                return None
+            last_day = end_date.date()
+        
+        return first_day, last_day
+    
     def can_transact(self, amount: Decimal, transaction_type: TransactionType) -> tuple[bool, str]:
         """Check if a transaction is allowed."""
         amount = Decimal(str(amount))
@@ -191,7 +234,7 @@ class UserWallet(AuditMixin, Model):
             if self.daily_limit:
                 today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
                 today_expenses = self.get_transaction_total(
-                    TransactionType.EXPENSE, today_start, datetime.utcnow()
+                    TransactionType.EXPENSE, today_start
                 )
                 if (today_expenses + amount) > self.daily_limit:
                     return False, f"Daily limit of {self.currency_code} {self.daily_limit} exceeded"
@@ -200,7 +243,7 @@ class UserWallet(AuditMixin, Model):
             if self.monthly_limit:
                 month_start = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
                 month_expenses = self.get_transaction_total(
-                    TransactionType.EXPENSE, month_start, datetime.utcnow()
+                    TransactionType.EXPENSE, month_start
                 )
                 if (month_expenses + amount) > self.monthly_limit:
                     return False, f"Monthly limit of {self.currency_code} {self.monthly_limit} exceeded"
@@ -309,6 +352,7 @@ class UserWallet(AuditMixin, Model):
         """
         # This method should now only be called within _lock_wallet_for_transaction context
         log.info(f"Applying {transaction_type.value} of {amount} to wallet {self.id}")
+        balance_before = self.balance
         
         if transaction_type == TransactionType.INCOME:
             self.balance += amount
@@ -328,8 +372,130 @@ class UserWallet(AuditMixin, Model):
                 self.balance += amount  # amount is already negative
                 self.available_balance += amount
         
+        self._record_ledger_entry(transaction, transaction_type, self.balance - balance_before)
         log.info(f"Wallet {self.id} balance updated: {self.balance} (available: {self.available_balance})")
     
+    def _record_ledger_entry(self, transaction: 'WalletTransaction',
+                             transaction_type: TransactionType, balance_change: Decimal):
+        """Stamp the running balance on a completed transaction and roll it into the daily ledger."""
+        transaction.balance_after = self.balance
+        if not self.ledger_initialized or self._is_void_reversal(transaction.metadata_json):
+            # A void reversal only restores the balance the voided transaction
+            # took, which is taken out of the ledger when it is cancelled
+            return
+        
+        from flask_appbuilder import db
+        day = (transaction.transaction_date or datetime.utcnow()).date()
+        WalletDailyBalance.record(
+            db.session, self.id, day, transaction_type,
+            Decimal(str(transaction.amount)), balance_change, self.balance
+        )
+    
+    @staticmethod
+    def _is_void_reversal(metadata_json: str = None) -> bool:
+        """Whether a transaction is the reversal posted when voiding another one."""
+        if not metadata_json:
+            return False
+        try:
+            return 'void_transaction_id' in json.loads(metadata_json)
+        except (json.JSONDecodeError, TypeError):
+            return False
+    
+    @staticmethod
+    def _ledger_balance_change(transaction_type: str, amount: Decimal,
+                               metadata_json: str = None) -> Decimal:
+        """Signed balance change of a completed transaction, as applied by this model."""
+        if transaction_type in (TransactionType.INCOME.value, TransactionType.REFUND.value,
+                                TransactionType.ADJUSTMENT.value):
+            return amount
+        if transaction_type == TransactionType.EXPENSE.value:
+            return -amount
+        if transaction_type == TransactionType.TRANSFER.value and metadata_json:
+            try:
+                transfer_type = json.loads(metadata_json).get('transfer_type')
+            except (json.JSONDecodeError, TypeError, AttributeError):
+                transfer_type = None
+            if transfer_type == 'outgoing':
+                return -amount
+            if transfer_type == 'incoming':
+                return amount
+        return Decimal('0.00')
+    
+    def rebuild_ledger(self, auto_commit: bool = True, batch_size: int = 1000) -> int:
+        """
+        Rebuild the running balances and daily ledger rows of this wallet.
+        
+        Backfills wallets created before the ledger existed, or repairs one
+        after transactions were edited outside add_transaction/transfer_to.
+        The opening balance is derived from the current balance minus the net
+        change of all completed transactions. Void reversals are left out,
+        as are the transactions they voided, which are no longer completed.
+        
+        Args:
+            auto_commit: Commit once the ledger is rebuilt
+            batch_size: Number of rows written per bulk statement
+            
+        Returns:
+            Number of completed transactions replayed
+        """
+        from flask_appbuilder import db
+        
+        rows = db.session.query(
+            WalletTransaction.id,
+            WalletTransaction.transaction_date,
+            WalletTransaction.transaction_type,
+            WalletTransaction.amount,
+            WalletTransaction.metadata_json
+        ).filter(
+            WalletTransaction.wallet_id == self.id,
+            WalletTransaction.status == TransactionStatus.COMPLETED.value
+        ).order_by(WalletTransaction.transaction_date.asc(), WalletTransaction.id.asc()).all()
+        rows = [row for row in rows if not self._is_void_reversal(row.metadata_json)]
+        
+        changes = [self._ledger_balance_change(r.transaction_type, r.amount, r.metadata_json)
+                   for r in rows]
+        running_balance = self.balance - sum(changes, Decimal('0.00'))
+        
+        days: Dict[date, Dict[str, Any]] = {}
+        balance_updates = []
+        for row, change in zip(rows, changes):
+            running_balance += change
+            balance_updates.append({'id': row.id, 'balance_after': running_balance})
+            
+            day = row.transaction_date.date()
+            totals = days.get(day)
+            if totals is None:
+                totals = days[day] = {
+                    'wallet_id': self.id, 'day': day,
+                    'income_total': Decimal('0.00'), 'expense_total': Decimal('0.00'),
+                    'transaction_count': 0, 'net_change': Decimal('0.00')
+                }
+            if row.transaction_type == TransactionType.INCOME.value:
+                totals['income_total'] += row.amount
+            elif row.transaction_type == TransactionType.EXPENSE.value:
+                totals['expense_total'] += row.amount
+            totals['transaction_count'] += 1
+            totals['net_change'] += change
+            totals['closing_balance'] = running_balance
+        
+        db.session.query(WalletDailyBalance).filter(
+            WalletDailyBalance.wallet_id == self.id
+        ).delete(synchronize_session=False)
+        
+        daily_rows = list(days.values())
+        for i in range(0, len(balance_updates), batch_size):
+            db.session.bulk_update_mappings(WalletTransaction, balance_updates[i:i + batch_size])
+        for i in range(0, len(daily_rows), batch_size):
+            db.session.bulk_insert_mappings(WalletDailyBalance, daily_rows[i:i + batch_size])
+        
+        self.ledger_initialized = True
+        
+        if auto_commit:
+            db.session.commit()
+        
+        log.info(f"Rebuilt ledger of wallet {self.id}: {len(rows)} transactions, {len(daily_rows)} days")
+        return len(rows)
+    
     def _create_transaction_approval_workflow(self, transaction: 'WalletTransaction'):
         """Create approval workflow for high-value transactions."""
         try:
@@ -511,6 +677,9 @@ class UserWallet(AuditMixin, Model):
             target_wallet.balance += amount
             target_wallet.available_balance += amount
             target_wallet.last_transaction_date = transfer_timestamp
+            
+            self._record_ledger_entry(outgoing, TransactionType.TRANSFER, -amount)
+            target_wallet._record_ledger_entry(incoming, TransactionType.TRANSFER, amount)
         
         # Add to session
         from flask_appbuilder import db
@@ -528,14 +697,37 @@ class UserWallet(AuditMixin, Model):
     
     def get_balance_history(self, days: int = 30) -> List[Dict]:
         """Get balance history for the specified number of days."""
+        from flask_appbuilder import db
+        
         end_date = datetime.utcnow()
         start_date = end_date - timedelta(days=days)
         
+        if self.ledger_initialized:
+            # Running balances are stored on each transaction, read just the columns
+            rows = db.session.query(
+                WalletTransaction.id,
+                WalletTransaction.transaction_date,
+                WalletTransaction.transaction_type,
+                WalletTransaction.amount,
+                WalletTransaction.balance_after
+            ).filter(
+                WalletTransaction.wallet_id == self.id,
+                WalletTransaction.transaction_date >= start_date,
+                WalletTransaction.transaction_date <= end_date,
+                WalletTransaction.status == TransactionStatus.COMPLETED.value,
+                WalletTransaction.balance_after.isnot(None)
+            ).order_by(WalletTransaction.transaction_date.asc(), WalletTransaction.id.asc()).all()
+            
+            return [{
+                'date': row.transaction_date,
+                'balance': float(row.balance_after),
+                'transaction_id': row.id,
+                'transaction_type': row.transaction_type,
+                'amount': float(row.amount)
+            } for row in rows]
+        
         # Get transactions in date range with optimized query
-        from sqlalchemy.orm import selectinload
-        transactions = db.session.query(WalletTransaction).options(
-            selectinload(WalletTransaction.category)
-        ).filter(
+        transactions = db.session.query(WalletTransaction).filter(
             WalletTransaction.wallet_id == self.id,
             WalletTransaction.transaction_date >= start_date,
             WalletTransaction.transaction_date <= end_date,
@@ -571,6 +763,91 @@ class UserWallet(AuditMixin, Model):
         
         return balance_history
     
+    def get_daily_balance_history(self, days: int = 30) -> List[Dict]:
+        """
+        Get one closing balance per day for the specified number of days.
+        
+        Reads the daily ledger, so the cost depends on the number of days
+        rather than the number of transactions. Days without activity carry
+        the previous closing balance forward.
+        
+        Args:
+            days: Number of days, ending today
+            
+        Returns:
+            List of dicts with date, balance, income, expense and transaction_count
+        """
+        from flask_appbuilder import db
+        
+        last_day = datetime.utcnow().date()
+        first_day = last_day - timedelta(days=days - 1)
+        
+        if not self.ledger_initialized:
+            return self._daily_history_from_transactions(first_day, days)
+        
+        rows = {row.day: row for row in db.session.query(WalletDailyBalance).filter(
+            WalletDailyBalance.wallet_id == self.id,
+            WalletDailyBalance.day >= first_day,
+            WalletDailyBalance.day <= last_day
+        )}
+        
+        # Opening balance: closing balance of the last active day before the window
+        balance = db.session.query(WalletDailyBalance.closing_balance).filter(
+            WalletDailyBalance.wallet_id == self.id,
+            WalletDailyBalance.day < first_day
+        ).order_by(WalletDailyBalance.day.desc()).limit(1).scalar()
+        if balance is None:
+            first_row = rows[min(rows)] if rows else None
+            balance = (first_row.closing_balance - first_row.net_change) if first_row else self.balance
+        
+        history = []
+        for offset in range(days):
+            day = first_day + timedelta(days=offset)
+            row = rows.get(day)
+            if row is not None:
+                balance = row.closing_balance
+            history.append({
+                'date': day,
+                'balance': float(balance),
+                'income': float(row.income_total) if row else 0.0,
+                'expense': float(row.expense_total) if row else 0.0,
+                'transaction_count': row.transaction_count if row else 0
+            })
+        
+        return history
+    
+    def _daily_history_from_transactions(self, first_day: date, days: int) -> List[Dict]:
+        """Daily balance history for wallets whose ledger has not been built yet."""
+        per_transaction = self.get_balance_history(days)
+        by_day: Dict[date, List[Dict]] = {}
+        for point in per_transaction:
+            by_day.setdefault(point['date'].date(), []).append(point)
+        
+        balance = float(self.balance)
+        if per_transaction:
+            first = per_transaction[0]
+            change = first['amount'] if first['transaction_type'] == TransactionType.INCOME.value else (
+                -first['amount'] if first['transaction_type'] == TransactionType.EXPENSE.value else 0.0)
+            balance = first['balance'] - change
+        
+        history = []
+        for offset in range(days):
+            day = first_day + timedelta(days=offset)
+            points = by_day.get(day, [])
+            if points:
+                balance = points[-1]['balance']
+            history.append({
+                'date': day,
+                'balance': balance,
+                'income': sum(p['amount'] for p in points
+                              if p['transaction_type'] == TransactionType.INCOME.value),
+                'expense': sum(p['amount'] for p in points
+                               if p['transaction_type'] == TransactionType.EXPENSE.value),
+                'transaction_count': len(points)
+            })
+        
+        return history
+    
     @validates('currency_code')
     def validate_currency_code(self, key, currency_code):
         """Validate currency code format."""
@@ -740,8 +1017,12 @@ class UserWallet(AuditMixin, Model):
         statement_transactions = []
         running_balance = self.balance if include_balance else None
         
+        # Ledger wallets store the balance after each transaction, otherwise it
+        # is reconstructed from the current balance
+        stored_balance = include_balance and self.ledger_initialized
+        
         # If including balance, we need to calculate from oldest to newest
-        if include_balance:
+        if include_balance and not stored_balance:
             # Reverse order for balance calculation
             transactions_for_balance = list(reversed(transactions))
             
@@ -761,11 +1042,11 @@ class UserWallet(AuditMixin, Model):
             # Update totals
             if txn.transaction_type == TransactionType.INCOME.value:
                 total_income += txn.amount
-                if include_balance:
+                if include_balance and not stored_balance:
                     running_balance += txn.amount
             elif txn.transaction_type == TransactionType.EXPENSE.value:
                 total_expense += txn.amount
-                if include_balance:
+                if include_balance and not stored_balance:
                     running_balance -= txn.amount
             
             # Parse metadata
@@ -793,7 +1074,11 @@ class UserWallet(AuditMixin, Model):
             }
             
             # Add running balance if requested
-            if include_balance:
+            if stored_balance:
+                transaction_details['balance_after'] = (
+                    float(txn.balance_after) if txn.balance_after is not None else None
+                )
+            elif include_balance:
                 # For display, show balance after this transaction
                 # Since we're displaying newest first, reverse the running balance calculation
                 display_balance = running_balance
@@ -927,6 +1212,9 @@ class WalletTransaction(AuditMixin, Model):
     processor_id = Column(String(100), nullable=True)
     processing_fee = Column(Numeric(precision=15, scale=2), nullable=True, default=0.00)
     
+    # Wallet balance right after this transaction was applied (ledger)
+    balance_after = Column(Numeric(precision=15, scale=2), nullable=True)
+    
     # Security and approval
     transaction_hash = Column(String(128), nullable=True)  # SHA-512 hash
     digital_signature = Column(Text, nullable=True)  # Cryptographic signature
@@ -1316,19 +1604,272 @@ class TransactionCategory(AuditMixin, Model):
         return f"<TransactionCategory(id={self.id}, name='{self.name}', type='{self.category_type}')>"
 
 
+# Session.info key of the budgets whose spend changed in the current flush
+_SPENT_BUDGETS_KEY = 'wallet_spent_budget_ids'
+# Session.info key of the wallets whose daily ledger changed in the current flush
+_LEDGER_WALLETS_KEY = 'wallet_ledger_wallet_ids'
+
+
+def _budget_spend_key(transaction_type, status, wallet_id, category_id, transaction_date, amount):
+    """Budget spend contribution of a transaction state, or None if it does not count."""
+    if transaction_type != TransactionType.EXPENSE.value or status != TransactionStatus.COMPLETED.value:
+        return None
+    if transaction_date is None or amount is None:
+        return None
+    return wallet_id, category_id, transaction_date, Decimal(str(amount))
+
+
+def _post_budget_spend(target, connection, key, sign=1):
+    """Apply a budget spend delta and queue the touched budgets for expiry."""
+    wallet_id, category_id, transaction_date, amount = key
+    budget_ids = WalletBudget.apply_spend_delta(
+        connection, wallet_id, category_id, transaction_date, sign * amount
+    )
+    session = object_session(target)
+    if budget_ids and session is not None:
+        session.info.setdefault(_SPENT_BUDGETS_KEY, set()).update(budget_ids)
+
+
+def _previous_value(state, key):
+    """Value of an attribute before the pending flush."""
+    history = state.attrs[key].history
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(state.object, key)
+
+
 # Set up event listeners for wallet balance updates
 @event.listens_for(WalletTransaction, 'after_insert')
 def update_wallet_balance_on_insert(mapper, connection, target):
     """Update wallet balance when transaction is inserted."""
-    # This is handled in the add_transaction method to ensure consistency
-    pass
+    # Balance is handled in the add_transaction method to ensure consistency,
+    # budget spend is posted here so every completed expense is counted once
+    key = _budget_spend_key(target.transaction_type, target.status, target.wallet_id,
+                            target.category_id, target.transaction_date, target.amount)
+    if key is not None:
+        _post_budget_spend(target, connection, key)
 
 
 @event.listens_for(WalletTransaction, 'after_update') 
 def update_wallet_balance_on_update(mapper, connection, target):
     """Update wallet balance when transaction is updated."""
-    # Handle status changes that affect balance
-    pass
+    # Status changes (approval, rejection, voiding) and edits of completed
+    # expenses move budget spend from the old state to the new one
+    from sqlalchemy import inspect
+    
+    fields = ('transaction_type', 'status', 'wallet_id', 'category_id', 'transaction_date', 'amount')
+    state = inspect(target)
+    if not any(state.attrs[field].history.has_changes() for field in fields):
+        return
+    
+    old_values = [_previous_value(state, field) for field in fields]
+    old_status = old_values[1]
+    if (old_status == TransactionStatus.COMPLETED.value
+            and target.status != TransactionStatus.COMPLETED.value):
+        _remove_from_ledger(target, connection, state, old_values)
+    
+    old_key = _budget_spend_key(*old_values)
+    new_key = _budget_spend_key(*(getattr(target, field) for field in fields))
+    if old_key == new_key:
+        return
+    if old_key is not None:
+        _post_budget_spend(target, connection, old_key, sign=-1)
+    if new_key is not None:
+        _post_budget_spend(target, connection, new_key)
+
+
+def _remove_from_ledger(target, connection, state, old_values):
+    """Take a transaction that is no longer completed out of its day's ledger row."""
+    transaction_type, _, wallet_id, _, transaction_date, amount = old_values
+    metadata_json = _previous_value(state, 'metadata_json')
+    if transaction_date is None or amount is None or UserWallet._is_void_reversal(metadata_json):
+        return
+    amount = Decimal(str(amount))
+    balance_change = UserWallet._ledger_balance_change(transaction_type, amount, metadata_json)
+    WalletDailyBalance.remove_on_connection(
+        connection, wallet_id, transaction_date.date(), transaction_type, amount, balance_change
+    )
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_LEDGER_WALLETS_KEY, set()).add(wallet_id)
+
+
+@event.listens_for(Session, 'after_flush_postexec')
+def expire_spent_budgets(session, flush_context):
+    """Expire loaded budgets and ledger rows updated by the flush, so they reload them."""
+    budget_ids = session.info.pop(_SPENT_BUDGETS_KEY, None)
+    wallet_ids = session.info.pop(_LEDGER_WALLETS_KEY, None)
+    if not budget_ids and not wallet_ids:
+        return
+    for instance in list(session.identity_map.values()):
+        if isinstance(instance, WalletBudget) and budget_ids and instance.id in budget_ids:
+            session.expire(instance, ['spent_amount', 'remaining_amount', 'last_updated'])
+        elif isinstance(instance, WalletDailyBalance) and wallet_ids and instance.wallet_id in wallet_ids:
+            session.expire(instance)
+
+
+class WalletDailyBalance(Model):
+    """
+    Daily ledger row of a wallet.
+    
+    Holds the income and expense totals, transaction count, net balance
+    change and closing balance of one wallet for one day. Rows are derived
+    data, maintained incrementally as transactions are applied and rebuilt
+    with UserWallet.rebuild_ledger(), so totals and balance history read
+    one row per day instead of every transaction.
+    """
+    
+    __tablename__ = 'ab_wallet_daily_balances'
+    __table_args__ = (
+        UniqueConstraint('wallet_id', 'day', name='uq_wallet_daily_balance_day'),
+    )
+    
+    #: Transaction types with a running total column
+    TOTAL_COLUMNS = {
+        TransactionType.INCOME: 'income_total',
+        TransactionType.EXPENSE: 'expense_total'
+    }
+    
+    id = Column(Integer, primary_key=True)
+    wallet_id = Column(Integer, ForeignKey('ab_user_wallets.id'), nullable=False)
+    day = Column(Date, nullable=False)
+    
+    income_total = Column(Numeric(precision=15, scale=2), nullable=False, default=0.00)
+    expense_total = Column(Numeric(precision=15, scale=2), nullable=False, default=0.00)
+    transaction_count = Column(Integer, nullable=False, default=0)
+    net_change = Column(Numeric(precision=15, scale=2), nullable=False, default=0.00)
+    closing_balance = Column(Numeric(precision=15, scale=2), nullable=False, default=0.00)
+    
+    wallet = relationship("UserWallet", back_populates="daily_balances")
+    
+    @classmethod
+    def record(cls, session, wallet_id: int, day: date, transaction_type: TransactionType,
+               amount: Decimal, balance_change: Decimal, balance: Decimal) -> 'WalletDailyBalance':
+        """
+        Add one completed transaction to the ledger row of its day.
+        
+        Args:
+            session: SQLAlchemy session
+            wallet_id: Wallet the transaction was applied to
+            day: Day of the transaction date
+            transaction_type: Type of the transaction
+            amount: Transaction amount
+            balance_change: Signed change it made to the wallet balance
+            balance: Wallet balance after the transaction
+            
+        Returns:
+            The updated ledger row
+        """
+        row = session.query(cls).filter_by(wallet_id=wallet_id, day=day).with_for_update().first()
+        
+        later = session.query(cls).filter(cls.wallet_id == wallet_id, cls.day > day)
+        next_row = later.order_by(cls.day.asc()).with_for_update().first()
+        
+        if row is None:
+            if next_row is not None:
+                # Back-dated entry: the day opens where the next active day opened
+                closing = next_row.closing_balance - next_row.net_change + balance_change
+            else:
+                closing = balance
+            row = cls(wallet_id=wallet_id, day=day, income_total=Decimal('0.00'),
+                      expense_total=Decimal('0.00'), transaction_count=0,
+                      net_change=Decimal('0.00'), closing_balance=closing)
+            session.add(row)
+        elif next_row is not None:
+            row.closing_balance += balance_change
+        else:
+            row.closing_balance = balance
+        
+        column = cls.TOTAL_COLUMNS.get(transaction_type)
+        if column:
+            setattr(row, column, getattr(row, column) + amount)
+        row.transaction_count += 1
+        row.net_change += balance_change
+        
+        if next_row is not None and balance_change:
+            later.update({cls.closing_balance: cls.closing_balance + balance_change},
+                         synchronize_session='fetch')
+        return row
+    
+    @classmethod
+    def remove_on_connection(cls, connection, wallet_id: int, day: date, transaction_type: str,
+                             amount: Decimal, balance_change: Decimal):
+        """
+        Take one transaction back out of the ledger row of its day.
+        
+        Used when a completed transaction is cancelled or voided. Runs on
+        the flush connection, so it can be used from mapper events; the day's
+        totals lose the transaction and the closing balances of its day and
+        every later day lose its balance change.
+        
+        Args:
+            connection: Connection of the flush in progress
+            wallet_id: Wallet the transaction was applied to
+            day: Day of the transaction date
+            transaction_type: Type of the transaction (value)
+            amount: Transaction amount
+            balance_change: Signed change it made to the wallet balance
+        """
+        from sqlalchemy import update
+        
+        table = cls.__table__
+        values = {
+            'transaction_count': table.c.transaction_count - 1,
+            'net_change': table.c.net_change - balance_change,
+            'closing_balance': table.c.closing_balance - balance_change,
+        }
+        column = {t.value: c for t, c in cls.TOTAL_COLUMNS.items()}.get(transaction_type)
+        if column:
+            values[column] = table.c[column] - amount
+        connection.execute(
+            update(table).where(table.c.wallet_id == wallet_id).where(table.c.day == day)
+            .values(**values)
+        )
+        if balance_change:
+            connection.execute(
+                update(table).where(table.c.wallet_id == wallet_id).where(table.c.day > day)
+                .values(closing_balance=table.c.closing_balance - balance_change)
+            )
+    
+    @classmethod
+    def get_total(cls, wallet_id: int, transaction_type: TransactionType,
+                  first_day: date = None, last_day: date = None) -> Decimal:
+        """Sum the income or expense total of a wallet over a day range (inclusive, open ends)."""
+        from flask_appbuilder import db
+        
+        column = getattr(cls, cls.TOTAL_COLUMNS[transaction_type])
+        query = db.session.query(func.sum(column)).filter(cls.wallet_id == wallet_id)
+        if first_day is not None:
+            query = query.filter(cls.day >= first_day)
+        if last_day is not None:
+            query = query.filter(cls.day <= last_day)
+        return query.scalar() or Decimal('0.00')
+    
+    @classmethod
+    def get_wallet_totals(cls, wallet_ids: List[int]) -> Dict[int, tuple]:
+        """
+        Get all-time (income, expense) totals for several wallets in one query.
+        
+        Args:
+            wallet_ids: IDs of wallets with an initialized ledger
+            
+        Returns:
+            Dict of wallet id to (income_total, expense_total)
+        """
+        from flask_appbuilder import db
+        
+        if not wallet_ids:
+            return {}
+        rows = db.session.query(
+            cls.wallet_id, func.sum(cls.income_total), func.sum(cls.expense_total)
+        ).filter(cls.wallet_id.in_(wallet_ids)).group_by(cls.wallet_id).all()
+        totals = {wallet_id: (Decimal('0.00'), Decimal('0.00')) for wallet_id in wallet_ids}
+        for wallet_id, income, expense in rows:
+            totals[wallet_id] = (income or Decimal('0.00'), expense or Decimal('0.00'))
+        return totals
+    
+    def __repr__(self):
+        return f"<WalletDailyBalance(wallet_id={self.wallet_id}, day={self.day}, closing={self.closing_balance})>"
 
 
 class WalletBudget(AuditMixin, Model):
@@ -1395,14 +1936,80 @@ class WalletBudget(AuditMixin, Model):
     @hybrid_property
     def alert_level(self):
         """Get current alert level (0-3)."""
-        percentage = self.spent_percentage
-        if percentage >= self.alert_threshold_3:
-            return 3
-        elif percentage >= self.alert_threshold_2:
-            return 2
-        elif percentage >= self.alert_threshold_1:
-            return 1
-        return 0
+        return self._alert_level_for(
+            self.spent_percentage,
+            (self.alert_threshold_1, self.alert_threshold_2, self.alert_threshold_3)
+        )
+    
+    @classmethod
+    def apply_spend_delta(cls, connection, wallet_id: int, category_id: Optional[int],
+                          transaction_date: datetime, amount: Decimal) -> int:
+        """
+        Add a spend delta to the active budgets covering a transaction.
+        
+        Matches budgets of the wallet whose period contains the transaction
+        date and that are either for all categories or for the transaction's
+        category, through the (wallet_id, category_id, ...) unique index.
+        Runs on the flush connection, so it can be used from mapper events;
+        budgets already loaded in a session are not refreshed by it, the
+        WalletTransaction listeners expire them once the flush is done.
+        
+        Args:
+            connection: Connection of the flush in progress
+            wallet_id: Wallet of the transaction
+            category_id: Category of the transaction, if any
+            transaction_date: Date of the transaction
+            amount: Spend to add (negative to remove)
+            
+        Returns:
+            IDs of the budgets updated
+        """
+        from sqlalchemy import or_, select, update
+        
+        table = cls.__table__
+        category_match = table.c.category_id.is_(None)
+        if category_id is not None:
+            category_match = or_(category_match, table.c.category_id == category_id)
+        
+        rows = connection.execute(
+            select(table.c.id, table.c.name, table.c.budget_amount, table.c.spent_amount,
+                   table.c.alert_threshold_1, table.c.alert_threshold_2, table.c.alert_threshold_3)
+            .where(table.c.wallet_id == wallet_id)
+            .where(category_match)
+            .where(table.c.period_start <= transaction_date)
+            .where(table.c.period_end >= transaction_date)
+            .where(table.c.is_active == True)
+        ).fetchall()
+        if not rows:
+            return []
+        
+        connection.execute(
+            update(table)
+            .where(table.c.id.in_([row.id for row in rows]))
+            .values(spent_amount=table.c.spent_amount + amount,
+                    remaining_amount=table.c.remaining_amount - amount,
+                    last_updated=datetime.utcnow())
+        )
+        
+        for row in rows:
+            if row.budget_amount <= 0:
+                continue
+            thresholds = (row.alert_threshold_1, row.alert_threshold_2, row.alert_threshold_3)
+            before = cls._alert_level_for((row.spent_amount / row.budget_amount) * 100, thresholds)
+            after = cls._alert_level_for(((row.spent_amount + amount) / row.budget_amount) * 100, thresholds)
+            if after > before:
+                log.warning(f"Budget {row.id} ('{row.name}') of wallet {wallet_id} reached alert level {after}")
+        
+        return [row.id for row in rows]
+    
+    @staticmethod
+    def _alert_level_for(percentage, thresholds) -> int:
+        """Alert level (0-3) of a spent percentage for the given thresholds."""
+        level = 0
+        for i, threshold in enumerate(thresholds, start=1):
+            if percentage >= threshold:
+                level = i
+        return level
     
     def update_spent_amount(self, auto_commit: bool = True):
         """Update spent amount based on actual transactions."""
@@ -1420,6 +2027,8 @@ class WalletBudget(AuditMixin, Model):
         
         spent = query.with_entities(func.sum(WalletTransaction.amount)).scalar() or Decimal('0.00')
         
+        if self.spent_amount is not None and spent != self.spent_amount:
+            log.info(f"Budget {self.id} spend reconciled from {self.spent_amount} to {spent}")
         self.spent_amount = spent
         self.remaining_amount = self.budget_amount - spent
         self.last_updated = datetime.utcnow()
@@ -1945,5 +2554,6 @@ __all__ = [
     'PaymentMethod',
     'RecurringTransaction',
     'WalletAudit',
+    'WalletDailyBalance',
     'SecureWalletTransaction'
 ]
\ No newline at end of file
@@ -21,7 +21,7 @@ from sqlalchemy.orm import sessionmaker
 
 from .models import (
     UserWallet, WalletTransaction, TransactionCategory, WalletBudget,
-    PaymentMethod, RecurringTransaction, WalletAudit,
+    PaymentMethod, RecurringTransaction, WalletAudit, WalletDailyBalance,
     TransactionType, TransactionStatus, BudgetPeriod, PaymentMethodType
 )
 
@@ -869,8 +869,8 @@ class BudgetService:
             analytics = []
             
             for budget in budgets:
-                # Update spent amount
-                budget.update_spent_amount(auto_commit=False)
+                # Spent amounts are kept current as transactions post, see
+                # WalletBudget.apply_spend_delta
                 
                 # Calculate analytics
                 days_total = (budget.period_end - budget.period_start).days + 1
@@ -904,29 +904,53 @@ class BudgetService:
             raise
     
     @staticmethod
-    def update_all_budgets(wallet_id: int = None, auto_commit: bool = True):
+    def update_all_budgets(wallet_id: int = None, auto_commit: bool = True,
+                           batch_size: int = 500, include_closed: bool = False) -> int:
         """
-        Update spent amounts for all active budgets.
+        Reconcile spent amounts of active budgets with their transactions.
+        
+        Spent amounts are maintained incrementally as transactions post, so
+        this is a periodic consistency check. Budgets are processed in id
+        order in batches, committing after each batch when auto_commit is set,
+        so no single long transaction is held.
         
         Args:
             wallet_id: Optional wallet ID to limit updates
-            auto_commit: Whether to commit the transaction
+            auto_commit: Whether to commit after each batch
+            batch_size: Number of budgets reconciled per batch
+            include_closed: Also reconcile budgets whose period has ended
+            
+        Returns:
+            Number of budgets reconciled
         """
         try:
             query = WalletBudget.query.filter_by(is_active=True)
             
             if wallet_id:
                 query = query.filter_by(wallet_id=wallet_id)
+            if not include_closed:
+                query = query.filter(WalletBudget.period_end >= datetime.utcnow())
+            
+            reconciled = 0
+            last_id = 0
+            while True:
+                budgets = query.filter(WalletBudget.id > last_id).order_by(
+                    WalletBudget.id.asc()
+                ).limit(batch_size).all()
+                if not budgets:
+                    break
+                
+                for budget in budgets:
+                    budget.update_spent_amount(auto_commit=False)
+                
+                reconciled += len(budgets)
+                last_id = budgets[-1].id
+                
+                if auto_commit:
+                    db.session.commit()
             
-            budgets = query.all()
-            
-            for budget in budgets:
-                budget.update_spent_amount(auto_commit=False)
-            
-            if auto_commit:
-                db.session.commit()
-            
-            log.info(f"Updated {len(budgets)} budgets")
+            log.info(f"Updated {reconciled} budgets")
+            return reconciled
             
         except Exception as e:
             if auto_commit:
@@ -1042,6 +1066,11 @@ class AnalyticsService:
             
             wallet_details = []
             
+            # All-time totals of ledger wallets come from one grouped query
+            ledger_totals = WalletDailyBalance.get_wallet_totals(
+                [wallet.id for wallet in wallets if wallet.ledger_initialized]
+            )
+            
             for wallet in wallets:
                 # Convert balance to target currency if needed
                 balance_in_currency = wallet.balance
@@ -1051,14 +1080,17 @@ class AnalyticsService:
                     )
                 
                 # Convert income and expenses
-                income_in_currency = wallet.total_income
-                expenses_in_currency = wallet.total_expenses
+                if wallet.id in ledger_totals:
+                    income_in_currency, expenses_in_currency = ledger_totals[wallet.id]
+                else:
+                    income_in_currency = wallet.total_income
+                    expenses_in_currency = wallet.total_expenses
                 if wallet.currency_code != currency:
                     income_in_currency = CurrencyService.convert_amount(
-                        wallet.total_income, wallet.currency_code, currency
+                        income_in_currency, wallet.currency_code, currency
                     )
                     expenses_in_currency = CurrencyService.convert_amount(
-                        wallet.total_expenses, wallet.currency_code, currency
+                        expenses_in_currency, wallet.currency_code, currency
                     )
                 
                 total_balance += balance_in_currency
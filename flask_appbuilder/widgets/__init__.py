@@ -48,49 +48,51 @@ from ..fieldwidgets import (
     Select2ManyWidget
 )
 
-# Import enhanced widgets (only if dependencies are available)
-try:
-    from .modern_ui import (
-        ModernTextWidget,
-        ModernTextAreaWidget,
-        ModernSelectWidget,
-        FileUploadWidget,
-        DateTimeRangeWidget,
-        TagInputWidget,
-        SignatureWidget
-    )
-    MODERN_UI_AVAILABLE = True
-except ImportError:
-    MODERN_UI_AVAILABLE = False
-
-try:
-    from .advanced_forms import (
-        FormBuilderWidget,
-        ValidationWidget
-    )
-    ADVANCED_FORMS_AVAILABLE = True
-except ImportError:
-    ADVANCED_FORMS_AVAILABLE = False
-
-try:
-    from .specialized_data import (
-        JSONEditorWidget,
-        ArrayEditorWidget
-    )
-    SPECIALIZED_DATA_AVAILABLE = True
-except ImportError:
-    SPECIALIZED_DATA_AVAILABLE = False
-
-# Import modular widgets (new architecture) - These take priority over legacy widgets
-try:
-    from .visualization import GPSTrackerWidget
-    from .editing import MermaidEditorWidget, DbmlEditorWidget, CodeEditorWidget
-    from .media import QrCodeWidget
-    from .charts import AdvancedChartsWidget
-    from .forms import ColorPickerWidget
-    MODULAR_WIDGETS_AVAILABLE = True
-except ImportError:
-    MODULAR_WIDGETS_AVAILABLE = False
+from ..utils.lazy import lazy_exports
+
+# Enhanced widgets (only if dependencies are available) are imported on
+# first access, modern_ui alone is thousands of lines
+_ENHANCED_WIDGETS = {
+    'modern_ui': ('.modern_ui', 'MODERN_UI_AVAILABLE', [
+        'ModernTextWidget',
+        'ModernTextAreaWidget',
+        'ModernSelectWidget',
+        # 'ColorPickerWidget',  # MIGRATED TO modular/forms
+        'FileUploadWidget',
+        'DateTimeRangeWidget',
+        'TagInputWidget',
+        'SignatureWidget',
+        # 'CodeEditorWidget',  # MIGRATED TO modular/editing
+        # 'AdvancedChartsWidget',  # MIGRATED TO modular/charts
+    ]),
+    'advanced_forms': ('.advanced_forms', 'ADVANCED_FORMS_AVAILABLE', [
+        'FormBuilderWidget',
+        'ValidationWidget',
+    ]),
+    'specialized_data': ('.specialized_data', 'SPECIALIZED_DATA_AVAILABLE', [
+        'JSONEditorWidget',
+        'ArrayEditorWidget',
+    ]),
+}
+
+# Modular widgets (new architecture) - These take priority over legacy widgets
+_MODULAR_WIDGETS = {
+    'GPSTrackerWidget': '.visualization',
+    'MermaidEditorWidget': '.editing',
+    'DbmlEditorWidget': '.editing',
+    'CodeEditorWidget': '.editing',
+    'QrCodeWidget': '.media',
+    'AdvancedChartsWidget': '.charts',
+    'ColorPickerWidget': '.forms',
+}
+_LAZY_IMPORTS = {
+    name: module
+    for module, _flag, names in _ENHANCED_WIDGETS.values()
+    for name in names
+}
+_LAZY_IMPORTS.update(_MODULAR_WIDGETS)
+
+_ENHANCED_WIDGETS['modular'] = (None, 'MODULAR_WIDGETS_AVAILABLE', list(_MODULAR_WIDGETS))
 
 # Core widgets - always available
 CORE_WIDGETS = {
@@ -129,46 +131,13 @@ FIELD_WIDGETS = {
     'Select2ManyWidget': Select2ManyWidget,
 }
 
-# Build exports list
-__all__ = list(CORE_WIDGETS.keys()) + list(FIELD_WIDGETS.keys())
-
-# Add enhanced widgets if available
-if MODERN_UI_AVAILABLE:
-    __all__.extend([
-        'ModernTextWidget',
-        'ModernTextAreaWidget',
-        'ModernSelectWidget',
-        # 'ColorPickerWidget',  # MIGRATED TO modular/forms
-        'FileUploadWidget',
-        'DateTimeRangeWidget',
-        'TagInputWidget',
-        'SignatureWidget'
-        # 'CodeEditorWidget',  # MIGRATED TO modular/editing
-        # 'AdvancedChartsWidget',  # MIGRATED TO modular/charts
-    ])
-
-if ADVANCED_FORMS_AVAILABLE:
-    __all__.extend([
-        'FormBuilderWidget',
-        'ValidationWidget'
-    ])
-
-if SPECIALIZED_DATA_AVAILABLE:
-    __all__.extend([
-        'JSONEditorWidget',
-        'ArrayEditorWidget'
-    ])
-
-if MODULAR_WIDGETS_AVAILABLE:
-    __all__.extend([
-        'GPSTrackerWidget',
-        'MermaidEditorWidget',
-        'DbmlEditorWidget',
-        'CodeEditorWidget',
-        'QrCodeWidget',
-        'AdvancedChartsWidget',
-        'ColorPickerWidget'
-    ])
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    globals(),
+    _LAZY_IMPORTS,
+    groups={flag: names for _module, flag, names in _ENHANCED_WIDGETS.values()},
+    exports=list(CORE_WIDGETS.keys()) + list(FIELD_WIDGETS.keys()),
+)
 
 
 def get_available_widgets():
@@ -182,42 +151,9 @@ def get_available_widgets():
         'field': FIELD_WIDGETS.copy(),
     }
     
-    if MODERN_UI_AVAILABLE:
-        widgets['modern_ui'] = {
-            'ModernTextWidget': ModernTextWidget,
-            'ModernTextAreaWidget': ModernTextAreaWidget,
-            'ModernSelectWidget': ModernSelectWidget,
-            # 'ColorPickerWidget': ColorPickerWidget,  # MIGRATED TO modular/forms
-            'FileUploadWidget': FileUploadWidget,
-            'DateTimeRangeWidget': DateTimeRangeWidget,
-            'TagInputWidget': TagInputWidget,
-            'SignatureWidget': SignatureWidget,
-            # 'CodeEditorWidget': CodeEditorWidget,  # MIGRATED TO modular/editing
-            # 'AdvancedChartsWidget': AdvancedChartsWidget,  # MIGRATED TO modular/charts
-        }
-    
-    if ADVANCED_FORMS_AVAILABLE:
-        widgets['advanced_forms'] = {
-            'FormBuilderWidget': FormBuilderWidget,
-            'ValidationWidget': ValidationWidget,
-        }
-    
-    if SPECIALIZED_DATA_AVAILABLE:
-        widgets['specialized_data'] = {
-            'JSONEditorWidget': JSONEditorWidget,
-            'ArrayEditorWidget': ArrayEditorWidget,
-        }
-
-    if MODULAR_WIDGETS_AVAILABLE:
-        widgets['modular'] = {
-            'GPSTrackerWidget': GPSTrackerWidget,
-            'MermaidEditorWidget': MermaidEditorWidget,
-            'DbmlEditorWidget': DbmlEditorWidget,
-            'CodeEditorWidget': CodeEditorWidget,
-            'QrCodeWidget': QrCodeWidget,
-            'AdvancedChartsWidget': AdvancedChartsWidget,
-            'ColorPickerWidget': ColorPickerWidget,
-        }
+    for category, (_module, flag, names) in _ENHANCED_WIDGETS.items():
+        if __getattr__(flag):
+            widgets[category] = {name: __getattr__(name) for name in names}
 
     return widgets
 
@@ -245,9 +181,9 @@ def get_widget_compatibility_info():
     return {
         'core_widgets_count': len(CORE_WIDGETS),
         'field_widgets_count': len(FIELD_WIDGETS),
-        'modern_ui_available': MODERN_UI_AVAILABLE,
-        'advanced_forms_available': ADVANCED_FORMS_AVAILABLE,
-        'specialized_data_available': SPECIALIZED_DATA_AVAILABLE,
-        'modular_widgets_available': MODULAR_WIDGETS_AVAILABLE,
-        'total_widgets': len(__all__)
+        'modern_ui_available': __getattr__('MODERN_UI_AVAILABLE'),
+        'advanced_forms_available': __getattr__('ADVANCED_FORMS_AVAILABLE'),
+        'specialized_data_available': __getattr__('SPECIALIZED_DATA_AVAILABLE'),
+        'modular_widgets_available': __getattr__('MODULAR_WIDGETS_AVAILABLE'),
+        'total_widgets': len(__getattr__('__all__'))
     }
\ No newline at end of file
@@ -112,6 +112,15 @@ class AdvancedChartsWidget(Input):
         # Generate unique ID for this chart instance
         chart_id = f"chart_{field.id}_{id(self)}"
 
+        # Built outside the f-string, its expressions can't contain backslashes
+        real_time_button = ''
+        if self.real_time:
+            real_time_button = (
+                '<button type="button" class="btn btn-sm btn-outline-secondary" '
+                'onclick="toggleRealTime(\'' + chart_id + '\')" title="'
+                + gettext('Toggle Real-time') + '"><i class="fas fa-play"></i></button>'
+            )
+
         return Markup(f"""
         <div class="advanced-charts-widget" data-field-id="{field.id}">
             <!-- Chart Configuration Panel -->
@@ -276,7 +285,7 @@ class AdvancedChartsWidget(Input):
                                 onclick="toggleFullscreen('{chart_id}')" title="{gettext('Fullscreen')}">
                             <i class="fas fa-expand"></i>
                         </button>
-                        {'<button type="button" class="btn btn-sm btn-outline-secondary" onclick="toggleRealTime(\'' + chart_id + '\')" title="' + gettext('Toggle Real-time') + '"><i class="fas fa-play"></i></button>' if self.real_time else ''}
+                        {real_time_button}
                     </div>
                 </div>
             </div>
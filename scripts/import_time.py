@@ -0,0 +1,96 @@
+"""
+Tracks import cost with ``python -X importtime``.
+
+Every module is imported in a fresh interpreter, the fastest of the runs
+is reported, with the time spent in each flask_appbuilder subpackage
+(import self time of its modules) and in third party packages.
+"""
+from collections import defaultdict
+import json
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+import click
+
+DEFAULT_MODULES = ("flask_appbuilder",)
+
+
+def parse_importtime(output: str) -> List[Tuple[str, int, int]]:
+    """
+    Parses ``-X importtime`` stderr into (module, self us, cumulative us)
+    """
+    imports = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue  # header
+        imports.append((module.strip(), int(self_us), int(cumulative_us)))
+    return imports
+
+
+def measure(module: str) -> Dict[str, int]:
+    """
+    Imports module in a fresh interpreter, returns microseconds by
+    subpackage, 'total' is the module's cumulative import time
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise click.ClickException(f"import {module} failed:\n{result.stderr[-2000:]}")
+    times: Dict[str, int] = defaultdict(int)
+    for name, self_us, cumulative_us in parse_importtime(result.stderr):
+        if name == module:
+            times["total"] = cumulative_us
+        parts = name.split(".")
+        if parts[0] == "flask_appbuilder":
+            times[".".join(parts[:2])] += self_us
+        else:
+            times["(third party)"] += self_us
+    return dict(times)
+
+
+@click.command()
+@click.argument("modules", nargs=-1)
+@click.option("--repeat", default=5, help="Runs per module, the fastest is kept")
+@click.option("--top", default=10, help="Subpackages listed per module")
+@click.option("--json-file", type=click.Path(), help="Also write results as JSON")
+@click.option(
+    "--max-ms",
+    type=float,
+    help="Fail if importing the first module takes longer than this",
+)
+def import_time(modules, repeat, top, json_file, max_ms):
+    """Measure import time of MODULES (default: flask_appbuilder)"""
+    modules = modules or DEFAULT_MODULES
+    results = {}
+    for module in modules:
+        runs = [measure(module) for _ in range(repeat)]
+        results[module] = min(runs, key=lambda times: times["total"])
+
+    for module, times in results.items():
+        click.echo(f"{module}: {times['total'] / 1000:.1f} ms")
+        packages = sorted(
+            ((name, us) for name, us in times.items() if name != "total"),
+            key=lambda item: item[1],
+            reverse=True,
+        )
+        for name, us in packages[:top]:
+            click.echo(f"  {us / 1000:8.1f} ms  {name}")
+
+    if json_file:
+        with open(json_file, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    if max_ms is not None and results[modules[0]]["total"] / 1000 > max_ms:
+        raise click.ClickException(
+            f"import {modules[0]} took more than {max_ms} ms"
+        )
+
+
+if __name__ == "__main__":
+    import_time()
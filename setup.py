@@ -95,6 +95,8 @@ setup(
             "matplotlib>=3.5.0, <4.0.0",   # Chart generation for dashboards
             "seaborn>=0.11.0, <1.0.0",     # Statistical visualization (optional)
         ],
+        "orjson": ["orjson>=3.6.0, <4.0.0"],  # Fast JSON for list_fast_serialization
+        "zstd": ["zstandard>=0.15.0, <1.0.0"],  # zstd compressed database backups
         "oauth": ["Authlib>=0.14, <2.0.0"],
         "openid": ["Flask-OpenID>=1.2.5, <2"],
         "talisman": ["flask-talisman>=1.0.0, <2.0"],
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Expression Evaluation Microbenchmark
+
+Measures the per-evaluation cost of gateway/edge condition expressions when
+the expression is parsed and validated on every evaluation (the previous
+behaviour) against evaluating the cached, compiled closure.
+
+Usage:
+    python benchmark_expression_eval.py [--iterations N]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask_appbuilder.process.engine.expression_compiler import compile_expression
+
+EXPRESSIONS = [
+    "amount > 1000",
+    "amount > 1000 and priority == 'high'",
+    "0 < amount <= limit and (approved or priority == 'urgent')",
+    "amount * rate - discount >= threshold",
+]
+
+VARIABLES = {
+    "amount": 2500, "limit": 5000, "priority": "high", "approved": False,
+    "rate": 1.2, "discount": 50, "threshold": 2000,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--iterations', type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{'expression':<62} {'parse+eval':>12} {'compiled':>12} {'speedup':>8}")
+    for expression in EXPRESSIONS:
+        uncached = timeit.timeit(
+            lambda: compile_expression(expression, use_cache=False)(VARIABLES),
+            number=args.iterations
+        )
+        compiled = compile_expression(expression)
+        cached = timeit.timeit(lambda: compile_expression(expression)(VARIABLES),
+                               number=args.iterations)
+        per_uncached = uncached / args.iterations * 1e6
+        per_cached = cached / args.iterations * 1e6
+        print(f"{expression:<62} {per_uncached:>10.2f}us {per_cached:>10.2f}us "
+              f"{per_uncached / per_cached:>7.1f}x")
+        assert compiled(VARIABLES) == compile_expression(expression, use_cache=False)(VARIABLES)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+from flask_appbuilder.models.sqla.interface import SQLAInterface
+from flask_appbuilder.security.sqla.models import Role
+from tests.base import BaseMVCTestCase
+
+
+class PermissionCacheSecurityTestCase(BaseMVCTestCase):
+    """
+    Revoked grants must stop working immediately, whatever path changed them
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.sm = self.appbuilder.sm
+        self.pvm = self.sm.add_permission_view_menu("can_revoke", "CacheTestView")
+        self.role = self.sm.add_role("CacheTestRole", [self.pvm])
+        self.assertTrue(self._has_access())
+
+    def tearDown(self):
+        self.appbuilder.session.rollback()
+        role = self.sm.find_role("CacheTestRole")
+        if role:
+            self.appbuilder.session.delete(role)
+            self.appbuilder.session.commit()
+        self.sm.del_permission_view_menu("can_revoke", "CacheTestView")
+        self.sm.del_view_menu("CacheTestView")
+
+    def _has_access(self):
+        return self.sm.exist_permission_on_roles(
+            "CacheTestView", "can_revoke", [self.role.id]
+        )
+
+    def test_del_permission_role(self):
+        self.sm.del_permission_role(self.role, self.pvm)
+        self.assertFalse(self._has_access())
+
+    def test_revoke_from_role_view(self):
+        """Role views and the role API edit roles through the datamodel"""
+        datamodel = SQLAInterface(Role, self.appbuilder.session)
+        role = datamodel.get(self.role.id)
+        role.permissions = []
+        datamodel.edit(role)
+        self.assertFalse(self._has_access())
+
+    def test_delete_role_from_role_view(self):
+        datamodel = SQLAInterface(Role, self.appbuilder.session)
+        datamodel.delete(datamodel.get(self.role.id))
+        self.assertFalse(self._has_access())
+
+    def test_rolled_back_revoke(self):
+        self.role.permissions = []
+        self.appbuilder.session.flush()
+        self.appbuilder.session.rollback()
+        self.assertTrue(self._has_access())
@@ -1,6 +1,8 @@
+import gzip
 import json
 import logging
 import os
+from unittest.mock import patch
 
 from flask_appbuilder import ModelRestApi, SQLA
 from flask_appbuilder.const import (
@@ -250,6 +252,12 @@ class APITestCase(FABTestCase):
         self.model1apifieldsinfo = Model1ApiFieldsInfo
         self.appbuilder.add_api(Model1ApiFieldsInfo)
 
+        class Model1ApiFastSerialization(Model1Api):
+            datamodel = SQLAInterface(Model1)
+            list_fast_serialization = True
+
+        self.appbuilder.add_api(Model1ApiFastSerialization)
+
         class Model1FuncApi(ModelRestApi):
             datamodel = SQLAInterface(Model1)
             list_columns = [
@@ -1543,6 +1551,52 @@ class APITestCase(FABTestCase):
             rv = self.auth_client_get(client, token, uri)
             self.assertEqual(rv.status_code, 200)
 
+    def test_get_list_keyset_page(self):
+        """
+        REST Api: Test get list keyset pagination with after cursor
+        """
+        page_size = 5
+        client = self.app.test_client()
+        token = self.login(client, USERNAME_ADMIN, PASSWORD_ADMIN)
+
+        arguments = {
+            "page_size": page_size,
+            "after": "",
+            "count": "none",
+            "order_column": "field_integer",
+            "order_direction": "asc",
+        }
+        uri = f"api/v1/model1api/?{API_URI_RIS_KEY}={prison.dumps(arguments)}"
+        with model1_data(self.appbuilder.session, MODEL1_DATA_SIZE):
+            rv = self.auth_client_get(client, token, uri)
+            self.assertEqual(rv.status_code, 200)
+            data = json.loads(rv.data.decode("utf-8"))
+            self.assertIsNone(data["count"])
+            self.assertEqual(
+                [item["field_integer"] for item in data[API_RESULT_RES_KEY]],
+                list(range(page_size)),
+            )
+            # seek the second page with the returned cursor
+            arguments["after"] = data["next"]
+            uri = f"api/v1/model1api/?{API_URI_RIS_KEY}={prison.dumps(arguments)}"
+            rv = self.auth_client_get(client, token, uri)
+            self.assertEqual(rv.status_code, 200)
+            data = json.loads(rv.data.decode("utf-8"))
+            self.assertEqual(
+                [item["field_integer"] for item in data[API_RESULT_RES_KEY]],
+                list(range(page_size, page_size * 2)),
+            )
+            # a cursor is bound to the order it was issued for
+            arguments["order_direction"] = "desc"
+            uri = f"api/v1/model1api/?{API_URI_RIS_KEY}={prison.dumps(arguments)}"
+            rv = self.auth_client_get(client, token, uri)
+            self.assertEqual(rv.status_code, 400)
+            # invalid cursor
+            arguments["after"] = "not-a-cursor"
+            uri = f"api/v1/model1api/?{API_URI_RIS_KEY}={prison.dumps(arguments)}"
+            rv = self.auth_client_get(client, token, uri)
+            self.assertEqual(rv.status_code, 400)
+
     def test_get_list_max_page_size(self):
         """
         REST Api: Test get list max page size config setting
@@ -2016,6 +2070,68 @@ class APITestCase(FABTestCase):
             self.assertEqual(data[API_LIST_COLUMNS_RES_KEY], ["field_integer"])
             self.assertEqual(rv.status_code, 200)
 
+    def test_get_list_choose_cols_schema_cached(self):
+        """
+        REST Api: Test select columns schemas are built once and reused
+        """
+        client = self.app.test_client()
+        token = self.login(client, USERNAME_ADMIN, PASSWORD_ADMIN)
+        model1api = next(
+            view
+            for view in self.appbuilder.baseviews
+            if isinstance(view, self.model1api)
+        )
+        converter = model1api.model2schemaconverter
+        stats = converter.get_cache_stats()
+
+        with model1_data(self.appbuilder.session, 2):
+            for columns in (
+                ["field_integer", "field_string"],
+                ["field_string", "field_integer"],
+                ["field_integer", "field_float", "field_string", "field_date"],
+            ):
+                argument = {API_SELECT_COLUMNS_RIS_KEY: columns}
+                uri = f"api/v1/model1api/?{API_URI_RIS_KEY}={prison.dumps(argument)}"
+                rv = self.auth_client_get(client, token, uri)
+                self.assertEqual(rv.status_code, 200)
+                data = json.loads(rv.data.decode("utf-8"))
+                self.assertEqual(set(data[API_RESULT_RES_KEY][0]), set(columns))
+
+        # The last request selects list_columns, warmed up at blueprint creation
+        new_stats = converter.get_cache_stats()
+        self.assertEqual(new_stats["misses"] - stats["misses"], 1)
+        self.assertEqual(new_stats["hits"] - stats["hits"], 2)
+
+    def test_get_list_fast_serialization(self):
+        """
+        REST Api: Test get list with fast serialization responds the same
+        """
+        client = self.app.test_client()
+        token = self.login(client, USERNAME_ADMIN, PASSWORD_ADMIN)
+        with model1_data(self.appbuilder.session, 20):
+            for argument in (
+                {},
+                {"order_column": "field_string", "order_direction": "desc"},
+                {"page": 1, "page_size": 5},
+                {API_SELECT_COLUMNS_RIS_KEY: ["field_string", "field_date"]},
+                {
+                    API_SELECT_COLUMNS_RIS_KEY: ["field_integer", "field_string"],
+                    API_FILTERS_RIS_KEY: [
+                        {"col": "field_integer", "opr": "gt", "value": 10}
+                    ],
+                    "page_size": 3,
+                    "after": "",
+                },
+            ):
+                query = f"?{API_URI_RIS_KEY}={prison.dumps(argument)}"
+                rv = self.auth_client_get(client, token, f"api/v1/model1api/{query}")
+                fast_rv = self.auth_client_get(
+                    client, token, f"api/v1/model1apifastserialization/{query}"
+                )
+                self.assertEqual(fast_rv.status_code, 200)
+                self.assertEqual(fast_rv.data, rv.data)
+                self.assertEqual(fast_rv.content_type, rv.content_type)
+
     def test_get_list_choose_select_cols(self):
         """
         REST Api: Test get list with select columns
@@ -3148,6 +3264,75 @@ class APITestCase(FABTestCase):
         rv = self.auth_client_get(client, token, uri)
         self.assertEqual(rv.status_code, 200)
 
+    def test_openapi_cached_with_etag(self):
+        """
+        REST Api: Test OpenAPI spec is cached, gzip encoded and revalidated by ETag
+        """
+        from flask_appbuilder.api import BaseApi, expose
+
+        client = self.app.test_client()
+        token = self.login(client, USERNAME_ADMIN, PASSWORD_ADMIN)
+        uri = "api/v1/_openapi"
+        headers = {"Authorization": f"Bearer {token}", "Accept-Encoding": "gzip"}
+        rv = client.get(uri, headers=headers)
+        self.assertEqual(rv.status_code, 200)
+        self.assertEqual(rv.headers["Content-Encoding"], "gzip")
+        spec = json.loads(gzip.decompress(rv.data).decode("utf-8"))
+        self.assertIn("paths", spec)
+        etag = rv.headers["ETag"]
+
+        rv = client.get(uri, headers={**headers, "If-None-Match": etag})
+        self.assertEqual(rv.status_code, 304)
+        self.assertEqual(rv.data, b"")
+
+        rv = self.auth_client_get(client, token, uri)
+        self.assertEqual(json.loads(rv.data.decode("utf-8")), spec)
+        self.assertNotEqual(rv.headers["ETag"], etag)
+
+        class OpenApiAddedApi(BaseApi):
+            @expose("/added")
+            def added(self):
+                """Added endpoint
+                ---
+                get:
+                  responses:
+                    200:
+                      description: Added
+                """
+                return self.response(200)
+
+        self.appbuilder.add_api(OpenApiAddedApi)
+        rv = client.get(uri, headers={**headers, "If-None-Match": etag})
+        self.assertEqual(rv.status_code, 200)
+        self.assertNotEqual(rv.headers["ETag"], etag)
+        spec = json.loads(gzip.decompress(rv.data).decode("utf-8"))
+        self.assertIn("/api/v1/openapiaddedapi/added", spec["paths"])
+
+    def test_openapi_host_specs_bounded(self):
+        """
+        REST Api: Test OpenAPI specs are generated once and bounded per request host
+        """
+        client = self.app.test_client()
+        token = self.login(client, USERNAME_ADMIN, PASSWORD_ADMIN)
+        openapi_manager = self.appbuilder.openapi_manager
+        openapi_manager.invalidate_specs()
+        uri = "api/v1/_openapi"
+        headers = {"Authorization": f"Bearer {token}"}
+
+        with patch.object(
+            openapi_manager, "_build_spec", wraps=openapi_manager._build_spec
+        ) as build_spec:
+            for i in range(openapi_manager.host_specs_cache_size + 5):
+                host_url = f"http://host{i}.example.com/"
+                rv = client.get(uri, headers=headers, base_url=host_url)
+                self.assertEqual(rv.status_code, 200)
+                spec = json.loads(rv.data.decode("utf-8"))
+                self.assertEqual(spec["servers"], [{"url": host_url}])
+        build_spec.assert_called_once()
+        self.assertEqual(
+            len(openapi_manager._host_specs), openapi_manager.host_specs_cache_size
+        )
+
     def test_swagger_ui(self):
         """
         REST Api: Test Swagger UI
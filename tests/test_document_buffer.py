@@ -0,0 +1,78 @@
+"""
+Tests for the rope-backed document buffer of the collaborative editor.
+"""
+
+import random
+import unittest
+
+from flask_appbuilder.collaborative.editing.document_buffer import (
+    DocumentBuffer,
+    LEAF_SIZE,
+)
+
+
+def _assert_balanced(node):
+    if node is None or node.text is not None:
+        return
+    assert abs(node.left.height - node.right.height) <= 1
+    assert node.length == node.left.length + node.right.length
+    _assert_balanced(node.left)
+    _assert_balanced(node.right)
+
+
+class TestDocumentBuffer(unittest.TestCase):
+    """Test editing, reading and snapshots of the document buffer."""
+
+    def test_behaves_like_a_string(self):
+        """Length, indexing, slicing and comparison match the text."""
+        text = "".join(chr(97 + i % 26) for i in range(LEAF_SIZE * 5 + 7))
+        buffer = DocumentBuffer(text).insert(0, "!")
+        text = "!" + text
+
+        self.assertEqual(len(buffer), len(text))
+        self.assertEqual(buffer, text)
+        self.assertEqual(buffer[LEAF_SIZE - 3:LEAF_SIZE * 2 + 3], text[LEAF_SIZE - 3:LEAF_SIZE * 2 + 3])
+        self.assertEqual(buffer[-1], text[-1])
+        self.assertEqual("".join(buffer), text)
+
+    def test_random_edits_match_string_slicing(self):
+        """Random inserts and deletes give the same text and keep the rope balanced."""
+        rnd = random.Random(7)
+        text = "x" * (LEAF_SIZE * 20)
+        buffer = DocumentBuffer(text)
+
+        for _ in range(2000):
+            position = rnd.randint(0, len(text))
+            if rnd.random() < 0.6:
+                insert = "ab" * rnd.choice([1, 3, LEAF_SIZE])
+                text = text[:position] + insert + text[position:]
+                buffer = buffer.insert(position, insert)
+            else:
+                length = rnd.choice([1, 4, LEAF_SIZE * 3])
+                text = text[:position] + text[position + length:]
+                buffer = buffer.delete(position, length)
+
+        self.assertEqual(str(buffer), text)
+        _assert_balanced(buffer._root)
+
+    def test_edits_leave_snapshots_unchanged(self):
+        """An edit returns a new buffer sharing structure with the old one."""
+        original = DocumentBuffer("y" * (LEAF_SIZE * 8))
+        edited = original.insert(LEAF_SIZE * 4, "hello").delete(0, 10)
+
+        self.assertEqual(str(original), "y" * (LEAF_SIZE * 8))
+        self.assertEqual(len(edited), LEAF_SIZE * 8 - 5)
+        self.assertIs(edited._root.right.right, original._root.right.right)
+
+    def test_out_of_range_positions_rejected(self):
+        """Positions outside the document raise IndexError."""
+        buffer = DocumentBuffer("abc")
+        with self.assertRaises(IndexError):
+            buffer.insert(4, "x")
+        with self.assertRaises(IndexError):
+            buffer.delete(-1, 1)
+        self.assertEqual(buffer.delete(1, 100), "a")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+"""
+Tests for the in-memory embedding matrix used by the RAG vector store.
+
+Covers normalized top-k search, team and document type filters, updates and
+deletes, and saving/memory-mapping a matrix.
+"""
+
+import shutil
+import tempfile
+import unittest
+
+from unittest.mock import Mock, patch
+
+import numpy as np
+
+from flask_appbuilder.collaborative.ai.embedding_matrix import (
+    EmbeddingMatrix, EmbeddingMatrixIndex
+)
+
+
+class TestEmbeddingMatrix(unittest.TestCase):
+    """Test search and maintenance of the embedding matrix."""
+
+    def setUp(self):
+        """Set up a matrix with a few 3-dimensional embeddings."""
+        self.matrix = EmbeddingMatrix(dimension=3, capacity=2)
+        self.matrix.add(
+            [1, 2, 3, 4],
+            [[1.0, 0.0, 0.0], [0.0, 2.0, 0.0], [3.0, 3.0, 0.0], [0.0, 0.0, 5.0]],
+            [10, 10, 20, None],
+            ["text", "code", "text", "text"]
+        )
+
+    def test_search_returns_top_k_by_cosine_similarity(self):
+        """Rows are normalized and ranked by cosine similarity."""
+        hits = self.matrix.search([2.0, 0.0, 0.0], limit=2)
+
+        self.assertEqual([embedding_id for embedding_id, _ in hits], [1, 3])
+        self.assertAlmostEqual(hits[0][1], 1.0, places=5)
+        self.assertAlmostEqual(hits[1][1], 2 ** -0.5, places=5)
+
+    def test_search_applies_threshold_and_filters(self):
+        """Threshold, team and document type filters restrict the hits."""
+        self.assertEqual(
+            [i for i, _ in self.matrix.search([1.0, 1.0, 0.0], limit=10, similarity_threshold=0.9)], [3]
+        )
+        self.assertEqual(
+            [i for i, _ in self.matrix.search([1.0, 1.0, 0.0], limit=10, team_id=10)], [1, 2]
+        )
+        self.assertEqual(
+            [i for i, _ in self.matrix.search([1.0, 1.0, 0.0], limit=10, document_types=["code"])], [2]
+        )
+
+    def test_remove_and_replace(self):
+        """Removed rows are not returned and re-adding an id replaces its row."""
+        self.assertEqual(self.matrix.remove([1]), 1)
+        self.matrix.add([3], [[0.0, 0.0, 1.0]], [None], ["text"])
+
+        hits = self.matrix.search([1.0, 0.0, 0.0], limit=10, similarity_threshold=0.5)
+        self.assertEqual(hits, [])
+        self.assertEqual(len(self.matrix), 3)
+
+        self.matrix.compact()
+        self.assertEqual(len(self.matrix), 3)
+        self.assertEqual(self.matrix.search([0.0, 0.0, 1.0], limit=1)[0][0], 3)
+
+    def test_mismatched_dimensions_are_skipped(self):
+        """Vectors and queries of another dimension are ignored."""
+        self.assertEqual(self.matrix.add([5], [[1.0, 0.0]], [None], ["text"]), 0)
+        self.assertEqual(self.matrix.search([1.0, 0.0], limit=3), [])
+
+    def test_save_and_memory_map(self):
+        """A saved matrix loads memory-mapped and becomes writable on change."""
+        path = tempfile.mkdtemp()
+        try:
+            self.matrix.save(path)
+            loaded = EmbeddingMatrix.load(path, mmap=True)
+
+            self.assertTrue(loaded.get_stats()["memory_mapped"])
+            self.assertIsInstance(loaded._vectors, np.memmap)
+            self.assertEqual(loaded.search([0.0, 0.0, 1.0], limit=1)[0][0], 4)
+
+            loaded.add([5], [[0.0, -1.0, 0.0]], [None], ["text"])
+            self.assertFalse(loaded.get_stats()["memory_mapped"])
+            self.assertEqual(loaded.search([0.0, -1.0, 0.0], limit=1)[0][0], 5)
+        finally:
+            shutil.rmtree(path)
+
+
+class TestMatrixSearch(unittest.TestCase):
+    """Test the vector store's top-k search over a loaded matrix."""
+
+    def test_deleted_rows_are_removed_and_backfilled(self):
+        """Hits deleted from the database leave the index and are replaced by the next best."""
+        from flask_appbuilder.collaborative.ai import rag_engine
+
+        index = EmbeddingMatrixIndex()
+        matrix = EmbeddingMatrix(dimension=2)
+        matrix.add(
+            [1, 2, 3, 4],
+            [[1.0, 0.0], [0.9, 0.1], [0.8, 0.2], [0.0, 1.0]],
+            [None] * 4,
+            ["comment"] * 4
+        )
+        index._matrices[None] = matrix
+        store = rag_engine.VectorStore.__new__(rag_engine.VectorStore)
+        store.embedding_index = Mock(wraps=index)
+
+        rows = {
+            embedding_id: Mock(id=embedding_id, content=f"row {embedding_id}", chunk_index=0,
+                               document_id="doc", document_type="comment", created_at=None,
+                               content_length=5)
+            for embedding_id in (1, 3, 4)
+        }
+        session = Mock()
+        session.query.return_value.filter.side_effect = lambda ids: [rows[i] for i in ids if i in rows]
+
+        with patch.object(rag_engine, "VectorEmbedding") as model:
+            model.id.in_.side_effect = list
+            results = store._matrix_search(session, matrix, [1.0, 0.0], None, None, 2, -1.0)
+
+        self.assertEqual([r.metadata["embedding_id"] for r in results], [1, 3])
+        self.assertEqual([r.rank for r in results], [1, 2])
+        store.embedding_index.remove.assert_called_once_with([2])
+        self.assertNotIn(2, matrix)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -12,11 +12,27 @@ from io import StringIO, BytesIO
 from datetime import datetime, date
 from decimal import Decimal
 
+from flask import Flask
+from sqlalchemy import Column, create_engine, Integer, String
+from sqlalchemy.engine import CursorResult
+from sqlalchemy.orm import declarative_base, Query, Session
+
 # Import the classes we're testing directly
+from flask_appbuilder.export import excel_exporter
 from flask_appbuilder.export.export_manager import ExportManager, ExportFormat
 from flask_appbuilder.export.csv_exporter import CSVExporter
 from flask_appbuilder.export.excel_exporter import ExcelExporter
+from flask_appbuilder.export.export_views import DataExportView
 from flask_appbuilder.export.pdf_exporter import PDFExporter
+from flask_appbuilder.models.sqla.interface import SQLAInterface
+
+StreamBase = declarative_base()
+
+
+class StreamItem(StreamBase):
+    __tablename__ = 'stream_item'
+    id = Column(Integer, primary_key=True)
+    name = Column(String(50))
 
 
 class TestExportManagerIsolated(unittest.TestCase):
@@ -246,6 +262,36 @@ class TestCSVExporterIsolated(unittest.TestCase):
         
         self.assertIn('No data available', result)
     
+    def test_export_stream(self):
+        """Test streaming CSV export in chunks."""
+        headers = ['name', 'age', 'active']
+        chunks = list(self.csv_exporter.export_stream(
+            iter(self.sample_data),
+            headers,
+            column_labels={'name': 'Name'},
+            options={'chunk_rows': 1}
+        ))
+        
+        # One chunk per row plus the final flush
+        self.assertEqual(len(chunks), len(self.sample_data) + 1)
+        self.assertTrue(all(isinstance(chunk, bytes) for chunk in chunks))
+        lines = b''.join(chunks).decode('utf-8').strip().splitlines()
+        self.assertEqual(lines[0], 'Name,age,active')
+        self.assertEqual(lines[1], 'John Doe,30,True')
+        self.assertEqual(len(lines), len(self.sample_data) + 1)
+    
+    def test_export_stream_utf16_single_bom(self):
+        """Test streaming CSV export only writes the BOM once."""
+        chunks = list(self.csv_exporter.export_stream(
+            iter(self.sample_data),
+            ['name'],
+            options={'chunk_rows': 1, 'encoding': 'utf-16'}
+        ))
+        
+        content = b''.join(chunks)
+        self.assertEqual(content.count(b'\xff\xfe') + content.count(b'\xfe\xff'), 1)
+        self.assertIn('Jane Smith', content.decode('utf-16'))
+    
     def test_format_row(self):
         """Test row formatting."""
         row = {
@@ -687,5 +733,175 @@ class TestExportIntegration(unittest.TestCase):
         self.assertIsInstance(result, str)
 
 
+class TestStreamingExport(unittest.TestCase):
+    """Test model exports are streamed in batches from the database."""
+    
+    row_count = 25
+    
+    def setUp(self):
+        """Set up a model with rows and an app context."""
+        engine = create_engine('sqlite://')
+        StreamBase.metadata.create_all(engine)
+        self.session = Session(engine)
+        self.session.add_all(
+            [StreamItem(id=i, name=f'item {i}') for i in range(1, self.row_count + 1)]
+        )
+        self.session.commit()
+        
+        self.app = Flask(__name__)
+        self.export_manager = ExportManager(self.app)
+        user_patcher = patch('flask_appbuilder.export.export_manager.current_user')
+        user_patcher.start().is_authenticated = False
+        self.addCleanup(user_patcher.stop)
+    
+    def tearDown(self):
+        self.session.close()
+    
+    def _no_fetchall(self):
+        """Fail if rows are fetched all at once, record yield_per batches."""
+        self.batch_sizes = []
+        yield_per = Query.yield_per
+        
+        def record_yield_per(query, count):
+            self.batch_sizes.append(count)
+            return yield_per(query, count)
+        
+        for patcher in (
+            patch.object(CursorResult, 'fetchall', side_effect=AssertionError('fetchall')),
+            patch.object(Query, 'all', side_effect=AssertionError('Query.all')),
+            patch.object(Query, 'yield_per', record_yield_per),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+    
+    def test_stream_query_csv_batches(self):
+        """Test stream_query fetches rows in batches and is lazy."""
+        self._no_fetchall()
+        with self.app.app_context():
+            chunks = self.export_manager.stream_query(
+                self.session.query(StreamItem).order_by(StreamItem.id),
+                ExportFormat.CSV,
+                column_labels={'name': 'Name'},
+                options={'chunk_rows': 10},
+                batch_size=5
+            )
+            # Nothing is read until the stream is consumed
+            self.assertEqual(self.batch_sizes, [])
+            content = b''.join(chunks).decode('utf-8')
+        
+        self.assertEqual(self.batch_sizes, [5])
+        lines = [line for line in content.strip().splitlines() if not line.startswith('#')]
+        self.assertEqual(lines[0], 'id,Name')
+        self.assertEqual(lines[1], '1,item 1')
+        self.assertEqual(len(lines), self.row_count + 1)
+    
+    @unittest.skipUnless(excel_exporter.OPENPYXL_AVAILABLE, 'openpyxl is not installed')
+    def test_stream_query_excel(self):
+        """Test the streamed xlsx workbook holds every row."""
+        from openpyxl import load_workbook
+        
+        self._no_fetchall()
+        with self.app.app_context():
+            content = b''.join(self.export_manager.stream_query(
+                self.session.query(StreamItem).order_by(StreamItem.id),
+                ExportFormat.EXCEL,
+                column_labels={'name': 'Name'},
+                metadata={'title': 'Items'},
+                options={'chunk_size': 1024},
+                batch_size=10
+            ))
+        
+        self.assertEqual(self.batch_sizes, [10])
+        workbook = load_workbook(BytesIO(content), read_only=True)
+        rows = list(workbook['Data'].iter_rows(values_only=True))
+        self.assertEqual(rows[0], ('id', 'Name'))
+        self.assertEqual(rows[1], (1, 'item 1'))
+        self.assertEqual(rows[-1], (self.row_count, f'item {self.row_count}'))
+        self.assertEqual(len(rows), self.row_count + 1)
+        metadata = dict(workbook['Export Metadata'].iter_rows(values_only=True))
+        self.assertEqual(metadata['Title'], 'Items')
+    
+    @unittest.skipUnless(excel_exporter.OPENPYXL_AVAILABLE, 'openpyxl is not installed')
+    def test_excel_export_stream_chunks(self):
+        """Test the xlsx archive is yielded in chunks of chunk_size."""
+        rows = ({'name': f'row {i}', 'value': i} for i in range(100))
+        chunks = list(ExcelExporter().export_stream(
+            rows, ['name', 'value'], options={'chunk_size': 512, 'include_metadata': False}
+        ))
+        
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(all(len(chunk) == 512 for chunk in chunks[:-1]))
+        self.assertEqual(b''.join(chunks)[:2], b'PK')
+    
+    def _export_view(self, has_access=True, list_columns=('id', 'name')):
+        view = DataExportView()
+        model_view = Mock(
+            datamodel=SQLAInterface(StreamItem, self.session),
+            class_permission_name='StreamItemView',
+            list_columns=list(list_columns),
+            show_columns=[],
+            label_columns={'name': 'Name'},
+            _base_filters=None,
+        )
+        view.appbuilder = Mock(app=self.app, baseviews=[model_view])
+        view.appbuilder.sm.has_access.return_value = has_access
+        return view
+    
+    def test_export_model_streams_response(self):
+        """Test export_model returns a streamed CSV of the model's view."""
+        self._no_fetchall()
+        view = self._export_view()
+        with self.app.test_request_context('/data-export/model/StreamItem?format=csv&max_records=7'):
+            response = DataExportView.export_model.__wrapped__(view, 'StreamItem')
+            self.assertTrue(response.is_streamed)
+            self.assertEqual(
+                response.headers['Content-Disposition'], 'attachment; filename=StreamItem.csv'
+            )
+            lines = [
+                line for line in response.get_data(as_text=True).strip().splitlines()
+                if not line.startswith('#')
+            ]
+        
+        view.appbuilder.sm.has_access.assert_called_with('can_list', 'StreamItemView')
+        self.assertEqual(lines[0], 'id,Name')
+        self.assertEqual(len(lines), 8)
+    
+    def test_export_model_hides_unlisted_columns(self):
+        """Test only the view's list columns that are model columns are exported."""
+        view = self._export_view(list_columns=['name', 'name_length'])
+        with self.app.test_request_context('/data-export/model/StreamItem?format=csv'):
+            response = DataExportView.export_model.__wrapped__(view, 'StreamItem')
+            lines = [
+                line for line in response.get_data(as_text=True).strip().splitlines()
+                if not line.startswith('#')
+            ]
+        
+        self.assertEqual(lines[0], 'Name')
+        self.assertEqual(lines[1], 'item 1')
+        self.assertEqual(len(lines), self.row_count + 1)
+    
+    def test_export_model_without_columns_rejected(self):
+        """Test a view showing no model columns exports nothing."""
+        view = self._export_view(list_columns=[])
+        with self.app.test_request_context('/data-export/model/StreamItem'), \
+                patch('flask_appbuilder.export.export_views.url_for', return_value='/export/'), \
+                patch('flask_appbuilder.export.export_views.flash') as mock_flash:
+            response = DataExportView.export_model.__wrapped__(view, 'StreamItem')
+        
+        self.assertEqual(response.status_code, 302)
+        mock_flash.assert_called_once_with("Model 'StreamItem' has no exportable columns", 'error')
+    
+    def test_export_model_requires_list_access(self):
+        """Test models of views the user can't list are not exported."""
+        view = self._export_view(has_access=False)
+        with self.app.test_request_context('/data-export/model/StreamItem'), \
+                patch('flask_appbuilder.export.export_views.url_for', return_value='/export/'), \
+                patch('flask_appbuilder.export.export_views.flash') as mock_flash:
+            response = DataExportView.export_model.__wrapped__(view, 'StreamItem')
+        
+        self.assertEqual(response.status_code, 302)
+        mock_flash.assert_called_once_with("Model 'StreamItem' not found", 'error')
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
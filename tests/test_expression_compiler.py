@@ -0,0 +1,91 @@
+"""
+Tests for the safe expression compiler used by gateway and edge conditions.
+"""
+
+import unittest
+
+from flask_appbuilder.process.engine.expression_compiler import (
+    ExpressionCache, ExpressionCompileError, compile_expression,
+    compile_template, get_expression_cache, safe_eval
+)
+from flask_appbuilder.process.models.process_graph import compile_edge_condition
+
+
+class TestExpressionCompiler(unittest.TestCase):
+    """Test compiling, caching and evaluating safe expressions."""
+
+    def setUp(self):
+        get_expression_cache().clear()
+
+    def test_evaluation(self):
+        """Test compiled expressions match Python semantics for allowed operators."""
+        variables = {"amount": 150, "limit": 100, "approved": True, "status": "open"}
+
+        self.assertTrue(safe_eval("amount > limit and approved", variables))
+        self.assertFalse(safe_eval("not approved", variables))
+        self.assertTrue(safe_eval("0 < limit < amount <= 150", variables))
+        self.assertFalse(safe_eval("0 < amount < limit", variables))
+        self.assertEqual(safe_eval("amount * 2 - limit", variables), 200)
+        self.assertTrue(safe_eval("status == 'open' or missing", variables))
+
+    def test_rejected_expressions(self):
+        """Test disallowed constructs fail at compile time and evaluate to False."""
+        for expression in ("__import__('os')", "amount.real", "[1, 2]", "amount >"):
+            with self.assertRaises(ExpressionCompileError):
+                compile_expression(expression)
+            self.assertFalse(safe_eval(expression, {"amount": 1}))
+
+        # Undefined names only fail when evaluated
+        self.assertFalse(safe_eval("undefined > 1", {}))
+
+    def test_cache_reuse(self):
+        """Test an expression is parsed once and reused from the LRU cache."""
+        first = compile_expression("amount > 1")
+        self.assertIs(compile_expression("amount > 1"), first)
+        self.assertIsNot(compile_expression("amount > 1", use_cache=False), first)
+
+        stats = get_expression_cache().get_stats()
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hits"], 1)
+
+        cache = ExpressionCache(maxsize=2)
+        for key in ("a", "b", "c"):
+            cache.get_or_set(key, lambda: key)
+        self.assertEqual(cache.get_stats()["size"], 2)
+        self.assertEqual(cache.get_or_set("a", lambda: "recomputed"), "recomputed")
+
+    def test_edge_expression_condition(self):
+        """Test edge conditions in expression form use the compiler."""
+        condition = compile_edge_condition({"expression": "amount >= 100"})
+        self.assertTrue(condition({"amount": 100}))
+        self.assertFalse(condition({"amount": 99}))
+        self.assertFalse(condition({}))
+        self.assertFalse(compile_edge_condition({"expression": "import os"})({}))
+
+    def test_template_cached_before_substitution(self):
+        """Test ${var} templates are cached once and bound at evaluation time."""
+        template = compile_template("${amount} > limit and '${status}' == 'open'")
+        self.assertEqual(template.variable_names, ["amount", "status"])
+
+        for amount in range(50):
+            self.assertIs(
+                compile_template("${amount} > limit and '${status}' == 'open'"), template
+            )
+            self.assertEqual(
+                template.evaluate({"limit": 25}, {"amount": amount, "status": "open"}),
+                amount > 25,
+            )
+        self.assertFalse(template.evaluate({"limit": 0}, {"amount": 1, "status": "closed"}))
+        self.assertEqual(get_expression_cache().get_stats()["size"], 1)
+
+        with self.assertRaises(NameError):
+            template.evaluate({"limit": 0}, {"amount": 1})
+        with self.assertRaises(ExpressionCompileError):
+            compile_template("${amount} >")
+
+    def test_edge_expression_condition_template(self):
+        """Test ${var} references in edge conditions bind from the context."""
+        condition = compile_edge_condition({"expression": "${amount} >= 100"})
+        self.assertTrue(condition({"amount": 100}))
+        self.assertFalse(condition({"amount": 99}))
+        self.assertFalse(condition({}))
@@ -630,6 +630,139 @@ class TestFAISSIntegration(unittest.TestCase):
         self.assertEqual(len(results), 0)
 
 
+@unittest.skipUnless(HAS_FAISS and FAISS_AVAILABLE, "FAISS not available")
+class TestFAISSDeltaLog(unittest.TestCase):
+    """Test snapshot loading and delta log replay of a FAISS vector store."""
+
+    def setUp(self):
+        import numpy as np
+
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir, ignore_errors=True)
+        self.index_path = os.path.join(self.temp_dir, "delta_index", "index")
+        self.vectors = np.random.default_rng(0).standard_normal((30, 16)).astype(np.float32)
+        self.vectors /= np.linalg.norm(self.vectors, axis=1, keepdims=True)
+
+    def _store(self, **kwargs):
+        return FAISSVectorStore(
+            session_factory=Mock(),
+            embedding_dim=16,
+            index_path=self.index_path,
+            enable_monitoring=False,
+            **kwargs
+        )
+
+    def _add(self, store, start, end):
+        store.add_vectors(self.vectors[start:end], [{"db_id": i + 1} for i in range(start, end)])
+
+    def test_faiss_delta_log_replay(self):
+        """Test a restarted store maps the snapshot and replays the delta log into an overlay."""
+        store = self._store(snapshot_every=3)
+        self._add(store, 0, 10)
+        self._add(store, 10, 20)
+        self._add(store, 20, 25)
+
+        # Third logged change triggered a snapshot and emptied the delta log
+        self.assertTrue(os.path.exists(f"{self.index_path}.index"))
+        self.assertEqual(os.path.getsize(f"{self.index_path}.delta"), 0)
+
+        self._add(store, 25, 30)
+        store.remove_vectors([3])
+
+        restarted = self._store(read_only=True)
+        stats = restarted.get_stats()
+        self.assertTrue(restarted._index_mmapped)
+        self.assertTrue(stats["memory_mapped"])
+        self.assertEqual(restarted.index.ntotal, 25)
+        self.assertEqual(stats["overlay_vectors"], 5)
+        self.assertEqual(restarted.ntotal, 30)
+        self.assertEqual(restarted.db_high_water, 30)
+        self.assertTrue(restarted.document_map[3].get("_removed"))
+
+        # Results from the snapshot and the overlay are merged by distance
+        self.assertEqual(restarted.search(self.vectors[25], k=1, similarity_threshold=0.0)[0][0], 25)
+        self.assertEqual(restarted.search(self.vectors[7], k=1, similarity_threshold=0.0)[0][0], 7)
+        results = restarted.search(self.vectors[25], k=30, similarity_threshold=-1.0)
+        self.assertEqual(sorted(faiss_id for faiss_id, _ in results), list(range(30)))
+        self.assertEqual([sim for _, sim in results], sorted((sim for _, sim in results), reverse=True))
+
+        # Read-only stores never write the log
+        restarted.remove_vectors([4])
+        with open(f"{self.index_path}.delta") as f:
+            self.assertEqual(len(f.readlines()), 2)
+
+    def test_snapshot_merges_overlay(self):
+        """Test saving a mapped store merges its overlay into a new mapped snapshot."""
+        store = self._store(snapshot_every=0)
+        self._add(store, 0, 20)
+        store.save_index()
+        store.close()
+
+        restarted = self._store(snapshot_every=0)
+        self.assertFalse(restarted.read_only)
+        self._add(restarted, 20, 30)
+        self.assertTrue(restarted._index_mmapped)
+        self.assertEqual(restarted.index.ntotal, 20)
+
+        restarted.save_index()
+        self.assertTrue(restarted._index_mmapped)
+        self.assertEqual(restarted.index.ntotal, 30)
+        self.assertEqual(restarted.get_stats()["overlay_vectors"], 0)
+        self.assertEqual(restarted.search(self.vectors[28], k=1, similarity_threshold=0.0)[0][0], 28)
+
+    def test_single_writer_per_index(self):
+        """Test a second writable store of the same index opens read-only until the writer closes."""
+        writer = self._store(snapshot_every=0)
+        self._add(writer, 0, 5)
+        second = self._store(snapshot_every=0)
+        self.assertTrue(second.read_only)
+
+        self._add(second, 5, 10)
+        with open(f"{self.index_path}.delta") as f:
+            self.assertEqual(len(f.readlines()), 1)
+
+        writer.close()
+        self.assertFalse(self._store(snapshot_every=0).read_only)
+
+    def test_reader_tails_delta_log(self):
+        """Test a read-only store applies appended delta log entries until a new snapshot."""
+        writer = self._store(snapshot_every=0)
+        self._add(writer, 0, 10)
+        writer.save_index()
+        reader = self._store(read_only=True)
+        self.assertEqual(reader.tail_delta_log(), 0)
+
+        self._add(writer, 10, 20)
+        writer.remove_vectors([2])
+        self.assertEqual(reader.tail_delta_log(), 2)
+        self.assertEqual(reader.ntotal, 20)
+        self.assertEqual(reader.db_high_water, 20)
+        self.assertTrue(reader.document_map[2].get("_removed"))
+        self.assertEqual(reader.tail_delta_log(), 0)
+
+        writer.save_index()
+        self.assertIsNone(reader.tail_delta_log())
+        self.assertTrue(reader.load_index())
+        self.assertEqual(reader.ntotal, 20)
+
+    def test_catch_up_removes_deleted_rows(self):
+        """Test vectors whose rows were deleted behind the store's back are removed."""
+        store = self._store(snapshot_every=0)
+        self._add(store, 0, 4)
+        integrated = FAISSIntegratedVectorStore.__new__(FAISSIntegratedVectorStore)
+        integrated.faiss_store = store
+        integrated.logger = Mock()
+
+        session = Mock()
+        session.query.return_value.filter.return_value.order_by.return_value \
+            .limit.return_value.all.return_value = []
+        session.query.return_value.scalar.return_value = 2
+        session.query.return_value.__iter__ = Mock(return_value=iter([(1,), (3,)]))
+
+        integrated._catch_up(session)
+        self.assertEqual(sorted(integrated._indexed_db_ids()), [1, 3])
+
+
 class TestFAISSIntegrationPerformance(unittest.TestCase):
     """Performance-focused tests for FAISS integration."""
 
@@ -0,0 +1,165 @@
+"""
+Tests for the cached graph topology snapshot used by graph analytics.
+"""
+
+import threading
+import unittest
+from unittest.mock import MagicMock, Mock
+
+from flask_appbuilder.database.graph_manager import GraphDatabaseManager
+from flask_appbuilder.database.graph_snapshot import GraphSnapshot, GraphSnapshotCache
+
+
+def _snapshot(edges):
+    snapshot = GraphSnapshot("test_graph")
+    for i, (source, target) in enumerate(edges):
+        snapshot.add_edge(f"e{i}", source, target)
+    snapshot.mark_changed()
+    return snapshot
+
+
+class TestGraphSnapshot(unittest.TestCase):
+    """Test topology updates, traversal and algorithms of the snapshot."""
+
+    def test_change_log_entries_update_topology(self):
+        """Created, updated and deleted elements are replayed onto the arrays."""
+        snapshot = _snapshot([("1", "2"), ("2", "3")])
+
+        self.assertTrue(snapshot.apply_change("node_created", "4", new_data={"label": "Person"}))
+        self.assertTrue(snapshot.apply_change(
+            "edge_created", "e9", new_data='{"source": "3", "target": "4", "weight": 2}'
+        ))
+        self.assertTrue(snapshot.apply_change("node_deleted", "2"))
+        self.assertFalse(snapshot.apply_change("edge_created", "e10", new_data={}))
+        self.assertFalse(snapshot.apply_change("schema_changed", "x"))
+        snapshot.mark_changed()
+
+        self.assertEqual(snapshot.node_count, 3)
+        self.assertEqual(snapshot.edge_count, 1)
+        self.assertEqual(snapshot.label_of(snapshot.node_index["4"]), "Person")
+        self.assertEqual(snapshot.neighbors("3", direction="out"), [("4", 1)])
+        self.assertEqual(snapshot.neighbors("1"), [])
+
+    def test_results_memoized_until_version_changes(self):
+        """Memoized results are reused until the topology changes."""
+        snapshot = _snapshot([("1", "2")])
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return snapshot.degree_centrality()
+
+        first = snapshot.memoize(("centrality", "degree"), compute)
+        self.assertIs(snapshot.memoize(("centrality", "degree"), compute), first)
+        self.assertEqual(len(calls), 1)
+
+        version = snapshot.version
+        snapshot.add_edge("e1", "2", "3")
+        snapshot.mark_changed()
+        self.assertEqual(snapshot.version, version + 1)
+        self.assertEqual(snapshot.memoize(("centrality", "degree"), compute)["2"], 1.0)
+        self.assertEqual(len(calls), 2)
+
+    def test_shortest_path_and_neighbors(self):
+        """Traversals follow edge direction and respect the depth limit."""
+        snapshot = _snapshot([("1", "2"), ("2", "3"), ("3", "4"), ("1", "5"), ("5", "4")])
+
+        self.assertEqual(snapshot.shortest_path("1", "4"), (["1", "5", "4"], ["e3", "e4"]))
+        self.assertIsNone(snapshot.shortest_path("4", "1"))
+        self.assertIsNone(snapshot.shortest_path("1", "4", max_length=1))
+        self.assertEqual(
+            sorted(snapshot.neighbors("4", depth=2, direction="in")),
+            [("1", 2), ("2", 2), ("3", 1), ("5", 1)],
+        )
+
+    def test_pagerank_and_degree_centrality(self):
+        """Array-based centralities match their closed-form values."""
+        snapshot = _snapshot([("1", "2"), ("2", "3"), ("3", "1")])
+        for score in snapshot.pagerank().values():
+            self.assertAlmostEqual(score, 1 / 3, places=5)
+
+        snapshot = _snapshot([("1", "2"), ("1", "3"), ("1", "4")])
+        self.assertEqual(snapshot.degree_centrality(), {"1": 1.0, "2": 1 / 3, "3": 1 / 3, "4": 1 / 3})
+        ranks = snapshot.pagerank()
+        self.assertAlmostEqual(sum(ranks.values()), 1.0, places=5)
+        self.assertGreater(ranks["2"], ranks["1"])
+
+
+class TestGraphSnapshotCache(unittest.TestCase):
+    """Test when cached snapshots are replayed, reloaded and invalidated."""
+
+    def _manager(self, graph_name="test_graph", cache=None):
+        manager = GraphDatabaseManager.__new__(GraphDatabaseManager)
+        manager.graph_name = graph_name
+        manager.engine = MagicMock()
+        manager.snapshot_cache = cache or GraphSnapshotCache(refresh_interval=0)
+        return manager
+
+    def test_missing_change_log_keeps_snapshot(self):
+        """Without a change log a snapshot is kept until it is invalidated."""
+        manager = self._manager()
+        manager.engine.connect.side_effect = Exception("relation graph_change_log does not exist")
+        manager.execute_cypher_query = Mock(return_value={"success": True, "results": []})
+
+        first = manager.get_graph_snapshot()
+        second = manager.get_graph_snapshot()
+
+        self.assertIs(second, first)
+        self.assertIsNone(first.change_id)
+        self.assertEqual(manager.execute_cypher_query.call_count, 2)
+
+        manager.snapshot_cache.invalidate("test_graph")
+        self.assertIsNot(manager.get_graph_snapshot(), first)
+        self.assertEqual(manager.execute_cypher_query.call_count, 4)
+
+    def test_loads_of_other_graphs_do_not_wait(self):
+        """A slow load of one graph doesn't block snapshots of another."""
+        cache = GraphSnapshotCache(refresh_interval=0)
+        slow, fast = self._manager("slow", cache), self._manager("fast", cache)
+        loading, release = threading.Event(), threading.Event()
+
+        def slow_query(query):
+            loading.set()
+            release.wait(5)
+            return {"success": True, "results": []}
+
+        slow.execute_cypher_query = Mock(side_effect=slow_query)
+        fast.execute_cypher_query = Mock(return_value={"success": True, "results": []})
+        thread = threading.Thread(target=slow.get_graph_snapshot)
+        thread.start()
+        try:
+            self.assertTrue(loading.wait(5))
+            self.assertEqual(fast.get_graph_snapshot().graph_name, "fast")
+        finally:
+            release.set()
+            thread.join(5)
+        self.assertIn("slow", cache._snapshots)
+
+    def test_invalidation_during_load_is_not_cached(self):
+        """A snapshot loaded across a write is returned but not kept."""
+        manager = self._manager()
+
+        def query(query):
+            manager.snapshot_cache.invalidate("test_graph")
+            return {"success": True, "results": []}
+
+        manager.execute_cypher_query = Mock(side_effect=query)
+        manager.get_graph_snapshot()
+        self.assertNotIn("test_graph", manager.snapshot_cache._snapshots)
+
+    def test_writes_invalidate_snapshot(self):
+        """Cypher writes through the manager drop the cached snapshot; reads keep it."""
+        manager = self._manager()
+        manager.snapshot_cache._snapshots["test_graph"] = GraphSnapshot("test_graph")
+        conn = manager.engine.connect.return_value.__enter__.return_value
+        conn.execute.return_value.fetchall.return_value = []
+
+        self.assertTrue(manager.execute_cypher_query("MATCH (n) RETURN n")["success"])
+        self.assertIn("test_graph", manager.snapshot_cache._snapshots)
+
+        self.assertTrue(manager.execute_cypher_query("MATCH (n {id: 1}) DETACH DELETE n")["success"])
+        self.assertNotIn("test_graph", manager.snapshot_cache._snapshots)
+
+
+if __name__ == "__main__":
+    unittest.main()
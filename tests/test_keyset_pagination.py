@@ -0,0 +1,72 @@
+"""
+Tests keyset pagination of SQLAInterface over nullable order columns.
+"""
+
+import unittest
+
+from flask_appbuilder.models.sqla.interface import SQLAInterface
+from sqlalchemy import Column, create_engine, Integer, String
+from sqlalchemy.orm import declarative_base, Session
+
+Base = declarative_base()
+
+
+class Item(Base):
+    __tablename__ = "keyset_item"
+    id = Column(Integer, primary_key=True)
+    name = Column(String(50), nullable=True)
+
+
+NAMES = ["c", None, "a", "b", None, "a", None, "d", "b", None]
+
+
+class TestKeysetPagination(unittest.TestCase):
+    def setUp(self):
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        self.session = Session(engine)
+        self.session.add_all(
+            [Item(id=i + 1, name=name) for i, name in enumerate(NAMES)]
+        )
+        self.session.commit()
+        self.datamodel = SQLAInterface(Item, self.session)
+
+    def tearDown(self):
+        self.session.close()
+
+    def _seek_all(self, order_direction, page_size=3):
+        ids = []
+        after = ""
+        while after is not None:
+            _, items = self.datamodel.query(
+                order_column="name",
+                order_direction=order_direction,
+                page_size=page_size,
+                after=after,
+            )
+            ids.extend(item.id for item in items)
+            after = None
+            if len(items) == page_size:
+                after = self.datamodel.encode_cursor(
+                    items[-1], "name", order_direction
+                )
+        return ids
+
+    def test_pages_include_null_order_values(self):
+        """Every row is returned once, in the order of an offset query"""
+        for order_direction in ("asc", "desc"):
+            with self.subTest(order_direction=order_direction):
+                _, items = self.datamodel.query(
+                    order_column="name", order_direction=order_direction
+                )
+                self.assertEqual(
+                    self._seek_all(order_direction), [item.id for item in items]
+                )
+
+    def test_cursor_on_null_value(self):
+        """A page ending on a NULL order value still has a next cursor"""
+        _, items = self.datamodel.query(
+            order_column="name", order_direction="asc", page_size=2, after=""
+        )
+        self.assertIsNone(items[-1].name)
+        self.assertIsNotNone(self.datamodel.encode_cursor(items[-1], "name", "asc"))
@@ -0,0 +1,88 @@
+"""
+Tests that enhanced subsystems are only imported on first access.
+"""
+
+import subprocess
+import sys
+import unittest
+
+
+def _run(code):
+    return subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout.split()
+
+
+class TestLazyImports(unittest.TestCase):
+    def test_import_does_not_load_enhanced_modules(self):
+        """Importing flask_appbuilder leaves wizard, dashboard and modern_ui unloaded"""
+        loaded = _run(
+            "import sys, flask_appbuilder\n"
+            "print(' '.join(m for m in sys.modules if m.startswith('flask_appbuilder')))"
+        )
+        for module in (
+            "flask_appbuilder.enhanced_index_view",
+            "flask_appbuilder.views.dashboard",
+            "flask_appbuilder.views.wizard",
+            "flask_appbuilder.views.wizard_builder",
+            "flask_appbuilder.views.wizard_migration",
+            "flask_appbuilder.widgets.modern_ui",
+            "flask_appbuilder.config.wizard",
+        ):
+            self.assertNotIn(module, loaded)
+
+    def test_lazy_names_resolve(self):
+        """Enhanced exports import their module on first access"""
+        output = _run(
+            "import sys, flask_appbuilder\n"
+            "from flask_appbuilder import WizardFormView\n"
+            "import flask_appbuilder.widgets as widgets\n"
+            "print(WizardFormView.__module__, 'flask_appbuilder.views.wizard' in sys.modules)\n"
+            "print(widgets.MODERN_UI_AVAILABLE, 'ModernTextWidget' in widgets.__all__)\n"
+            "print('WizardFormView' in flask_appbuilder.__all__)"
+        )
+        self.assertEqual(
+            output, ["flask_appbuilder.views.wizard", "True", "True", "True", "True"]
+        )
+
+    def test_unknown_name_raises_attribute_error(self):
+        import flask_appbuilder
+
+        with self.assertRaises(AttributeError):
+            flask_appbuilder.NotAView
+        self.assertFalse(hasattr(flask_appbuilder, "NotAView"))
+        self.assertIn("WizardFormView", dir(flask_appbuilder))
+
+    def test_previous_exports_resolve(self):
+        """Names the packages exported before they were lazy still resolve"""
+        output = _run(
+            "import flask_appbuilder.forms as forms\n"
+            "import flask_appbuilder.widgets as widgets\n"
+            "print(forms.wizard_exports == [n for n in forms.__all__ if n.startswith('Wizard')])\n"
+            "print(widgets.AdvancedChartsWidget.__module__)"
+        )
+        self.assertEqual(
+            output, ["True", "flask_appbuilder.widgets.charts.advanced_charts"]
+        )
+
+    def test_wallet_keeps_star_exports(self):
+        """Everything the wallet package star-imported from its submodules is still mapped"""
+        import ast
+        import os
+
+        import flask_appbuilder
+
+        def assigned(path, target):
+            with open(path) as f:
+                tree = ast.parse(f.read())
+            for node in tree.body:
+                if isinstance(node, ast.Assign) and any(
+                    getattr(t, "id", None) == target for t in node.targets
+                ):
+                    return ast.literal_eval(node.value)
+
+        package = os.path.join(os.path.dirname(flask_appbuilder.__file__), "wallet")
+        lazy_imports = assigned(os.path.join(package, "__init__.py"), "_LAZY_IMPORTS")
+        for module in ("views", "services", "widgets"):
+            for name in assigned(os.path.join(package, f"{module}.py"), "__all__"):
+                self.assertEqual(lazy_imports.get(name), f".{module}", name)
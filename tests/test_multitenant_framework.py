@@ -28,9 +28,11 @@ from flask_appbuilder import AppBuilder, SQLA
 from flask_appbuilder.models.tenant_models import (
     Tenant, TenantUser, TenantConfig, TenantSubscription, TenantUsage, TenantAwareMixin
 )
-from flask_appbuilder.models.tenant_context import tenant_context, get_current_tenant_id
+from flask_appbuilder.models.tenant_context import (
+    tenant_context, get_current_tenant_id, TenantResolutionCache
+)
 from flask_appbuilder.tenants.billing import get_billing_service
-from flask_appbuilder.tenants.usage_tracking import get_usage_tracker
+from flask_appbuilder.tenants.usage_tracking import get_usage_tracker, UsageTracker
 from flask_appbuilder.tenants.branding import get_branding_manager
 from flask_appbuilder.tenants.performance import get_db_optimizer, get_cache_manager
 from flask_appbuilder.tenants.resource_isolation import (
@@ -315,6 +317,39 @@ class TestBillingIntegration(MultiTenantTestCase):
         self.assertEqual(storage_usage.usage_amount, Decimal('2.5'))
         self.assertEqual(storage_usage.total_cost, Decimal('0.25'))  # 2.5 * 0.10
     
+    def test_usage_batch_tracking(self):
+        """Test batched usage tracking writes one record per coalesced key."""
+        tracker = UsageTracker(async_processing=False)
+        timestamp = datetime(2024, 1, 1, 12, 30, 15)
+        batch = [
+            {'tenant_id': self.tenant1.id, 'usage_type': 'api_calls', 'amount': 1.0,
+             'unit': 'calls', 'metadata': {}, 'timestamp': timestamp},
+            {'tenant_id': self.tenant1.id, 'usage_type': 'api_calls', 'amount': 1.0,
+             'unit': 'calls', 'metadata': {}, 'timestamp': timestamp + timedelta(seconds=30)},
+            {'tenant_id': self.tenant1.id, 'usage_type': 'api_calls', 'amount': 1.0,
+             'unit': 'calls', 'metadata': {}, 'timestamp': timestamp + timedelta(minutes=1)},
+        ]
+        
+        tracker._flush(batch)
+        
+        usage_records = TenantUsage.query.filter_by(
+            tenant_id=self.tenant1.id
+        ).order_by(TenantUsage.created_on).all()
+        self.assertEqual(len(usage_records), 2)
+        self.assertEqual(usage_records[0].usage_amount, 2)
+        self.assertEqual(usage_records[0].metadata, {'event_count': 2})
+        self.assertEqual(usage_records[1].usage_amount, 1)
+    
+    def test_usage_queue_backpressure(self):
+        """Test usage is dropped and counted when the queue is full."""
+        tracker = UsageTracker(async_processing=True, max_queue_size=1)
+        tracker.stop_worker()
+        
+        tracker.track(self.tenant1.id, 'api_calls', 1.0, 'calls')
+        tracker.track(self.tenant1.id, 'api_calls', 1.0, 'calls')
+        
+        self.assertEqual(tracker.get_stats()['dropped'], 1)
+    
     def test_usage_based_billing_calculation(self):
         """Test usage-based billing calculations."""
         usage_data = {
@@ -612,6 +647,56 @@ class TestSecurityAndAuditTrail(MultiTenantTestCase):
         self.assertEqual(config.config_value, 'sk_test_12345')
 
 
+class TestTenantResolutionCache(unittest.TestCase):
+    """Test the host to tenant resolution cache."""
+    
+    def test_hit_miss_and_negative_entries(self):
+        """Test hits, misses and negative caching of unknown hosts."""
+        cache = TenantResolutionCache()
+        self.assertEqual(cache.get('tenant1.example.com'), (False, None))
+        
+        cache.set('tenant1.example.com', {'id': 1, 'slug': 'tenant1'})
+        cache.set('unknown.example.com', None)
+        self.assertEqual(cache.get('tenant1.example.com'), (True, {'id': 1, 'slug': 'tenant1'}))
+        self.assertEqual(cache.get('unknown.example.com'), (True, None))
+        
+        stats = cache.get_stats()
+        self.assertEqual(stats['hits'], 2)
+        self.assertEqual(stats['misses'], 1)
+    
+    def test_ttl_expiry(self):
+        """Test entries expire after their TTL."""
+        cache = TenantResolutionCache(ttl=0, negative_ttl=0)
+        cache.set('tenant1.example.com', {'id': 1})
+        self.assertEqual(cache.get('tenant1.example.com'), (False, None))
+        self.assertEqual(cache.get_stats()['size'], 0)
+    
+    def test_invalidate_tenant(self):
+        """Test invalidating a tenant drops its hosts and negative entries."""
+        cache = TenantResolutionCache()
+        cache.set('tenant1.example.com', {'id': 1})
+        cache.set('tenant1.com', {'id': 1})
+        cache.set('tenant2.example.com', {'id': 2})
+        cache.set('new.example.com', None)
+        
+        cache.invalidate_tenant(1)
+        
+        self.assertFalse(cache.get('tenant1.example.com')[0])
+        self.assertFalse(cache.get('tenant1.com')[0])
+        self.assertFalse(cache.get('new.example.com')[0])
+        self.assertTrue(cache.get('tenant2.example.com')[0])
+    
+    def test_maxsize_eviction(self):
+        """Test the oldest entry is evicted when full."""
+        cache = TenantResolutionCache(maxsize=2)
+        cache.set('a.example.com', None)
+        cache.set('b.example.com', None)
+        cache.set('c.example.com', None)
+        
+        self.assertFalse(cache.get('a.example.com')[0])
+        self.assertTrue(cache.get('c.example.com')[0])
+
+
 class LoadTestRunner:
     """Utility for running load tests on multi-tenant system."""
     
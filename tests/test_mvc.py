@@ -18,7 +18,12 @@ from flask_appbuilder.hooks import before_request
 from flask_appbuilder.models.generic import PSModel
 from flask_appbuilder.models.generic import PSSession
 from flask_appbuilder.models.generic.interface import GenericInterface
-from flask_appbuilder.models.group import aggregate_avg, aggregate_count, aggregate_sum
+from flask_appbuilder.models.group import (
+    aggregate_avg,
+    aggregate_count,
+    aggregate_sum,
+    GroupByProcessData,
+)
 from flask_appbuilder.models.sqla.filters import (
     FilterEqual,
     FilterEqualFunction,
@@ -1457,6 +1462,33 @@ class MVCTestCase(BaseMVCTestCase):
         rv = client.get("/model2timechartview/chart/")
         self.assertEqual(rv.status_code, 200)
 
+    def test_chart_sql_group_aggregate(self):
+        """
+        Test chart group by aggregation on the database matches python
+        """
+        datamodel = SQLAInterface(Model2, self.appbuilder.session)
+        aggregations = [
+            (aggregate_sum, "field_integer"),
+            (aggregate_avg, "field_float"),
+            (aggregate_count, "field_integer"),
+        ]
+        with model2_data(self.appbuilder.session, 3):
+            result = datamodel.query_group_aggregate("field_string", aggregations)
+            count, lst = datamodel.query()
+            expected = GroupByProcessData(["field_string"], aggregations, {}).apply(
+                lst
+            )
+            self.assertEqual(result, expected)
+            # property and function columns fall back to python
+            self.assertIsNone(
+                datamodel.query_group_aggregate("field_method", aggregations)
+            )
+            self.assertIsNone(
+                datamodel.query_group_aggregate(
+                    "field_string", [(aggregate_sum, "field_method")]
+                )
+            )
+
     def test_master_detail_view(self):
         """
         Test Master detail view
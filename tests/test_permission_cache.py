@@ -0,0 +1,69 @@
+"""
+Tests for the compiled per-role permission cache.
+"""
+
+import unittest
+
+from flask_appbuilder.security.permission_cache import PermissionCache
+
+
+class PermissionCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+        self.db = {
+            1: {("can_list", "ModelView"), ("can_show", "ModelView")},
+            2: {("can_add", "ModelView")},
+        }
+
+        def loader(role_ids):
+            self.calls.append(list(role_ids))
+            return {role_id: set(self.db.get(role_id, ())) for role_id in role_ids}
+
+        self.cache = PermissionCache(loader)
+
+    def test_has_permission(self):
+        self.assertTrue(self.cache.has_permission([1], "can_list", "ModelView"))
+        self.assertFalse(self.cache.has_permission([1], "can_add", "ModelView"))
+        self.assertTrue(self.cache.has_permission([1, 2], "can_add", "ModelView"))
+        self.assertFalse(self.cache.has_permission([3], "can_add", "ModelView"))
+
+    def test_bulk_load_once(self):
+        self.cache.has_permission([1, 2], "can_list", "ModelView")
+        self.cache.has_permission([1, 2], "can_add", "ModelView")
+        self.cache.has_permission([2], "can_show", "ModelView")
+        self.assertEqual(self.calls, [[1, 2]])
+        self.assertEqual(self.cache.stats()["hits"], 2)
+        self.assertEqual(self.cache.stats()["misses"], 1)
+
+    def test_loads_only_missing_roles(self):
+        self.cache.has_permission([1], "can_list", "ModelView")
+        self.cache.has_permission([1, 2], "can_list", "ModelView")
+        self.assertEqual(self.calls, [[1], [2]])
+
+    def test_compiled_sets_are_immutable(self):
+        permissions = self.cache.get_role_permissions([1])[1]
+        self.assertIsInstance(permissions, frozenset)
+
+    def test_invalidate(self):
+        self.assertFalse(self.cache.has_permission([2], "can_edit", "ModelView"))
+        self.db[2].add(("can_edit", "ModelView"))
+        # Stale until the version is bumped
+        self.assertFalse(self.cache.has_permission([2], "can_edit", "ModelView"))
+        version = self.cache.version
+        self.assertEqual(self.cache.invalidate(), version + 1)
+        self.assertTrue(self.cache.has_permission([2], "can_edit", "ModelView"))
+
+    def test_ttl_expiry(self):
+        cache = PermissionCache(lambda role_ids: {1: {("can_list", "V")}}, ttl=60)
+        cache.has_permission([1], "can_list", "V")
+        version = cache.version
+        cache._built_at -= 120
+        cache.has_permission([1], "can_list", "V")
+        self.assertEqual(cache.version, version + 1)
+
+    def test_invalidate_all(self):
+        self.cache.has_permission([1], "can_list", "ModelView")
+        version = self.cache.version
+        PermissionCache.invalidate_all()
+        self.assertEqual(self.cache.version, version + 1)
+        self.assertEqual(self.cache.stats()["roles"], 0)
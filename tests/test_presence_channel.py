@@ -0,0 +1,76 @@
+"""
+Tests for the presence channel coalescing cursor and selection updates.
+"""
+
+import unittest
+
+from flask_appbuilder.collaborative.realtime.presence_channel import PresenceChannel
+
+
+class TestPresenceChannel(unittest.TestCase):
+    """Test coalescing, batching and stats of presence updates."""
+
+    def setUp(self):
+        self.published = []
+        self.channel = PresenceChannel(
+            lambda session_id, updates: self.published.append((session_id, updates))
+        )
+
+    def test_latest_value_per_user_flushed_as_one_batch(self):
+        """Many updates within a tick become one batch with the latest values."""
+        for position in range(10):
+            self.channel.update("s1", 1, "cursor", position, resource_id="doc")
+        self.channel.update("s1", 1, "selection", {"start": 2, "end": 4}, resource_id="doc")
+        self.channel.update("s1", 2, "cursor", 7, resource_id="doc")
+        self.channel.update("s2", 3, "cursor", 1)
+
+        self.assertEqual(self.channel.flush(), 2)
+        self.assertEqual(dict(self.published)["s1"], [
+            {"user_id": 1, "resource_id": "doc", "cursor": 9,
+             "selection": {"start": 2, "end": 4}},
+            {"user_id": 2, "resource_id": "doc", "cursor": 7},
+        ])
+
+        stats = self.channel.get_session_stats("s1")
+        self.assertEqual(stats["events"], 12)
+        self.assertEqual(stats["coalesced"], 9)
+        self.assertEqual(stats["updates_sent"], 2)
+        self.assertEqual(stats["flushes"], 1)
+
+    def test_unchanged_values_not_republished(self):
+        """Only fields that differ from the last published values are sent."""
+        self.channel.update("s1", 1, "cursor", 5)
+        self.channel.update("s1", 1, "selection", {"start": 0, "end": 1})
+        self.channel.flush()
+
+        self.channel.update("s1", 1, "cursor", 5)
+        self.channel.update("s1", 1, "selection", {"start": 0, "end": 3})
+        self.channel.flush()
+        self.assertEqual(self.published[-1][1], [
+            {"user_id": 1, "resource_id": None, "selection": {"start": 0, "end": 3}}
+        ])
+
+        self.channel.update("s1", 1, "cursor", 5)
+        self.assertEqual(self.channel.flush(), 0)
+        self.assertEqual(len(self.published), 2)
+
+    def test_removed_user_is_published_again_after_rejoining(self):
+        """Forgetting a user drops its pending and last published presence."""
+        self.channel.update("s1", 1, "cursor", 5)
+        self.channel.flush()
+        self.channel.remove_user("s1", 1)
+
+        self.channel.update("s1", 1, "cursor", 5)
+        self.assertEqual(self.channel.flush(), 1)
+
+        self.channel.remove_session("s1")
+        self.assertEqual(self.channel.get_stats()["sessions"], 0)
+
+    def test_unknown_field_rejected(self):
+        """Only cursor and selection presence is accepted."""
+        with self.assertRaises(ValueError):
+            self.channel.update("s1", 1, "scroll", 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
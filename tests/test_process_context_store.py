@@ -0,0 +1,115 @@
+"""
+Tests for the cached, write-behind process context store.
+"""
+
+import asyncio
+import unittest
+from unittest.mock import Mock, patch
+
+from flask_appbuilder.process.engine.context_manager import ProcessContextManager
+
+
+class TestProcessContextStore(unittest.TestCase):
+    """Test copy-free reads, dirty tracking and write-behind flushing."""
+
+    def setUp(self):
+        self.redis = Mock()
+        self.manager = ProcessContextManager(self.redis)
+        self.manager.config["audit_variable_access"] = False
+        self.instance = Mock(id=1, context=None, variables=None)
+
+        self.db_patch = patch("flask_appbuilder.process.engine.context_manager.db")
+        self.tenant_patch = patch(
+            "flask_appbuilder.process.engine.context_manager.get_current_tenant_id",
+            return_value=None
+        )
+        self.mock_db = self.db_patch.start()
+        self.tenant_patch.start()
+        self.mock_db.session.query.return_value.get.return_value = self.instance
+
+        asyncio.run(self.manager._store_context(1, {
+            "process_instance_id": 1,
+            "variables": {"items": [1, 2, 3], "amount": 10}
+        }))
+        asyncio.run(self.manager.flush_context(1))
+        self.redis.reset_mock()
+
+    def tearDown(self):
+        self.db_patch.stop()
+        self.tenant_patch.stop()
+
+    def test_reads_do_not_copy(self):
+        """Test reads return the cached values themselves."""
+        first = asyncio.run(self.manager.get_variable(1, "items"))
+        second = asyncio.run(self.manager.get_variable(1, "items"))
+        self.assertIs(first, second)
+        self.redis.get.assert_not_called()
+
+    def test_copy_on_write(self):
+        """Test writes leave earlier snapshots untouched."""
+        before = asyncio.run(self.manager._get_context(1))
+        asyncio.run(self.manager.set_variable(1, "amount", 20, step_id=5))
+        after = asyncio.run(self.manager._get_context(1))
+
+        self.assertEqual(before["variables"]["amount"], 10)
+        self.assertEqual(after["variables"]["amount"], 20)
+        self.assertIs(before["variables"]["items"], after["variables"]["items"])
+        self.assertEqual(after["variables"]["__amount__meta"]["previous_value"], 10)
+
+    def test_write_behind_flushes_only_changed_keys(self):
+        """Test nothing is written until flush, then only dirty keys."""
+        asyncio.run(self.manager.set_variable(1, "amount", 20))
+        asyncio.run(self.manager.set_variable(1, "amount", 30))
+        self.redis.pipeline.assert_not_called()
+        self.mock_db.session.commit.assert_not_called()
+
+        self.assertTrue(asyncio.run(self.manager.flush_context(1)))
+        pipe = self.redis.pipeline.return_value
+        pipe.setex.assert_not_called()
+        pipe.hset.assert_called_once()
+        written = pipe.hset.call_args[1]["mapping"]
+        self.assertEqual(set(written), {"amount", "__amount__meta"})
+        self.assertEqual(written["amount"], "30")
+        self.assertEqual(self.instance.variables["amount"], 30)
+
+        # Nothing left to flush
+        self.assertFalse(asyncio.run(self.manager.flush_context(1)))
+
+    def test_lru_eviction_flushes_dirty_contexts(self):
+        """Test the cache bound holds and dirty contexts are written before eviction."""
+        self.manager.config["context_cache_max_entries"] = 1
+        asyncio.run(self.manager._store_context(2, {"variables": {"a": 1}}))
+
+        stats = self.manager.get_context_stats()
+        self.assertEqual(stats["cached_contexts"], 1)
+        self.assertEqual(stats["dirty_contexts"], 1)
+        self.assertNotIn(1, self.manager._context_cache)
+        self.redis.pipeline.assert_not_called()
+
+        asyncio.run(self.manager._store_context(3, {"variables": {"b": 2}}))
+        self.assertEqual(set(self.manager._context_cache), {3})
+        self.redis.pipeline.return_value.hset.assert_called_once_with(
+            "process_context:2:variables", mapping={"a": "1"}
+        )
+        self.assertEqual(self.instance.variables, {"a": 1})
+
+    def test_reads_are_read_only(self):
+        """Test the cached context can't be modified through a read."""
+        context = asyncio.run(self.manager._get_context(1))
+
+        with self.assertRaises(TypeError):
+            context["variables"] = {}
+        with self.assertRaises(TypeError):
+            context["variables"]["amount"] = 99
+        self.assertEqual(asyncio.run(self.manager.get_variable(1, "amount")), 10)
+
+    def test_shutdown_flushes_dirty_contexts(self):
+        """Test shutdown writes and commits buffered variable writes."""
+        asyncio.run(self.manager.set_variable(1, "amount", 20))
+
+        self.manager.shutdown()
+
+        self.redis.pipeline.return_value.hset.assert_called_once()
+        self.mock_db.session.commit.assert_called_once()
+        self.assertEqual(self.instance.variables["amount"], 20)
+        self.assertEqual(self.manager.get_context_stats()["dirty_contexts"], 0)
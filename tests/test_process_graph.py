@@ -0,0 +1,101 @@
+"""
+Tests for the compiled process graph.
+
+Covers indexed node and edge lookups, precompiled edge conditions and the
+per-definition graph cache.
+"""
+
+import unittest
+from datetime import datetime
+from unittest.mock import Mock
+
+from flask_appbuilder.process.models.process_graph import (
+    CompiledProcessGraph, ProcessGraphCache
+)
+
+
+class TestCompiledProcessGraph(unittest.TestCase):
+    """Test the indexed process graph and its cache."""
+
+    def setUp(self):
+        """Set up a small branching graph."""
+        self.graph = {
+            "nodes": [
+                {"id": "start", "type": "start"},
+                {"id": "check", "type": "gateway"},
+                {"id": "approve", "type": "task"},
+                {"id": "reject", "type": "task"},
+                {"id": "end", "type": "end"}
+            ],
+            "edges": [
+                {"source": "start", "target": "check"},
+                {"source": "check", "target": "approve",
+                 "condition": {"field": "amount", "operator": "<", "value": 100}},
+                {"source": "check", "target": "reject",
+                 "condition": {"field": "amount", "operator": ">=", "value": 100}},
+                {"source": "approve", "target": "end"},
+                {"source": "reject", "target": "end"}
+            ]
+        }
+
+    def test_lookups(self):
+        """Test node and adjacency lookups."""
+        compiled = CompiledProcessGraph(self.graph)
+
+        self.assertEqual(compiled.get_node("check")["type"], "gateway")
+        self.assertIsNone(compiled.get_node("missing"))
+        self.assertEqual([n["id"] for n in compiled.get_start_nodes()], ["start"])
+        self.assertEqual(
+            [e["target"] for e in compiled.get_outgoing_edges("check")],
+            ["approve", "reject"]
+        )
+        self.assertEqual(
+            [e["source"] for e in compiled.get_incoming_edges("end")],
+            ["approve", "reject"]
+        )
+        self.assertEqual(compiled.get_outgoing_edges("end"), [])
+        self.assertEqual(
+            [n["id"] for n in compiled.get_successors("check")], ["approve", "reject"]
+        )
+        self.assertTrue(compiled.has_edge("check", "reject"))
+        self.assertFalse(compiled.has_edge("start", "end"))
+
+    def test_compiled_conditions(self):
+        """Test precompiled edge conditions select the right branch."""
+        compiled = CompiledProcessGraph(self.graph)
+
+        taken = [t.target["id"] for t in compiled.get_transitions("check")
+                 if t.condition({"amount": 250})]
+        self.assertEqual(taken, ["reject"])
+
+        # Missing fields and incomparable values fail, unconditioned edges pass
+        self.assertEqual(
+            [t for t in compiled.get_transitions("check") if t.condition({})], []
+        )
+        self.assertEqual(
+            [t for t in compiled.get_transitions("check")
+             if t.condition({"amount": "x"})], []
+        )
+        self.assertTrue(compiled.get_transitions("start")[0].condition({}))
+
+    def test_cache_per_definition_version(self):
+        """Test compiled graphs are reused per id and version."""
+        cache = ProcessGraphCache(maxsize=2)
+        definition = Mock(id=1, version=1, changed_on=None, process_graph=self.graph)
+
+        first = cache.get(definition)
+        self.assertIs(cache.get(definition), first)
+
+        definition.version = 2
+        self.assertIsNot(cache.get(definition), first)
+
+        definition.changed_on = datetime.utcnow()
+        second = cache.get(definition)
+        self.assertIs(cache.get(definition), second)
+
+        cache.invalidate(definition)
+        self.assertIsNot(cache.get(definition), second)
+
+        # Unsaved definitions are compiled but not cached
+        unsaved = Mock(id=None, version=1, process_graph=self.graph)
+        self.assertIsNot(cache.get(unsaved), cache.get(unsaved))
@@ -0,0 +1,218 @@
+"""
+Tests for parallel gateway fork/join execution in the process engine.
+"""
+
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+from flask import Flask
+
+from flask_appbuilder.process.engine.process_engine import ProcessEngine
+from flask_appbuilder.process.models.process_graph import CompiledProcessGraph
+
+
+class _InstanceRow:
+    """Stand-in for the instance row, locked by SELECT ... FOR UPDATE until commit."""
+
+    def __init__(self, instance):
+        self.instance = instance
+        self.lock = threading.Lock()
+        self.owner = None
+
+    def select_for_update(self):
+        if self.owner != threading.get_ident():
+            self.lock.acquire()
+            self.owner = threading.get_ident()
+        return self.instance.join_tokens
+
+    def commit(self):
+        if self.owner == threading.get_ident():
+            self.owner = None
+            self.lock.release()
+
+    def compare_and_set(self, instance, expected, tokens):
+        """Conditional UPDATE of the tokens, like _swap_join_tokens."""
+        if self.instance.join_tokens != expected:
+            return False
+        self.instance.join_tokens = tokens
+        return True
+
+
+class TestParallelGateway(unittest.TestCase):
+    """Test fork/join execution of parallel gateways."""
+
+    BRANCH_DELAY = 0.2
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.engine = self._make_engine()
+        self.addCleanup(self.engine.shutdown)
+        graph = {
+            "nodes": [
+                {"id": "fork", "type": "gateway", "subtype": "parallel"},
+                {"id": "a", "type": "service"},
+                {"id": "b", "type": "service"},
+                {"id": "c", "type": "service"},
+                {"id": "join", "type": "gateway", "subtype": "parallel"},
+                {"id": "end", "type": "end"}
+            ],
+            "edges": [
+                {"source": "fork", "target": "a"},
+                {"source": "fork", "target": "b"},
+                {"source": "fork", "target": "c", "condition": {"field": "c", "value": True}},
+                {"source": "a", "target": "join"},
+                {"source": "b", "target": "join"},
+                {"source": "c", "target": "join"},
+                {"source": "join", "target": "end"}
+            ]
+        }
+        self.instance = Mock(id=1, join_tokens=None, tenant_id=7)
+        self.instance.definition.compiled_graph = CompiledProcessGraph(graph)
+        self.row = _InstanceRow(self.instance)
+        self.executed = []
+        self.counter_lock = threading.Lock()
+        self.running = self.max_running = 0
+
+        self.db_patch = patch("flask_appbuilder.process.engine.process_engine.db")
+        self.mock_db = self.db_patch.start()
+        self.addCleanup(self.db_patch.stop)
+        self.mock_db.session.query.return_value.get.return_value = self.instance
+        self.mock_db.session.query.return_value.filter.return_value \
+            .with_for_update.return_value.scalar.side_effect = self.row.select_for_update
+        self.mock_db.session.commit.side_effect = self.row.commit
+        swap_patch = patch.object(self.engine, "_swap_join_tokens", side_effect=self.row.compare_and_set)
+        swap_patch.start()
+        self.addCleanup(swap_patch.stop)
+
+    @staticmethod
+    def _make_engine():
+        """Build an engine without its state machine, context store and executors."""
+        with patch("flask_appbuilder.process.engine.process_engine.ProcessStateMachine"), \
+                patch("flask_appbuilder.process.engine.process_engine.ProcessContextManager"), \
+                patch.object(ProcessEngine, "_register_default_executors"):
+            return ProcessEngine()
+
+    async def _fake_execute_node(self, instance, node, input_data=None):
+        """Simulate a slow node that continues along the graph."""
+        self.executed.append(node["id"])
+        if node["type"] == "service":
+            with self.counter_lock:
+                self.running += 1
+                self.max_running = max(self.max_running, self.running)
+            await asyncio.sleep(self.BRANCH_DELAY)
+            with self.counter_lock:
+                self.running -= 1
+            await self.engine._continue_process_execution(
+                instance, node, {node["id"]: True}
+            )
+        return {}
+
+    def _fork(self, output_data):
+        fork = self.instance.definition.compiled_graph.get_node("fork")
+        with self.app.app_context(), \
+                patch.object(self.engine, "_execute_node", side_effect=self._fake_execute_node):
+            started = time.time()
+            asyncio.run(self.engine._continue_process_execution(self.instance, fork, output_data))
+            return time.time() - started
+
+    def test_fork_runs_branches_concurrently(self):
+        """Test fan-out time tracks the slowest branch and the join runs once."""
+        elapsed = self._fork({"c": True})
+
+        self.assertLess(elapsed, self.BRANCH_DELAY * 2)
+        self.assertEqual(sorted(self.executed[:3]), ["a", "b", "c"])
+        self.assertEqual(self.executed.count("join"), 1)
+        self.assertEqual(self.instance.join_tokens, {})
+
+    def test_join_counts_only_activated_branches(self):
+        """Test a join does not wait for a branch whose condition was false at the fork."""
+        self._fork({"c": False})
+
+        self.assertEqual(sorted(self.executed[:2]), ["a", "b"])
+        self.assertNotIn("c", self.executed)
+        self.assertEqual(self.executed.count("join"), 1)
+        self.assertEqual(self.instance.join_tokens, {})
+
+    def test_branches_share_engine_pool(self):
+        """Test forks reuse one worker pool bounded by max_branch_workers."""
+        self.engine.config["max_branch_workers"] = 4
+        self._fork({"c": True})
+        pool = self.engine._branch_executor
+        self._fork({"c": True})
+
+        self.assertIs(self.engine._branch_executor, pool)
+        self.assertEqual(pool._max_workers, 4)
+        self.assertEqual(self.executed.count("join"), 2)
+
+    def test_branches_bounded_per_instance(self):
+        """Test an instance runs at most max_parallel_branches branches at once."""
+        self.engine.config["max_parallel_branches"] = 2
+        elapsed = self._fork({"c": True})
+
+        self.assertEqual(self.max_running, 2)
+        self.assertGreaterEqual(elapsed, self.BRANCH_DELAY * 2)
+        self.assertEqual(self.executed.count("join"), 1)
+
+    def test_branch_threads_use_instance_tenant(self):
+        """Test branch threads run in the tenant of the instance."""
+        tenants = []
+
+        async def record_tenant(instance, node, input_data=None):
+            from flask_appbuilder.models.tenant_context import get_current_tenant_id
+            tenants.append(get_current_tenant_id())
+
+        with patch.object(self.engine, "_enter_node", side_effect=record_tenant):
+            self.engine._run_branch(self.app, 1, {"id": "a"}, {}, tenant_id=7)
+
+        self.assertEqual(tenants, [7])
+
+    def test_join_retries_when_tokens_changed(self):
+        """Test an arrival is recomputed when another branch wrote the tokens first."""
+        fork = self.instance.definition.compiled_graph.get_node("fork")
+        join = self.instance.definition.compiled_graph.get_node("join")
+        branches = [self.instance.definition.compiled_graph.get_node(n) for n in ("a", "b")]
+        self.engine._register_fork(self.instance, fork, branches)
+        stale = dict(self.instance.join_tokens)
+        # Branch "a" arrives after branch "b" read the tokens
+        self.assertIsNone(self.engine._arrive_at_join(self.instance, join, {"a": 1}))
+
+        reads = iter([stale])
+        read_tokens = self.mock_db.session.query.return_value.filter.return_value \
+            .with_for_update.return_value.scalar
+        read_tokens.side_effect = lambda: next(reads, self.instance.join_tokens)
+
+        self.assertEqual(
+            self.engine._arrive_at_join(self.instance, join, {"b": 2}), {"a": 1, "b": 2}
+        )
+        self.assertEqual(self.instance.join_tokens, {})
+
+    def test_join_waits_for_all_tokens(self):
+        """Test a join gateway releases merged data on the last arrival."""
+        join = self.instance.definition.compiled_graph.get_node("join")
+
+        self.assertIsNone(self.engine._arrive_at_join(self.instance, join, {"a": 1}))
+        self.assertIsNone(self.engine._arrive_at_join(self.instance, join, {"b": 2}))
+        self.assertEqual(
+            self.engine._arrive_at_join(self.instance, join, {"c": 3}),
+            {"a": 1, "b": 2, "c": 3}
+        )
+        self.assertEqual(self.instance.join_tokens, {})
+
+    def test_join_state_survives_engine_restart(self):
+        """Test arrivals are kept on the instance, not in the engine."""
+        fork = self.instance.definition.compiled_graph.get_node("fork")
+        join = self.instance.definition.compiled_graph.get_node("join")
+        branches = [self.instance.definition.compiled_graph.get_node(n) for n in ("a", "b")]
+
+        self.engine._register_fork(self.instance, fork, branches)
+        self.assertIsNone(self.engine._arrive_at_join(self.instance, join, {"a": 1}))
+        self.assertEqual(self.instance.join_tokens["join"]["expected"], 2)
+
+        restarted = self._make_engine()
+        with patch.object(restarted, "_swap_join_tokens", side_effect=self.row.compare_and_set):
+            self.assertEqual(
+                restarted._arrive_at_join(self.instance, join, {"b": 2}), {"a": 1, "b": 2}
+            )
@@ -0,0 +1,117 @@
+"""
+Tests for batched step persistence in the process engine.
+"""
+
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+from flask_appbuilder.process.engine.process_engine import ProcessEngine
+from flask_appbuilder.process.models.process_graph import CompiledProcessGraph
+
+
+class TestProcessUnitOfWork(unittest.TestCase):
+    """Test a run of non-blocking nodes is written in one transaction."""
+
+    def setUp(self):
+        with patch("flask_appbuilder.process.engine.process_engine.ProcessStateMachine"), \
+                patch("flask_appbuilder.process.engine.process_engine.ProcessContextManager"), \
+                patch.object(ProcessEngine, "_register_default_executors"):
+            self.engine = ProcessEngine()
+        self.engine.context_manager = Mock(
+            finalize_context=AsyncMock(), flush_context=AsyncMock(return_value=False)
+        )
+        graph = {
+            "nodes": [
+                {"id": "start", "type": "start"},
+                {"id": "task1", "type": "task"},
+                {"id": "end", "type": "end"}
+            ],
+            "edges": [
+                {"source": "start", "target": "task1"},
+                {"source": "task1", "target": "end"}
+            ]
+        }
+        self.instance = Mock(id=1, tenant_id=1, step_counter=0, duration=1)
+        self.instance.definition.compiled_graph = CompiledProcessGraph(graph)
+        for node_type in ("start", "task", "end"):
+            self.engine.executors[node_type] = Mock(execute=AsyncMock(return_value={}))
+
+    def _run(self, batch, mock_db=None, tenant_id=1):
+        self.engine.config["batch_step_writes"] = batch
+        start = self.instance.definition.compiled_graph.get_node("start")
+        with patch("flask_appbuilder.process.engine.process_engine.db", mock_db or MagicMock()) as mock_db, \
+                patch("flask_appbuilder.process.engine.process_engine.get_current_tenant_id",
+                      return_value=tenant_id):
+            asyncio.run(self.engine._execute_node(self.instance, start))
+        return mock_db
+
+    def test_batched_run_commits_once(self):
+        """Test steps and logs of a whole run share one commit and one bulk insert."""
+        mock_db = self._run(batch=True)
+
+        # One commit for the run of steps plus one from completing the instance
+        self.assertEqual(mock_db.session.commit.call_count, 2)
+        mock_db.session.bulk_insert_mappings.assert_called_once()
+        mappings = mock_db.session.bulk_insert_mappings.call_args[0][1]
+        self.assertEqual(
+            [m["event_type"] for m in mappings],
+            ["step_started", "step_completed"] * 3 + ["process_completed"]
+        )
+        self.assertEqual(self.instance.step_counter, 3)
+
+    def test_logs_use_instance_tenant_without_context(self):
+        """Test log rows written outside a tenant context get the instance's tenant."""
+        mock_db = MagicMock()
+        mock_db.session.query.return_value.get.return_value = Mock(tenant_id=5)
+        self._run(batch=True, mock_db=mock_db, tenant_id=None)
+
+        mappings = mock_db.session.bulk_insert_mappings.call_args[0][1]
+        self.assertEqual({m["tenant_id"] for m in mappings}, {5})
+
+    def test_unbatched_run_commits_per_transition(self):
+        """Test disabling batching keeps per-transition commits."""
+        mock_db = self._run(batch=False)
+
+        mock_db.session.bulk_insert_mappings.assert_not_called()
+        self.assertGreater(mock_db.session.commit.call_count, 6)
+
+    def test_step_flushed_before_executor(self):
+        """Test executors get a step that has been flushed for its id."""
+        mock_db = MagicMock()
+        flushed = []
+
+        async def execute(instance, node, step, input_data):
+            flushed.append(mock_db.session.flush.call_count)
+            return {}
+
+        self.engine.executors["task"] = Mock(execute=execute)
+        self._run(batch=True, mock_db=mock_db)
+
+        # Start step flushed once, the task step once more before its executor ran
+        self.assertEqual(flushed, [2])
+
+    def test_failed_log_write_does_not_fail_steps(self):
+        """Test log rows that cannot be written are rolled back to their savepoint only."""
+        mock_db = MagicMock()
+        mock_db.session.bulk_insert_mappings.side_effect = RuntimeError("tenant_id is NULL")
+
+        self._run(batch=True, mock_db=mock_db)
+
+        mock_db.session.begin_nested.return_value.__exit__.assert_called()
+        self.assertIsInstance(
+            mock_db.session.begin_nested.return_value.__exit__.call_args[0][1], RuntimeError
+        )
+        mock_db.session.rollback.assert_not_called()
+        self.assertEqual(mock_db.session.commit.call_count, 2)
+        self.assertEqual(self.instance.step_counter, 3)
+
+    def test_failed_write_rolls_back_and_raises(self):
+        """Test a failing unit of work commit is rolled back and not swallowed."""
+        mock_db = MagicMock()
+        mock_db.session.commit.side_effect = RuntimeError("database is gone")
+
+        with self.assertRaises(RuntimeError):
+            self._run(batch=True, mock_db=mock_db)
+
+        mock_db.session.rollback.assert_called()
@@ -0,0 +1,191 @@
+"""
+Tests for the buffered writer and durable spool of SecurityAuditLogger.
+"""
+
+from datetime import datetime
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from flask_appbuilder.security.audit_logging import (
+    AuditEvent,
+    AuditEventType,
+    RiskLevel,
+    SecurityAuditLogger,
+)
+
+
+def _event(action):
+    return AuditEvent(
+        event_type=AuditEventType.DATA_READ,
+        tenant_id=1,
+        user_id=2,
+        resource_type="customer",
+        resource_id=None,
+        action=action,
+        details={"n": action},
+        ip_address=None,
+        user_agent=None,
+        session_id=None,
+        timestamp=datetime.utcnow(),
+        risk_level=RiskLevel.LOW,
+        success=True,
+    )
+
+
+def _spool_and_replay(spool_path, inserted_path, worker):
+    """Spool and replay rows from a separate process, recording inserted rows."""
+    with patch.object(SecurityAuditLogger, "_start_flush_thread"), patch("atexit.register"):
+        logger = SecurityAuditLogger(spool_path=spool_path)
+
+    def insert_rows(rows):
+        with open(inserted_path, "a") as inserted:
+            inserted.writelines(f"{row['action']}\n" for row in rows)
+
+    logger._insert_rows = insert_rows
+    for i in range(20):
+        logger._spool([{"action": f"{worker}_{i}", "timestamp": datetime.utcnow()}])
+        logger._replay_spool()
+
+
+class TestSecurityAuditWriter(unittest.TestCase):
+    """Test that audit capture never writes in the caller and never drops events."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.spool_path = os.path.join(self.directory, "audit.spool")
+        with patch.object(SecurityAuditLogger, "_start_flush_thread"), patch("atexit.register"):
+            self.logger = SecurityAuditLogger(spool_path=self.spool_path)
+        self.written = []
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_log_event_only_buffers(self):
+        """Reaching the buffer limit wakes the writer instead of writing inline."""
+        self.logger._max_buffer_size = 3
+        with patch.object(self.logger, "_insert_rows") as insert_rows:
+            for i in range(3):
+                self.logger.log_event(_event(f"read_{i}"))
+            insert_rows.assert_not_called()
+        self.assertTrue(self.logger._flush_requested.is_set())
+
+        with patch.object(self.logger, "_insert_rows", side_effect=self.written.extend):
+            self.logger._flush_events()
+        self.assertEqual([row["action"] for row in self.written], ["read_0", "read_1", "read_2"])
+        self.assertEqual(self.logger._event_buffer, [])
+        self.assertFalse(self.logger._flush_requested.is_set())
+
+    def test_failed_batch_spooled_and_replayed(self):
+        """A failed write goes to the spool file and is replayed after recovery."""
+        self.logger.log_event(_event("export"))
+        with patch.object(self.logger, "_insert_rows", side_effect=OSError("database down")):
+            self.logger._flush_events()
+        self.assertTrue(os.path.exists(self.spool_path))
+        self.assertEqual(self.logger._flush_failure_count, 1)
+
+        self.logger.log_event(_event("delete"))
+        with patch.object(self.logger, "_insert_rows", side_effect=self.written.extend):
+            self.logger._flush_events()
+
+        self.assertEqual([row["action"] for row in self.written], ["delete", "export"])
+        self.assertIsInstance(self.written[1]["timestamp"], datetime)
+        self.assertFalse(os.path.exists(self.spool_path))
+        self.assertFalse(os.path.exists(self.spool_path + ".replay"))
+
+    def test_overflow_spooled_while_writer_is_blocked(self):
+        """Events beyond the critical size are spooled, then replayed, not dropped."""
+        self.logger._critical_buffer_size = 5
+        started, release = threading.Event(), threading.Event()
+        writer = threading.Thread(target=self.logger._flush_events)
+
+        def blocked_insert(rows):
+            started.set()
+            release.wait(5)
+            self.written.extend(rows)
+
+        with patch.object(self.logger, "_insert_rows", side_effect=blocked_insert):
+            self.logger.log_event(_event("first"))
+            writer.start()
+            started.wait(5)
+            for i in range(5):
+                self.logger.log_event(_event(f"read_{i}"))
+            with open(self.spool_path) as spool:
+                self.assertEqual(len(spool.readlines()), 5)
+            release.set()
+            writer.join()
+
+        self.assertEqual(
+            [row["action"] for row in self.written],
+            ["first"] + [f"read_{i}" for i in range(5)],
+        )
+        self.assertFalse(os.path.exists(self.spool_path))
+
+    def test_corrupt_spool_lines_quarantined(self):
+        """Unreadable spool lines are set aside and the remaining events are replayed."""
+        self.logger.log_event(_event("export"))
+        with patch.object(self.logger, "_insert_rows", side_effect=OSError("database down")):
+            self.logger._flush_events()
+        with open(self.spool_path, "a") as spool:
+            spool.write('{"action": "torn", "timest\n')
+            spool.write('{"action": "no_timestamp"}\n')
+        self.logger.log_event(_event("delete"))
+        with patch.object(self.logger, "_insert_rows", side_effect=OSError("database down")):
+            self.logger._flush_events()
+
+        with patch.object(self.logger, "_insert_rows", side_effect=self.written.extend):
+            self.logger._flush_events()
+
+        self.assertEqual([row["action"] for row in self.written], ["export", "delete"])
+        self.assertFalse(os.path.exists(self.spool_path + ".replay"))
+        with open(self.spool_path + ".corrupt") as quarantine:
+            self.assertEqual(len(quarantine.readlines()), 2)
+
+    @unittest.skipIf(fcntl is None, "spool files are only locked where fcntl is available")
+    def test_replay_skipped_while_another_process_replays(self):
+        """The spool is left alone while another process holds the replay lock."""
+        self.logger._spool([{"action": "export", "timestamp": datetime.utcnow()}])
+        with open(self.spool_path + ".replay.lock", "a") as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            with patch.object(self.logger, "_insert_rows") as insert_rows:
+                self.logger._replay_spool()
+            insert_rows.assert_not_called()
+        self.assertTrue(os.path.exists(self.spool_path))
+
+        with patch.object(self.logger, "_insert_rows", side_effect=self.written.extend):
+            self.logger._replay_spool()
+        self.assertEqual([row["action"] for row in self.written], ["export"])
+
+    @unittest.skipIf(fcntl is None, "spool files are only locked where fcntl is available")
+    def test_processes_sharing_spool_insert_each_row_once(self):
+        """Processes spooling and replaying one file neither lose nor duplicate rows."""
+        inserted_path = os.path.join(self.directory, "inserted")
+        context = multiprocessing.get_context("fork")
+        workers = [
+            context.Process(target=_spool_and_replay, args=(self.spool_path, inserted_path, worker))
+            for worker in range(4)
+        ]
+        for process in workers:
+            process.start()
+        for process in workers:
+            process.join(30)
+            self.assertEqual(process.exitcode, 0)
+        _spool_and_replay(self.spool_path, inserted_path, "parent")
+
+        with open(inserted_path) as inserted:
+            actions = inserted.read().split()
+        expected = [f"{worker}_{i}" for worker in [0, 1, 2, 3, "parent"] for i in range(20)]
+        self.assertEqual(sorted(actions), sorted(expected))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+"""
+Tests for incremental budget spend tracking and the budget reconcile job.
+"""
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from flask_appbuilder import db
+from flask_appbuilder.wallet.models import TransactionType, WalletBudget
+from flask_appbuilder.wallet.services import BudgetService, TransactionService
+from tests.test_wallet_ledger import WalletTestCase
+
+
+class TestWalletBudgetSpend(WalletTestCase):
+    """Test budget spend follows posted, edited and voided expenses."""
+
+    def setUp(self):
+        super().setUp()
+        self.wallet.add_transaction(Decimal('500.00'), TransactionType.INCOME)
+        self.budget = self._add_budget('Monthly', 'monthly', days_left=30)
+
+    def _add_budget(self, name, period_type, days_left):
+        now = datetime.utcnow()
+        budget = WalletBudget(
+            wallet_id=self.wallet.id, name=name, budget_amount=Decimal('100.00'),
+            period_type=period_type, period_start=now - timedelta(days=1),
+            period_end=now + timedelta(days=days_left),
+            spent_amount=Decimal('0.00'), remaining_amount=Decimal('100.00')
+        )
+        db.session.add(budget)
+        db.session.commit()
+        # Load the budget into the session, as analytics do before transactions post
+        self.assertEqual(budget.spent_amount, Decimal('0.00'))
+        return budget
+
+    def _spend(self, amount):
+        expense = self.wallet.add_transaction(Decimal(amount), TransactionType.EXPENSE,
+                                              auto_commit=False)
+        db.session.flush()
+        return expense
+
+    def test_insert_adds_spend(self):
+        """Test a posted expense updates loaded budgets as soon as it is flushed."""
+        self._spend('40.00')
+
+        self.assertEqual(self.budget.spent_amount, Decimal('40.00'))
+        self.assertEqual(self.budget.remaining_amount, Decimal('60.00'))
+
+    def test_update_moves_spend(self):
+        """Test editing the amount of a completed expense moves the budget spend."""
+        expense = self._spend('40.00')
+
+        expense.amount = Decimal('55.00')
+        db.session.flush()
+
+        self.assertEqual(self.budget.spent_amount, Decimal('55.00'))
+        self.assertEqual(self.budget.alert_level, 0)
+
+        expense.amount = Decimal('100.00')
+        db.session.flush()
+        self.assertEqual(self.budget.alert_level, 3)
+
+    def test_void_removes_spend(self):
+        """Test voiding an expense takes it out of the budget spend."""
+        expense = self._spend('40.00')
+        db.session.commit()
+
+        TransactionService.void_transaction(expense.id, self.user.id, 'duplicate', auto_commit=False)
+        db.session.flush()
+
+        self.assertEqual(self.budget.spent_amount, Decimal('0.00'))
+        self.assertEqual(self.budget.remaining_amount, Decimal('100.00'))
+
+    def test_update_all_budgets_reconciles(self):
+        """Test the reconcile job repairs drifted open budgets in batches and skips closed ones."""
+        weekly = self._add_budget('Weekly', 'weekly', days_left=6)
+        closed = self._add_budget('Closed', 'yearly', days_left=-0.5)
+        self._spend('40.00')
+        db.session.commit()
+
+        WalletBudget.query.update({WalletBudget.spent_amount: Decimal('999.00')},
+                                  synchronize_session=False)
+        db.session.commit()
+
+        self.assertEqual(BudgetService.update_all_budgets(self.wallet.id, batch_size=1), 2)
+        self.assertEqual(self.budget.spent_amount, Decimal('40.00'))
+        self.assertEqual(self.budget.remaining_amount, Decimal('60.00'))
+        self.assertEqual(weekly.spent_amount, Decimal('40.00'))
+        self.assertEqual(closed.spent_amount, Decimal('999.00'))
+
+        self.assertEqual(BudgetService.update_all_budgets(self.wallet.id, include_closed=True), 3)
+        self.assertEqual(closed.spent_amount, Decimal('0.00'))
@@ -0,0 +1,182 @@
+"""
+Tests for the wallet running-balance ledger and daily rollups.
+"""
+
+import unittest
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from flask import Flask
+from sqlalchemy import func
+
+from flask_appbuilder import db
+from flask_appbuilder.security.sqla.models import User
+from flask_appbuilder.wallet.models import (
+    SecureWalletTransaction, TransactionStatus, TransactionType,
+    UserWallet, WalletDailyBalance, WalletTransaction
+)
+from flask_appbuilder.wallet.services import TransactionService
+
+
+class WalletTestCase(unittest.TestCase):
+    """Wallet with an initialized ledger on an in-memory database."""
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.config['TESTING'] = True
+        self.app.config['SECRET_KEY'] = 'wallet-test'
+        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+        self.app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+        db.init_app(self.app)
+
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        self.user = User(first_name='Wallet', last_name='Owner', username='wallet_owner',
+                         email='wallet_owner@example.com', active=True)
+        db.session.add(self.user)
+        db.session.flush()
+        self.wallet = UserWallet(user_id=self.user.id, wallet_name='Main', currency_code='USD',
+                                 balance=Decimal('0.00'), available_balance=Decimal('0.00'),
+                                 pending_balance=Decimal('0.00'), ledger_initialized=True)
+        db.session.add(self.wallet)
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _add_dated(self, amount, transaction_type, transaction_date, category_id=None):
+        """Post a completed transaction with a given date, as approvals and imports do."""
+        transaction = SecureWalletTransaction.create_secure_transaction(
+            wallet_id=self.wallet.id, user_id=self.user.id, amount=Decimal(amount),
+            transaction_type=transaction_type, category_id=category_id,
+            transaction_date=transaction_date
+        )
+        transaction.status = TransactionStatus.COMPLETED.value
+        self.wallet._apply_transaction_to_balance(transaction, transaction_type, Decimal(amount))
+        db.session.add(transaction)
+        db.session.commit()
+        return transaction
+
+    def _daily_rows(self):
+        return [
+            (row.day, row.income_total, row.expense_total, row.transaction_count,
+             row.net_change, row.closing_balance)
+            for row in db.session.query(WalletDailyBalance).filter_by(
+                wallet_id=self.wallet.id
+            ).order_by(WalletDailyBalance.day)
+        ]
+
+
+class TestWalletLedger(WalletTestCase):
+    """Test ledger entries, reversals, rollup totals and ledger rebuilds."""
+
+    def test_insert_records_ledger_entry(self):
+        """Test a posted transaction stamps its running balance and updates its day."""
+        income = self.wallet.add_transaction(Decimal('100.00'), TransactionType.INCOME)
+        expense = self.wallet.add_transaction(Decimal('30.00'), TransactionType.EXPENSE)
+
+        self.assertEqual(income.balance_after, Decimal('100.00'))
+        self.assertEqual(expense.balance_after, Decimal('70.00'))
+        self.assertEqual(self._daily_rows(), [(
+            datetime.utcnow().date(), Decimal('100.00'), Decimal('30.00'), 2,
+            Decimal('70.00'), Decimal('70.00')
+        )])
+
+    def test_void_records_reversal(self):
+        """Test voiding a transaction posts a reversal that restores the running balance."""
+        self.wallet.add_transaction(Decimal('100.00'), TransactionType.INCOME)
+        expense = self.wallet.add_transaction(Decimal('30.00'), TransactionType.EXPENSE)
+
+        reversal = TransactionService.void_transaction(expense.id, self.user.id, 'duplicate')
+
+        self.assertEqual(expense.status, TransactionStatus.CANCELLED.value)
+        self.assertEqual(reversal.transaction_type, TransactionType.REFUND.value)
+        self.assertEqual(reversal.balance_after, Decimal('100.00'))
+        self.assertEqual(self.wallet.balance, Decimal('100.00'))
+        day, income, expense_total, count, net_change, closing = self._daily_rows()[0]
+        self.assertEqual(
+            (income, expense_total, count, net_change, closing),
+            (Decimal('100.00'), Decimal('0.00'), 1, Decimal('100.00'), Decimal('100.00'))
+        )
+
+    def test_void_leaves_totals(self):
+        """Test voided income and expenses no longer count towards the wallet totals."""
+        self.wallet.add_transaction(Decimal('100.00'), TransactionType.INCOME)
+        expense = self.wallet.add_transaction(Decimal('30.00'), TransactionType.EXPENSE)
+        bonus = self.wallet.add_transaction(Decimal('20.00'), TransactionType.INCOME)
+
+        TransactionService.void_transaction(expense.id, self.user.id, 'duplicate')
+        TransactionService.void_transaction(bonus.id, self.user.id, 'duplicate')
+
+        self.assertEqual(self.wallet.total_income, Decimal('100.00'))
+        self.assertEqual(self.wallet.total_expenses, Decimal('0.00'))
+        self.assertEqual(self.wallet.net_worth, Decimal('100.00'))
+        self.assertEqual(self.wallet.balance, Decimal('100.00'))
+
+    def test_void_matches_rebuilt_ledger(self):
+        """Test the incremental ledger after a void equals a rebuilt one."""
+        self._add_dated('50.00', TransactionType.INCOME, datetime.utcnow() - timedelta(days=1))
+        income = self.wallet.add_transaction(Decimal('100.00'), TransactionType.INCOME)
+        expense = self.wallet.add_transaction(Decimal('30.00'), TransactionType.EXPENSE)
+        TransactionService.void_transaction(expense.id, self.user.id, 'duplicate')
+        incremental = self._daily_rows()
+
+        self.wallet.rebuild_ledger()
+        db.session.expire_all()
+
+        self.assertEqual(self._daily_rows(), incremental)
+        self.assertEqual(incremental[0][5], Decimal('50.00'))
+        self.assertEqual(incremental[-1][5], Decimal('150.00'))
+        self.assertEqual(db.session.query(WalletTransaction).get(income.id).balance_after,
+                         Decimal('150.00'))
+
+    def test_rollup_totals_match_ledger(self):
+        """Test daily rollups add up to the ledger entries, including back-dated ones."""
+        yesterday = datetime.utcnow() - timedelta(days=1)
+        self.wallet.add_transaction(Decimal('100.00'), TransactionType.INCOME)
+        self.wallet.add_transaction(Decimal('25.50'), TransactionType.EXPENSE)
+        self._add_dated('50.00', TransactionType.INCOME, yesterday)
+        self._add_dated('10.00', TransactionType.EXPENSE, yesterday)
+
+        for transaction_type in (TransactionType.INCOME, TransactionType.EXPENSE):
+            ledger_sum = db.session.query(func.sum(WalletTransaction.amount)).filter(
+                WalletTransaction.wallet_id == self.wallet.id,
+                WalletTransaction.transaction_type == transaction_type.value,
+                WalletTransaction.status == TransactionStatus.COMPLETED.value
+            ).scalar()
+            self.assertEqual(WalletDailyBalance.get_total(self.wallet.id, transaction_type), ledger_sum)
+        self.assertEqual(self.wallet.net_worth, Decimal('114.50'))
+
+        history = self.wallet.get_daily_balance_history(days=2)
+        self.assertEqual([point['balance'] for point in history], [40.0, 114.5])
+        self.assertEqual([point['income'] for point in history], [50.0, 100.0])
+        self.assertEqual([point['expense'] for point in history], [10.0, 25.5])
+        self.assertEqual(history[-1]['balance'], float(self.wallet.balance))
+
+    def test_rebuild_ledger_is_idempotent(self):
+        """Test rebuilding reproduces the incremental ledger and is stable when repeated."""
+        self._add_dated('50.00', TransactionType.INCOME, datetime.utcnow() - timedelta(days=2))
+        self.wallet.add_transaction(Decimal('100.00'), TransactionType.INCOME)
+        self.wallet.add_transaction(Decimal('40.00'), TransactionType.EXPENSE)
+        incremental = self._daily_rows()
+
+        def balances():
+            return [
+                t.balance_after for t in db.session.query(WalletTransaction).filter_by(
+                    wallet_id=self.wallet.id
+                ).order_by(WalletTransaction.id)
+            ]
+
+        self.assertEqual(self.wallet.rebuild_ledger(), 3)
+        first_rows, first_balances = self._daily_rows(), balances()
+        self.assertEqual(self.wallet.rebuild_ledger(), 3)
+        db.session.expire_all()
+
+        self.assertEqual(first_rows, incremental)
+        self.assertEqual(self._daily_rows(), first_rows)
+        self.assertEqual(balances(), first_balances)
+        self.assertEqual(first_balances, [Decimal('50.00'), Decimal('150.00'), Decimal('110.00')])
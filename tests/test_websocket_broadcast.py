@@ -0,0 +1,184 @@
+"""
+Tests for outbound delivery in the collaborative WebSocket manager.
+
+Covers per-connection outboxes (coalescing and the high-water mark),
+encoding broadcasts once, dropping slow consumers without delaying the
+other recipients, and batching cursor moves through the presence channel.
+"""
+
+import asyncio
+import json
+import unittest
+from unittest.mock import Mock, patch
+
+from flask_appbuilder.collaborative.realtime import websocket_manager
+from flask_appbuilder.collaborative.realtime.websocket_manager import (
+    ConnectionOutbox,
+    MessageType,
+    WebSocketConnection,
+    WebSocketManager,
+    WebSocketMessage,
+)
+
+
+class FakeWebSocket:
+    """WebSocket double recording sent payloads, optionally never completing sends."""
+
+    def __init__(self, stalled=False):
+        self.sent = []
+        self.stalled = stalled
+        self.closed = False
+
+    async def send(self, payload):
+        if self.stalled:
+            await asyncio.Event().wait()
+        self.sent.append(json.loads(payload))
+
+    async def close(self):
+        self.closed = True
+
+
+class TestConnectionOutbox(unittest.TestCase):
+    """Test queueing, coalescing and the high-water mark of an outbox."""
+
+    def test_coalesced_payload_replaced_in_place(self):
+        """A payload with a pending coalesce key replaces the earlier one."""
+        outbox = ConnectionOutbox(high_water=10)
+        outbox.put("cursor-1", coalesce_key="cursor")
+        outbox.put("text")
+        outbox.put("cursor-2", coalesce_key="cursor")
+
+        async def drain():
+            return [await outbox.get(), await outbox.get()]
+
+        self.assertEqual(asyncio.run(drain()), ["cursor-2", "text"])
+        self.assertEqual(outbox.coalesced, 1)
+
+    def test_put_refused_at_high_water_and_after_close(self):
+        """Puts are refused once the outbox is full or closed."""
+        outbox = ConnectionOutbox(high_water=2)
+        self.assertTrue(outbox.put("a"))
+        self.assertTrue(outbox.put("b"))
+        self.assertFalse(outbox.put("c"))
+
+        outbox.close()
+        self.assertFalse(outbox.put("d", coalesce_key="x"))
+
+
+class TestWebSocketBroadcast(unittest.TestCase):
+    """Test broadcasting through the per-connection writer tasks."""
+
+    def setUp(self):
+        async def leave_session(session_id, user_id):
+            return True
+
+        engine = Mock(leave_session=leave_session)
+        with patch.object(websocket_manager, "WEBSOCKETS_AVAILABLE", False):
+            self.manager = WebSocketManager(engine)
+        self.manager.config["outbound_queue_high_water"] = 3
+        self.manager.config["outbound_drain_timeout"] = 0.05
+
+    async def _close_outboxes(self):
+        for connection in list(self.manager.connections.values()):
+            await self.manager._close_outbox(connection)
+
+    def _connect(self, connection_id, user_id, websocket):
+        self.manager.connections[connection_id] = WebSocketConnection(
+            connection_id=connection_id,
+            websocket=websocket,
+            user_id=user_id,
+            jwt_token="token",
+            session_id="session",
+        )
+        self.manager.session_connections["session"].add(connection_id)
+
+    def test_broadcast_encodes_once_and_excludes_sender(self):
+        """The payload is serialized once for all recipients."""
+        sockets = [FakeWebSocket() for _ in range(3)]
+        for user_id, websocket in enumerate(sockets):
+            self._connect(f"c{user_id}", user_id, websocket)
+
+        async def run():
+            with patch.object(
+                websocket_manager.json, "dumps", wraps=json.dumps
+            ) as dumps:
+                await self.manager._broadcast_to_session(
+                    WebSocketMessage(
+                        message_type=MessageType.TEXT_CHANGE,
+                        sender_id=0,
+                        session_id="session",
+                        data={"text": "hello"},
+                    ),
+                    exclude_sender=True,
+                )
+            await asyncio.sleep(0.01)
+            await self._close_outboxes()
+            return dumps.call_count
+
+        self.assertEqual(asyncio.run(run()), 1)
+        self.assertEqual(sockets[0].sent, [])
+        self.assertEqual(sockets[1].sent[0]["data"], {"text": "hello"})
+        self.assertEqual(sockets[2].sent[0]["type"], "text_change")
+
+    def test_slow_consumer_dropped_without_blocking_others(self):
+        """A recipient that stops reading is disconnected at the high-water mark."""
+        fast, slow = FakeWebSocket(), FakeWebSocket(stalled=True)
+        self._connect("fast", 1, fast)
+        self._connect("slow", 2, slow)
+
+        async def run():
+            for i in range(6):
+                await self.manager._broadcast_to_session(
+                    WebSocketMessage(
+                        message_type=MessageType.FORM_CHANGE,
+                        sender_id=3,
+                        session_id="session",
+                        data={"i": i},
+                    )
+                )
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0.1)
+            await self._close_outboxes()
+
+        asyncio.run(run())
+        self.assertEqual([m["data"]["i"] for m in fast.sent], list(range(6)))
+        self.assertNotIn("slow", self.manager.connections)
+        self.assertTrue(slow.closed)
+        self.assertEqual(self.manager.slow_consumer_disconnects, 1)
+
+    def test_cursor_moves_sent_as_one_presence_batch(self):
+        """Cursor moves are not broadcast one by one but batched per tick."""
+        sockets = [FakeWebSocket() for _ in range(2)]
+        for user_id, websocket in enumerate(sockets):
+            self._connect(f"c{user_id}", user_id, websocket)
+
+        async def run():
+            for position in range(20):
+                await self.manager._handle_cursor_move(
+                    "c0",
+                    WebSocketMessage(
+                        message_type=MessageType.CURSOR_MOVE,
+                        sender_id=0,
+                        session_id="session",
+                        resource_id="doc",
+                        data={"position": position},
+                    ),
+                )
+            self.manager.presence.flush()
+            await asyncio.sleep(0.01)
+            await self._close_outboxes()
+
+        asyncio.run(run())
+        self.assertEqual(len(sockets[1].sent), 1)
+        self.assertEqual(sockets[1].sent[0]["type"], "presence")
+        self.assertEqual(
+            sockets[1].sent[0]["data"]["updates"],
+            [{"user_id": 0, "resource_id": "doc", "cursor": 19}],
+        )
+        self.assertEqual(
+            self.manager.presence.get_session_stats("session")["coalesced"], 19
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()